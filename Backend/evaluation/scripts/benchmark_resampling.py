@@ -0,0 +1,109 @@
+"""
+Resampling Benchmark
+
+Compares resampling browser uploads to 16 kHz with
+torchaudio.functional.resample, which rebuilds the polyphase sinc kernel on
+every call, against the process-wide kernel cache used by AudioSample
+(src/infrastructure/biometrics/resampling.py).
+
+Reports the median and p95 time per utterance for each source rate and
+duration, the speed-up, and the largest sample difference between the two
+(should be ~0: both use the same kernel).
+
+Usage:
+    python benchmark_resampling.py
+    python benchmark_resampling.py --rates 44100,48000,22050 --durations 1,3,10 --repeats 200
+"""
+
+import sys
+import time
+import argparse
+import logging
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+import torch
+import torchaudio
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.infrastructure.biometrics.resampling import TARGET_SAMPLE_RATE, clear_resamplers, resample
+
+logger = logging.getLogger(__name__)
+
+
+def resample_uncached(waveform: np.ndarray, orig_rate: int) -> np.ndarray:
+    """The previous per-call path."""
+    return torchaudio.functional.resample(
+        torch.from_numpy(waveform), orig_freq=orig_rate, new_freq=TARGET_SAMPLE_RATE
+    ).numpy()
+
+
+def time_calls(func: Callable[[], np.ndarray], repeats: int) -> Dict[str, float]:
+    """Median and p95 wall time in milliseconds."""
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {"median_ms": float(np.median(timings)), "p95_ms": float(np.percentile(timings, 95))}
+
+
+def run_benchmark(rates: List[int], durations: List[float], repeats: int) -> List[Dict]:
+    rng = np.random.default_rng(0)
+    results = []
+    for rate in rates:
+        # The first cached call builds the kernel once, as start-up preloading does
+        clear_resamplers()
+        for duration in durations:
+            waveform = rng.uniform(-0.5, 0.5, int(rate * duration)).astype(np.float32)
+            cached_output = resample(waveform, rate)
+            max_diff = float(np.max(np.abs(cached_output - resample_uncached(waveform, rate))))
+
+            uncached = time_calls(lambda: resample_uncached(waveform, rate), repeats)
+            cached = time_calls(lambda: resample(waveform, rate), repeats)
+            results.append({
+                "rate": rate,
+                "duration_sec": duration,
+                "uncached": uncached,
+                "cached": cached,
+                "speedup": uncached["median_ms"] / cached["median_ms"],
+                "max_diff": max_diff
+            })
+    return results
+
+
+def print_report(results: List[Dict]):
+    print(f"{'rate':>7} {'dur':>5} {'uncached p50/p95 ms':>22} {'cached p50/p95 ms':>20} {'speed-up':>9} {'max diff':>9}")
+    for r in results:
+        print(
+            f"{r['rate']:>7} {r['duration_sec']:>5.1f} "
+            f"{r['uncached']['median_ms']:>10.2f} /{r['uncached']['p95_ms']:>9.2f} "
+            f"{r['cached']['median_ms']:>8.2f} /{r['cached']['p95_ms']:>9.2f} "
+            f"{r['speedup']:>8.1f}x {r['max_diff']:>9.1e}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cached vs per-call resampling kernels")
+    parser.add_argument("--rates", default="44100,48000", help="Comma-separated source sample rates")
+    parser.add_argument("--durations", default="1.5,3,5", help="Comma-separated utterance lengths (s)")
+    parser.add_argument("--repeats", type=int, default=100, help="Timed calls per configuration")
+    parser.add_argument("--threads", type=int, default=1, help="torch intra-op threads")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    torch.set_num_threads(args.threads)
+
+    results = run_benchmark(
+        rates=[int(rate) for rate in args.rates.split(",")],
+        durations=[float(duration) for duration in args.durations.split(",")],
+        repeats=args.repeats
+    )
+    print_report(results)
+
+
+if __name__ == "__main__":
+    main()
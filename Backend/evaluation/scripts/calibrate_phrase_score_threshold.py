@@ -0,0 +1,102 @@
+"""
+Phrase Score Threshold Calibration
+
+Scores the correct and incorrect phrase cases of an evaluate_asr.py
+configuration with ASRAdapter.score_phrase (CTC likelihood ratio against the
+free path) and reports the threshold for ASR_PHRASE_SCORE_THRESHOLD: the EER
+point, and optionally the threshold at a target FAR (incorrect phrases
+accepted).
+
+Cases scored in transcription mode (ASR model not loaded) are skipped: their
+scores are on a different scale.
+
+Usage:
+    python calibrate_phrase_score_threshold.py --dataset phrases_dataset --config asr_config.json
+    python calibrate_phrase_score_threshold.py --dataset phrases_dataset --config asr_config.json --target-far 0.01
+"""
+
+import sys
+import json
+import argparse
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from evaluation.scripts.metrics_calculator import BiometricMetrics, BiometricScores, ThresholdOptimizer
+from src.infrastructure.biometrics.ASRAdapter import ASRAdapter
+
+logger = logging.getLogger(__name__)
+
+
+def score_cases(adapter: ASRAdapter, cases: List[Dict], dataset_dir: Path) -> List[float]:
+    """CTC phrase scores of the cases whose audio exists."""
+    scores = []
+    for case in cases:
+        audio_path = dataset_dir / case["audio_path"]
+        if not audio_path.exists():
+            logger.warning(f"Missing audio: {audio_path}")
+            continue
+        result = adapter.score_phrase(audio_path.read_bytes(), case["expected_phrase"])
+        if result.get("mode") != "ctc_alignment":
+            logger.warning(f"Skipping {audio_path}: scored in {result.get('mode')} mode")
+            continue
+        scores.append(result["phrase_match"])
+    return scores
+
+
+def calibrate(genuine: List[float], impostor: List[float], target_far: Optional[float] = None) -> Dict:
+    """EER threshold and, with ``target_far``, the threshold at that FAR."""
+    metrics = BiometricMetrics(BiometricScores(genuine_scores=genuine, impostor_scores=impostor))
+    eer = metrics.find_eer()
+    report = {
+        "correct_cases": len(genuine),
+        "incorrect_cases": len(impostor),
+        "eer": eer.eer,
+        "eer_threshold": eer.eer_threshold
+    }
+    if target_far is not None:
+        at_far = ThresholdOptimizer.find_threshold_at_far(metrics, target_far)
+        report.update({
+            "target_far": target_far,
+            "threshold_at_far": at_far.threshold,
+            "frr_at_far": at_far.frr
+        })
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate ASR_PHRASE_SCORE_THRESHOLD")
+    parser.add_argument("--dataset", type=str, default="dataset", help="Dataset directory path")
+    parser.add_argument("--config", type=str, required=True,
+                        help="evaluate_asr.py configuration (correct_phrases, incorrect_phrases)")
+    parser.add_argument("--target-far", type=float, default=None,
+                        help="Also report the threshold at this FAR (e.g. 0.01)")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+
+    adapter = ASRAdapter(use_gpu=True)
+    dataset_dir = Path(args.dataset)
+    genuine = score_cases(adapter, config.get("correct_phrases", []), dataset_dir)
+    impostor = score_cases(adapter, config.get("incorrect_phrases", []), dataset_dir)
+    if not genuine or not impostor:
+        logger.error("Need CTC scores for both correct and incorrect phrases")
+        sys.exit(1)
+
+    report = calibrate(genuine, impostor, args.target_far)
+    print(json.dumps(report, indent=2))
+    print(f"\nASR_PHRASE_SCORE_THRESHOLD={report['eer_threshold']:.3f}  (EER {report['eer']:.2%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -129,17 +129,10 @@ class FeatureEnhancedEvaluator:
                 # Load audio for feature extraction
                 audio = self.load_audio(audio_path)
                 
-                # Extract features
-                features = self.feature_extractor.extract_all_features(audio)
-                
-                # Enhanced decision
-                is_spoof = self.make_enhanced_decision(spoof_score, features, ensemble_threshold)
-                
                 genuine_results.append({
                     'file': audio_path.name,
                     'ensemble_score': spoof_score,
-                    'features': features,
-                    'is_spoof': is_spoof
+                    'audio': audio
                 })
                 
                 if i % 10 == 0:
@@ -160,17 +153,10 @@ class FeatureEnhancedEvaluator:
                 # Load audio for feature extraction
                 audio = self.load_audio(audio_path)
                 
-                # Extract features
-                features = self.feature_extractor.extract_all_features(audio)
-                
-                # Enhanced decision
-                is_spoof = self.make_enhanced_decision(spoof_score, features, ensemble_threshold)
-                
                 cloning_results.append({
                     'file': audio_path.name,
                     'ensemble_score': spoof_score,
-                    'features': features,
-                    'is_spoof': is_spoof
+                    'audio': audio
                 })
                 
                 if i % 10 == 0:
@@ -179,6 +165,17 @@ class FeatureEnhancedEvaluator:
             except Exception as e:
                 logger.error(f"Failed to process {audio_path.name}: {e}")
         
+        # Features of all clips in one batch (one spectrogram per clip, all cores),
+        # then the enhanced decision
+        logger.info("Extracting features...")
+        for results in (genuine_results, cloning_results):
+            clips = [result.pop('audio') for result in results]
+            for result, features in zip(results, self.feature_extractor.extract_features_batch(clips)):
+                result['features'] = features
+                result['is_spoof'] = self.make_enhanced_decision(
+                    result['ensemble_score'], features, ensemble_threshold
+                )
+        
         # Calculate metrics
         genuine_rejected = sum(1 for r in genuine_results if r['is_spoof'])
         cloning_accepted = sum(1 for r in cloning_results if not r['is_spoof'])
@@ -19,8 +19,8 @@ from datetime import datetime
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
-from evaluation.metrics_calculator import calculate_wer
-from evaluation.results_manager import (
+from evaluation.scripts.metrics_calculator import calculate_wer
+from evaluation.scripts.results_manager import (
     ResultsManager, ExperimentMetadata, TestResult, generate_experiment_id
 )
 
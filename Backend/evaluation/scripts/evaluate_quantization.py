@@ -0,0 +1,258 @@
+"""
+INT8 Quantization Evaluation Script
+
+Runs the speaker verification and anti-spoofing evaluations twice, once with
+the fp32 models and once with dynamic INT8 quantization enabled, and reports
+the EER of each run, the EER delta and the per-audio score drift.
+
+Use it before enabling a model in QUANTIZE_MODELS: the quantized model should
+keep the EER within a small margin of fp32 and the score drift should stay
+well below the decision margins around the thresholds.
+
+Usage:
+    python evaluate_quantization.py --dataset dataset \
+        --speaker-config dataset/voxceleb_config.json \
+        --antispoof-config dataset/asvspoof_config.json
+    python evaluate_quantization.py --dataset dataset --antispoof-config dataset/asvspoof_config.json \
+        --models aasist,rawnet2
+"""
+
+import sys
+import json
+import time
+import argparse
+import logging
+from pathlib import Path
+from typing import Any, List, Dict, Tuple, Optional
+import numpy as np
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from evaluation.scripts.metrics_calculator import BiometricScores, BiometricMetrics
+from evaluation.scripts.results_manager import (
+    ResultsManager, ExperimentMetadata, TestResult, generate_experiment_id
+)
+from evaluation.scripts.evaluate_speaker_verification import SpeakerVerificationEvaluator
+from evaluation.scripts.evaluate_antispoofing import AntiSpoofingEvaluator
+
+try:
+    from src.infrastructure.biometrics.model_manager import model_manager
+except ImportError as e:
+    print(f"Error importing biometric components: {e}")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+SPEAKER_MODELS = ["ecapa_tdnn"]
+ANTISPOOF_MODELS = ["aasist", "rawnet2"]
+
+
+def set_quantization(models: List[str], enabled: bool):
+    """Toggle INT8 quantization for the given models before building the adapters."""
+    for model_id in models:
+        model_manager.set_quantization(model_id, enabled)
+
+
+def calculate_eer(genuine_scores: List[float], impostor_scores: List[float]) -> Optional[float]:
+    """EER for similarity-like scores (higher = genuine), None without both classes."""
+    if not genuine_scores or not impostor_scores:
+        return None
+    scores = BiometricScores(
+        genuine_scores=np.array(genuine_scores),
+        impostor_scores=np.array(impostor_scores)
+    )
+    return float(BiometricMetrics(scores).find_eer().eer)
+
+
+def calculate_score_drift(
+    fp32_results: List[TestResult],
+    int8_results: List[TestResult],
+    score_field: str
+) -> Dict[str, float]:
+    """
+    Compare the scores of the two runs audio by audio.
+
+    Results are paired by test_id, so audios that failed in either run are skipped.
+    """
+    fp32_scores = {r.test_id: getattr(r, score_field) for r in fp32_results}
+    pairs = [
+        (fp32_scores[r.test_id], getattr(r, score_field))
+        for r in int8_results
+        if r.test_id in fp32_scores
+    ]
+    if not pairs:
+        return {"paired_tests": 0}
+
+    fp32, int8 = np.array(pairs, dtype=np.float64).T
+    diff = np.abs(int8 - fp32)
+    drift = {
+        "paired_tests": int(len(pairs)),
+        "mean_abs_drift": float(diff.mean()),
+        "p95_abs_drift": float(np.percentile(diff, 95)),
+        "max_abs_drift": float(diff.max()),
+    }
+    if len(pairs) > 1 and fp32.std() > 0 and int8.std() > 0:
+        drift["correlation"] = float(np.corrcoef(fp32, int8)[0, 1])
+    return drift
+
+
+def run_speaker_verification(dataset_dir: Path, config: Dict) -> Dict:
+    """Run the speaker verification evaluation with the current quantization settings."""
+    evaluator = SpeakerVerificationEvaluator(dataset_dir=dataset_dir)
+
+    start = time.perf_counter()
+    evaluator.enroll_users(config["enrollment"])
+    genuine_scores, genuine_results = evaluator.evaluate_genuine_tests(config["genuine"])
+    impostor_scores, impostor_results = evaluator.evaluate_impostor_tests(config["impostor"])
+    elapsed = time.perf_counter() - start
+
+    results = genuine_results + impostor_results
+    return {
+        "eer": calculate_eer(genuine_scores, impostor_scores),
+        "results": results,
+        "avg_latency_ms": elapsed * 1000 / max(1, len(results)),
+        "model_version": evaluator.speaker_adapter.get_model_version(),
+    }
+
+
+def run_antispoofing(dataset_dir: Path, config: Dict, model_name: str) -> Dict:
+    """Run the anti-spoofing evaluation with the current quantization settings."""
+    evaluator = AntiSpoofingEvaluator(model_name=model_name)
+
+    start = time.perf_counter()
+    genuine_scores, genuine_results = evaluator.evaluate_genuine_audios(config["genuine"], dataset_dir)
+    spoofed_scores, spoofed_results = evaluator.evaluate_spoofed_audios(
+        config["spoofed"], dataset_dir, config.get("attack_types")
+    )
+    elapsed = time.perf_counter() - start
+
+    # Bonafide should score low, so use (1 - spoof_prob) as the similarity
+    results = genuine_results + spoofed_results
+    return {
+        "eer": calculate_eer(
+            [1 - s for s in genuine_scores],
+            [1 - s for s in spoofed_scores]
+        ),
+        "results": results,
+        "avg_latency_ms": elapsed * 1000 / max(1, len(results)),
+        "model_version": evaluator.spoof_detector.get_model_version(),
+    }
+
+
+def compare_runs(module: str, fp32: Dict, int8: Dict, score_field: str) -> Tuple[Dict, List[TestResult]]:
+    """Build the fp32 vs int8 metrics of one module and the tagged results of both runs."""
+    metrics = {
+        "eer_fp32": fp32["eer"],
+        "eer_int8": int8["eer"],
+        "avg_latency_ms_fp32": fp32["avg_latency_ms"],
+        "avg_latency_ms_int8": int8["avg_latency_ms"],
+        "model_version_fp32": fp32["model_version"],
+        "model_version_int8": int8["model_version"],
+    }
+    if fp32["eer"] is not None and int8["eer"] is not None:
+        metrics["eer_delta"] = int8["eer"] - fp32["eer"]
+    if int8["avg_latency_ms"] > 0:
+        metrics["speedup"] = fp32["avg_latency_ms"] / int8["avg_latency_ms"]
+    metrics.update(calculate_score_drift(fp32["results"], int8["results"], score_field))
+
+    logger.info(f"\n{'='*60}")
+    logger.info(f"QUANTIZATION RESULTS: {module}")
+    logger.info(f"{'='*60}")
+    if metrics.get("eer_delta") is not None:
+        logger.info(f"EER fp32: {fp32['eer']:.3%}  int8: {int8['eer']:.3%}  Δ: {metrics['eer_delta']:+.3%}")
+    if metrics["paired_tests"]:
+        logger.info(
+            f"Score drift over {metrics['paired_tests']} audios: "
+            f"mean={metrics['mean_abs_drift']:.4f} max={metrics['max_abs_drift']:.4f}"
+        )
+    logger.info(
+        f"Latency: {fp32['avg_latency_ms']:.1f} ms -> {int8['avg_latency_ms']:.1f} ms per audio"
+    )
+    logger.info(f"{'='*60}\n")
+
+    tagged = []
+    for precision, run in (("fp32", fp32), ("int8", int8)):
+        for result in run["results"]:
+            result.test_id = f"{module}_{precision}_{result.test_id}"
+            tagged.append(result)
+    return metrics, tagged
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate INT8 quantization against fp32")
+    parser.add_argument("--dataset", type=str, default="dataset",
+                        help="Dataset directory path")
+    parser.add_argument("--speaker-config", type=str, default=None,
+                        help="Speaker verification configuration JSON (enrollment/genuine/impostor)")
+    parser.add_argument("--antispoof-config", type=str, default=None,
+                        help="Anti-spoofing configuration JSON (genuine/spoofed)")
+    parser.add_argument("--antispoof-model", type=str, default="ensemble_antispoofing",
+                        help="Anti-spoofing model passed to SpoofDetectorAdapter")
+    parser.add_argument("--models", type=str, default=",".join(SPEAKER_MODELS + ANTISPOOF_MODELS),
+                        help="Comma-separated models to quantize in the int8 run")
+    parser.add_argument("--name", type=str, default="quantization_eval",
+                        help="Experiment name")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Enable verbose logging")
+
+    args = parser.parse_args()
+
+    # Setup logging
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    if not args.speaker_config and not args.antispoof_config:
+        parser.error("provide --speaker-config and/or --antispoof-config")
+
+    models = [m.strip() for m in args.models.split(",") if m.strip()]
+    dataset_dir = Path(args.dataset)
+    metrics: Dict[str, Any] = {"quantized_models": models}
+    all_results: List[TestResult] = []
+
+    try:
+        if args.speaker_config:
+            with open(args.speaker_config, 'r') as f:
+                config = json.load(f)
+            set_quantization(models, False)
+            fp32 = run_speaker_verification(dataset_dir, config)
+            set_quantization(models, True)
+            int8 = run_speaker_verification(dataset_dir, config)
+            metrics["speaker_verification"], results = compare_runs(
+                "speaker", fp32, int8, "similarity_score"
+            )
+            all_results.extend(results)
+
+        if args.antispoof_config:
+            with open(args.antispoof_config, 'r') as f:
+                config = json.load(f)
+            set_quantization(models, False)
+            fp32 = run_antispoofing(dataset_dir, config, args.antispoof_model)
+            set_quantization(models, True)
+            int8 = run_antispoofing(dataset_dir, config, args.antispoof_model)
+            metrics["anti_spoofing"], results = compare_runs(
+                "antispoof", fp32, int8, "spoof_probability"
+            )
+            all_results.extend(results)
+
+        experiment_id = generate_experiment_id("quantization", args.name)
+        metadata = ExperimentMetadata(
+            experiment_id=experiment_id,
+            experiment_type="quantization",
+            timestamp=datetime.now().strftime("%Y%m%d_%H%M%S"),
+            dataset=args.name,
+            description=f"INT8 dynamic quantization vs fp32 ({', '.join(models)})"
+        )
+        result_path = ResultsManager().save_experiment(metadata, all_results, metrics)
+        print(f"\n✓ Evaluation complete! Results: {result_path}")
+
+    except Exception as e:
+        logger.error(f"Evaluation failed: {e}", exc_info=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
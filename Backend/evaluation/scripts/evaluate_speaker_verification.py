@@ -21,8 +21,8 @@ from datetime import datetime
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
-from evaluation.metrics_calculator import BiometricScores, BiometricMetrics
-from evaluation.results_manager import (
+from evaluation.scripts.metrics_calculator import BiometricScores, BiometricMetrics
+from evaluation.scripts.results_manager import (
     ResultsManager, ExperimentMetadata, TestResult, generate_experiment_id
 )
 
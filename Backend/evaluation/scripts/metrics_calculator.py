@@ -15,6 +15,8 @@ from typing import List, Tuple, Dict, Optional
 from dataclasses import dataclass
 import logging
 
+from src.shared.phrase_matching import word_error_rate
+
 logger = logging.getLogger(__name__)
 
 
@@ -356,6 +358,10 @@ def calculate_wer(reference: str, hypothesis: str) -> float:
     
     WER = (Substitutions + Deletions + Insertions) / Total words in reference
     
+    Both texts are normalized like the API does (case, accents, punctuation)
+    and the reference is compiled once, so scoring many transcripts of the
+    same phrase only scans each transcript.
+    
     Args:
         reference: Ground truth text
         hypothesis: ASR transcription
@@ -363,32 +369,7 @@ def calculate_wer(reference: str, hypothesis: str) -> float:
     Returns:
         WER as a float (0.0 = perfect, higher is worse)
     """
-    ref_words = reference.lower().split()
-    hyp_words = hypothesis.lower().split()
-    
-    # Use dynamic programming to find edit distance
-    d = np.zeros((len(ref_words) + 1, len(hyp_words) + 1), dtype=np.int32)
-    
-    for i in range(len(ref_words) + 1):
-        d[i][0] = i
-    for j in range(len(hyp_words) + 1):
-        d[0][j] = j
-    
-    for i in range(1, len(ref_words) + 1):
-        for j in range(1, len(hyp_words) + 1):
-            if ref_words[i-1] == hyp_words[j-1]:
-                d[i][j] = d[i-1][j-1]
-            else:
-                substitution = d[i-1][j-1] + 1
-                insertion = d[i][j-1] + 1
-                deletion = d[i-1][j] + 1
-                d[i][j] = min(substitution, insertion, deletion)
-    
-    if len(ref_words) == 0:
-        return 1.0 if len(hyp_words) > 0 else 0.0
-    
-    wer = float(d[len(ref_words)][len(hyp_words)]) / len(ref_words)
-    return wer
+    return word_error_rate(reference, hypothesis)
 
 
 if __name__ == "__main__":
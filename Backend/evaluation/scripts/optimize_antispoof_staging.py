@@ -0,0 +1,252 @@
+"""
+Anti-Spoofing Staging Optimization Script
+
+Picks the uncertainty band of the staged anti-spoofing ensemble
+(ANTISPOOF_STAGED). Every audio of an evaluate_antispoofing.py dataset is
+scored once by both AASIST and RawNet2; the staged decision is then
+simulated for every band on a grid, reporting the compute saved (share of
+second-stage runs avoided, weighted by the measured model latencies) against
+the change in EER and in error rate at the operating threshold.
+
+Usage:
+    python optimize_antispoof_staging.py --dataset dataset --config dataset/asvspoof_config.json
+    python optimize_antispoof_staging.py --dataset dataset --config dataset/asvspoof_config.json \
+        --first-stage rawnet2 --max-eer-increase 0.005
+"""
+
+import sys
+import json
+import argparse
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+import numpy as np
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from evaluation.scripts.metrics_calculator import BiometricScores, BiometricMetrics
+from evaluation.scripts.results_manager import (
+    ResultsManager, ExperimentMetadata, TestResult, generate_experiment_id
+)
+from evaluation.scripts.evaluate_antispoofing import load_example_config
+
+try:
+    from src.infrastructure.biometrics.SpoofDetectorAdapter import SpoofDetectorAdapter
+except ImportError as e:
+    print(f"Error importing biometric components: {e}")
+    sys.exit(1)
+
+logger = logging.getLogger(__name__)
+
+MODELS = ("aasist", "rawnet2")
+
+
+def collect_scores(
+    detector: SpoofDetectorAdapter,
+    dataset_dir: Path,
+    config: Dict
+) -> Dict[str, Any]:
+    """Score every audio with both models (unstaged) and time each model."""
+    labels, per_model = [], {name: [] for name in MODELS}
+    latencies = {name: [] for name in MODELS}
+    results = []
+
+    audios = [(p, 0) for p in config["genuine"]] + [(p, 1) for p in config["spoofed"]]
+    for i, (audio_path_str, label) in enumerate(audios, 1):
+        audio_path = dataset_dir / audio_path_str
+        if not audio_path.exists():
+            logger.warning(f"  Audio not found: {audio_path}")
+            continue
+
+        details = detector.get_spoof_details(audio_path.read_bytes())
+        scores = details.get("individual_model_scores", {})
+        if not all(name in scores for name in MODELS):
+            logger.warning(f"  Skipping {audio_path.name}: both models are needed ({list(scores)})")
+            continue
+
+        labels.append(label)
+        for name in MODELS:
+            per_model[name].append(scores[name])
+            latencies[name].append(details["stage_latency_ms"][name])
+
+        results.append(TestResult(
+            test_id=f"{'spoofed' if label else 'genuine'}_{i:04d}",
+            test_type="spoof" if label else "genuine",
+            spoof_probability=details["spoof_probability"],
+            label="spoof" if label else "genuine",
+            timestamp=datetime.now().isoformat(),
+            notes=", ".join(f"{name}={scores[name]:.4f}" for name in MODELS)
+        ))
+
+        if i % 50 == 0:
+            logger.info(f"  Scored {i}/{len(audios)} audios")
+
+    return {
+        "labels": np.array(labels, dtype=int),
+        "scores": {name: np.array(values) for name, values in per_model.items()},
+        "latency_ms": {name: float(np.median(values)) if values else 0.0 for name, values in latencies.items()},
+        "results": results,
+    }
+
+
+def evaluate_scores(spoof_scores: np.ndarray, labels: np.ndarray, threshold: float) -> Dict[str, float]:
+    """EER and error rates at the operating threshold for spoof probabilities."""
+    genuine, spoofed = spoof_scores[labels == 0], spoof_scores[labels == 1]
+    # Bonafide should score low, so use (1 - spoof_prob) as the similarity
+    eer = BiometricMetrics(BiometricScores(
+        genuine_scores=1 - genuine,
+        impostor_scores=1 - spoofed
+    )).find_eer().eer
+    far = float(np.mean(spoofed < threshold))   # Spoof accepted as genuine
+    frr = float(np.mean(genuine >= threshold))  # Genuine rejected as spoof
+    return {"eer": float(eer), "far": far, "frr": frr, "error_rate": (far + frr) / 2}
+
+
+def simulate_band(
+    data: Dict[str, Any],
+    first_stage: str,
+    low: float,
+    high: float,
+    weights: Dict[str, float],
+    threshold: float
+) -> Dict[str, float]:
+    """Staged scores for one band: first-stage score outside it, ensemble inside."""
+    second_stage = next(name for name in MODELS if name != first_stage)
+    first, second = data["scores"][first_stage], data["scores"][second_stage]
+
+    ensemble = (
+        first * weights[first_stage] + second * weights[second_stage]
+    ) / (weights[first_stage] + weights[second_stage])
+    escalated = (first >= low) & (first <= high)
+    staged = np.where(escalated, ensemble, first)
+
+    latency = data["latency_ms"]
+    full_cost = latency[first_stage] + latency[second_stage]
+    staged_cost = latency[first_stage] + float(escalated.mean()) * latency[second_stage]
+
+    return {
+        "first_stage": first_stage,
+        "band_low": round(low, 4),
+        "band_high": round(high, 4),
+        "escalation_rate": float(escalated.mean()),
+        "compute_saved": 1 - staged_cost / full_cost if full_cost > 0 else 0.0,
+        **evaluate_scores(staged, data["labels"], threshold),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pick the uncertainty band of the staged anti-spoofing ensemble")
+    parser.add_argument("--dataset", type=str, default="dataset",
+                        help="Dataset directory path")
+    parser.add_argument("--config", type=str, default=None,
+                        help="Anti-spoofing configuration JSON (genuine/spoofed), as for evaluate_antispoofing.py")
+    parser.add_argument("--first-stage", type=str, default=None, choices=MODELS,
+                        help="First-stage model (default: try both)")
+    parser.add_argument("--step", type=float, default=0.05,
+                        help="Grid step for the band edges")
+    parser.add_argument("--max-eer-increase", type=float, default=0.005,
+                        help="Largest acceptable EER increase over the full ensemble")
+    parser.add_argument("--threshold", type=float, default=0.5,
+                        help="Operating threshold on the spoof probability (ANTI_SPOOFING_THRESHOLD)")
+    parser.add_argument("--name", type=str, default="antispoof_staging",
+                        help="Experiment name")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Enable verbose logging")
+
+    args = parser.parse_args()
+
+    # Setup logging
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    # find_eer logs every call; the grid runs it hundreds of times
+    logging.getLogger("evaluation.scripts.metrics_calculator").setLevel(logging.WARNING)
+
+    # Load configuration
+    if args.config:
+        with open(args.config, 'r') as f:
+            config = json.load(f)
+    else:
+        print("WARNING: No config file provided, using example configuration")
+        print("In production, provide config with: --config dataset/asvspoof_config.json")
+        config = load_example_config()
+
+    try:
+        # Unstaged, unbatched: both models score every audio
+        detector = SpoofDetectorAdapter(staged=False, max_batch_size=1)
+        data = collect_scores(detector, Path(args.dataset), config)
+        labels = data["labels"]
+        if (labels == 0).sum() == 0 or (labels == 1).sum() == 0:
+            raise ValueError("Need genuine and spoofed audios scored by both models")
+
+        weights = detector.model_weights
+        full = np.zeros(len(labels))
+        for name in MODELS:
+            full += data["scores"][name] * weights[name]
+        baseline = evaluate_scores(full / sum(weights[name] for name in MODELS), labels, args.threshold)
+
+        edges = np.round(np.arange(0.0, 1.0 + 1e-9, args.step), 4)
+        first_stages = [args.first_stage] if args.first_stage else list(MODELS)
+        candidates = [
+            simulate_band(data, first_stage, low, high, weights, args.threshold)
+            for first_stage in first_stages
+            for low in edges
+            for high in edges
+            if low < high
+        ]
+        for candidate in candidates:
+            candidate["eer_delta"] = candidate["eer"] - baseline["eer"]
+            candidate["error_rate_delta"] = candidate["error_rate"] - baseline["error_rate"]
+
+        acceptable = [c for c in candidates if c["eer_delta"] <= args.max_eer_increase]
+        best: Optional[Dict] = max(
+            acceptable, key=lambda c: (c["compute_saved"], -c["eer_delta"]), default=None
+        )
+
+        logger.info(f"\n{'='*60}")
+        logger.info(f"STAGED ANTI-SPOOFING: {len(labels)} audios")
+        logger.info(f"Median latency: " + ", ".join(f"{k}={v:.1f} ms" for k, v in data["latency_ms"].items()))
+        logger.info(f"Full ensemble: EER={baseline['eer']:.3%}, error@{args.threshold}={baseline['error_rate']:.3%}")
+        for c in sorted(acceptable, key=lambda c: -c["compute_saved"])[:5]:
+            logger.info(
+                f"  {c['first_stage']} first, band [{c['band_low']:.2f}, {c['band_high']:.2f}]: "
+                f"saved {c['compute_saved']:.1%}, escalated {c['escalation_rate']:.1%}, "
+                f"EER Δ {c['eer_delta']:+.3%}, error Δ {c['error_rate_delta']:+.3%}"
+            )
+        if best:
+            logger.info(
+                f"Recommended: ANTISPOOF_STAGED=true ANTISPOOF_FIRST_STAGE={best['first_stage']} "
+                f"ANTISPOOF_UNCERTAINTY_BAND={best['band_low']},{best['band_high']}"
+            )
+        else:
+            logger.info(f"No band keeps the EER within +{args.max_eer_increase:.3%}; keep the full ensemble")
+        logger.info(f"{'='*60}\n")
+
+        experiment_id = generate_experiment_id("antispoofing", args.name)
+        metadata = ExperimentMetadata(
+            experiment_id=experiment_id,
+            experiment_type="anti_spoofing_staging",
+            timestamp=datetime.now().strftime("%Y%m%d_%H%M%S"),
+            dataset=args.name,
+            description=f"Staged anti-spoofing band search: {len(labels)} audios, {len(candidates)} bands"
+        )
+        metrics = {
+            "baseline": baseline,
+            "latency_ms": data["latency_ms"],
+            "max_eer_increase": args.max_eer_increase,
+            "recommended": best,
+            "candidates": sorted(candidates, key=lambda c: -c["compute_saved"]),
+        }
+        result_path = ResultsManager().save_experiment(metadata, data["results"], metrics)
+        print(f"\n✓ Optimization complete! Results: {result_path}")
+
+    except Exception as e:
+        logger.error(f"Optimization failed: {e}", exc_info=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -70,13 +70,10 @@ class ThresholdOptimizer:
                 # Load audio for feature extraction
                 audio = self.load_audio(audio_path)
                 
-                # Extract features
-                features = self.feature_extractor.extract_all_features(audio)
-                
                 genuine_data.append({
                     'file': audio_path.name,
                     'ensemble_score': spoof_score,
-                    'features': features
+                    'audio': audio
                 })
                 
                 if i % 10 == 0:
@@ -97,13 +94,10 @@ class ThresholdOptimizer:
                 # Load audio for feature extraction
                 audio = self.load_audio(audio_path)
                 
-                # Extract features
-                features = self.feature_extractor.extract_all_features(audio)
-                
                 cloning_data.append({
                     'file': audio_path.name,
                     'ensemble_score': spoof_score,
-                    'features': features
+                    'audio': audio
                 })
                 
                 if i % 10 == 0:
@@ -112,6 +106,13 @@ class ThresholdOptimizer:
             except Exception as e:
                 logger.error(f"Failed to process {audio_path.name}: {e}")
         
+        # Features of all clips in one batch (one spectrogram per clip, all cores)
+        logger.info("Extracting features...")
+        for data in (genuine_data, cloning_data):
+            clips = [sample.pop('audio') for sample in data]
+            for sample, features in zip(data, self.feature_extractor.extract_features_batch(clips)):
+                sample['features'] = features
+        
         return genuine_data, cloning_data
     
     def test_configuration(
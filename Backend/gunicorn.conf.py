@@ -0,0 +1,34 @@
+"""
+Preload-then-fork deployment of the API.
+
+    gunicorn -c gunicorn.conf.py src.main:app
+
+The master imports the app and loads every model checkpoint once
+(memory-mapped, see src/infrastructure/biometrics/shared_weights.py) before
+forking WEB_CONCURRENCY uvicorn workers. Each worker then builds its models
+on top of the inherited weights, which stay shared copy-on-write instead of
+being loaded again per worker. ModelManager.get_memory_usage() reports the
+resulting shared vs private memory of each worker.
+"""
+
+import os
+
+os.environ.setdefault("SHARED_MODEL_WEIGHTS", "true")
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+# Model loading and warm-up happen in each worker's lifespan
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "300"))
+graceful_timeout = 30
+
+
+def on_starting(server):
+    """Runs in the master before any worker is forked."""
+    from src.infrastructure.biometrics.shared_weights import preload_shared_weights
+
+    summary = preload_shared_weights()
+    server.log.info(
+        f"Shared model weights: {summary['files']} checkpoints, {summary['size_mb']:.0f} MB"
+    )
@@ -0,0 +1,117 @@
+"""
+Export AASIST, RawNet2 and the ECAPA-TDNN embedding model to ONNX.
+
+The graphs are written next to the weights in models/, where the adapters
+pick them up on load (MODEL_RUNTIME=auto). Each export is checked against
+the torch model on random input.
+
+Usage:
+    python scripts/export_onnx_models.py
+    python scripts/export_onnx_models.py --models aasist,rawnet2
+"""
+
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+
+# Export the fp32 torch models, whatever the runtime settings are
+os.environ["MODEL_RUNTIME"] = "torch"
+os.environ["QUANTIZE_MODELS"] = "none"
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+import torch
+
+from src.infrastructure.biometrics.local_antispoof_models import (
+    LocalAASISTModel,
+    LocalONNXAntiSpoofModel,
+    LocalRawNet2Model,
+    build_local_model_paths,
+)
+from src.infrastructure.biometrics.model_manager import model_manager
+from src.infrastructure.biometrics.onnx_runtime import (
+    ECAPA_ONNX_FILE,
+    ONNXRUNTIME_AVAILABLE,
+    create_onnx_session,
+)
+
+logger = logging.getLogger(__name__)
+
+ALL_MODELS = ["aasist", "rawnet2", "ecapa_tdnn"]
+
+
+def export_antispoof(name: str) -> bool:
+    """Export one local anti-spoofing model and compare ONNX and torch scores."""
+    paths = build_local_model_paths()
+    device = torch.device("cpu")
+    if name == "aasist":
+        model, onnx_path = LocalAASISTModel(device, paths), paths.aasist_onnx
+    else:
+        model, onnx_path = LocalRawNet2Model(device, paths), paths.rawnet_onnx
+
+    if not model.export_onnx(onnx_path):
+        logger.error(f"{name}: torch model not available, nothing exported")
+        return False
+
+    if ONNXRUNTIME_AVAILABLE:
+        onnx_model = LocalONNXAntiSpoofModel(device, onnx_path, name)
+        waveforms = [torch.randn(1, n) for n in (16000, 48000, 80000)]
+        expected = model.predict_spoof_probability_batch(waveforms, 16000)
+        actual = onnx_model.predict_spoof_probability_batch(waveforms, 16000)
+        logger.info(f"{name}: max score difference vs torch {np.max(np.abs(np.subtract(expected, actual))):.2e}")
+    return True
+
+
+def export_speaker() -> bool:
+    """Export the ECAPA-TDNN embedding model and compare ONNX and torch embeddings."""
+    from src.infrastructure.biometrics.SpeakerEmbeddingAdapter import SpeakerEmbeddingAdapter
+
+    adapter = SpeakerEmbeddingAdapter(use_gpu=False, max_batch_size=1, replicas=1)
+    try:
+        if not adapter.export_onnx():
+            logger.error("ecapa_tdnn: torch model not available, nothing exported")
+            return False
+
+        if ONNXRUNTIME_AVAILABLE:
+            waveforms = [np.random.randn(n).astype(np.float32) * 0.1 for n in (24000, 48000)]
+            expected = adapter._encode_batch(waveforms)
+            onnx_path = model_manager.get_model_path("ecapa_tdnn") / ECAPA_ONNX_FILE
+            adapter._onnx_session = create_onnx_session(onnx_path)
+            actual = adapter._encode_batch(waveforms)
+            diff = max(float(np.max(np.abs(e - a))) for e, a in zip(expected, actual))
+            logger.info(f"ecapa_tdnn: max embedding difference vs torch {diff:.2e}")
+        return True
+    finally:
+        adapter.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export biometric models to ONNX")
+    parser.add_argument("--models", type=str, default=",".join(ALL_MODELS),
+                        help="Comma-separated models to export (aasist, rawnet2, ecapa_tdnn)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if not ONNXRUNTIME_AVAILABLE:
+        logger.warning("onnxruntime is not installed: graphs are exported but not checked")
+
+    failed = []
+    for name in (m.strip() for m in args.models.split(",") if m.strip()):
+        if name not in ALL_MODELS:
+            parser.error(f"unknown model: {name}")
+        ok = export_speaker() if name == "ecapa_tdnn" else export_antispoof(name)
+        if not ok:
+            failed.append(name)
+
+    if failed:
+        print(f"✗ Export failed for: {', '.join(failed)}")
+        sys.exit(1)
+    print("✓ ONNX export complete")
+
+
+if __name__ == "__main__":
+    main()
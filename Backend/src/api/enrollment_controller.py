@@ -10,6 +10,8 @@ import logging
 
 from ..application.enrollment_service import EnrollmentService
 from ..infrastructure.biometrics.VoiceBiometricEngineFacade import VoiceBiometricEngineFacade
+from ..infrastructure.biometrics.audio_validation import AudioValidationError
+from .upload_ingestion import read_audio_upload
 from ..application.dto.enrollment_dto import (
     StartEnrollmentRequest,
     StartEnrollmentResponse,
@@ -99,11 +101,24 @@ async def add_enrollment_sample(
     enrollment_uuid = UUID(enrollment_id)
     challenge_uuid = UUID(challenge_id)
     
-    # Read audio file
-    audio_bytes = await audio_file.read()
+    # Read and decode audio once (off the event loop); validation, embedding
+    # and dataset recording share it
+    audio_bytes, audio_format = await read_audio_upload(audio_file)
+    try:
+        audio_sample = await voice_engine.decode(audio_bytes, audio_format)
+    except AudioValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to decode audio: {str(e)}"
+        )
     
     # Validate audio quality
-    quality_info = voice_engine.validate_audio_quality(audio_bytes, audio_file.content_type)
+    quality_info = voice_engine.validate_audio_quality(audio_sample, audio_format)
     if not quality_info["is_valid"]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -111,7 +126,7 @@ async def add_enrollment_sample(
         )
     
     # Extract embedding
-    embedding = voice_engine.extract_embedding_only(audio_bytes, audio_file.content_type)
+    embedding = await voice_engine.embed(audio_sample)
     snr_db = quality_info.get('snr_db')
     duration_sec = quality_info.get('duration_sec')
     
@@ -126,15 +141,14 @@ async def add_enrollment_sample(
     
     # Save audio to dataset (always active)
     from evaluation.dataset_recorder import dataset_recorder
-    from ..infrastructure.biometrics.audio_converter import ensure_wav_format
     
     try:
         # Get user info from active session using public methods
         session = enrollment_service.get_session(enrollment_uuid)
         user = await enrollment_service.get_session_user(enrollment_uuid)
         
-        # Convert to WAV format
-        wav_bytes = ensure_wav_format(audio_bytes)
+        # Encode the already decoded sample as WAV
+        wav_bytes = audio_sample.to_wav_bytes()
         
         if wav_bytes and session:
             # Save audio
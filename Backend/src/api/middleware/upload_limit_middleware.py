@@ -0,0 +1,102 @@
+"""Request body size limit for multipart uploads, enforced while the body streams in."""
+
+import json
+import logging
+from typing import Optional
+
+from starlette.exceptions import HTTPException
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ...infrastructure.biometrics.audio_validation import get_max_upload_bytes
+
+logger = logging.getLogger(__name__)
+
+# Room for the multipart boundaries and the form fields next to the file
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class _BodyTooLarge(HTTPException):
+    """Raised from receive(); an HTTPException so the body parser lets it through as a 413."""
+
+    def __init__(self, max_body_bytes: int):
+        super().__init__(
+            status_code=413,
+            detail=f"Request body too large (max: {max_body_bytes} bytes)"
+        )
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject multipart requests whose body exceeds the upload limit.
+
+    A pure ASGI middleware (not BaseHTTPMiddleware) so the body is never
+    buffered here: a Content-Length over the limit is refused before the body
+    is read, and a chunked body is cut off at the first chunk past the limit,
+    before the form parser spools the rest to disk.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_bytes: Optional[int] = None):
+        self.app = app
+        if max_body_bytes is None:
+            max_body_bytes = get_max_upload_bytes() + MULTIPART_OVERHEAD_BYTES
+        self.max_body_bytes = max_body_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self._is_multipart(scope):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = self._header(scope, b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_body_bytes:
+            await self._reject(send)
+            return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_bytes:
+                    raise _BodyTooLarge(self.max_body_bytes)
+            return message
+
+        async def tracking_send(message: Message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except _BodyTooLarge:
+            logger.warning(f"Upload to {scope.get('path')} cut off after {received} bytes")
+            if not response_started:
+                await self._reject(send)
+
+    @staticmethod
+    def _header(scope: Scope, name: bytes) -> Optional[str]:
+        for key, value in scope.get("headers", []):
+            if key == name:
+                return value.decode("latin-1")
+        return None
+
+    def _is_multipart(self, scope: Scope) -> bool:
+        content_type = self._header(scope, b"content-type") or ""
+        return content_type.startswith("multipart/form-data")
+
+    async def _reject(self, send: Send):
+        body = json.dumps({
+            "detail": f"Request body too large (max: {self.max_body_bytes} bytes)"
+        }).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
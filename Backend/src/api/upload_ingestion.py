@@ -0,0 +1,114 @@
+"""
+Bounded ingestion of uploaded audio files.
+
+By the time an endpoint runs, the form parser has already received the
+whole multipart body and spooled the file part (in memory, or on disk past
+1 MB). Rejecting a request while it is still arriving is the job of
+``UploadSizeLimitMiddleware`` (src/api/middleware), which cuts off a body
+over the size limit before the parser spools it.
+
+``read_audio_upload`` then reads the spooled file in chunks instead of
+``await audio_file.read()`` and stops as soon as the bytes read allow, so a
+bad upload is never copied whole into memory or decoded:
+
+- an upload larger than AUDIO_MAX_UPLOAD_BYTES fails (413) on its spooled
+  size, or on the first chunk past the limit;
+- the container is sniffed from the first bytes, and unsupported formats
+  fail (415) before the rest is read;
+- once the container header has been read, a declared duration outside the
+  accepted limits fails (400) before the audio data is read.
+"""
+
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, UploadFile, status
+
+from ..infrastructure.biometrics.audio_sample import normalize_format, sniff_format
+from ..infrastructure.biometrics.audio_validation import (
+    UPLOAD_FORMATS,
+    check_audio_limits,
+    get_max_upload_bytes,
+    probe_header,
+)
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Bytes needed to sniff the container (RIFF/WAVE, fLaC, OggS, EBML, ftyp)
+SNIFF_BYTES = 12
+
+# The container header (WAV fmt/data, FLAC STREAMINFO, WebM Info) fits here
+HEADER_PROBE_BYTES = 64 * 1024
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Audio file too large (max: {max_bytes} bytes)"
+    )
+
+
+def _detect_format(head: bytes, content_type: Optional[str]) -> str:
+    """Sniffed container, else the declared type; 415 if unsupported."""
+    audio_format = sniff_format(head) or normalize_format(content_type) or "webm"
+    if audio_format not in UPLOAD_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported format: {content_type or audio_format}"
+        )
+    return audio_format
+
+
+async def read_audio_upload(
+    audio_file: UploadFile,
+    max_bytes: Optional[int] = None
+) -> Tuple[bytes, str]:
+    """
+    Read a spooled upload in chunks, rejecting it as early as possible.
+
+    Args:
+        audio_file: The multipart file
+        max_bytes: Size limit; defaults to AUDIO_MAX_UPLOAD_BYTES
+
+    Returns:
+        (upload bytes, normalized container format)
+
+    Raises:
+        HTTPException: 400 if empty or the header declares an invalid
+            duration, 413 if too large, 415 if the format is unsupported
+    """
+    if max_bytes is None:
+        max_bytes = get_max_upload_bytes()
+    if audio_file.size is not None and audio_file.size > max_bytes:
+        raise _too_large(max_bytes)
+
+    # Chunks are joined once at the end; only the header window is copied early
+    chunks: List[bytes] = []
+    received = 0
+    head = b""
+    audio_format = None
+    while True:
+        chunk = await audio_file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        received += len(chunk)
+        if received > max_bytes:
+            raise _too_large(max_bytes)
+        chunks.append(chunk)
+
+        if len(head) >= HEADER_PROBE_BYTES:
+            continue
+        head += chunk[:HEADER_PROBE_BYTES - len(head)]
+        if audio_format is None and len(head) >= SNIFF_BYTES:
+            audio_format = _detect_format(head[:SNIFF_BYTES], audio_file.content_type)
+        if audio_format is not None and len(head) >= HEADER_PROBE_BYTES:
+            header = probe_header(head, audio_format, partial=True)
+            reason = check_audio_limits(header.duration_sec, header.sample_rate, header.channels)
+            if reason:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=reason)
+
+    if not received:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Empty audio data")
+    if audio_format is None:
+        audio_format = _detect_format(head, audio_file.content_type)
+    # Uploads smaller than the probe window get the full header check in decode()
+    return b"".join(chunks), audio_format
@@ -1,15 +1,21 @@
 """Voice biometric verification API endpoints with dynamic phrase support."""
 
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, status, Request
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, status, Request, WebSocket, WebSocketDisconnect
 from typing import Optional
 from uuid import UUID
 from datetime import datetime, timezone
+import asyncio
 import io
+import json
+import os
 import soundfile as sf
 import logging
 
 from ..application.verification_service import VerificationService
 from ..infrastructure.biometrics.VoiceBiometricEngineFacade import VoiceBiometricEngineFacade
+from ..infrastructure.biometrics.audio_validation import AudioValidationError
+from ..infrastructure.biometrics.streaming import StreamingAudioSession, create_stream_decoder
+from .upload_ingestion import read_audio_upload
 from ..application.dto.verification_dto import (
     StartVerificationRequest,
     StartVerificationResponse,
@@ -24,6 +30,7 @@ from ..infrastructure.config.dependencies import (
 )
 from ..domain.repositories.AuditLogRepositoryPort import AuditLogRepositoryPort
 from ..shared.types.common_types import AuditAction
+from ..shared.stage_timing import start_stage_timer
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["verification"])
@@ -69,6 +76,71 @@ async def start_verification(
         )
 
 
+async def _get_expected_phrase(verification_service: VerificationService, phrase_uuid: UUID) -> Optional[str]:
+    """Text of the phrase the user was asked to read (scored directly by the ASR)."""
+    phrase = await verification_service.get_phrase(phrase_uuid)
+    return phrase.text if phrase else None
+
+
+async def _complete_verification(
+    verification_service: VerificationService,
+    verification_uuid: UUID,
+    phrase_uuid: UUID,
+    features: dict,
+    expected_phrase: Optional[str]
+) -> VerifyVoiceResponse:
+    """Decide on extracted features and build the response (shared by /verify and /verify/stream)."""
+    embedding = features["embedding"]
+    anti_spoofing_score = features["anti_spoofing_score"]
+    transcribed_text = features.get("transcribed_text", "")
+    phrase_match_score = features.get("phrase_match_score")
+    short_circuited = features.get("short_circuited", False)
+    
+    if short_circuited:
+        logger.info(f"Cascade short-circuit: {features['short_circuit_reason']}")
+    if anti_spoofing_score is not None:
+        logger.info(f"Anti-spoofing score: {anti_spoofing_score:.4f}")
+    logger.info(f"Transcribed text: {transcribed_text}")
+    if phrase_match_score is not None:
+        logger.info(f"Phrase match score: {phrase_match_score:.4f}")
+    
+    # Verify voice with phrase matching
+    verify_result = await verification_service.verify_voice(
+        verification_id=verification_uuid,
+        challenge_id=phrase_uuid,  # Fixed: was phrase_id, now challenge_id
+        embedding=embedding,
+        anti_spoofing_score=anti_spoofing_score,
+        transcribed_text=transcribed_text,
+        expected_phrase=expected_phrase,
+        short_circuited=short_circuited,
+        phrase_match_score=phrase_match_score,
+        phrase_match_threshold=features.get("phrase_match_threshold")
+    )
+    
+    # Debug logging
+    logger.info(f"verify_result keys: {verify_result.keys()}")
+    logger.info(f"verify_result types: {[(k, type(v).__name__) for k, v in verify_result.items()]}")
+    
+    # Convert numpy types to native Python types for JSON serialization
+    response = VerifyVoiceResponse(
+        verification_id=str(verify_result["verification_id"]),
+        user_id=str(verify_result["user_id"]),
+        is_verified=bool(verify_result["is_verified"]),
+        confidence_score=float(verify_result["confidence_score"]),
+        similarity_score=float(verify_result["similarity_score"]),
+        anti_spoofing_score=float(verify_result["anti_spoofing_score"]) if verify_result.get("anti_spoofing_score") is not None else None,
+        phrase_match=bool(verify_result["phrase_match"]) if verify_result.get("phrase_match") is not None else None,
+        phrase_match_score=float(verify_result["phrase_match_score"]) if verify_result.get("phrase_match_score") is not None else None,
+        word_confidences=features.get("word_confidences"),
+        is_live=bool(verify_result["is_live"]),
+        threshold_used=float(verify_result["threshold_used"]),
+        short_circuited=bool(verify_result.get("short_circuited", False))
+    )
+    
+    logger.info("Response created successfully")
+    return response
+
+
 @router.post("/verify", response_model=VerifyVoiceResponse)
 async def verify_voice(
     verification_id: str = Form(...),
@@ -86,80 +158,52 @@ async def verify_voice(
     
     Returns verification result with scores and decision.
     """
+    # Per-stage latency of this request, stored with the attempt
+    start_stage_timer()
     try:
         # Validate IDs
         verification_uuid = UUID(verification_id)
         phrase_uuid = UUID(phrase_id)
         
-        # Read audio file
-        audio_bytes = await audio_file.read()
-        audio_format = audio_file.content_type or "audio/webm"
-        
-        # Convert to WAV if needed
-        from ..infrastructure.biometrics.audio_converter import convert_to_wav
-        format_lower = audio_format.lower()
-        if '/' in format_lower:
-            format_lower = format_lower.split('/')[1].split(';')[0]
+        # Read and decode audio once (off the event loop); all models share the decoded sample
+        audio_bytes, audio_format = await read_audio_upload(audio_file)
         
-        if format_lower != "wav":
-            logger.info(f"Converting {format_lower} audio to WAV for verification")
-            try:
-                audio_bytes = convert_to_wav(audio_bytes, format_lower)
-                logger.info("Audio conversion successful")
-            except Exception as e:
-                logger.error(f"Audio conversion failed: {e}")
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Failed to convert audio: {str(e)}"
-                )
-        
-        # Extract features (embedding + anti-spoofing + ASR) from audio
-        features = voice_engine.extract_features(
-            audio_data=audio_bytes,
-            audio_format="wav"
-        )
-        
-        embedding = features["embedding"]
-        anti_spoofing_score = features["anti_spoofing_score"]
-        transcribed_text = features.get("transcribed_text", "")
+        try:
+            audio_sample = await voice_engine.decode(audio_bytes, audio_format)
+        except AudioValidationError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        except ValueError as e:
+            logger.error(f"Audio decoding failed: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Failed to convert audio: {str(e)}"
+            )
         
-        logger.info(f"Anti-spoofing score: {anti_spoofing_score:.4f}")
-        logger.info(f"Transcribed text: {transcribed_text}")
+        # Cascade mode needs the voiceprint up front to reject clear impostors early
+        reference_embedding = None
+        if voice_engine.cascade_enabled:
+            reference_embedding = await verification_service.get_reference_embedding(verification_uuid)
         
-        # Get expected phrase for verification using public method
-        phrase = await verification_service.get_phrase(phrase_uuid)
-        expected_phrase = phrase.text if phrase else None
+        # The ASR scores the expected phrase directly instead of transcribing freely
+        expected_phrase = await _get_expected_phrase(verification_service, phrase_uuid)
         
-        # Verify voice with phrase matching
-        verify_result = await verification_service.verify_voice(
-            verification_id=verification_uuid,
-            challenge_id=phrase_uuid,  # Fixed: was phrase_id, now challenge_id
-            embedding=embedding,
-            anti_spoofing_score=anti_spoofing_score,
-            transcribed_text=transcribed_text,
+        # Extract features (embedding + anti-spoofing + ASR) from audio
+        features = await voice_engine.analyze(
+            audio_data=audio_sample,
+            audio_format=audio_sample.source_format,
+            reference_embedding=reference_embedding,
             expected_phrase=expected_phrase
         )
         
-        # Debug logging
-        logger.info(f"verify_result keys: {verify_result.keys()}")
-        logger.info(f"verify_result types: {[(k, type(v).__name__) for k, v in verify_result.items()]}")
-        
-        # Convert numpy types to native Python types for JSON serialization
-        response = VerifyVoiceResponse(
-            verification_id=str(verify_result["verification_id"]),
-            user_id=str(verify_result["user_id"]),
-            is_verified=bool(verify_result["is_verified"]),
-            confidence_score=float(verify_result["confidence_score"]),
-            similarity_score=float(verify_result["similarity_score"]),
-            anti_spoofing_score=float(verify_result["anti_spoofing_score"]) if verify_result.get("anti_spoofing_score") is not None else None,
-            phrase_match=bool(verify_result["phrase_match"]) if verify_result.get("phrase_match") is not None else None,
-            is_live=bool(verify_result["is_live"]),
-            threshold_used=float(verify_result["threshold_used"])
+        return await _complete_verification(
+            verification_service, verification_uuid, phrase_uuid, features, expected_phrase
         )
-        
-        logger.info("Response created successfully")
-        return response
     
+    except HTTPException:
+        raise
     except ValueError as e:
         logger.error(f"Validation error in verify_voice: {e}", exc_info=True)
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -171,6 +215,167 @@ async def verify_voice(
         )
 
 
+@router.websocket("/verify/stream")
+async def verify_voice_stream(
+    websocket: WebSocket,
+    verification_id: str,
+    phrase_id: str,
+    format: str = "webm",
+    sample_rate: int = 16000,
+    verification_service: VerificationService = Depends(get_verification_service),
+    voice_engine: VoiceBiometricEngineFacade = Depends(get_voice_biometric_engine)
+):
+    """
+    Streaming variant of /verify: audio is sent while the user speaks.
+    
+    - **verification_id**, **phrase_id**: As for /verify (query parameters)
+    - **format**: pcm_s16le, pcm_f32le (mono, at **sample_rate**: 8000,
+      16000, 22050, 44100 or 48000), webm or ogg
+    
+    The client sends binary audio chunks and may send ``{"type": "end"}``
+    when recording stops; the server also ends the utterance on its own
+    once the VAD hears enough trailing silence. Every pause in the speech
+    starts the analysis of the audio so far, reported as ``partial``
+    messages; the final ``result`` message carries a VerifyVoiceResponse.
+    Errors are sent as ``{"type": "error", "detail": ...}``.
+    """
+    await websocket.accept()
+    
+    if voice_engine is None:
+        await _close_stream(websocket, "Biometric engine is still loading", code=1013)
+        return
+    
+    try:
+        verification_uuid = UUID(verification_id)
+        phrase_uuid = UUID(phrase_id)
+        session = StreamingAudioSession(create_stream_decoder(format, sample_rate))
+    except ValueError as e:
+        await _close_stream(websocket, str(e), code=1003)
+        return
+    except OSError as e:
+        logger.error(f"Could not start the stream decoder: {e}")
+        await _close_stream(websocket, "Audio decoder unavailable", code=1011)
+        return
+    
+    idle_timeout_sec = float(os.getenv("STREAM_IDLE_TIMEOUT_SEC", "10"))
+    loop = asyncio.get_running_loop()
+    speculative: Optional[tuple] = None  # (digest, task) of the latest partial analysis
+    reported = None
+    
+    try:
+        # Similarity on partial audio (and the cascade) need the voiceprint up front
+        reference_embedding = await verification_service.get_reference_embedding(verification_uuid)
+        expected_phrase = await _get_expected_phrase(verification_service, phrase_uuid)
+        await websocket.send_json({"type": "ready"})
+        
+        while not session.speech_ended:
+            try:
+                message = await asyncio.wait_for(websocket.receive(), timeout=idle_timeout_sec)
+            except asyncio.TimeoutError:
+                break
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            if message.get("bytes"):
+                # Decoding (an ffmpeg pipe write for webm/ogg) and the VAD stay off the loop
+                paused = await loop.run_in_executor(None, session.feed, message["bytes"])
+            elif message.get("text") and _is_end_message(message["text"]):
+                break
+            else:
+                continue
+            
+            # A pause may be the end of the phrase: start the models on what we have
+            if paused and (speculative is None or speculative[1].done()):
+                sample = await loop.run_in_executor(None, session.to_sample)
+                if sample is not None and (speculative is None or speculative[0] != sample.digest):
+                    speculative = (sample.digest, asyncio.create_task(voice_engine.analyze(
+                        audio_data=sample,
+                        audio_format=sample.source_format,
+                        reference_embedding=reference_embedding,
+                        expected_phrase=expected_phrase
+                    )))
+            
+            if speculative and speculative[1].done() and reported is not speculative[1]:
+                reported = speculative[1]
+                if reported.exception() is None:
+                    await websocket.send_json(_partial_message(reported.result(), session))
+        
+        # Latency is measured from the end of speech (reused partial analyses are not timed)
+        start_stage_timer()
+        
+        # Flush the decoder; ffmpeg may still hold the last frames
+        await loop.run_in_executor(None, session.finish)
+        sample = await loop.run_in_executor(None, session.to_sample)
+        if sample is None:
+            await _close_stream(websocket, "No speech detected", code=1000)
+            return
+        
+        features = None
+        if speculative and speculative[0] == sample.digest:
+            # Nothing new since the last pause: its analysis is the final one.
+            # Any new audio changes the digest, so the sample is analysed in full.
+            try:
+                features = await speculative[1]
+            except Exception as e:
+                logger.warning(f"Partial analysis failed, analysing again: {e}")
+        if features is None:
+            features = await voice_engine.analyze(
+                audio_data=sample,
+                audio_format=sample.source_format,
+                reference_embedding=reference_embedding,
+                expected_phrase=expected_phrase
+            )
+        
+        response = await _complete_verification(
+            verification_service, verification_uuid, phrase_uuid, features, expected_phrase
+        )
+        await websocket.send_json({"type": "result", **response.model_dump()})
+        await websocket.close()
+    
+    except WebSocketDisconnect:
+        logger.info(f"Verification stream {verification_id} closed by the client")
+    except ValueError as e:
+        logger.error(f"Validation error in verify_voice_stream: {e}")
+        await _close_stream(websocket, str(e), code=1003)
+    except Exception as e:
+        logger.error(f"Error in verify_voice_stream: {e}", exc_info=True)
+        await _close_stream(websocket, "Failed to verify voice", code=1011)
+    finally:
+        if speculative and not speculative[1].done():
+            speculative[1].cancel()
+        session.close()
+
+
+def _is_end_message(text: str) -> bool:
+    try:
+        return json.loads(text).get("type") == "end"
+    except (ValueError, AttributeError):
+        return False
+
+
+def _partial_message(features: dict, session: StreamingAudioSession) -> dict:
+    """Progress message with the scores of the audio analysed so far."""
+    similarity = features.get("similarity")
+    spoof = features.get("anti_spoofing_score")
+    phrase_match = features.get("phrase_match_score")
+    return {
+        "type": "partial",
+        "speech_sec": round(session.speech_sec, 2),
+        "similarity": float(similarity) if similarity is not None else None,
+        "anti_spoofing_score": float(spoof) if spoof is not None else None,
+        "phrase_match_score": float(phrase_match) if phrase_match is not None else None,
+        "short_circuited": bool(features.get("short_circuited", False))
+    }
+
+
+async def _close_stream(websocket: WebSocket, detail: str, code: int):
+    """Report an error to the client and close the stream."""
+    try:
+        await websocket.send_json({"type": "error", "detail": detail})
+        await websocket.close(code=code)
+    except Exception:
+        pass  # Client already gone
+
+
 @router.post("/quick-verify", response_model=VerifyVoiceResponse)
 async def quick_verify(
     user_id: str = Form(...),
@@ -189,39 +394,35 @@ async def quick_verify(
     try:
         user_uuid = UUID(user_id)
         
-        # Read audio file
-        audio_bytes = await audio_file.read()
-        audio_format = audio_file.content_type or "audio/wav"
-        
-        # Convert to WAV if needed
-        from ..infrastructure.biometrics.audio_converter import convert_to_wav
-        format_lower = audio_format.lower()
-        if '/' in format_lower:
-            format_lower = format_lower.split('/')[1].split(';')[0]
+        # Read and decode audio once (off the event loop); all models share the decoded sample
+        audio_bytes, audio_format = await read_audio_upload(audio_file)
         
-        if format_lower != "wav":
-            logger.info(f"Converting {format_lower} audio to WAV for quick verification")
-            try:
-                audio_bytes = convert_to_wav(audio_bytes, format_lower)
-            except Exception as e:
-                logger.error(f"Audio conversion failed: {e}")
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Failed to convert audio: {str(e)}"
-                )
+        try:
+            audio_sample = await voice_engine.decode(audio_bytes, audio_format)
+        except AudioValidationError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        except ValueError as e:
+            logger.error(f"Audio decoding failed: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Failed to convert audio: {str(e)}"
+            )
         
         # Validate audio quality
-        quality_info = voice_engine.validate_audio_quality(audio_bytes, "audio/wav")
+        quality_info = voice_engine.validate_audio_quality(audio_sample, "wav")
         if not quality_info["is_valid"]:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=quality_info.get('reason', 'Invalid audio')
             )
         
-        # Extract features using the correct method (not process_audio which doesn't exist)
-        features = voice_engine.extract_features(
-            audio_data=audio_bytes,
-            audio_format="wav"
+        # Extract features on the inference pool (never blocks the event loop)
+        features = await voice_engine.analyze(
+            audio_data=audio_sample,
+            audio_format=audio_sample.source_format
         )
         
         embedding = features["embedding"]
@@ -246,6 +447,8 @@ async def quick_verify(
             threshold_used=verify_result["threshold_used"]
         )
     
+    except HTTPException:
+        raise
     except ValueError as e:
         logger.error(f"Validation error in quick_verify: {e}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -320,43 +523,44 @@ async def verify_phrase(
         verification_uuid = UUID(verification_id)
         phrase_uuid = UUID(phrase_id)
         
-        # Read audio file
-        audio_bytes = await audio_file.read()
-        audio_format = audio_file.content_type or "audio/webm"
+        # Read and decode audio once (off the event loop); all models share the decoded sample
+        audio_bytes, audio_format = await read_audio_upload(audio_file)
+        
+        try:
+            audio_sample = await voice_engine.decode(audio_bytes, audio_format)
+        except AudioValidationError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        except ValueError as e:
+            logger.error(f"Audio decoding failed: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Failed to convert audio: {str(e)}"
+            )
         
-        # Convert to WAV if needed
-        from ..infrastructure.biometrics.audio_converter import convert_to_wav
-        format_lower = audio_format.lower()
-        if '/' in format_lower:
-            format_lower = format_lower.split('/')[1].split(';')[0]
+        # Get user info BEFORE verify_phrase (session might be deleted after completion)
+        multi_session = verification_service.get_multi_session(verification_uuid)
+        user = await verification_service.get_multi_session_user(verification_uuid)
         
-        if format_lower != "wav":
-            logger.info(f"Converting {format_lower} audio to WAV for verification")
-            try:
-                audio_bytes = convert_to_wav(audio_bytes, format_lower)
-                logger.info("Audio conversion successful")
-            except Exception as e:
-                logger.error(f"Audio conversion failed: {e}")
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Failed to convert audio: {str(e)}"
-                )
+        # The ASR scores the session's expected phrase directly
+        expected_phrase = None
+        if multi_session and 1 <= phrase_number <= len(multi_session.challenges):
+            expected_phrase = multi_session.challenges[phrase_number - 1].get("phrase") or None
         
         # Process audio through full pipeline (parallel processing for speed)
         # Extract biometric features concurrently
-        features = await voice_engine.extract_features_parallel(
-            audio_data=audio_bytes,
-            audio_format="wav"
+        features = await voice_engine.analyze(
+            audio_data=audio_sample,
+            audio_format=audio_sample.source_format,
+            expected_phrase=expected_phrase
         )
         
         embedding = features["embedding"]
         anti_spoofing_score = features["anti_spoofing_score"]
         transcribed_text = features.get("transcribed_text", "")
         
-        
-        # Get user info BEFORE verify_phrase (session might be deleted after completion)
-        multi_session = verification_service.get_multi_session(verification_uuid)
-        user = await verification_service.get_multi_session_user(verification_uuid)
         user_id_for_dataset = str(multi_session.user_id) if multi_session else None
         
         # Verify phrase
@@ -366,18 +570,19 @@ async def verify_phrase(
             phrase_number=phrase_number,
             embedding=embedding,
             anti_spoofing_score=anti_spoofing_score,
-            transcribed_text=transcribed_text
+            transcribed_text=transcribed_text,
+            phrase_match_score=features.get("phrase_match_score"),
+            phrase_match_threshold=features.get("phrase_match_threshold")
         )
         
         logger.info(f"Phrase {phrase_number} verified. is_complete={result.get('is_complete')}")
         
         # Save audio to dataset (always active)
         from evaluation.dataset_recorder import dataset_recorder
-        from ..infrastructure.biometrics.audio_converter import ensure_wav_format
         
         try:
-            # Ensure WAV format (already converted above, but just to be safe)
-            wav_bytes = ensure_wav_format(audio_bytes)
+            # Encode the already decoded sample as 16 kHz mono WAV
+            wav_bytes = audio_sample.to_wav_bytes()
             
             if wav_bytes and user_id_for_dataset:
                 # Save audio
@@ -429,6 +634,8 @@ async def verify_phrase(
         
         return VerifyPhraseResponse(**result)
     
+    except HTTPException:
+        raise
     except ValueError as e:
         logger.error(f"Validation error in verify_phrase: {e}", exc_info=True)
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
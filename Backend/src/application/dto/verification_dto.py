@@ -43,8 +43,11 @@ class VerifyVoiceResponse(BaseModel):
     similarity_score: float = Field(..., description="Voice similarity to enrolled voiceprint (0-1)", ge=0, le=1)
     anti_spoofing_score: Optional[float] = Field(None, description="Probability of genuine speech (0-1)")
     phrase_match: Optional[bool] = Field(None, description="Whether spoken text matched expected phrase")
+    phrase_match_score: Optional[float] = Field(None, description="Phrase match score (0-1)")
+    word_confidences: Optional[list[dict]] = Field(None, description="Per-word confidence of the expected phrase (word, confidence, start_sec, end_sec)")
     is_live: bool = Field(..., description="Whether anti-spoofing passed")
     threshold_used: float = Field(..., description="Similarity threshold used for decision")
+    short_circuited: bool = Field(False, description="Whether the cascade rejected early, skipping later models")
 
 
 # Multi-phrase verification DTOs
@@ -2,7 +2,6 @@
 
 import numpy as np
 import logging
-import difflib
 import json
 from typing import Dict, Optional, List
 from uuid import UUID, uuid4
@@ -11,7 +10,12 @@ from datetime import datetime, timezone
 from ..domain.repositories.VoiceSignatureRepositoryPort import VoiceSignatureRepositoryPort
 from ..domain.repositories.UserRepositoryPort import UserRepositoryPort
 from ..domain.repositories.AuditLogRepositoryPort import AuditLogRepositoryPort
-from ..shared.types.common_types import VoiceEmbedding, AuditAction, ChallengeId
+from ..domain.repositories.AuthAttemptRepositoryPort import AuthAttemptRepositoryPort
+from ..domain.services.ResultBuilder import ResultBuilder
+from ..shared.constants.biometric_constants import TRANSCRIPT_PHRASE_MATCH_THRESHOLD
+from ..shared.types.common_types import VoiceEmbedding, AuditAction, AuthReason, ChallengeId
+from ..shared.phrase_matching import phrase_similarity
+from ..shared.stage_timing import STAGE_DB, STAGE_INFERENCE, current_stage_timer, timed_stage
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +45,13 @@ from .services.BiometricValidator import BiometricValidator
 
 
 class VerificationService:
-    """Service for voice biometric verification with dynamic phrases."""
+    """
+    Service for voice biometric verification with dynamic phrases.
+    
+    With an ``auth_attempt_repo``, every decided /verify attempt is stored
+    with its scores, model inference latency, end-to-end latency and the
+    per-stage breakdown of the request's ``StageTimer``.
+    """
     
     def __init__(
         self,
@@ -51,7 +61,8 @@ class VerificationService:
         challenge_service,  # ChallengeService
         biometric_validator: BiometricValidator,
         similarity_threshold: float = 0.75,
-        anti_spoofing_threshold: float = 0.7  # Ajustado de 0.5 a 0.7 para reducir FRR
+        anti_spoofing_threshold: float = 0.7,  # Ajustado de 0.5 a 0.7 para reducir FRR
+        auth_attempt_repo: Optional[AuthAttemptRepositoryPort] = None
     ):
         self._voice_repo = voice_repo
         self._user_repo = user_repo
@@ -60,6 +71,7 @@ class VerificationService:
         self._biometric_validator = biometric_validator
         self._similarity_threshold = similarity_threshold
         self._anti_spoofing_threshold = anti_spoofing_threshold
+        self._auth_attempt_repo = auth_attempt_repo
         # In-memory sessions (in production, use Redis)
         # Moved to instance variables to avoid sharing state between instances
         self._active_sessions: Dict[UUID, VerificationSession] = {}
@@ -67,9 +79,7 @@ class VerificationService:
     
     def _calculate_phrase_similarity(self, expected: str, transcribed: str) -> float:
         """Calculate similarity between expected and transcribed phrases."""
-        norm_expected = expected.lower().strip()
-        norm_transcribed = transcribed.lower().strip()
-        return difflib.SequenceMatcher(None, norm_expected, norm_transcribed).ratio()
+        return phrase_similarity(expected, transcribed)
     
     def _calculate_composite_score(
         self,
@@ -87,6 +97,23 @@ class VerificationService:
             phrase_match_score * w_asr
         )
     
+    @staticmethod
+    def _phrase_confidence(phrase_match_score: float, phrase_match_threshold: Optional[float]) -> float:
+        """
+        Put an ASR phrase score on the transcript-similarity scale of the composite.
+        
+        The composite's weights and the similarity threshold it is compared
+        with were tuned on transcript similarity; a score with its own pass
+        mark is mapped piecewise-linearly so that its threshold lands on
+        TRANSCRIPT_PHRASE_MATCH_THRESHOLD (0 and 1 stay fixed).
+        """
+        if phrase_match_threshold is None or not 0.0 < phrase_match_threshold < 1.0:
+            return phrase_match_score
+        target = TRANSCRIPT_PHRASE_MATCH_THRESHOLD
+        if phrase_match_score < phrase_match_threshold:
+            return phrase_match_score / phrase_match_threshold * target
+        return target + (phrase_match_score - phrase_match_threshold) / (1.0 - phrase_match_threshold) * (1.0 - target)
+    
     def _is_verification_passed(
         self,
         similarity_score: float,
@@ -103,13 +130,24 @@ class VerificationService:
     def _get_phrase_match_result(
         self,
         transcribed_text: Optional[str],
-        expected_phrase: Optional[str]
+        expected_phrase: Optional[str],
+        phrase_match_score: Optional[float] = None,
+        phrase_match_threshold: Optional[float] = None
     ) -> tuple[float, bool]:
-        """Calculate phrase match score and result."""
+        """
+        Calculate phrase match score and result (an ASR phrase score takes precedence).
+        
+        An ASR score is judged against the threshold of the mode that produced
+        it; the transcript similarity uses TRANSCRIPT_PHRASE_MATCH_THRESHOLD.
+        """
+        if phrase_match_score is not None and expected_phrase:
+            if phrase_match_threshold is None:
+                phrase_match_threshold = TRANSCRIPT_PHRASE_MATCH_THRESHOLD
+            return phrase_match_score, phrase_match_score >= phrase_match_threshold
         if not transcribed_text or not expected_phrase:
             return 0.0, True
         score = self._calculate_phrase_similarity(expected_phrase, transcribed_text)
-        return score, score >= 0.7  # 70% threshold
+        return score, score >= TRANSCRIPT_PHRASE_MATCH_THRESHOLD
     
     def _parse_log_metadata(self, metadata) -> dict:
         """Parse metadata from log entry (handles JSON strings)."""
@@ -204,9 +242,20 @@ class VerificationService:
         embedding: VoiceEmbedding,
         anti_spoofing_score: Optional[float] = None,
         transcribed_text: Optional[str] = None,
-        expected_phrase: Optional[str] = None
+        expected_phrase: Optional[str] = None,
+        short_circuited: bool = False,
+        phrase_match_score: Optional[float] = None,
+        phrase_match_threshold: Optional[float] = None
     ) -> Dict:
-        """Verify voice with challenge validation and optional phrase matching."""
+        """
+        Verify voice with challenge validation and optional phrase matching.
+        
+        ``short_circuited`` marks features from a cascade that stopped early:
+        the checks that were skipped count as failed. ``phrase_match_score``
+        is the ASR's own score of the expected phrase and
+        ``phrase_match_threshold`` its pass mark; without a score the
+        transcript is compared with the phrase.
+        """
         
         # Get session
         session = self._active_sessions.get(verification_id)
@@ -218,10 +267,11 @@ class VerificationService:
             raise ValueError("Challenge does not match verification session")
         
         # Validate challenge (strict validation)
-        is_valid, reason = await self._challenge_service.validate_challenge_strict(
-            challenge_id=challenge_id,
-            user_id=session.user_id
-        )
+        with timed_stage(STAGE_DB):
+            is_valid, reason = await self._challenge_service.validate_challenge_strict(
+                challenge_id=challenge_id,
+                user_id=session.user_id
+            )
         
         if not is_valid:
             raise ValueError(f"Invalid challenge: {reason}")
@@ -231,7 +281,8 @@ class VerificationService:
             raise ValueError("Invalid voice embedding")
         
         # Get user's voiceprint
-        voiceprint = await self._voice_repo.get_voiceprint_by_user(session.user_id)
+        with timed_stage(STAGE_DB):
+            voiceprint = await self._voice_repo.get_voiceprint_by_user(session.user_id)
         if not voiceprint:
             raise ValueError("User voiceprint not found")
         
@@ -241,12 +292,18 @@ class VerificationService:
         
         # Calculate phrase match score using helper
         phrase_match_score, phrase_match = self._get_phrase_match_result(
-            transcribed_text, expected_phrase
+            transcribed_text, expected_phrase, phrase_match_score, phrase_match_threshold
         )
         
         # Check anti-spoofing
         is_live = anti_spoofing_score is None or anti_spoofing_score < self._anti_spoofing_threshold
         
+        # Skipped checks are not passes
+        if short_circuited:
+            is_live = is_live and anti_spoofing_score is not None
+            if not transcribed_text and phrase_match_score is None:
+                phrase_match_score, phrase_match = 0.0, False
+        
         # Calculate composite score using helper
         composite_score = self._calculate_composite_score(
             similarity_score, anti_spoofing_score, phrase_match_score
@@ -255,27 +312,40 @@ class VerificationService:
         # Make decision using helper
         is_verified = self._is_verification_passed(similarity_score, is_live, phrase_match)
         
-        # Mark challenge as used
-        await self._challenge_service.mark_challenge_used(challenge_id)
-        
-        # Log verification result
-        await self._audit_repo.log_event(
-            actor="system",
-            action=AuditAction.VERIFY,
-            entity_type="verification_result",
-            entity_id=str(verification_id),
-            success=is_verified,
-            metadata={
-                "user_id": str(session.user_id),
-                "challenge_id": str(challenge_id),
-                "similarity_score": float(similarity_score),
-                "anti_spoofing_score": float(anti_spoofing_score) if anti_spoofing_score else None,
-                "phrase_match_score": float(phrase_match_score),
-                "composite_score": float(composite_score),
-                "is_verified": is_verified,
-                "is_live": is_live,
-                "phrase_match": phrase_match
-            }
+        with timed_stage(STAGE_DB):
+            # Mark challenge as used
+            await self._challenge_service.mark_challenge_used(challenge_id)
+            
+            # Log verification result
+            await self._audit_repo.log_event(
+                actor="system",
+                action=AuditAction.VERIFY,
+                entity_type="verification_result",
+                entity_id=str(verification_id),
+                success=is_verified,
+                metadata={
+                    "user_id": str(session.user_id),
+                    "challenge_id": str(challenge_id),
+                    "similarity_score": float(similarity_score),
+                    "anti_spoofing_score": float(anti_spoofing_score) if anti_spoofing_score else None,
+                    "phrase_match_score": float(phrase_match_score),
+                    "composite_score": float(composite_score),
+                    "is_verified": is_verified,
+                    "is_live": is_live,
+                    "phrase_match": phrase_match,
+                    "short_circuited": short_circuited
+                }
+            )
+        
+        await self._record_attempt(
+            user_id=session.user_id,
+            challenge_id=challenge_id,
+            similarity_score=similarity_score,
+            anti_spoofing_score=anti_spoofing_score,
+            phrase_match_score=phrase_match_score,
+            phrase_match=phrase_match,
+            is_verified=is_verified,
+            short_circuited=short_circuited
         )
         
         # Log to evaluation system if active
@@ -307,9 +377,95 @@ class VerificationService:
             "phrase_match": phrase_match,
             "phrase_match_score": float(phrase_match_score),
             "is_live": is_live,
-            "threshold_used": self._similarity_threshold
+            "threshold_used": self._similarity_threshold,
+            "short_circuited": short_circuited
         }
     
+    def _decision_reason(
+        self,
+        similarity_score: float,
+        anti_spoofing_score: Optional[float],
+        phrase_match: bool,
+        is_verified: bool,
+        short_circuited: bool = False
+    ) -> AuthReason:
+        """
+        Reason stored with the attempt (the first failed check).
+        
+        Only checks that actually ran can be the reason: a cascade that
+        stopped early did so on a spoof or low-similarity result, never on
+        the checks it skipped.
+        """
+        if is_verified:
+            return AuthReason.OK
+        if anti_spoofing_score is not None and anti_spoofing_score >= self._anti_spoofing_threshold:
+            return AuthReason.SPOOF
+        if similarity_score < self._similarity_threshold:
+            return AuthReason.LOW_SIMILARITY
+        if not short_circuited and not phrase_match:
+            return AuthReason.BAD_PHRASE
+        return AuthReason.ERROR
+    
+    async def _record_attempt(
+        self,
+        user_id: UUID,
+        challenge_id: ChallengeId,
+        similarity_score: float,
+        anti_spoofing_score: Optional[float],
+        phrase_match_score: float,
+        phrase_match: bool,
+        is_verified: bool,
+        short_circuited: bool = False
+    ) -> None:
+        """
+        Persist the attempt with its latency breakdown.
+        
+        The breakdown covers the request up to this point, so the write
+        itself is not part of its ``db`` stage. A failed write is logged and
+        does not change the verification result.
+        """
+        if self._auth_attempt_repo is None:
+            return
+        
+        timer = current_stage_timer()
+        inference_ms = timer.get(STAGE_INFERENCE) if timer else None
+        
+        builder = (ResultBuilder()
+                   .with_user(user_id)
+                   .with_challenge(challenge_id)
+                   .with_biometric_scores(
+                       similarity=float(similarity_score),
+                       # NULL when the cascade skipped anti-spoofing
+                       spoof_probability=float(anti_spoofing_score) if anti_spoofing_score is not None else None,
+                       phrase_match=float(phrase_match_score),
+                       phrase_ok=phrase_match,
+                       inference_latency_ms=int(round(inference_ms)) if inference_ms is not None else None
+                   ))
+        if timer:
+            builder.with_stage_latencies(timer.as_dict()).with_total_latency(int(round(timer.elapsed_ms())))
+        
+        reason = self._decision_reason(
+            similarity_score, anti_spoofing_score, phrase_match, is_verified, short_circuited
+        )
+        if is_verified:
+            builder.accept_with_reason(reason)
+        else:
+            builder.reject_with_reason(reason)
+        
+        try:
+            await self._auth_attempt_repo.save_attempt(builder.build())
+        except Exception as e:
+            logger.warning(f"Could not store auth attempt for user {user_id}: {e}")
+    
+    async def get_reference_embedding(self, verification_id: UUID) -> Optional[np.ndarray]:
+        """Enrolled voiceprint of the user behind an active verification session."""
+        session = self._active_sessions.get(verification_id)
+        if not session:
+            return None
+        with timed_stage(STAGE_DB):
+            voiceprint = await self._voice_repo.get_voiceprint_by_user(session.user_id)
+        return np.array(voiceprint.embedding) if voiceprint else None
+    
     async def quick_verify(
         self,
         user_id: UUID,
@@ -406,7 +562,8 @@ class VerificationService:
     
     async def get_phrase(self, phrase_id: UUID):
         """Get phrase by ID through challenge service (public accessor)."""
-        return await self._challenge_service.get_phrase(phrase_id)
+        with timed_stage(STAGE_DB):
+            return await self._challenge_service.get_phrase(phrase_id)
     
     async def start_multi_phrase_verification(
         self,
@@ -475,9 +632,17 @@ class VerificationService:
         phrase_number: int,
         embedding: VoiceEmbedding,
         transcribed_text: Optional[str] = None,
-        anti_spoofing_score: Optional[float] = None
+        anti_spoofing_score: Optional[float] = None,
+        phrase_match_score: Optional[float] = None,
+        phrase_match_threshold: Optional[float] = None
     ) -> Dict:
-        """Verify a single phrase implementation with real ASR scoring."""
+        """
+        Verify a single phrase implementation with real ASR scoring.
+        
+        ``phrase_match_score`` (the ASR's own phrase score) is mapped onto the
+        transcript-similarity scale via its ``phrase_match_threshold`` before
+        it enters the composite score.
+        """
         
         # Check active session
         session = self._active_multi_sessions.get(verification_id)
@@ -493,8 +658,11 @@ class VerificationService:
         current_challenge = session.challenges[phrase_number - 1]
         expected_phrase = current_challenge.get("phrase", "")
         
-        # Calculate ASR Confidence using helper
-        asr_confidence = self._calculate_phrase_similarity(expected_phrase, transcribed_text) if transcribed_text and expected_phrase else 0.0
+        # Calculate ASR Confidence using helper (the ASR's phrase score when given)
+        if phrase_match_score is not None:
+            asr_confidence = self._phrase_confidence(phrase_match_score, phrase_match_threshold)
+        else:
+            asr_confidence = self._calculate_phrase_similarity(expected_phrase, transcribed_text) if transcribed_text and expected_phrase else 0.0
         
         # Get user's voiceprint
         voiceprint = await self._voice_repo.get_voiceprint_by_user(session.user_id)
@@ -2,7 +2,7 @@
 
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Dict, Optional
 from uuid import UUID
 
 from ...shared.types.common_types import AuthReason, UserId, ClientId, ChallengeId, AudioId
@@ -12,10 +12,10 @@ from ...shared.types.common_types import AuthReason, UserId, ClientId, Challenge
 class BiometricScores:
     """Raw biometric analysis scores."""
     similarity: float
-    spoof_probability: float
+    spoof_probability: Optional[float]  # None when anti-spoofing was skipped
     phrase_match: float
     phrase_ok: bool
-    inference_latency_ms: int
+    inference_latency_ms: Optional[int]  # None when not measured
     speaker_model_id: Optional[int] = None
     antispoof_model_id: Optional[int] = None
     asr_model_id: Optional[int] = None
@@ -40,6 +40,7 @@ class AuthAttemptResult:
     
     # Performance metrics
     total_latency_ms: Optional[int] = None
+    stage_latency_ms: Optional[Dict[str, int]] = None  # decode, convert, embed, spoof, asr, db, ...
     
     # Biometric analysis
     scores: Optional[BiometricScores] = None
@@ -59,7 +60,7 @@ class AuthAttemptResult:
         
         return (
             self.reason == AuthReason.SPOOF or
-            (self.scores.spoof_probability > 0.7) or
+            (self.scores.spoof_probability is not None and self.scores.spoof_probability > 0.7) or
             (self.scores.similarity < 0.3 and self.scores.phrase_ok)
         )
     
@@ -70,9 +71,9 @@ class AuthAttemptResult:
         if self.scores:
             indicators.update({
                 "low_similarity": self.scores.similarity < 0.5,
-                "high_spoof_prob": self.scores.spoof_probability > 0.5,
+                "high_spoof_prob": (self.scores.spoof_probability or 0.0) > 0.5,
                 "phrase_mismatch": not self.scores.phrase_ok,
-                "high_latency": self.scores.inference_latency_ms > 3000,
+                "high_latency": (self.scores.inference_latency_ms or 0) > 3000,
             })
         
         indicators.update({
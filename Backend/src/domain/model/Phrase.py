@@ -5,6 +5,8 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
+from ...shared.phrase_matching import CompiledPhrase, compile_phrase
+
 
 @dataclass
 class Phrase:
@@ -41,6 +43,11 @@ class Phrase:
     def get_display_text(self) -> str:
         """Get the phrase text for display purposes."""
         return self.text.strip()
+    
+    @property
+    def matcher(self) -> CompiledPhrase:
+        """Normalized form of the text used to match transcripts (cached per text)."""
+        return compile_phrase(self.text)
 
 
 @dataclass
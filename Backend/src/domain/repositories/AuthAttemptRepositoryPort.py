@@ -65,6 +65,15 @@ class AuthAttemptRepositoryPort(ABC):
         """Get attempts that might indicate fraud."""
         pass
     
+    @abstractmethod
+    async def get_latency_summary(
+        self,
+        hours: int = 24,
+        sla_ms: Optional[int] = None
+    ) -> dict:
+        """Latency percentiles per stage and attempts over the SLA."""
+        pass
+    
     @abstractmethod
     async def store_audio_blob(self, audio_data: bytes, mime_type: str) -> UUID:
         """Store encrypted audio data and return blob ID."""
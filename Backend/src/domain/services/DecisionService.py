@@ -39,7 +39,7 @@ class StandardDecisionStrategy(DecisionStrategy):
         """Apply standard decision logic."""
         
         # Check for spoofing first (highest priority)
-        if scores.spoof_probability > policy.spoof_threshold:
+        if scores.spoof_probability is not None and scores.spoof_probability > policy.spoof_threshold:
             return False, AuthReason.SPOOF
         
         # Check phrase correctness
@@ -95,7 +95,7 @@ class BankingDecisionStrategy(DecisionStrategy):
         
         # Extra spoofing vigilance - lower threshold
         banking_spoof_reduction = 0.1
-        if scores.spoof_probability > (policy.spoof_threshold - banking_spoof_reduction):
+        if scores.spoof_probability is not None and scores.spoof_probability > (policy.spoof_threshold - banking_spoof_reduction):
             return False, AuthReason.SPOOF
         
         return True, AuthReason.OK
@@ -113,7 +113,7 @@ class DemoDecisionStrategy(DecisionStrategy):
         """Apply relaxed decision logic for demos."""
         
         # Very basic checks for demo purposes
-        if scores.spoof_probability > 0.8:  # Only reject obvious spoofing
+        if scores.spoof_probability is not None and scores.spoof_probability > 0.8:  # Only reject obvious spoofing
             return False, AuthReason.SPOOF
         
         if scores.similarity < 0.6:  # Very low threshold
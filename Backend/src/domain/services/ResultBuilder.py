@@ -1,7 +1,7 @@
 """Builder Pattern for constructing AuthAttemptResult step by step."""
 
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Dict, Optional
 from uuid import UUID, uuid4
 
 from ..model.AuthAttemptResult import AuthAttemptResult, BiometricScores
@@ -47,10 +47,10 @@ class ResultBuilder:
     def with_biometric_scores(
         self,
         similarity: float,
-        spoof_probability: float,
+        spoof_probability: Optional[float],
         phrase_match: float,
         phrase_ok: bool,
-        inference_latency_ms: int,
+        inference_latency_ms: Optional[int],
         speaker_model_id: Optional[int] = None,
         antispoof_model_id: Optional[int] = None,
         asr_model_id: Optional[int] = None
@@ -73,6 +73,11 @@ class ResultBuilder:
         self._result.total_latency_ms = latency_ms
         return self
     
+    def with_stage_latencies(self, stage_latency_ms: Dict[str, int]) -> 'ResultBuilder':
+        """Set the per-stage latency breakdown (milliseconds per stage)."""
+        self._result.stage_latency_ms = dict(stage_latency_ms)
+        return self
+    
     def accept_with_reason(self, reason: AuthReason = AuthReason.OK) -> 'ResultBuilder':
         """Accept the authentication with a reason."""
         self._result.decided = True
@@ -113,6 +118,7 @@ class ResultBuilder:
             reason=self._result.reason,
             policy_id=self._result.policy_id,
             total_latency_ms=self._result.total_latency_ms,
+            stage_latency_ms=self._result.stage_latency_ms,
             scores=self._result.scores,
             created_at=self._result.created_at,
             decided_at=self._result.decided_at
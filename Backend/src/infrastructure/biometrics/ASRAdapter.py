@@ -1,13 +1,12 @@
 """ASR adapter for speech recognition and phrase verification using lightweight ASR model."""
 
-import difflib
+import functools
 import logging
-import io
 import os
+import re
 import torch
-import torchaudio
 import numpy as np
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 from pathlib import Path
 
 try:
@@ -18,10 +17,16 @@ except ImportError:
     SPEECHBRAIN_AVAILABLE = False
 
 try:
-    from ...shared.constants.biometric_constants import DEFAULT_PHRASE_MATCH_THRESHOLD
+    from ...shared.constants.biometric_constants import (
+        DEFAULT_PHRASE_MATCH_THRESHOLD,
+        DEFAULT_PHRASE_SCORE_THRESHOLD,
+        TRANSCRIPT_PHRASE_MATCH_THRESHOLD,
+    )
 except ImportError:
     # Fallback for standalone testing
     DEFAULT_PHRASE_MATCH_THRESHOLD = 0.7
+    DEFAULT_PHRASE_SCORE_THRESHOLD = 0.5
+    TRANSCRIPT_PHRASE_MATCH_THRESHOLD = 0.7
 
 try:
     from .model_manager import model_manager
@@ -29,6 +34,14 @@ except ImportError:
     # Fallback for standalone testing
     model_manager = None
 
+from .batching import MicroBatcher
+from .result_cache import mark_fallback_result
+from .replica_pool import ModelReplicaPool
+from .quantization import QUANTIZED_VERSION_SUFFIX, is_quantization_supported, quantize_dynamic_int8
+from .audio_sample import AudioSample, AudioInput, as_audio_sample, readonly_tensor, stable_audio_seed
+from .ctc_alignment import greedy_token_ids, score_phrase
+from ...shared.phrase_matching import compile_phrase, normalize_words, phrase_similarity
+
 logger = logging.getLogger(__name__)
 
 # Constants for mock transcription
@@ -38,6 +51,9 @@ BANKING_SECURITY_PHRASE = "banking security is very important"
 SPEECH_TECH_PHRASE = "speech recognition technology advances"
 BIOMETRIC_SECURITY_PHRASE = "biometric systems provide security"
 
+# Characters dropped from an expected phrase before it is tokenized
+_PHRASE_STRIP_PATTERN = re.compile(r"[^\w\s']")
+
 
 class ASRAdapter:
     """
@@ -49,7 +65,18 @@ class ASRAdapter:
     - Word-level accuracy analysis
     """
     
-    def __init__(self, model_id: int = 3, model_name: str = None, use_gpu: bool = True):
+    def __init__(
+        self,
+        model_id: int = 3,
+        model_name: str = None,
+        use_gpu: bool = True,
+        batch_window_ms: Optional[float] = None,
+        max_batch_size: Optional[int] = None,
+        bucket_width_sec: Optional[float] = None,
+        replicas: Optional[int] = None,
+        max_speech_sec: Optional[float] = None,
+        phrase_score_threshold: Optional[float] = None
+    ):
         self._model_id = model_id
         
         # Allow model selection via environment variable or parameter
@@ -68,16 +95,71 @@ class ASRAdapter:
         # Model components
         self._asr_model = None
         self._model_loaded = False
+        self._quantized = False
         
         # Audio processing parameters
         self.target_sample_rate = 16000
         
+        # Speech (after VAD) fed to Wav2Vec2 for open transcription: slow on
+        # CPU, and phrases are 3-5 s. Phrase scoring is never cropped: the
+        # whole expected phrase is aligned, so every word must be in the input
+        # Priority: parameter > env var > default
+        if max_speech_sec is None:
+            max_speech_sec = float(os.getenv("ASR_MAX_SPEECH_SEC", "5"))
+        self.max_speech_sec = max_speech_sec
+        
+        # Pass mark for the CTC likelihood-ratio phrase score; calibrate with
+        # evaluation/scripts/calibrate_phrase_score_threshold.py
+        # Priority: parameter > env var > default
+        if phrase_score_threshold is None:
+            phrase_score_threshold = float(os.getenv(
+                "ASR_PHRASE_SCORE_THRESHOLD", str(DEFAULT_PHRASE_SCORE_THRESHOLD)
+            ))
+        self.phrase_score_threshold = phrase_score_threshold
+        
         # Thread safety for parallel processing
         import threading
-        self._lock = threading.Lock()
+        
+        # Replica pool: K independent ASR instances instead of one behind a lock
+        # Priority: parameter > env var > default
+        if replicas is None:
+            replicas = int(os.getenv("ASR_REPLICAS", "1"))
+        self._replicas: Optional[ModelReplicaPool] = None
+        
+        # Batched transcription queue with duration buckets
+        # Priority: parameter > env var > default
+        if batch_window_ms is None:
+            batch_window_ms = float(os.getenv("ASR_BATCH_WINDOW_MS", "20"))
+        if max_batch_size is None:
+            max_batch_size = int(os.getenv("ASR_MAX_BATCH_SIZE", "4"))
+        if bucket_width_sec is None:
+            bucket_width_sec = float(os.getenv("ASR_BUCKET_WIDTH_SEC", "1.0"))
+        self._bucket_width_samples = max(1, int(bucket_width_sec * self.target_sample_rate))
+        self._batcher: Optional[MicroBatcher] = None
+        
+        # Padding waste accounting (samples actually fed vs. samples in padded batches)
+        self._padding_lock = threading.Lock()
+        self._real_samples = 0
+        self._padded_samples = 0
         
         # Load the ASR model
         self._load_asr_model()
+        
+        if self._model_loaded:
+            self._replicas = ModelReplicaPool.from_model(
+                self._asr_model, size=replicas, name="asr_replicas", governor_key="asr"
+            )
+        
+        if self._model_loaded and max_batch_size > 1:
+            # One batching worker per replica so batches run in parallel
+            self._batcher = MicroBatcher(
+                self._run_batch,
+                max_batch_size=max_batch_size,
+                max_wait_ms=batch_window_ms,
+                name="asr_batcher",
+                bucket_fn=self._duration_bucket,
+                num_workers=self._replicas.size
+            )
     
     def _load_asr_model(self):
         """Load lightweight ASR model for speech recognition."""
@@ -129,6 +211,9 @@ class ASRAdapter:
                     )
                     logger.info("Lightweight ASR model loaded successfully from local path")
                     self._model_loaded = True
+                    
+                    if model_manager.is_quantized(self._model_name):
+                        self._apply_quantization()
                 except Exception as load_error:
                     logger.warning(f"Failed to load ASR from local path: {load_error}")
                     self._asr_model = None
@@ -143,12 +228,21 @@ class ASRAdapter:
             logger.error(f"Failed to load ASR model: {e}")
             self._model_loaded = False
     
-    def transcribe(self, audio_data: bytes) -> str:
+    def _apply_quantization(self):
+        """Quantize the wav2vec2 Linear layers to INT8 (enabled per model in ModelManager)."""
+        if not is_quantization_supported(self.device):
+            logger.warning(f"INT8 quantization requested for ASR but not supported on {self.device}")
+            return
+        if quantize_dynamic_int8(self._asr_model.mods, self._model_name):
+            self._quantized = True
+            self._model_version += QUANTIZED_VERSION_SUFFIX
+    
+    def transcribe(self, audio_data: AudioInput) -> str:
         """
         Transcribe audio to text using lightweight ASR model.
         
         Args:
-            audio_data: Raw audio bytes
+            audio_data: Decoded AudioSample or raw audio bytes
             
         Returns:
             str: Recognized text
@@ -160,50 +254,229 @@ class ASRAdapter:
                 return self._fallback_transcription(audio_data)
             
             # Preprocess audio
-            waveform = self._preprocess_audio(audio_data)
+            waveform = self._preprocess_audio(as_audio_sample(audio_data))
             
-            # Perform ASR inference (thread-safe)
-            with self._lock:
-                with torch.no_grad():
-                    wav_lens = torch.tensor([1.0]).to(self.device)
-                    # transcribe_batch returns (words, tokens)
-                    results = self._asr_model.transcribe_batch(waveform, wav_lens)
-                    transcribed_text = results[0] # Get the list of predicted words
+            # Queue for a shared forward pass with similar-length utterances
+            transcribed_text = self._run(waveform)
             
             logger.debug(f"Transcribed text: '{transcribed_text}'")
-            return transcribed_text[0] if isinstance(transcribed_text, list) else transcribed_text
+            return transcribed_text
             
         except Exception as e:
             logger.error(f"Transcription failed: {e}")
             return self._fallback_transcription(audio_data)
     
-    def _preprocess_audio(self, audio_data: bytes) -> torch.Tensor:
-        """Convert audio bytes to tensor format required by ASR model."""
-        try:
-            # Convert bytes to audio
-            audio_io = io.BytesIO(audio_data)
-            waveform, sample_rate = torchaudio.load(audio_io)
+    def score_phrase(self, audio_data: AudioInput, expected_phrase: str) -> Dict[str, Any]:
+        """
+        Score how well the audio matches the expected phrase (no free decoding).
+        
+        The phrase is force-aligned against the CTC emissions of the model.
+        The greedy transcript of the same emissions comes for free and is
+        returned for logging.
+        
+        Args:
+            audio_data: Decoded AudioSample or raw audio bytes
+            expected_phrase: Phrase the user was asked to read
             
-            # Resample if needed
-            if sample_rate != self.target_sample_rate:
-                resampler = torchaudio.transforms.Resample(sample_rate, self.target_sample_rate)
-                waveform = resampler(waveform)
-                sample_rate = self.target_sample_rate
+        Returns:
+            dict: recognized_text, phrase_match (0-1), word_confidences
+            (word, confidence, start_sec, end_sec), log_likelihood, mode and
+            the threshold phrase_match must reach in that mode
+        """
+        
+        try:
+            if not self._model_loaded:
+                return self._fallback_phrase_score(audio_data, expected_phrase)
             
-            # Convert to mono if stereo
-            if waveform.shape[0] > 1:
-                waveform = torch.mean(waveform, dim=0, keepdim=True)
+            # Uncropped: a word cut off here would be scored as not spoken
+            waveform = self._preprocess_audio(as_audio_sample(audio_data), crop=False)
+            result = self._run(waveform, expected_phrase)
+            logger.debug(f"Phrase score {result['phrase_match']:.3f} for '{expected_phrase}'")
+            return result
             
-            # PERFORMANCE OPTIMIZATION: Limit to 5s for ASR
-            # Wav2Vec2 is slow on CPU, and typical phrases are 3-5s
-            max_asr_samples = int(5.0 * sample_rate)
-            if waveform.shape[1] > max_asr_samples:
-                # Take center portion (best quality usually)
-                start = (waveform.shape[1] - max_asr_samples) // 2
-                waveform = waveform[:, start:start + max_asr_samples]
+        except Exception as e:
+            logger.error(f"Phrase scoring failed: {e}")
+            return self._fallback_phrase_score(audio_data, expected_phrase)
+    
+    def _fallback_phrase_score(self, audio_data: AudioInput, expected_phrase: str) -> Dict[str, Any]:
+        """Phrase score from a (fallback) transcription when no CTC emissions are available."""
+        mark_fallback_result("asr")
+        recognized_text = self.transcribe(audio_data)
+        recognized_words = set(normalize_words(recognized_text))
+        return {
+            "recognized_text": recognized_text,
+            "phrase_match": self.calculate_phrase_similarity(expected_phrase, recognized_text),
+            "word_confidences": [
+                {"word": word, "confidence": 1.0 if word in recognized_words else 0.0,
+                 "start_sec": None, "end_sec": None}
+                for word in normalize_words(expected_phrase)
+            ],
+            "log_likelihood": None,
+            "mode": "transcription",
+            "threshold": TRANSCRIPT_PHRASE_MATCH_THRESHOLD
+        }
+    
+    def _run(self, waveform: torch.Tensor, expected_phrase: Optional[str] = None):
+        """Queue one utterance (transcription or phrase scoring) for a batched forward pass."""
+        if self._batcher is not None:
+            return self._batcher.run((waveform, expected_phrase))
+        return self._run_batch([(waveform, expected_phrase)])[0]
+    
+    def _duration_bucket(self, item: tuple) -> int:
+        """Bucket key for the batching queue: utterance duration in bucket-width steps."""
+        return item[0].shape[-1] // self._bucket_width_samples
+    
+    def _run_batch(self, items: List[tuple]) -> List[Any]:
+        """
+        One forward pass for a batch of (waveform, expected_phrase) items.
+        
+        Items without a phrase are transcribed; items with one are scored
+        against it. Both kinds share the same encoder pass (mixed batches
+        transcribe with greedy CTC decoding).
+        """
+        waveforms = [waveform for waveform, _ in items]
+        if all(phrase is None for _, phrase in items):
+            return self._transcribe_batch(waveforms)
+        
+        with self._replicas.checkout() as asr_model:
+            with torch.no_grad():
+                batch, wav_lens, lengths = self._pad_batch(waveforms)
+                # The encoder ends with a log-softmax: (batch, frames, vocabulary) CTC emissions
+                encoder_out = asr_model.encode_batch(batch, wav_lens)
+                frame_counts = [
+                    max(1, int(round(encoder_out.shape[1] * length / max(lengths))))
+                    for length in lengths
+                ]
+                log_probs = encoder_out.float().cpu().numpy()
+        
+        # Alignment runs on numpy after the replica is released
+        results = []
+        for i, (_, phrase) in enumerate(items):
+            emissions = log_probs[i, :frame_counts[i]]
+            if phrase is None:
+                results.append(self._decode_emissions(asr_model, emissions))
+            else:
+                frame_sec = lengths[i] / self.target_sample_rate / frame_counts[i]
+                results.append(self._score_emissions(asr_model, emissions, phrase, frame_sec))
+        return results
+    
+    def _pad_batch(self, waveforms: List[torch.Tensor]):
+        """
+        Stack (1, samples) waveforms into one batch.
+        
+        Waveforms are right-padded to the longest one and the relative
+        length of each utterance is returned as wav_lens.
+        """
+        lengths = [w.shape[-1] for w in waveforms]
+        max_len = max(lengths)
+        
+        batch = torch.zeros(len(waveforms), max_len, dtype=torch.float32, device=self.device)
+        for i, waveform in enumerate(waveforms):
+            batch[i, :lengths[i]] = waveform.reshape(-1)
+        wav_lens = torch.tensor([length / max_len for length in lengths], device=self.device)
+        
+        with self._padding_lock:
+            self._real_samples += sum(lengths)
+            self._padded_samples += max_len * len(lengths)
+        
+        return batch, wav_lens, lengths
+    
+    def _blank_index(self, asr_model) -> int:
+        return getattr(asr_model.hparams, "blank_index", 0)
+    
+    def _decode_emissions(self, asr_model, emissions: np.ndarray) -> str:
+        """Greedy transcript of one utterance's emissions."""
+        token_ids = greedy_token_ids(emissions, self._blank_index(asr_model))
+        return asr_model.tokenizer.decode_ids(token_ids) if token_ids else ""
+    
+    def _score_emissions(self, asr_model, emissions: np.ndarray, expected_phrase: str, frame_sec: float) -> Dict[str, Any]:
+        """Force-align the expected phrase against one utterance's emissions."""
+        words, word_tokens = self._tokenize_phrase(asr_model.tokenizer, expected_phrase)
+        alignment = score_phrase(emissions, word_tokens, words, frame_sec, self._blank_index(asr_model))
+        return {
+            "recognized_text": self._decode_emissions(asr_model, emissions),
+            "phrase_match": alignment.score,
+            "word_confidences": alignment.word_confidences(),
+            "log_likelihood": alignment.log_likelihood if alignment.aligned else None,
+            "log_likelihood_ratio": alignment.log_likelihood_ratio if alignment.aligned else None,
+            "mode": "ctc_alignment",
+            "threshold": self.phrase_score_threshold
+        }
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _tokenize_phrase(tokenizer, expected_phrase: str) -> tuple:
+        """
+        Words of the phrase and the SentencePiece ids of each word.
+        
+        The model's vocabulary may be upper- or lower-case; the casing that
+        produces fewer unknown pieces is used.
+        """
+        words = _PHRASE_STRIP_PATTERN.sub(" ", expected_phrase).split()
+        unk_id = tokenizer.unk_id()
+        
+        best = None
+        for cased in ([w.upper() for w in words], [w.lower() for w in words]):
+            word_tokens = tuple(tuple(tokenizer.encode_as_ids(w)) for w in cased)
+            unknown = sum(token == unk_id for tokens in word_tokens for token in tokens)
+            if best is None or unknown < best[0]:
+                best = (unknown, word_tokens)
+        return tuple(words), best[1]
+    
+    def _transcribe_batch(self, waveforms: List[torch.Tensor]) -> List[str]:
+        """Transcribe a batch of (1, samples) waveforms with one forward pass."""
+        batch, wav_lens, _ = self._pad_batch(waveforms)
+        
+        # Perform ASR inference (thread-safe: each concurrent batch gets its own replica)
+        with self._replicas.checkout() as asr_model:
+            with torch.no_grad():
+                # transcribe_batch returns (words, tokens), one entry per utterance
+                predicted_words, _ = asr_model.transcribe_batch(batch, wav_lens)
+        
+        return [
+            " ".join(words) if isinstance(words, list) else words
+            for words in predicted_words
+        ]
+    
+    def get_batching_stats(self) -> Optional[Dict[str, Any]]:
+        """Get batching statistics, including the fraction of compute spent on padding."""
+        if self._batcher is None:
+            return None
+        
+        stats = self._batcher.get_stats()
+        with self._padding_lock:
+            padded = self._padded_samples
+            wasted = padded - self._real_samples
+        stats["bucket_width_sec"] = self._bucket_width_samples / self.target_sample_rate
+        stats["padding_samples_wasted"] = wasted
+        stats["padding_waste_ratio"] = wasted / padded if padded else 0.0
+        return stats
+    
+    def get_replica_stats(self) -> Optional[Dict[str, Any]]:
+        """Get replica pool checkout statistics (None when the model is not loaded)."""
+        return self._replicas.get_stats() if self._replicas else None
+    
+    def close(self):
+        """Stop the batching worker. Call this on application shutdown."""
+        if self._batcher is not None:
+            self._batcher.close()
+            self._batcher = None
+    
+    def _preprocess_audio(self, sample: AudioSample, crop: bool = True) -> torch.Tensor:
+        """
+        Get the tensor format required by ASR model from the shared decoded buffer.
+        
+        With ``crop=False`` all speech is kept instead of max_speech_sec.
+        """
+        max_speech_sec = self.max_speech_sec if crop else None
+        try:
+            # Speech frames only (VAD), center portion beyond max_speech_sec
+            # (best quality usually); zero-copy when nothing is trimmed
+            waveform = readonly_tensor(sample.model_input(max_speech_sec)).unsqueeze(0)
             
             # AUDIO NORMALIZATION: Normalize amplitude to improve ASR accuracy
             # Scale waveform to [-1, 1] range for consistent model input
+            # (out-of-place: the shared buffer must not be modified)
             max_val = waveform.abs().max()
             if max_val > 0:
                 waveform = waveform / max_val
@@ -239,7 +512,7 @@ class ASRAdapter:
     def _enhanced_mock_transcription(self, audio_data: bytes, waveform: torch.Tensor) -> str:
         """Enhanced mock transcription based on audio characteristics."""
         # Use audio features to generate more realistic transcription
-        hash_value = hash(audio_data) % 1000
+        hash_value = stable_audio_seed(audio_data) % 1000
         
         # Analyze audio characteristics
         duration = waveform.shape[-1] / self.target_sample_rate
@@ -291,10 +564,12 @@ class ASRAdapter:
         zcr = torch.sum(sign_changes).float() / len(waveform)
         return zcr.item()
     
-    def _fallback_transcription(self, audio_data: bytes) -> str:
+    def _fallback_transcription(self, audio_data: AudioInput) -> str:
         """Fallback transcription when ASR model is not available."""
+        mark_fallback_result("asr")
+        
         # Generate pseudo-random but deterministic transcription
-        hash_value = hash(audio_data) % 1000
+        hash_value = stable_audio_seed(audio_data) % 1000
         
         # Mock phrases based on hash
         mock_phrases = [
@@ -319,12 +594,12 @@ class ASRAdapter:
         
         return base_phrase.title()
     
-    def verify_phrase(self, audio_data: bytes, expected_phrase: str) -> Dict[str, Any]:
+    def verify_phrase(self, audio_data: AudioInput, expected_phrase: str) -> Dict[str, Any]:
         """
         Verify that audio contains the expected phrase using ASR analysis.
         
         Args:
-            audio_data: Raw audio bytes
+            audio_data: Decoded AudioSample or raw audio bytes
             expected_phrase: Expected phrase text
             
         Returns:
@@ -382,7 +657,7 @@ class ASRAdapter:
             }
     
     def _calculate_verification_confidence(self, similarity: float, word_accuracy: float, 
-                                         semantic_similarity: float, audio_data: bytes) -> float:
+                                         semantic_similarity: float, audio_data: AudioInput) -> float:
         """Calculate overall verification confidence."""
         try:
             # Audio quality factor
@@ -404,8 +679,8 @@ class ASRAdapter:
     def _calculate_semantic_similarity(self, expected: str, recognized: str) -> float:
         """Calculate semantic similarity between phrases."""
         # Simple semantic similarity based on word overlap and order
-        expected_words = expected.lower().split()
-        recognized_words = recognized.lower().split()
+        expected_words = normalize_words(expected)
+        recognized_words = normalize_words(recognized)
         
         if not expected_words or not recognized_words:
             return 0.0
@@ -442,32 +717,13 @@ class ASRAdapter:
         return False
     
     def _calculate_edit_distance(self, expected: str, recognized: str) -> int:
-        """Calculate Levenshtein edit distance."""
-        if not expected or not recognized:
-            return max(len(expected), len(recognized))
-        
-        # Dynamic programming approach
-        m, n = len(expected), len(recognized)
-        dp = [[0] * (n + 1) for _ in range(m + 1)]
-        
-        for i in range(m + 1):
-            dp[i][0] = i
-        for j in range(n + 1):
-            dp[0][j] = j
-        
-        for i in range(1, m + 1):
-            for j in range(1, n + 1):
-                if expected[i-1] == recognized[j-1]:
-                    dp[i][j] = dp[i-1][j-1]
-                else:
-                    dp[i][j] = 1 + min(dp[i-1][j], dp[i][j-1], dp[i-1][j-1])
-        
-        return dp[m][n]
+        """Calculate character-level Levenshtein edit distance of the normalized texts."""
+        return compile_phrase(expected).char_distance(recognized)
     
     def _check_word_order(self, expected: str, recognized: str) -> bool:
         """Check if word order is preserved."""
-        expected_words = expected.lower().split()
-        recognized_words = recognized.lower().split()
+        expected_words = normalize_words(expected)
+        recognized_words = normalize_words(recognized)
         
         # Find common words and check their relative order
         common_words = []
@@ -493,8 +749,8 @@ class ASRAdapter:
     
     def _check_key_words(self, expected: str, recognized: str) -> Dict[str, bool]:
         """Check presence of key words."""
-        expected_words = set(expected.lower().split())
-        recognized_words = set(recognized.lower().split())
+        expected_words = set(normalize_words(expected))
+        recognized_words = set(normalize_words(recognized))
         
         # Define key word categories
         key_categories = {
@@ -511,12 +767,15 @@ class ASRAdapter:
         
         return results
     
-    def _assess_audio_quality(self, audio_data: bytes) -> float:
+    def _assess_audio_quality(self, audio_data: AudioInput) -> float:
         """Assess audio quality for confidence calculation."""
         try:
             # Simple quality assessment based on audio data
-            data_size = len(audio_data)
-            hash_factor = hash(audio_data) % 100
+            if isinstance(audio_data, AudioSample):
+                data_size = audio_data.source_num_bytes
+            else:
+                data_size = len(audio_data)
+            hash_factor = stable_audio_seed(audio_data) % 100
             
             # Simulate quality based on size and content
             if data_size > 50000:  # Larger audio typically better quality
@@ -549,18 +808,7 @@ class ASRAdapter:
     
     def calculate_phrase_similarity(self, expected: str, recognized: str) -> float:
         """Calculate similarity between expected and recognized phrases."""
-        
-        # Normalize text
-        expected_norm = expected.lower().strip()
-        recognized_norm = recognized.lower().strip()
-        
-        if not expected_norm or not recognized_norm:
-            return 0.0
-        
-        # Use difflib for sequence matching
-        similarity = difflib.SequenceMatcher(None, expected_norm, recognized_norm).ratio()
-        
-        return similarity
+        return phrase_similarity(expected, recognized)
     
     def _mock_transcription(self, audio_data: bytes) -> str:
         """
@@ -569,7 +817,7 @@ class ASRAdapter:
         """
         
         # Generate pseudo-random but deterministic transcription
-        hash_value = hash(audio_data) % 1000
+        hash_value = stable_audio_seed(audio_data) % 1000
         
         # Mock phrases based on hash
         mock_phrases = [
@@ -600,8 +848,8 @@ class ASRAdapter:
     
     def _calculate_word_accuracy(self, expected: str, recognized: str) -> float:
         """Calculate word-level accuracy."""
-        expected_words = set(expected.lower().split())
-        recognized_words = set(recognized.lower().split())
+        expected_words = set(normalize_words(expected))
+        recognized_words = set(normalize_words(recognized))
         
         if not expected_words:
             return 1.0 if not recognized_words else 0.0
@@ -611,8 +859,8 @@ class ASRAdapter:
     
     def _get_common_words(self, expected: str, recognized: str) -> list:
         """Get list of common words between expected and recognized."""
-        expected_words = set(expected.lower().split())
-        recognized_words = set(recognized.lower().split())
+        expected_words = set(normalize_words(expected))
+        recognized_words = set(normalize_words(recognized))
         
         return list(expected_words.intersection(recognized_words))
     
@@ -620,6 +868,10 @@ class ASRAdapter:
         """Get model ID for audit trail."""
         return self._model_id
     
+    def is_model_loaded(self) -> bool:
+        """Whether inference runs on the real model (False when it falls back to the mock)."""
+        return self._model_loaded
+    
     def get_model_name(self) -> str:
         """Get model name."""
         return self._model_name
@@ -1,12 +1,12 @@
 """Anti-spoofing adapter using AASIST and RawNet2 models for spoofing detection."""
 
 import numpy as np
-import io
-import wave
+import os
 import torch
-import torchaudio
 import logging
 import pickle
+import threading
+import time
 from typing import Dict, Any, Tuple, Optional, List
 from pathlib import Path
 import speechbrain as sb
@@ -14,10 +14,15 @@ from speechbrain.inference.speaker import EncoderClassifier
 
 from .local_antispoof_models import (
     BaseLocalAntiSpoofModel,
-    LocalAASISTModel,
-    LocalRawNet2Model,
     build_local_model_paths,
+    load_local_antispoof_model,
 )
+from .batching import MicroBatcher
+from .result_cache import mark_fallback_result
+from .replica_pool import ModelReplicaPool
+from .quantization import QUANTIZED_VERSION_SUFFIX
+from .onnx_runtime import ONNX_VERSION_SUFFIX
+from .audio_sample import AudioSample, AudioInput, as_audio_sample, readonly_tensor, stable_audio_seed
 
 try:
     from ...shared.constants.biometric_constants import DEFAULT_SPOOF_THRESHOLD
@@ -46,7 +51,19 @@ class SpoofDetectorAdapter:
     Trained on ASVspoof 2019/2021 datasets for comprehensive spoofing detection.
     """
     
-    def __init__(self, model_id: int = 2, model_name: str = "ensemble_antispoofing", use_gpu: bool = True):
+    def __init__(
+        self,
+        model_id: int = 2,
+        model_name: str = "ensemble_antispoofing",
+        use_gpu: bool = True,
+        batch_window_ms: Optional[float] = None,
+        max_batch_size: Optional[int] = None,
+        replicas: Optional[int] = None,
+        staged: Optional[bool] = None,
+        first_stage: Optional[str] = None,
+        uncertainty_band: Optional[Tuple[float, float]] = None,
+        max_speech_sec: Optional[float] = None
+    ):
         self._model_id = model_id
         self._model_name = model_name
         self._model_version = "1.0.0"
@@ -60,6 +77,7 @@ class SpoofDetectorAdapter:
         self._rawnet2_model = None
         self._local_models: Dict[str, BaseLocalAntiSpoofModel] = {}
         self._models_loaded = False
+        self._quantized_models: List[str] = []
         
         # Audio processing parameters
         self.target_sample_rate = 16000
@@ -73,12 +91,70 @@ class SpoofDetectorAdapter:
             'rawnet2': 0.45   # Strong for deepfake detection
         }
         
+        # Speech (after VAD) fed to the models; AASIST/RawNet2 see ~4 s windows
+        # Priority: parameter > env var > default
+        if max_speech_sec is None:
+            max_speech_sec = float(os.getenv("ANTISPOOF_MAX_SPEECH_SEC", "6"))
+        self.max_speech_sec = max_speech_sec
+        
+        # Staged ensemble: the cheaper model runs first and the second one is
+        # consulted only when the first score falls inside the uncertainty band.
+        # Pick the band with evaluation/scripts/optimize_antispoof_staging.py
+        # Priority: parameter > env var > default
+        if staged is None:
+            staged = os.getenv("ANTISPOOF_STAGED", "false").lower() in ("1", "true", "yes")
+        if first_stage is None:
+            first_stage = os.getenv("ANTISPOOF_FIRST_STAGE", "rawnet2")  # ~5x cheaper than AASIST on CPU
+        if uncertainty_band is None:
+            low, high = os.getenv("ANTISPOOF_UNCERTAINTY_BAND", "0.25,0.75").split(",")
+            uncertainty_band = (float(low), float(high))
+        if first_stage not in self.model_weights:
+            raise ValueError(f"Unknown first-stage anti-spoofing model: {first_stage}")
+        self._staged = staged
+        self._stage_order = [first_stage] + [m for m in ("aasist", "rawnet2") if m != first_stage]
+        self._uncertainty_band = uncertainty_band
+        self._staging_lock = threading.Lock()
+        self._first_stage_only = 0
+        self._escalated = 0
+        
         # Thread safety for parallel processing
-        import threading
         self._lock = threading.Lock()
         
+        # Replica pool: K independent copies of the local AASIST/RawNet2 models.
+        # SpeechBrain fallback models are not replicated and stay behind the lock.
+        # Priority: parameter > env var > default
+        if replicas is None:
+            replicas = int(os.getenv("ANTISPOOF_REPLICAS", "1"))
+        self._replicas: Optional[ModelReplicaPool] = None
+        
+        # Request coalescing: concurrent requests share one forward pass per model
+        # Priority: parameter > env var > default
+        if batch_window_ms is None:
+            batch_window_ms = float(os.getenv("ANTISPOOF_BATCH_WINDOW_MS", "10"))
+        if max_batch_size is None:
+            max_batch_size = int(os.getenv("ANTISPOOF_MAX_BATCH_SIZE", "8"))
+        self._batcher: Optional[MicroBatcher] = None
+        
         # Load the anti-spoofing models
         self._load_antispoofing_models()
+        
+        if self._models_loaded:
+            self._replicas = ModelReplicaPool.from_model(
+                self._local_models,
+                size=replicas if self._local_models else 1,
+                name="antispoof_replicas",
+                governor_key="antispoof"
+            )
+        
+        if self._models_loaded and max_batch_size > 1:
+            # One batching worker per replica so batches run in parallel
+            self._batcher = MicroBatcher(
+                self._detect_spoof_batch,
+                max_batch_size=max_batch_size,
+                max_wait_ms=batch_window_ms,
+                name="antispoof_batcher",
+                num_workers=self._replicas.size
+            )
     
     def _load_antispoofing_models(self):
         """Load AASIST and RawNet2 models for ensemble anti-spoofing."""
@@ -94,17 +170,21 @@ class SpoofDetectorAdapter:
             self._local_models = {}
             local_paths = build_local_model_paths()
 
-            # Local AASIST
-            local_aasist = LocalAASISTModel(device=self.device, paths=local_paths)
+            # Local AASIST (ONNX Runtime when exported, torch otherwise)
+            local_aasist = load_local_antispoof_model("aasist", self.device, local_paths)
             if local_aasist.available:
                 self._local_models["aasist"] = local_aasist
                 success_count += 1
 
-            # Local RawNet2
-            local_rawnet = LocalRawNet2Model(device=self.device, paths=local_paths)
+            # Local RawNet2 (ONNX Runtime when exported, torch otherwise)
+            local_rawnet = load_local_antispoof_model("rawnet2", self.device, local_paths)
             if local_rawnet.available:
                 self._local_models["rawnet2"] = local_rawnet
                 success_count += 1
+            
+            self._apply_quantization()
+            if any(m.runtime == "onnx" for m in self._local_models.values()):
+                self._model_version += ONNX_VERSION_SUFFIX
 
             # Fallback to SpeechBrain downloads when local assets are missing
             if "aasist" not in self._local_models:
@@ -252,12 +332,25 @@ class SpoofDetectorAdapter:
         
         return np.array(features)
     
-    def detect_spoof(self, audio_data: bytes) -> float:
+    def _apply_quantization(self):
+        """Quantize the local models enabled for INT8 in ModelManager (CPU only)."""
+        for model_name, local_model in self._local_models.items():
+            if not model_manager.is_quantized(model_name):
+                continue
+            if local_model.quantize_dynamic(model_name):
+                self._quantized_models.append(model_name)
+            else:
+                logger.warning(f"INT8 quantization requested for {model_name} but not applied")
+        
+        if self._quantized_models:
+            self._model_version += QUANTIZED_VERSION_SUFFIX
+    
+    def detect_spoof(self, audio_data: AudioInput) -> float:
         """
         Detect spoofing probability using ensemble of AASIST and RawNet2 models.
         
         Args:
-            audio_data: Raw audio bytes
+            audio_data: Decoded AudioSample or raw audio bytes
             
         Returns:
             float: Probability that audio is spoofed/synthetic (0.0 = genuine, 1.0 = spoofed)
@@ -268,16 +361,15 @@ class SpoofDetectorAdapter:
                 return self._fallback_spoof_detection(audio_data)
             
             # Convert audio data to tensor
-            waveform = self._preprocess_audio(audio_data)
+            waveform = self._preprocess_audio(as_audio_sample(audio_data))
             
-            # Get predictions from available models
-            predictions = {}
-            predictions.update(self._get_model_prediction("aasist", waveform))
-            predictions.update(self._get_model_prediction("rawnet2", waveform))
+            # Ensemble prediction, coalesced with concurrent requests when batching
+            if self._batcher is not None:
+                weighted_score = self._batcher.run(waveform)
+            else:
+                weighted_score = self._detect_spoof_batch([waveform])[0]
             
-            # Ensemble prediction using weighted average
-            if predictions:
-                weighted_score = self._ensemble_prediction(predictions)
+            if weighted_score is not None:
                 logger.debug(f"Ensemble spoofing score: {weighted_score:.3f}")
                 return weighted_score
             
@@ -288,6 +380,86 @@ class SpoofDetectorAdapter:
             logger.error(f"Spoofing detection failed: {e}")
             return self._fallback_spoof_detection(audio_data)
     
+    def _detect_spoof_batch(self, waveforms: List[torch.Tensor]) -> List[Optional[float]]:
+        """
+        Score a batch of preprocessed waveforms with the ensemble.
+        
+        Returns None for requests no model could score.
+        """
+        return [
+            self._ensemble_prediction(predictions) if predictions else None
+            for predictions in self._score_batch(waveforms)
+        ]
+    
+    def _score_batch(
+        self,
+        waveforms: List[torch.Tensor],
+        stage_latency_ms: Optional[Dict[str, float]] = None
+    ) -> List[Dict[str, float]]:
+        """
+        Per-model scores of each request, in the order the models ran.
+        
+        Each model runs once over the whole batch (in staged mode the second
+        model only over the uncertain requests). If ``stage_latency_ms`` is
+        given, the time of each model that ran is stored in it.
+        """
+        per_request: List[Dict[str, float]] = [{} for _ in waveforms]
+        
+        with self._replicas.checkout() as local_models:
+            pending = list(range(len(waveforms)))
+            for stage, model_name in enumerate(self._stage_order):
+                if not pending:
+                    break
+                started = time.perf_counter()
+                batch_predictions = self._get_batch_predictions(
+                    model_name, [waveforms[i] for i in pending], local_models
+                )
+                if stage_latency_ms is not None:
+                    stage_latency_ms[model_name] = (time.perf_counter() - started) * 1000
+                for i, model_prediction in zip(pending, batch_predictions):
+                    per_request[i].update(model_prediction)
+                if self._staged and stage == 0:
+                    pending = [i for i in pending if self._needs_second_stage(per_request[i], model_name)]
+                    self._record_staging(len(waveforms) - len(pending), len(pending))
+        
+        return per_request
+    
+    def _needs_second_stage(self, predictions: Dict[str, float], first_stage: str) -> bool:
+        """A first-stage score inside the uncertainty band (or missing) escalates."""
+        score = predictions.get(first_stage)
+        if score is None:
+            return True
+        low, high = self._uncertainty_band
+        return low <= score <= high
+    
+    def _record_staging(self, first_stage_only: int, escalated: int):
+        with self._staging_lock:
+            self._first_stage_only += first_stage_only
+            self._escalated += escalated
+    
+    def _get_batch_predictions(
+        self,
+        model_name: str,
+        waveforms: List[torch.Tensor],
+        local_models: Optional[Dict[str, BaseLocalAntiSpoofModel]] = None
+    ) -> List[dict]:
+        """Get predictions from a single model (of the given replica) for a batch of waveforms."""
+        if local_models is None:
+            local_models = self._local_models
+        local_model = local_models.get(model_name)
+        
+        if local_model:
+            try:
+                scores = local_model.predict_spoof_probability_batch(waveforms, self.target_sample_rate)
+                if scores is not None:
+                    return [{model_name: score} for score in scores]
+            except Exception as e:
+                logger.warning(f"{model_name} batch prediction failed: {e}")
+            return [{} for _ in waveforms]
+        
+        # SpeechBrain fallback models are scored one request at a time
+        return [self._get_model_prediction(model_name, waveform) for waveform in waveforms]
+    
     def _get_model_prediction(self, model_name: str, waveform: torch.Tensor) -> dict:
         """Get prediction from a single model (local or fallback)."""
         local_model = self._local_models.get(model_name)
@@ -307,21 +479,11 @@ class SpoofDetectorAdapter:
         
         return {}
     
-    def _preprocess_audio(self, audio_data: bytes) -> torch.Tensor:
-        """Convert audio bytes to tensor format required by models."""
+    def _preprocess_audio(self, sample: AudioSample) -> torch.Tensor:
+        """Get the (1, samples) tensor required by models from the shared decoded buffer."""
         try:
-            # Convert bytes to audio
-            audio_io = io.BytesIO(audio_data)
-            waveform, sample_rate = torchaudio.load(audio_io)
-            
-            # Resample if needed
-            if sample_rate != self.target_sample_rate:
-                resampler = torchaudio.transforms.Resample(sample_rate, self.target_sample_rate)
-                waveform = resampler(waveform)
-            
-            # Convert to mono if stereo
-            if waveform.shape[0] > 1:
-                waveform = torch.mean(waveform, dim=0, keepdim=True)
+            # Speech frames only (VAD); zero-copy when nothing is trimmed
+            waveform = readonly_tensor(sample.model_input(self.max_speech_sec)).unsqueeze(0)
             
             # Move to device
             waveform = waveform.to(self.device)
@@ -361,7 +523,11 @@ class SpoofDetectorAdapter:
         return zcr.item()
     
     def _ensemble_prediction(self, predictions: Dict[str, float]) -> float:
-        """Combine predictions from multiple models using weighted average."""
+        """Combine predictions from multiple models using weighted average.
+        
+        In staged mode a confident first stage is the only prediction, so its
+        score is used as is.
+        """
         weighted_sum = 0.0
         total_weight = 0.0
         
@@ -377,14 +543,15 @@ class SpoofDetectorAdapter:
         else:
             return np.mean(list(predictions.values()))
     
-    def _fallback_spoof_detection(self, audio_data: bytes) -> float:
+    def _fallback_spoof_detection(self, audio_data: AudioInput) -> float:
         """
         Fallback spoofing detection when models are not available.
         Uses basic audio analysis for demonstration.
         """
+        mark_fallback_result("antispoof")
         
         # Create deterministic but varied results based on audio
-        hash_value = hash(audio_data) % 1000
+        hash_value = stable_audio_seed(audio_data) % 1000
         
         # Most audio should be genuine (low spoof probability)
         if hash_value < 850:  # 85% genuine
@@ -397,7 +564,7 @@ class SpoofDetectorAdapter:
             rng = np.random.default_rng(seed=hash_value)
             return rng.uniform(0.6, 1.0)  # High spoof probability
     
-    def get_spoof_details(self, audio_data: bytes) -> Dict[str, Any]:
+    def get_spoof_details(self, audio_data: AudioInput) -> Dict[str, Any]:
         """
         Get detailed spoofing analysis results from ensemble models.
         
@@ -405,20 +572,23 @@ class SpoofDetectorAdapter:
         attack type classification, and confidence metrics.
         """
         try:
-            # Get overall spoof probability
-            spoof_prob = self.detect_spoof(audio_data)
+            # Decode once for the ensemble score and the per-model breakdown
+            audio_data = as_audio_sample(audio_data)
             
-            # Get individual model scores if models are loaded
+            # Individual model scores (in the order the stages ran) and their ensemble
             individual_scores = {}
+            stage_latency_ms: Dict[str, float] = {}
             if self._models_loaded:
-                waveform = self._preprocess_audio(audio_data)
-                
-                if self._aasist_model is not None:
-                    individual_scores['aasist'] = self._predict_with_aasist(waveform)
-                if self._rawnet2_model is not None:
-                    individual_scores['rawnet2'] = self._predict_with_rawnet2(waveform)
+                individual_scores = self._score_batch(
+                    [self._preprocess_audio(audio_data)], stage_latency_ms
+                )[0]
                 # Note: resnet model removed - not implemented in current version
             
+            if individual_scores:
+                spoof_prob = self._ensemble_prediction(individual_scores)
+            else:
+                spoof_prob = self._fallback_spoof_detection(audio_data)
+            
             # Calculate confidence based on model agreement
             confidence = self._calculate_ensemble_confidence(individual_scores, spoof_prob)
             
@@ -439,7 +609,14 @@ class SpoofDetectorAdapter:
                 "models_available": {
                     "aasist": self._aasist_model is not None or "aasist" in self._local_models,
                     "rawnet2": self._rawnet2_model is not None or "rawnet2" in self._local_models
-                }
+                },
+                "model_runtimes": {
+                    name: model.runtime for name, model in self._local_models.items()
+                },
+                "staged": self._staged,
+                "stages_run": list(individual_scores),
+                "stage_latency_ms": stage_latency_ms,
+                "uncertainty_band": list(self._uncertainty_band) if self._staged else None
             }
             
         except Exception as e:
@@ -503,11 +680,11 @@ class SpoofDetectorAdapter:
         
         return attack_probs
     
-    def _generate_quality_indicators(self, audio_data: bytes) -> Dict[str, float]:
+    def _generate_quality_indicators(self, audio_data: AudioInput) -> Dict[str, float]:
         """Generate audio quality indicators for spoofing analysis."""
         try:
             # Basic audio analysis for quality indicators
-            hash_seed = hash(audio_data) % 1000
+            hash_seed = stable_audio_seed(audio_data) % 1000
             rng = np.random.default_rng(seed=hash_seed)
             
             # Simulate quality analysis
@@ -529,10 +706,41 @@ class SpoofDetectorAdapter:
                 "frequency_distribution": 0.8
             }
     
+    def get_batching_stats(self) -> Optional[Dict[str, Any]]:
+        """Get request coalescing statistics (None when batching is disabled)."""
+        return self._batcher.get_stats() if self._batcher else None
+    
+    def get_staging_stats(self) -> Dict[str, Any]:
+        """How many requests the first stage settled alone vs escalated."""
+        with self._staging_lock:
+            total = self._first_stage_only + self._escalated
+            return {
+                "staged": self._staged,
+                "stage_order": list(self._stage_order),
+                "uncertainty_band": list(self._uncertainty_band),
+                "first_stage_only": self._first_stage_only,
+                "escalated": self._escalated,
+                "escalation_rate": self._escalated / total if total else 0.0
+            }
+    
+    def get_replica_stats(self) -> Optional[Dict[str, Any]]:
+        """Get replica pool checkout statistics (None when the models are not loaded)."""
+        return self._replicas.get_stats() if self._replicas else None
+    
+    def close(self):
+        """Stop the batching worker. Call this on application shutdown."""
+        if self._batcher is not None:
+            self._batcher.close()
+            self._batcher = None
+    
     def get_model_id(self) -> int:
         """Get model ID for audit trail."""
         return self._model_id
     
+    def is_model_loaded(self) -> bool:
+        """Whether inference runs on the real model (False when it falls back to the mock)."""
+        return self._models_loaded
+    
     def get_model_name(self) -> str:
         """Get model name."""
         return self._model_name
@@ -1,27 +1,60 @@
 """Voice Biometric Engine Facade - main interface for biometric processing."""
 
 import asyncio
+import contextvars
+import logging
+import os
 import numpy as np
 from concurrent.futures import ThreadPoolExecutor
-from typing import Optional
+from typing import List, Optional, Tuple
 from dataclasses import dataclass
 
 from .SpeakerEmbeddingAdapter import SpeakerEmbeddingAdapter
 from .SpoofDetectorAdapter import SpoofDetectorAdapter
 from .ASRAdapter import ASRAdapter
+from .audio_sample import AudioInput, AudioSample, as_audio_sample, normalize_format, sniff_format
+from .audio_validation import AudioValidationError, check_audio_limits, check_signal_quality, check_upload
+from .resource_governor import get_resource_governor
+from .result_cache import (
+    InferenceResultCache,
+    RESULT_EMBEDDING,
+    RESULT_SPOOF,
+    RESULT_TRANSCRIPT,
+    phrase_result_kind,
+    track_fallbacks,
+)
+from ...shared.constants.biometric_constants import TRANSCRIPT_PHRASE_MATCH_THRESHOLD
 from ...shared.types.common_types import VoiceEmbedding
+from ...shared.phrase_matching import phrase_similarity
+from ...shared.stage_timing import (
+    STAGE_ASR,
+    STAGE_EMBED,
+    STAGE_INFERENCE,
+    STAGE_PREPROCESS,
+    STAGE_SPOOF,
+    STAGE_VALIDATE,
+    timed_stage,
+)
+
+logger = logging.getLogger(__name__)
+
+# Reasons reported when the cascade stops early
+SHORT_CIRCUIT_LOW_SIMILARITY = "low_similarity"
+SHORT_CIRCUIT_SPOOF = "spoof_detected"
 
 
 @dataclass
 class BiometricAnalysisResult:
     """Result of complete biometric analysis."""
     similarity: float
-    spoof_probability: float
+    spoof_probability: Optional[float]  # None when the cascade skipped anti-spoofing
     phrase_match: float
     phrase_ok: bool
     speaker_model_id: Optional[int] = None
     antispoof_model_id: Optional[int] = None
     asr_model_id: Optional[int] = None
+    short_circuited: bool = False
+    short_circuit_reason: Optional[str] = None
 
 
 class VoiceBiometricEngineFacade:
@@ -29,24 +62,86 @@ class VoiceBiometricEngineFacade:
     Facade that coordinates all biometric processing components.
     Provides a unified interface for voice analysis, hiding the complexity
     of individual adapters.
+    
+    Cascade mode: when a reference embedding is given, the speaker model
+    runs first and an attempt whose similarity is more than
+    ``reject_margin`` below ``similarity_threshold`` is rejected without
+    running anti-spoofing or ASR. With ``spoof_skip_asr_threshold`` set,
+    ASR is also skipped when the spoof probability reaches it. Impostor
+    and noise traffic then costs one model instead of three.
+    
+    Result cache: each model output is cached under the digest of the
+    decoded audio and the model id/version, so a retried or re-submitted
+    upload is answered without inference. ``bypass_cache=True`` skips the
+    lookup and stores the fresh result.
+    
+    Phrase scoring: when the expected phrase is passed in, ASR aligns that
+    phrase against the model's CTC emissions instead of transcribing freely
+    and comparing strings (``phrase_scoring=False`` restores the latter).
+    
+    Latency: the async API records decode, preprocess and per-model stages
+    into the request's ``StageTimer`` (see ``shared.stage_timing``).
     """
     
     def __init__(
         self,
         speaker_adapter: SpeakerEmbeddingAdapter,
         spoof_adapter: SpoofDetectorAdapter,
-        asr_adapter: ASRAdapter
+        asr_adapter: ASRAdapter,
+        max_workers: int = 3,
+        cascade: Optional[bool] = None,
+        similarity_threshold: Optional[float] = None,
+        reject_margin: Optional[float] = None,
+        spoof_skip_asr_threshold: Optional[float] = None,
+        cache_size: Optional[int] = None,
+        cache_ttl_sec: Optional[float] = None,
+        phrase_scoring: Optional[bool] = None
     ):
         self._speaker_adapter = speaker_adapter
         self._spoof_adapter = spoof_adapter
         self._asr_adapter = asr_adapter
-        # Reusable thread pool for parallel model inference (prevents memory leak)
-        self._executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="biometric_")
+        # Reusable thread pool for parallel model inference (prevents memory leak).
+        # With the process-pool backend these threads only wait on worker results.
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="biometric_")
+        
+        # Cascade configuration
+        # Priority: parameter > env var > default
+        if cascade is None:
+            cascade = os.getenv("CASCADE_ENABLED", "false").lower() in ("1", "true", "yes")
+        if similarity_threshold is None:
+            similarity_threshold = float(os.getenv("SIMILARITY_THRESHOLD", "0.60"))
+        if reject_margin is None:
+            reject_margin = float(os.getenv("CASCADE_REJECT_MARGIN", "0.20"))
+        if spoof_skip_asr_threshold is None and os.getenv("CASCADE_SPOOF_SKIP_ASR"):
+            spoof_skip_asr_threshold = float(os.getenv("CASCADE_SPOOF_SKIP_ASR"))
+        self._cascade = cascade
+        self._reject_below = similarity_threshold - reject_margin
+        self._spoof_skip_asr_threshold = spoof_skip_asr_threshold
+        
+        # Cascade counters
+        self._cascade_attempts = 0
+        self._short_circuits = {SHORT_CIRCUIT_LOW_SIMILARITY: 0, SHORT_CIRCUIT_SPOOF: 0}
+        
+        # Content-addressed result cache (0 entries disables it)
+        # Priority: parameter > env var > default
+        if cache_size is None:
+            cache_size = int(os.getenv("RESULT_CACHE_SIZE", "256"))
+        if cache_ttl_sec is None:
+            cache_ttl_sec = float(os.getenv("RESULT_CACHE_TTL_SEC", "300"))
+        self._result_cache = InferenceResultCache(cache_size, cache_ttl_sec, name="biometric_results")
+        
+        # Priority: parameter > env var > default
+        if phrase_scoring is None:
+            phrase_scoring = os.getenv("ASR_PHRASE_SCORING", "true").lower() in ("1", "true", "yes")
+        self._phrase_scoring = phrase_scoring
     
     def close(self):
         """Close the executor and release resources. Call this on application shutdown."""
         if hasattr(self, '_executor') and self._executor:
             self._executor.shutdown(wait=True)
+        self._speaker_adapter.close()
+        self._spoof_adapter.close()
+        self._asr_adapter.close()
     
     def __del__(self):
         """Cleanup resources when the object is destroyed."""
@@ -58,10 +153,11 @@ class VoiceBiometricEngineFacade:
     
     def analyze_voice(
         self,
-        audio_data: bytes,
+        audio_data: AudioInput,
         audio_format: str,
         reference_embedding: VoiceEmbedding,
-        expected_phrase: Optional[str] = None
+        expected_phrase: Optional[str] = None,
+        bypass_cache: bool = False
     ) -> BiometricAnalysisResult:
         """
         Perform complete voice biometric analysis.
@@ -70,124 +166,449 @@ class VoiceBiometricEngineFacade:
         a comprehensive analysis of the voice sample.
         """
         
+        # Decode once; every adapter reads the same buffer
+        audio_data = as_audio_sample(audio_data, audio_format)
+        
         # 1. Extract speaker embedding
-        current_embedding = self._speaker_adapter.extract_embedding(
-            audio_data, audio_format
-        )
+        current_embedding = self._embed_cached(audio_data, bypass_cache)
         
         # 2. Calculate similarity with reference
         similarity = self._calculate_similarity(current_embedding, reference_embedding)
         
-        # 3. Detect spoofing/deepfake
-        spoof_probability = self._spoof_adapter.detect_spoof(audio_data)
-        
-        # 4. Perform speech recognition and phrase matching
-        phrase_match = 0.0
-        phrase_ok = True
-        
-        if expected_phrase:
-            recognized_text = self._asr_adapter.transcribe(audio_data)
-            phrase_match = self._calculate_phrase_similarity(expected_phrase, recognized_text)
-            phrase_ok = phrase_match >= 0.7  # Threshold for phrase acceptance
-        
-        return BiometricAnalysisResult(
+        result = BiometricAnalysisResult(
             similarity=similarity,
-            spoof_probability=spoof_probability,
-            phrase_match=phrase_match,
-            phrase_ok=phrase_ok,
+            spoof_probability=None,
+            phrase_match=0.0,
+            phrase_ok=False,
             speaker_model_id=self._speaker_adapter.get_model_id(),
             antispoof_model_id=self._spoof_adapter.get_model_id(),
             asr_model_id=self._asr_adapter.get_model_id()
         )
+        
+        if self._check_similarity_cascade(similarity):
+            result.short_circuited = True
+            result.short_circuit_reason = SHORT_CIRCUIT_LOW_SIMILARITY
+            return result
+        
+        # 3. Detect spoofing/deepfake
+        result.spoof_probability = self._detect_spoof_cached(audio_data, bypass_cache)
+        
+        if self._check_spoof_cascade(result.spoof_probability):
+            result.short_circuited = True
+            result.short_circuit_reason = SHORT_CIRCUIT_SPOOF
+            return result
+        
+        # 4. Perform speech recognition and phrase matching
+        result.phrase_ok = True
+        if expected_phrase:
+            _, phrase = self._recognize_cached(audio_data, expected_phrase, bypass_cache)
+            result.phrase_match = phrase["phrase_match"]
+            result.phrase_ok = result.phrase_match >= self._phrase_threshold(phrase)
+        
+        return result
     
     def extract_embedding_only(
         self,
-        audio_data: bytes,
-        audio_format: str
+        audio_data: AudioInput,
+        audio_format: str,
+        bypass_cache: bool = False
     ) -> VoiceEmbedding:
         """Extract only speaker embedding (for enrollment)."""
-        return self._speaker_adapter.extract_embedding(audio_data, audio_format)
+        return self._embed_cached(as_audio_sample(audio_data, audio_format), bypass_cache)
     
     def extract_features(
         self,
-        audio_data: bytes,
-        audio_format: str
+        audio_data: AudioInput,
+        audio_format: str,
+        reference_embedding: Optional[VoiceEmbedding] = None,
+        bypass_cache: bool = False,
+        expected_phrase: Optional[str] = None
     ) -> dict:
         """
         Extract biometric features (embedding and anti-spoofing score).
+        
+        With a reference embedding and cascade mode enabled, later models
+        are skipped once the attempt is clearly rejected.
         """
+        audio_data = as_audio_sample(audio_data, audio_format)
+        
         # 1. Extract speaker embedding
-        embedding = self._speaker_adapter.extract_embedding(audio_data, audio_format)
+        embedding = self._embed_cached(audio_data, bypass_cache)
+        
+        similarity = None
+        if reference_embedding is not None:
+            similarity = self._calculate_similarity(embedding, reference_embedding)
+            if self._check_similarity_cascade(similarity):
+                return self._features(embedding, similarity, reason=SHORT_CIRCUIT_LOW_SIMILARITY)
         
         # 2. Detect spoofing
-        spoof_prob = self._spoof_adapter.detect_spoof(audio_data)
+        spoof_prob = self._detect_spoof_cached(audio_data, bypass_cache)
+        if similarity is not None and self._check_spoof_cascade(spoof_prob):
+            return self._features(embedding, similarity, spoof_prob, reason=SHORT_CIRCUIT_SPOOF)
         
-        # 3. Transcribe audio (ASR)
-        transcribed_text = self._asr_adapter.transcribe(audio_data)
+        # 3. Transcribe audio or score the expected phrase (ASR)
+        transcribed_text, phrase = self._recognize_cached(audio_data, expected_phrase, bypass_cache)
         
+        return self._features(embedding, similarity, spoof_prob, transcribed_text, phrase=phrase)
+    
+    # ------------------------------------------------------------------
+    # Result cache helpers shared by the sync and async paths.
+    # ------------------------------------------------------------------
+    
+    def _cache_key(self, kind: str, adapter, sample: AudioSample) -> tuple:
+        return self._result_cache.make_key(
+            sample.digest, kind, adapter.get_model_id(), adapter.get_model_version()
+        )
+    
+    def _cache_lookup(self, kind: str, adapter, sample: AudioSample, bypass_cache: bool):
+        """Cached output of one model, or None on a miss, a bypass or a disabled cache."""
+        if not self._result_cache.enabled:
+            return None
+        if bypass_cache:
+            self._result_cache.record_bypass()
+            return None
+        return self._result_cache.get(self._cache_key(kind, adapter, sample))
+    
+    def _cache_store(self, kind: str, adapter, sample: AudioSample, value, fallbacks: List[str]):
+        """Store a model output; mock/heuristic fallbacks are never cached under the model's id."""
+        if not self._result_cache.enabled:
+            return
+        if fallbacks:
+            self._result_cache.record_fallback()
+            logger.debug(f"Not caching {kind} result produced by fallback ({', '.join(fallbacks)})")
+            return
+        self._result_cache.put(self._cache_key(kind, adapter, sample), value)
+    
+    def _cached_inference(self, kind: str, adapter, func, sample: AudioSample, bypass_cache: bool, *args):
+        """Run one model synchronously, answering from the cache when possible."""
+        value = self._cache_lookup(kind, adapter, sample, bypass_cache)
+        if value is None:
+            with track_fallbacks() as fallbacks:
+                value = func(sample, *args)
+            self._cache_store(kind, adapter, sample, value, fallbacks)
+        return value
+    
+    async def _cached_inference_async(self, kind: str, adapter, func, sample: AudioSample, bypass_cache: bool, *args):
+        """Like ``_cached_inference``, but hits are answered without an executor hop."""
+        value = self._cache_lookup(kind, adapter, sample, bypass_cache)
+        if value is None:
+            with track_fallbacks() as fallbacks:
+                value = await self._run_blocking(func, sample, *args)
+            self._cache_store(kind, adapter, sample, value, fallbacks)
+        return value
+    
+    def _embed_cached(self, sample: AudioSample, bypass_cache: bool = False) -> VoiceEmbedding:
+        return self._cached_inference(
+            RESULT_EMBEDDING, self._speaker_adapter, self._speaker_adapter.extract_embedding,
+            sample, bypass_cache, sample.source_format
+        )
+    
+    def _detect_spoof_cached(self, sample: AudioSample, bypass_cache: bool = False) -> float:
+        return self._cached_inference(
+            RESULT_SPOOF, self._spoof_adapter, self._spoof_adapter.detect_spoof, sample, bypass_cache
+        )
+    
+    def _transcribe_cached(self, sample: AudioSample, bypass_cache: bool = False) -> str:
+        return self._cached_inference(
+            RESULT_TRANSCRIPT, self._asr_adapter, self._asr_adapter.transcribe, sample, bypass_cache
+        )
+    
+    def _score_phrase_cached(self, sample: AudioSample, expected_phrase: str, bypass_cache: bool = False) -> dict:
+        return self._cached_inference(
+            phrase_result_kind(expected_phrase), self._asr_adapter, self._asr_adapter.score_phrase,
+            sample, bypass_cache, expected_phrase
+        )
+    
+    def _phrase_from_text(self, expected_phrase: str, recognized_text: str) -> dict:
+        """Phrase result of the transcribe-and-compare mode."""
+        return {
+            "recognized_text": recognized_text,
+            "phrase_match": self._calculate_phrase_similarity(expected_phrase, recognized_text),
+            "word_confidences": None,
+            "mode": "transcription",
+            "threshold": TRANSCRIPT_PHRASE_MATCH_THRESHOLD
+        }
+    
+    @staticmethod
+    def _phrase_threshold(phrase: dict) -> float:
+        """Pass mark for ``phrase_match``; each scoring mode has its own scale."""
+        return phrase.get("threshold", TRANSCRIPT_PHRASE_MATCH_THRESHOLD)
+    
+    def _recognize_cached(
+        self,
+        sample: AudioSample,
+        expected_phrase: Optional[str],
+        bypass_cache: bool = False
+    ) -> Tuple[str, Optional[dict]]:
+        """Transcript and, with an expected phrase, its phrase result (sync path)."""
+        if expected_phrase and self._phrase_scoring:
+            phrase = self._score_phrase_cached(sample, expected_phrase, bypass_cache)
+            return phrase["recognized_text"], phrase
+        transcribed_text = self._transcribe_cached(sample, bypass_cache)
+        if expected_phrase:
+            return transcribed_text, self._phrase_from_text(expected_phrase, transcribed_text)
+        return transcribed_text, None
+    
+    async def _recognize(
+        self,
+        sample: AudioSample,
+        expected_phrase: Optional[str],
+        bypass_cache: bool = False
+    ) -> Tuple[str, Optional[dict]]:
+        """Async counterpart of ``_recognize_cached``."""
+        if expected_phrase and self._phrase_scoring:
+            phrase = await self.score_phrase(sample, expected_phrase, bypass_cache=bypass_cache)
+            return phrase["recognized_text"], phrase
+        transcribed_text = await self.transcribe(sample, bypass_cache=bypass_cache)
+        if expected_phrase:
+            return transcribed_text, self._phrase_from_text(expected_phrase, transcribed_text)
+        return transcribed_text, None
+    
+    @staticmethod
+    def _features(
+        embedding: VoiceEmbedding,
+        similarity: Optional[float],
+        spoof_prob: Optional[float] = None,
+        transcribed_text: str = "",
+        reason: Optional[str] = None,
+        phrase: Optional[dict] = None
+    ) -> dict:
+        """Feature dictionary shared by the sync and async analysis paths."""
         return {
             "embedding": embedding,
             "anti_spoofing_score": spoof_prob,
-            "transcribed_text": transcribed_text
+            "transcribed_text": transcribed_text,
+            "phrase_match_score": phrase["phrase_match"] if phrase else None,
+            "phrase_match_threshold": VoiceBiometricEngineFacade._phrase_threshold(phrase) if phrase else None,
+            "word_confidences": phrase.get("word_confidences") if phrase else None,
+            "similarity": similarity,
+            "short_circuited": reason is not None,
+            "short_circuit_reason": reason
         }
     
+    @property
+    def cascade_enabled(self) -> bool:
+        """Whether analyses with a reference embedding may stop early."""
+        return self._cascade
+    
+    def _check_similarity_cascade(self, similarity: float) -> bool:
+        """Count a cascade attempt; True if it is hopelessly below the threshold."""
+        if not self._cascade:
+            return False
+        self._cascade_attempts += 1
+        if similarity < self._reject_below:
+            self._short_circuits[SHORT_CIRCUIT_LOW_SIMILARITY] += 1
+            logger.info(f"Cascade: similarity {similarity:.3f} < {self._reject_below:.3f}, skipping anti-spoofing and ASR")
+            return True
+        return False
+    
+    def _check_spoof_cascade(self, spoof_prob: float) -> bool:
+        """True if the spoof probability is extreme enough to skip ASR."""
+        if not self._cascade or self._spoof_skip_asr_threshold is None:
+            return False
+        if spoof_prob >= self._spoof_skip_asr_threshold:
+            self._short_circuits[SHORT_CIRCUIT_SPOOF] += 1
+            logger.info(f"Cascade: spoof probability {spoof_prob:.3f}, skipping ASR")
+            return True
+        return False
+    
     async def extract_features_parallel(
         self,
-        audio_data: bytes,
+        audio_data: AudioInput,
         audio_format: str
     ) -> dict:
+        """Deprecated alias of ``analyze`` kept for existing callers."""
+        return await self.analyze(audio_data, audio_format)
+    
+    # ------------------------------------------------------------------
+    # Async API for FastAPI controllers.
+    #
+    # Every method below runs decoding and model inference on the facade's
+    # thread pool, never on the event loop thread, so a slow verification
+    # does not stall health checks, logins or challenge creation.
+    # ------------------------------------------------------------------
+    
+    async def _run_blocking(self, func, *args):
+        """Run a blocking call on the shared inference executor (with the caller's context)."""
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self._executor, context.run, func, *args)
+    
+    async def decode(
+        self,
+        audio_data: AudioInput,
+        audio_format: Optional[str] = None
+    ) -> AudioSample:
         """
-        Extract biometric features in parallel for faster processing.
+        Decode uploaded audio once, off the event loop.
+        
+        Oversized, too short or too long uploads are rejected from their
+        container header before decoding; noisy, clipped or silent audio
+        right after it, before any model runs.
+        
+        Raises:
+            AudioValidationError: If the audio fails validation
+            ValueError: If the audio cannot be decoded
+        """
+        if isinstance(audio_data, AudioSample):
+            return audio_data
+        audio_format = sniff_format(audio_data) or normalize_format(audio_format) or "webm"
+        with timed_stage(STAGE_VALIDATE):
+            check_upload(audio_data, audio_format)
+        return await self._run_blocking(self._decode_sample, audio_data, audio_format)
+    
+    def _decode_sample(self, audio_data: bytes, audio_format: Optional[str]) -> AudioSample:
+        """
+        Decode, validate, trim to speech and, with the cache on, hash the
+        waveform while still off the event loop (all are shared by the models).
+        """
+        sample = as_audio_sample(audio_data, audio_format)
+        with timed_stage(STAGE_VALIDATE):
+            reason = check_audio_limits(
+                sample.duration_sec, sample.original_sample_rate, sample.original_channels
+            ) or check_signal_quality(sample.signal_quality)
+        if reason:
+            raise AudioValidationError(reason)
+        with timed_stage(STAGE_PREPROCESS):
+            sample.speech_waveform
+            if self._result_cache.enabled:
+                sample.digest
+        return sample
+    
+    async def analyze(
+        self,
+        audio_data: AudioInput,
+        audio_format: str = "wav",
+        reference_embedding: Optional[VoiceEmbedding] = None,
+        bypass_cache: bool = False,
+        expected_phrase: Optional[str] = None
+    ) -> dict:
+        """
+        Extract all biometric features in parallel.
         
         Runs speaker embedding, anti-spoofing, and ASR models concurrently
-        using asyncio and a shared ThreadPoolExecutor. This reduces processing time
+        on the shared ThreadPoolExecutor. This reduces processing time
         from ~18s sequential to ~10s parallel (the time of the slowest model).
         
+        In cascade mode with a reference embedding, the embedding runs first
+        and clearly failing attempts skip the other models.
+        
         Args:
-            audio_data: Audio data as bytes
+            audio_data: Decoded AudioSample or raw audio bytes
             audio_format: Format of audio (defaults to 'wav')
+            reference_embedding: Enrolled voiceprint used by the cascade
+            bypass_cache: Recompute every result instead of reading the cache
+            expected_phrase: Phrase the user read; ASR then scores it directly
             
         Returns:
-            Dictionary with embedding, anti_spoofing_score, and transcribed_text
+            Dictionary with embedding, anti_spoofing_score, transcribed_text,
+            phrase_match_score, phrase_match_threshold and word_confidences
+            (None without a phrase),
+            similarity (None without reference) and short_circuited
         """
-        loop = asyncio.get_running_loop()  # Fixed: use get_running_loop instead of deprecated get_event_loop
-        
-        # Run all three models concurrently using shared executor
-        embedding_task = loop.run_in_executor(
-            self._executor,
-            self._speaker_adapter.extract_embedding,
-            audio_data,
-            audio_format
-        )
+        # Decode once and share the buffer with all three models
+        sample = await self.decode(audio_data, audio_format)
         
-        anti_spoof_task = loop.run_in_executor(
-            self._executor,
-            self._spoof_adapter.detect_spoof,
-            audio_data
-        )
+        with timed_stage(STAGE_INFERENCE):
+            return await self._analyze_sample(sample, reference_embedding, bypass_cache, expected_phrase)
+    
+    async def _analyze_sample(
+        self,
+        sample: AudioSample,
+        reference_embedding: Optional[VoiceEmbedding],
+        bypass_cache: bool,
+        expected_phrase: Optional[str]
+    ) -> dict:
+        """Model phase of ``analyze`` on a decoded sample."""
+        if self._cascade and reference_embedding is not None:
+            return await self._analyze_cascade(sample, reference_embedding, bypass_cache, expected_phrase)
         
-        transcription_task = loop.run_in_executor(
-            self._executor,
-            self._asr_adapter.transcribe,
-            audio_data
+        embedding, spoof_prob, (transcribed_text, phrase) = await asyncio.gather(
+            self.embed(sample, bypass_cache=bypass_cache),
+            self.detect_spoof(sample, bypass_cache=bypass_cache),
+            self._recognize(sample, expected_phrase, bypass_cache)
         )
         
-        # Wait for all tasks to complete
-        embedding, spoof_prob, transcribed_text = await asyncio.gather(
-            embedding_task,
-            anti_spoof_task,
-            transcription_task
-        )
+        similarity = None
+        if reference_embedding is not None:
+            similarity = self._calculate_similarity(embedding, reference_embedding)
+        return self._features(embedding, similarity, spoof_prob, transcribed_text, phrase=phrase)
+    
+    async def _analyze_cascade(
+        self,
+        sample: AudioSample,
+        reference_embedding: VoiceEmbedding,
+        bypass_cache: bool = False,
+        expected_phrase: Optional[str] = None
+    ) -> dict:
+        """Embedding first, then anti-spoofing and ASR only if still needed."""
+        embedding = await self.embed(sample, bypass_cache=bypass_cache)
+        similarity = self._calculate_similarity(embedding, reference_embedding)
+        if self._check_similarity_cascade(similarity):
+            return self._features(embedding, similarity, reason=SHORT_CIRCUIT_LOW_SIMILARITY)
         
-        return {
-            "embedding": embedding,
-            "anti_spoofing_score": spoof_prob,
-            "transcribed_text": transcribed_text
-        }
+        if self._spoof_skip_asr_threshold is None:
+            # Nothing depends on the spoof score: keep both models in parallel
+            spoof_prob, (transcribed_text, phrase) = await asyncio.gather(
+                self.detect_spoof(sample, bypass_cache=bypass_cache),
+                self._recognize(sample, expected_phrase, bypass_cache)
+            )
+            return self._features(embedding, similarity, spoof_prob, transcribed_text, phrase=phrase)
+        
+        spoof_prob = await self.detect_spoof(sample, bypass_cache=bypass_cache)
+        if self._check_spoof_cascade(spoof_prob):
+            return self._features(embedding, similarity, spoof_prob, reason=SHORT_CIRCUIT_SPOOF)
+        
+        transcribed_text, phrase = await self._recognize(sample, expected_phrase, bypass_cache)
+        return self._features(embedding, similarity, spoof_prob, transcribed_text, phrase=phrase)
+    
+    async def embed(
+        self,
+        audio_data: AudioInput,
+        audio_format: str = "wav",
+        bypass_cache: bool = False
+    ) -> VoiceEmbedding:
+        """Extract only the speaker embedding (for enrollment)."""
+        sample = await self.decode(audio_data, audio_format)
+        with timed_stage(STAGE_EMBED):
+            return await self._cached_inference_async(
+                RESULT_EMBEDDING, self._speaker_adapter, self._speaker_adapter.extract_embedding,
+                sample, bypass_cache, sample.source_format
+            )
+    
+    async def detect_spoof(self, audio_data: AudioInput, bypass_cache: bool = False) -> float:
+        """Get the anti-spoofing probability (0.0 = genuine, 1.0 = spoofed)."""
+        sample = await self.decode(audio_data)
+        with timed_stage(STAGE_SPOOF):
+            return await self._cached_inference_async(
+                RESULT_SPOOF, self._spoof_adapter, self._spoof_adapter.detect_spoof, sample, bypass_cache
+            )
+    
+    async def transcribe(self, audio_data: AudioInput, bypass_cache: bool = False) -> str:
+        """Transcribe the utterance with the ASR model."""
+        sample = await self.decode(audio_data)
+        with timed_stage(STAGE_ASR):
+            return await self._cached_inference_async(
+                RESULT_TRANSCRIPT, self._asr_adapter, self._asr_adapter.transcribe, sample, bypass_cache
+            )
+    
+    async def score_phrase(
+        self,
+        audio_data: AudioInput,
+        expected_phrase: str,
+        bypass_cache: bool = False
+    ) -> dict:
+        """Score the utterance against the expected phrase (CTC forced alignment)."""
+        sample = await self.decode(audio_data)
+        with timed_stage(STAGE_ASR):
+            return await self._cached_inference_async(
+                phrase_result_kind(expected_phrase), self._asr_adapter, self._asr_adapter.score_phrase,
+                sample, bypass_cache, expected_phrase
+            )
     
     def validate_audio_quality(
         self,
-        audio_data: bytes,
+        audio_data: AudioInput,
         audio_format: str
     ) -> dict:
         """Validate audio quality for enrollment/verification."""
@@ -207,21 +628,11 @@ class VoiceBiometricEngineFacade:
         similarity = np.dot(norm1, norm2)
         
         # Clamp to [0, 1] and return
-        return max(0.0, min(1.0, similarity))
+        return float(max(0.0, min(1.0, similarity)))
     
     def _calculate_phrase_similarity(self, expected: str, recognized: str) -> float:
         """Calculate similarity between expected and recognized phrases."""
-        # Simple word-based similarity (in production, use more sophisticated NLP)
-        expected_words = set(expected.lower().split())
-        recognized_words = set(recognized.lower().split())
-        
-        if not expected_words:
-            return 1.0 if not recognized_words else 0.0
-        
-        intersection = expected_words.intersection(recognized_words)
-        union = expected_words.union(recognized_words)
-        
-        return len(intersection) / len(union) if union else 0.0
+        return phrase_similarity(expected, recognized)
     
     def get_engine_info(self) -> dict:
         """Get information about loaded models."""
@@ -229,16 +640,49 @@ class VoiceBiometricEngineFacade:
             "speaker_model": {
                 "id": self._speaker_adapter.get_model_id(),
                 "name": self._speaker_adapter.get_model_name(),
-                "version": self._speaker_adapter.get_model_version()
+                "version": self._speaker_adapter.get_model_version(),
+                "batching": self._speaker_adapter.get_batching_stats(),
+                "replicas": self._speaker_adapter.get_replica_stats()
             },
             "antispoof_model": {
                 "id": self._spoof_adapter.get_model_id(),
                 "name": self._spoof_adapter.get_model_name(),
-                "version": self._spoof_adapter.get_model_version()
+                "version": self._spoof_adapter.get_model_version(),
+                "batching": self._spoof_adapter.get_batching_stats(),
+                "replicas": self._spoof_adapter.get_replica_stats()
             },
             "asr_model": {
                 "id": self._asr_adapter.get_model_id(),
                 "name": self._asr_adapter.get_model_name(),
-                "version": self._asr_adapter.get_model_version()
-            }
-        }
\ No newline at end of file
+                "version": self._asr_adapter.get_model_version(),
+                "batching": self._asr_adapter.get_batching_stats(),
+                "replicas": self._asr_adapter.get_replica_stats()
+            },
+            "cascade": self.get_cascade_stats(),
+            "phrase_scoring": self._phrase_scoring,
+            "result_cache": self.get_cache_stats(),
+            "cpu_governor": self.get_cpu_allocation()
+        }
+    
+    def get_cpu_allocation(self) -> Optional[dict]:
+        """Thread budgets of each model, or None without the CPU governor."""
+        governor = get_resource_governor()
+        return governor.get_allocation() if governor is not None else None
+    
+    def get_cascade_stats(self) -> dict:
+        """Cascade configuration and how often it stopped early."""
+        return {
+            "enabled": self._cascade,
+            "reject_below_similarity": self._reject_below,
+            "spoof_skip_asr_threshold": self._spoof_skip_asr_threshold,
+            "attempts": self._cascade_attempts,
+            "short_circuited": dict(self._short_circuits)
+        }
+    
+    def get_cache_stats(self) -> dict:
+        """Result cache hit/miss statistics."""
+        return self._result_cache.get_stats()
+    
+    def clear_cache(self):
+        """Drop every cached result (e.g. after replacing a model)."""
+        self._result_cache.clear()
@@ -2,12 +2,16 @@
 Audio Converter Utility
 Converts audio from various formats (WebM, MP3, etc.) to WAV format
 for processing with SpeechBrain ECAPA-TDNN model.
+
+Inference does not go through WAV bytes any more (``AudioSample.from_bytes``
+decodes straight to an array, see ``audio_decoding``); this module is kept
+for callers that need a WAV file, and uses the same in-process decoders.
 """
 
-import io
 import logging
 from typing import Optional
-from pydub import AudioSegment
+
+from .audio_sample import AudioSample
 
 logger = logging.getLogger(__name__)
 
@@ -43,19 +47,8 @@ class AudioConverter:
             
             logger.info(f"Converting audio from {format_lower} to WAV")
             
-            # Load audio from bytes
-            audio_io = io.BytesIO(audio_bytes)
-            audio = AudioSegment.from_file(audio_io, format=format_lower)
-            
-            # Convert to WAV with optimal settings for speech recognition
-            audio = audio.set_frame_rate(16000)
-            audio = audio.set_channels(1)
-            audio = audio.set_sample_width(2)  # 16 bits
-            
-            # Export to WAV format
-            wav_io = io.BytesIO()
-            audio.export(wav_io, format="wav")
-            wav_bytes = wav_io.getvalue()
+            # Decode in-process, then encode 16 kHz mono 16-bit PCM
+            wav_bytes = AudioSample.from_bytes(audio_bytes, format_lower).to_wav_bytes()
             
             logger.info(f"Converted audio: {len(audio_bytes)} -> {len(wav_bytes)} bytes")
             return wav_bytes
@@ -0,0 +1,257 @@
+"""
+In-process decoding of uploaded audio.
+
+Uploads used to be converted by pydub, which starts one ffmpeg process per
+call and writes a WAV byte string that was then parsed again. The decoders
+here return the mono float32 waveform directly:
+
+- WAV, FLAC and Ogg (Vorbis/Opus) are read by libsndfile (``soundfile``) in
+  the calling thread; PCM WAV also decodes without it (``wave`` module);
+- WebM/Opus, MP3 and M4A are decoded in-process by PyAV (FFmpeg's libraries)
+  when it is installed, resampled to 16 kHz mono on the way out;
+- otherwise they go through a pool of pre-started ffmpeg processes that
+  already wait on their stdin when an upload arrives, so a request does not
+  pay the process start-up; each process decodes one upload and a
+  replacement is started in the background (FFMPEG_DECODER_POOL_SIZE).
+
+Container decoding is timed as the ``convert`` stage, the rest as ``decode``.
+"""
+
+import io
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .audio_sample import TARGET_SAMPLE_RATE
+from ...shared.stage_timing import STAGE_CONVERT, STAGE_DECODE, timed_stage
+
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except (ImportError, OSError):  # OSError: libsndfile itself is missing
+    sf = None
+    SOUNDFILE_AVAILABLE = False
+
+try:
+    import av
+    AV_AVAILABLE = True
+except ImportError:
+    av = None
+    AV_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Formats libsndfile reads from memory
+SOUNDFILE_FORMATS = frozenset({"wav", "flac", "ogg"})
+
+DecodedAudio = Tuple[np.ndarray, int, int]  # mono float32 waveform, sample rate, original channels
+
+
+def _decode_wave_module(audio_data: bytes) -> DecodedAudio:
+    """Parse PCM WAV bytes with the standard library."""
+    with wave.open(io.BytesIO(audio_data), 'rb') as wav_file:
+        frames = wav_file.readframes(-1)
+        sample_rate = wav_file.getframerate()
+        channels = wav_file.getnchannels()
+        sample_width = wav_file.getsampwidth()
+
+    if sample_width == 1:
+        waveform = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128) / 128.0
+    elif sample_width == 2:
+        waveform = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / np.iinfo(np.int16).max
+    elif sample_width == 4:
+        waveform = np.frombuffer(frames, dtype=np.int32).astype(np.float32) / np.iinfo(np.int32).max
+    else:
+        raise ValueError(f"Unsupported sample width: {sample_width}")
+
+    # Handle multi-channel audio
+    if channels > 1:
+        waveform = waveform.reshape(-1, channels).mean(axis=1)
+
+    return waveform, sample_rate, channels
+
+
+def _decode_soundfile(audio_data: bytes) -> Optional[DecodedAudio]:
+    """Decode with libsndfile; None if it cannot read this upload."""
+    if not SOUNDFILE_AVAILABLE:
+        return None
+    try:
+        frames, sample_rate = sf.read(io.BytesIO(audio_data), dtype="float32", always_2d=True)
+    except (RuntimeError, TypeError, ValueError) as e:
+        logger.debug(f"libsndfile could not decode the upload: {e}")
+        return None
+    channels = frames.shape[1]
+    waveform = frames[:, 0] if channels == 1 else frames.mean(axis=1)
+    return waveform, sample_rate, channels
+
+
+def _decode_av(audio_data: bytes) -> DecodedAudio:
+    """Decode any FFmpeg-supported container in-process, resampled to 16 kHz mono."""
+    chunks = []
+    with av.open(io.BytesIO(audio_data), mode="r") as container:
+        if not container.streams.audio:
+            raise ValueError("No audio stream in upload")
+        stream = container.streams.audio[0]
+        channels = stream.codec_context.channels
+        resampler = av.AudioResampler(format="flt", layout="mono", rate=TARGET_SAMPLE_RATE)
+        for frame in container.decode(stream):
+            for resampled in resampler.resample(frame):
+                chunks.append(resampled.to_ndarray().reshape(-1))
+        # Flush the samples buffered by the resampler
+        for resampled in resampler.resample(None):
+            chunks.append(resampled.to_ndarray().reshape(-1))
+
+    if not chunks:
+        raise ValueError("No audio decoded")
+    return np.concatenate(chunks), TARGET_SAMPLE_RATE, channels
+
+
+class FFmpegDecoderPool:
+    """
+    Pre-started ffmpeg processes, each decoding one upload from stdin to
+    16 kHz mono float32 PCM on stdout.
+
+    Args:
+        size: Idle processes kept ready.
+        ffmpeg_path: ffmpeg binary; defaults to FFMPEG_PATH, then PATH.
+        timeout_sec: Maximum time to decode one upload.
+    """
+
+    def __init__(self, size: int = 2, ffmpeg_path: Optional[str] = None, timeout_sec: float = 30.0):
+        self._ffmpeg_path = ffmpeg_path or os.getenv("FFMPEG_PATH") or shutil.which("ffmpeg")
+        if not self._ffmpeg_path:
+            raise ValueError("ffmpeg (or PyAV) is required to decode compressed audio")
+        self.size = max(0, size)
+        self._timeout_sec = timeout_sec
+        self._idle: "queue.Queue[subprocess.Popen]" = queue.Queue()
+        self._spawner = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ffmpeg_spawner")
+        self._closed = False
+        for _ in range(self.size):
+            self._idle.put(self._spawn())
+
+    def _spawn(self) -> subprocess.Popen:
+        return subprocess.Popen(
+            [
+                self._ffmpeg_path, "-hide_banner", "-loglevel", "error",
+                "-i", "pipe:0",
+                "-f", "f32le", "-ac", "1", "-ar", str(TARGET_SAMPLE_RATE), "pipe:1"
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+
+    def _refill(self):
+        if not self._closed and self._idle.qsize() < self.size:
+            self._idle.put(self._spawn())
+
+    def _take(self) -> subprocess.Popen:
+        """An idle process, or a new one when the pool is exhausted."""
+        while True:
+            try:
+                process = self._idle.get_nowait()
+            except queue.Empty:
+                return self._spawn()
+            if process.poll() is None:
+                return process
+
+    def decode(self, audio_data: bytes) -> DecodedAudio:
+        process = self._take()
+        if self.size:
+            self._spawner.submit(self._refill)
+        try:
+            output, stderr = process.communicate(audio_data, timeout=self._timeout_sec)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise ValueError(f"ffmpeg did not decode the upload within {self._timeout_sec:.0f}s")
+
+        if process.returncode != 0:
+            raise ValueError(f"ffmpeg could not decode the upload: {stderr.decode(errors='replace').strip()}")
+        usable = len(output) - len(output) % 4
+        if usable == 0:
+            raise ValueError("No audio decoded")
+        # ffmpeg already downmixed; the original channel count is not reported
+        return np.frombuffer(output[:usable], dtype="<f4"), TARGET_SAMPLE_RATE, 1
+
+    def close(self):
+        self._closed = True
+        self._spawner.shutdown(wait=True)
+        while True:
+            try:
+                process = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            process.kill()
+            process.wait()
+
+
+_ffmpeg_pool: Optional[FFmpegDecoderPool] = None
+_ffmpeg_pool_lock = threading.Lock()
+
+
+def get_ffmpeg_pool() -> FFmpegDecoderPool:
+    """Process-wide ffmpeg pool, created on first use (FFMPEG_DECODER_POOL_SIZE)."""
+    global _ffmpeg_pool
+    with _ffmpeg_pool_lock:
+        if _ffmpeg_pool is None:
+            _ffmpeg_pool = FFmpegDecoderPool(size=int(os.getenv("FFMPEG_DECODER_POOL_SIZE", "2")))
+        return _ffmpeg_pool
+
+
+def _forget_ffmpeg_pool():
+    """The parent's processes and pipes are not usable from a forked child."""
+    global _ffmpeg_pool, _ffmpeg_pool_lock
+    _ffmpeg_pool = None
+    _ffmpeg_pool_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_ffmpeg_pool)
+
+
+def decode_container(audio_data: bytes) -> DecodedAudio:
+    """Decode a compressed container (WebM, MP3, M4A, ...) with PyAV or the ffmpeg pool."""
+    with timed_stage(STAGE_CONVERT):
+        if AV_AVAILABLE:
+            try:
+                return _decode_av(audio_data)
+            except Exception as e:
+                raise ValueError(f"Failed to decode audio: {e}")
+        return get_ffmpeg_pool().decode(audio_data)
+
+
+def decode_audio(audio_data: bytes, audio_format: str) -> DecodedAudio:
+    """
+    Decode an upload into a mono float32 waveform at its own sample rate.
+
+    Args:
+        audio_data: Raw upload bytes
+        audio_format: Normalized format ("wav", "webm", ...)
+
+    Returns:
+        (waveform, sample_rate, original_channels)
+
+    Raises:
+        ValueError: If the audio cannot be decoded
+    """
+    if audio_format in SOUNDFILE_FORMATS:
+        with timed_stage(STAGE_DECODE):
+            decoded = _decode_soundfile(audio_data)
+            if decoded is None and audio_format == "wav":
+                try:
+                    decoded = _decode_wave_module(audio_data)
+                except (wave.Error, EOFError) as e:
+                    raise ValueError(f"Failed to decode wav audio: {str(e)}")
+        if decoded is not None:
+            return decoded
+    # Compressed containers, and Ogg/FLAC variants libsndfile cannot read
+    return decode_container(audio_data)
@@ -10,15 +10,66 @@ Key Features:
 - Spectral Artifacts: Synthetic audio has frequency domain artifacts
 - Background Noise: Genuine recordings have natural ambient noise
 - Pitch Stability: Cloned audio has overly stable pitch
+
+All features of a clip share one ``FeatureFrames`` bundle: the 25 ms frame
+matrix and the 2048-point magnitude spectrogram are computed once and reused
+by every feature. ``extract_features_batch`` runs whole datasets on a thread
+pool (the FFTs and array reductions release the GIL).
 """
 
 import numpy as np
 import librosa
-from typing import Dict, Tuple
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Spectrogram shared by the spectral and pitch features (librosa defaults)
+N_FFT = 2048
+HOP_LENGTH = 512
+
+
+class FeatureFrames:
+    """
+    Framing and spectrogram of one clip, each computed on first use and then
+    shared by every feature.
+    
+    Args:
+        audio: Audio signal as numpy array
+        sample_rate: Audio sample rate
+    """
+    
+    def __init__(self, audio: np.ndarray, sample_rate: int):
+        self.audio = np.asarray(audio)
+        self.sample_rate = sample_rate
+        self.frame_length = int(0.025 * sample_rate)  # 25ms frames
+        self.hop_length = int(0.010 * sample_rate)    # 10ms hop
+    
+    @cached_property
+    def frames(self) -> np.ndarray:
+        """(frame_length, n_frames) strided view over the audio."""
+        return librosa.util.frame(self.audio, frame_length=self.frame_length, hop_length=self.hop_length)
+    
+    @cached_property
+    def frame_energies(self) -> np.ndarray:
+        frames = self.frames
+        return np.einsum("ij,ij->j", frames, frames)
+    
+    @cached_property
+    def rms(self) -> np.ndarray:
+        return np.sqrt(self.frame_energies / self.frame_length)
+    
+    @cached_property
+    def magnitude(self) -> np.ndarray:
+        """|STFT| (1 + N_FFT/2, n_frames)."""
+        return np.abs(librosa.stft(self.audio, n_fft=N_FFT, hop_length=HOP_LENGTH))
+
+
+AudioOrFrames = Union[np.ndarray, FeatureFrames]
+
 
 class AudioFeatureExtractor:
     """
@@ -36,8 +87,14 @@ class AudioFeatureExtractor:
             sample_rate: Audio sample rate (default: 16000 Hz)
         """
         self.sample_rate = sample_rate
+    
+    def prepare(self, audio: AudioOrFrames) -> FeatureFrames:
+        """Wrap a clip in the bundle shared by its features (no-op if already wrapped)."""
+        if isinstance(audio, FeatureFrames):
+            return audio
+        return FeatureFrames(audio, self.sample_rate)
         
-    def calculate_snr(self, audio: np.ndarray) -> float:
+    def calculate_snr(self, audio: AudioOrFrames) -> float:
         """
         Calculate Signal-to-Noise Ratio (SNR).
         
@@ -53,22 +110,24 @@ class AudioFeatureExtractor:
         try:
             # Estimate signal power (using RMS of voiced segments)
             # Use top 50% energy frames as signal
-            frame_length = int(0.025 * self.sample_rate)  # 25ms frames
-            hop_length = int(0.010 * self.sample_rate)    # 10ms hop
-            
-            # Calculate frame energies
-            frames = librosa.util.frame(audio, frame_length=frame_length, hop_length=hop_length)
-            frame_energies = np.sum(frames ** 2, axis=0)
+            bundle = self.prepare(audio)
+            frame_energies = bundle.frame_energies
             
             # Signal: top 50% energy frames
             threshold = np.percentile(frame_energies, 50)
-            signal_frames = frames[:, frame_energies >= threshold]
-            signal_power = np.mean(signal_frames ** 2) if signal_frames.size > 0 else np.mean(audio ** 2)
+            signal = frame_energies >= threshold
+            signal_power = (
+                frame_energies[signal].sum() / (signal.sum() * bundle.frame_length)
+                if signal.any() else np.mean(bundle.audio ** 2)
+            )
             
             # Noise: bottom 20% energy frames (likely silence/noise)
             noise_threshold = np.percentile(frame_energies, 20)
-            noise_frames = frames[:, frame_energies <= noise_threshold]
-            noise_power = np.mean(noise_frames ** 2) if noise_frames.size > 0 else 1e-10
+            noise = frame_energies <= noise_threshold
+            noise_power = (
+                frame_energies[noise].sum() / (noise.sum() * bundle.frame_length)
+                if noise.any() else 1e-10
+            )
             
             # Avoid division by zero
             if noise_power < 1e-10:
@@ -86,7 +145,7 @@ class AudioFeatureExtractor:
             logger.warning(f"SNR calculation failed: {e}")
             return 30.0  # Default moderate SNR
     
-    def detect_spectral_artifacts(self, audio: np.ndarray) -> float:
+    def detect_spectral_artifacts(self, audio: AudioOrFrames) -> float:
         """
         Detect spectral artifacts typical of synthetic audio.
         
@@ -102,9 +161,9 @@ class AudioFeatureExtractor:
             Artifact score (0.0 = clean, 1.0 = many artifacts)
         """
         try:
-            # Compute spectrogram
-            D = librosa.stft(audio, n_fft=2048, hop_length=512)
-            magnitude = np.abs(D)
+            # Shared spectrogram
+            bundle = self.prepare(audio)
+            magnitude = bundle.magnitude
             
             # 1. Check for abrupt high-frequency cutoff
             # Genuine speech has energy up to ~8kHz, synthetic often cuts off earlier
@@ -130,7 +189,7 @@ class AudioFeatureExtractor:
             
             # 2. Check spectral flatness (how "noisy" vs "tonal")
             # Synthetic audio tends to be more tonal (lower flatness)
-            spectral_flatness = librosa.feature.spectral_flatness(y=audio, n_fft=2048, hop_length=512)
+            spectral_flatness = librosa.feature.spectral_flatness(S=magnitude)
             avg_flatness = np.mean(spectral_flatness)
             
             # Genuine speech: 0.05-0.15, Synthetic: often < 0.05
@@ -158,7 +217,7 @@ class AudioFeatureExtractor:
             logger.warning(f"Spectral artifact detection failed: {e}")
             return 0.0  # Default: no artifacts detected
     
-    def analyze_background_noise(self, audio: np.ndarray) -> float:
+    def analyze_background_noise(self, audio: AudioOrFrames) -> float:
         """
         Analyze background noise characteristics.
         
@@ -173,11 +232,10 @@ class AudioFeatureExtractor:
         """
         try:
             # Detect silence/low-energy segments
-            frame_length = int(0.025 * self.sample_rate)
-            hop_length = int(0.010 * self.sample_rate)
+            bundle = self.prepare(audio)
             
-            # Calculate RMS energy per frame
-            rms = librosa.feature.rms(y=audio, frame_length=frame_length, hop_length=hop_length)[0]
+            # RMS energy per frame
+            rms = bundle.rms
             
             # Find low-energy frames (likely silence/background)
             threshold = np.percentile(rms, 20)  # Bottom 20%
@@ -186,19 +244,8 @@ class AudioFeatureExtractor:
             if np.sum(silence_frames_idx) == 0:
                 return 0.0  # No silence detected
             
-            # Extract audio from silence frames
-            silence_audio = []
-            for i, is_silence in enumerate(silence_frames_idx):
-                if is_silence:
-                    start = i * hop_length
-                    end = start + frame_length
-                    if end <= len(audio):
-                        silence_audio.append(audio[start:end])
-            
-            if not silence_audio:
-                return 0.0
-            
-            silence_audio = np.concatenate(silence_audio)
+            # Audio of the silence frames
+            silence_audio = bundle.frames[:, silence_frames_idx]
             
             # Measure noise characteristics
             noise_std = np.std(silence_audio)
@@ -213,7 +260,7 @@ class AudioFeatureExtractor:
             logger.warning(f"Background noise analysis failed: {e}")
             return 0.5  # Default moderate noise
     
-    def calculate_pitch_stability(self, audio: np.ndarray) -> float:
+    def calculate_pitch_stability(self, audio: AudioOrFrames) -> float:
         """
         Calculate pitch stability/variance.
         
@@ -227,27 +274,25 @@ class AudioFeatureExtractor:
             Pitch variance score (0.0 = very stable/synthetic, 1.0 = natural variation)
         """
         try:
-            # Extract pitch using librosa
+            # Extract pitch from the shared spectrogram
+            bundle = self.prepare(audio)
             pitches, magnitudes = librosa.piptrack(
-                y=audio,
+                S=bundle.magnitude,
                 sr=self.sample_rate,
+                n_fft=N_FFT,
+                hop_length=HOP_LENGTH,
                 fmin=80,   # Minimum pitch (Hz)
                 fmax=400   # Maximum pitch (Hz)
             )
             
-            # Get pitch values for frames with sufficient magnitude
-            pitch_values = []
-            for t in range(pitches.shape[1]):
-                index = magnitudes[:, t].argmax()
-                pitch = pitches[index, t]
-                if pitch > 0:  # Valid pitch
-                    pitch_values.append(pitch)
+            # Pitch of the strongest bin in each frame; 0 means unvoiced
+            strongest = magnitudes.argmax(axis=0)
+            pitch_values = pitches[strongest, np.arange(pitches.shape[1])]
+            pitch_values = pitch_values[pitch_values > 0]
             
             if len(pitch_values) < 10:
                 return 0.5  # Not enough data
             
-            pitch_values = np.array(pitch_values)
-            
             # Calculate variance
             pitch_variance = np.var(pitch_values)
             
@@ -270,26 +315,52 @@ class AudioFeatureExtractor:
             logger.warning(f"Pitch stability calculation failed: {e}")
             return 0.5  # Default moderate stability
     
-    def extract_all_features(self, audio: np.ndarray) -> Dict[str, float]:
+    def extract_all_features(self, audio: AudioOrFrames) -> Dict[str, float]:
         """
         Extract all anti-spoofing features from audio.
         
+        The clip is framed and transformed once; every feature reuses it.
+        
         Args:
             audio: Audio signal as numpy array
             
         Returns:
             Dictionary with all extracted features
         """
+        bundle = self.prepare(audio)
         features = {
-            'snr': self.calculate_snr(audio),
-            'spectral_artifacts': self.detect_spectral_artifacts(audio),
-            'background_noise': self.analyze_background_noise(audio),
-            'pitch_stability': self.calculate_pitch_stability(audio)
+            'snr': self.calculate_snr(bundle),
+            'spectral_artifacts': self.detect_spectral_artifacts(bundle),
+            'background_noise': self.analyze_background_noise(bundle),
+            'pitch_stability': self.calculate_pitch_stability(bundle)
         }
         
         logger.debug(f"Extracted features: {features}")
         return features
     
+    def extract_features_batch(
+        self,
+        clips: Sequence[np.ndarray],
+        max_workers: Optional[int] = None
+    ) -> List[Dict[str, float]]:
+        """
+        Extract all features from many clips (e.g. a whole evaluation dataset).
+        
+        Args:
+            clips: Audio signals as numpy arrays
+            max_workers: Threads to use (default: CPU count; 1 runs inline)
+            
+        Returns:
+            One feature dictionary per clip, in input order
+        """
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        max_workers = max(1, min(max_workers, len(clips)))
+        if max_workers == 1:
+            return [self.extract_all_features(clip) for clip in clips]
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="audio_features") as executor:
+            return list(executor.map(self.extract_all_features, clips))
+    
     def is_likely_cloning(self, features: Dict[str, float]) -> Tuple[bool, float, str]:
         """
         Determine if features indicate voice cloning.
@@ -0,0 +1,231 @@
+"""
+Decode-once audio representation shared across the biometric pipeline.
+
+An upload is decoded a single time at the API edge into an ``AudioSample``:
+a read-only mono float32 buffer at 16 kHz plus metadata about the original
+upload. Speaker, anti-spoofing and ASR adapters all consume the same buffer
+through zero-copy NumPy/torch views instead of re-parsing the bytes.
+"""
+
+import hashlib
+import io
+import logging
+import wave
+import warnings
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Optional, Union
+
+import numpy as np
+import torch
+
+from .audio_validation import SignalQuality, measure_signal_quality
+from .resampling import TARGET_SAMPLE_RATE, resample
+from .vad import trim_to_speech
+from ...shared.stage_timing import STAGE_DECODE, timed_stage
+
+logger = logging.getLogger(__name__)
+
+
+def readonly_tensor(array: np.ndarray) -> torch.Tensor:
+    """
+    Zero-copy tensor view over a read-only buffer. Do not modify in place.
+
+    torch warns that such views are writable; the adapters never write to
+    them, so the warning is silenced here only, not for the whole process.
+    """
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message=".*NumPy array is not writable.*")
+        return torch.from_numpy(array)
+
+
+def normalize_format(audio_format: Optional[str]) -> Optional[str]:
+    """Extract the bare format from a MIME type (e.g. "audio/webm;codecs=opus" -> "webm")."""
+    if not audio_format:
+        return None
+    format_lower = audio_format.lower()
+    if '/' in format_lower:
+        format_lower = format_lower.split('/')[1].split(';')[0]
+    if format_lower in ("wave", "x-wav"):
+        format_lower = "wav"
+    elif format_lower == "mpeg":
+        format_lower = "mp3"
+    elif format_lower in ("mp4", "x-m4a"):
+        format_lower = "m4a"
+    return format_lower
+
+
+def sniff_format(audio_data: bytes) -> Optional[str]:
+    """Detect the container format from the first bytes of the upload."""
+    header = audio_data[:12]
+    if header[:4] == b'RIFF' and header[8:12] == b'WAVE':
+        return "wav"
+    if header[:4] == b'fLaC':
+        return "flac"
+    if header[:4] == b'OggS':
+        return "ogg"
+    if header[:4] == b'\x1a\x45\xdf\xa3':
+        return "webm"
+    if header[:3] == b'ID3' or header[:2] in (b'\xff\xfb', b'\xff\xf3', b'\xff\xf2'):
+        return "mp3"
+    if header[4:8] == b'ftyp':
+        return "m4a"
+    return None
+
+
+@dataclass(frozen=True)
+class AudioSample:
+    """
+    Immutable decoded audio: mono float32 at 16 kHz plus upload metadata.
+
+    The waveform is marked read-only so the same buffer can be shared safely
+    between adapters running in parallel threads.
+    """
+    waveform: np.ndarray
+    sample_rate: int = TARGET_SAMPLE_RATE
+    source_format: str = "wav"
+    original_sample_rate: int = TARGET_SAMPLE_RATE
+    original_channels: int = 1
+    source_num_bytes: int = 0
+
+    def __post_init__(self):
+        waveform = np.ascontiguousarray(self.waveform, dtype=np.float32)
+        if waveform.ndim != 1:
+            raise ValueError(f"AudioSample waveform must be mono (1-D), got shape {waveform.shape}")
+        waveform.setflags(write=False)
+        object.__setattr__(self, "waveform", waveform)
+
+    @classmethod
+    def from_bytes(cls, audio_data: bytes, audio_format: Optional[str] = None) -> "AudioSample":
+        """
+        Decode uploaded audio bytes once into the shared representation.
+
+        Args:
+            audio_data: Raw upload bytes
+            audio_format: Extension or MIME type; sniffed from the header when omitted
+
+        Raises:
+            ValueError: If the audio is empty or cannot be decoded
+        """
+        if not audio_data:
+            raise ValueError("Empty audio data")
+
+        format_lower = sniff_format(audio_data) or normalize_format(audio_format) or "webm"
+
+        # Decoded in-process straight to a float array (no intermediate WAV)
+        from .audio_decoding import decode_audio
+        waveform, sample_rate, channels = decode_audio(audio_data, format_lower)
+
+        with timed_stage(STAGE_DECODE):
+            return cls.from_array(
+                waveform,
+                sample_rate,
+                source_format=format_lower,
+                original_channels=channels,
+                source_num_bytes=len(audio_data)
+            )
+
+    @classmethod
+    def from_array(
+        cls,
+        waveform: np.ndarray,
+        sample_rate: int,
+        source_format: str = "pcm",
+        original_channels: int = 1,
+        source_num_bytes: int = 0
+    ) -> "AudioSample":
+        """Build a sample from an already decoded mono array, resampling to 16 kHz."""
+        original_sample_rate = sample_rate
+        waveform = np.asarray(waveform, dtype=np.float32)
+        if sample_rate != TARGET_SAMPLE_RATE:
+            waveform = resample(waveform, sample_rate, TARGET_SAMPLE_RATE)
+
+        return cls(
+            waveform=waveform,
+            sample_rate=TARGET_SAMPLE_RATE,
+            source_format=source_format,
+            original_sample_rate=original_sample_rate,
+            original_channels=original_channels,
+            source_num_bytes=source_num_bytes
+        )
+
+    @property
+    def num_samples(self) -> int:
+        return int(self.waveform.shape[0])
+
+    @property
+    def duration_sec(self) -> float:
+        return self.num_samples / self.sample_rate
+
+    @cached_property
+    def digest(self) -> str:
+        """SHA-256 of the normalized waveform; stable across processes, unlike hash()."""
+        hasher = hashlib.sha256(str(self.sample_rate).encode())
+        hasher.update(self.waveform.data)
+        return hasher.hexdigest()
+
+    @cached_property
+    def speech_waveform(self) -> np.ndarray:
+        """
+        The waveform with non-speech frames dropped (read-only).
+
+        Computed once per sample and shared by every model; equals the full
+        waveform when VAD is disabled or hears no speech.
+        """
+        speech = trim_to_speech(self.waveform, self.sample_rate)
+        if speech is not self.waveform:
+            speech.setflags(write=False)
+        return speech
+
+    @property
+    def speech_duration_sec(self) -> float:
+        return len(self.speech_waveform) / self.sample_rate
+
+    @cached_property
+    def signal_quality(self) -> SignalQuality:
+        """SNR, clipping and silence ratio of the waveform, measured once per sample."""
+        return measure_signal_quality(self.waveform, self.sample_rate)
+
+    def model_input(self, max_speech_sec: Optional[float] = None) -> np.ndarray:
+        """Speech-only waveform, keeping the center ``max_speech_sec`` of longer speech."""
+        speech = self.speech_waveform
+        if max_speech_sec is not None:
+            max_samples = int(max_speech_sec * self.sample_rate)
+            if len(speech) > max_samples:
+                start = (len(speech) - max_samples) // 2
+                speech = speech[start:start + max_samples]
+        return speech
+
+    def as_tensor(self) -> torch.Tensor:
+        """Zero-copy (samples,) tensor view over the shared buffer. Do not modify in place."""
+        return readonly_tensor(self.waveform)
+
+    def to_wav_bytes(self) -> bytes:
+        """Encode as 16-bit PCM WAV (used for dataset recording, not for inference)."""
+        pcm = (np.clip(self.waveform, -1.0, 1.0) * np.iinfo(np.int16).max).astype(np.int16)
+        wav_io = io.BytesIO()
+        with wave.open(wav_io, 'wb') as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(self.sample_rate)
+            wav_file.writeframes(pcm.tobytes())
+        return wav_io.getvalue()
+
+
+AudioInput = Union[bytes, AudioSample]
+
+
+def stable_audio_seed(audio_data: AudioInput) -> int:
+    """Deterministic 32-bit seed for the mock/fallback paths (same audio, same result)."""
+    if isinstance(audio_data, AudioSample):
+        digest = audio_data.digest
+    else:
+        digest = hashlib.sha256(audio_data).hexdigest()
+    return int(digest[:8], 16)
+
+
+def as_audio_sample(audio_data: AudioInput, audio_format: Optional[str] = None) -> AudioSample:
+    """Return the input unchanged if already decoded, otherwise decode it once."""
+    if isinstance(audio_data, AudioSample):
+        return audio_data
+    return AudioSample.from_bytes(audio_data, audio_format)
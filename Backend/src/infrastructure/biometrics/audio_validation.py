@@ -0,0 +1,346 @@
+"""
+Fast validation of uploaded audio, before any model runs.
+
+Two cheap stages reject bad uploads:
+
+1. ``check_upload`` reads only the container header (WAV ``fmt``/``data``
+   chunks, FLAC STREAMINFO, the Ogg Vorbis/Opus identification header and
+   last granule position, WebM ``Info``/``Tracks`` elements) and rejects
+   empty, oversized, too short or too long uploads without decoding them.
+   Formats or files whose header does not state the duration (MP3, M4A,
+   WebM from MediaRecorder) are checked again after decoding.
+2. ``measure_signal_quality`` computes the SNR, clipping ratio and
+   silence ratio of the decoded buffer from 30 ms frame energies (the VAD's
+   vectorized framing) in a few milliseconds, and ``check_signal_quality`` compares them with the
+   AUDIO_MIN_SNR_DB, AUDIO_MAX_CLIPPING_RATIO and AUDIO_MAX_SILENCE_RATIO
+   limits.
+"""
+
+import logging
+import os
+import struct
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
+
+import numpy as np
+
+from .vad import frame_length, frame_levels_db, speech_frame_mask
+from ...shared.constants.biometric_constants import (
+    MAX_AUDIO_DURATION_SEC,
+    MAX_AUDIO_SIZE_BYTES,
+    MIN_AUDIO_DURATION_SEC,
+)
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_FORMATS = ("wav", "mp3", "flac", "m4a", "webm", "ogg")
+
+# |sample| at or above this counts as clipped
+CLIPPING_LEVEL = 0.999
+
+# SNR reported when there is no noise to measure (digital silence)
+MAX_SNR_DB = 100.0
+
+_EPS = 1e-10
+
+
+class AudioValidationError(ValueError):
+    """The upload was rejected by validation (not a decoding failure)."""
+
+
+@dataclass(frozen=True)
+class AudioHeader:
+    """What the container header says about an upload (None: not stated)."""
+    format: str
+    duration_sec: Optional[float] = None
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+
+
+# ----------------------------------------------------------------------
+# Header probing
+# ----------------------------------------------------------------------
+
+def _probe_wav(data: bytes, partial: bool) -> AudioHeader:
+    pos, fmt = 12, None
+    while pos + 8 <= len(data):
+        chunk_id = data[pos:pos + 4]
+        size = int.from_bytes(data[pos + 4:pos + 8], "little")
+        body = pos + 8
+        if chunk_id == b"fmt " and size >= 16:
+            fmt = struct.unpack_from("<HHII", data, body)
+        elif chunk_id == b"data" and fmt is not None:
+            _, channels, sample_rate, byte_rate = fmt
+            # Streamed WAVs leave the size at 0 or 0xFFFFFFFF
+            declared = size not in (0, 0xFFFFFFFF)
+            if not declared or (body + size > len(data) and not partial):
+                size = None if partial else len(data) - body
+            duration = size / byte_rate if byte_rate and size is not None else None
+            return AudioHeader("wav", duration, sample_rate, channels)
+        pos = body + size + (size & 1)
+    return AudioHeader("wav")
+
+
+def _probe_flac(data: bytes, partial: bool) -> AudioHeader:
+    # STREAMINFO is always the first metadata block
+    if len(data) < 26 or data[4] & 0x7F != 0:
+        return AudioHeader("flac")
+    packed = int.from_bytes(data[18:26], "big")
+    sample_rate = packed >> 44
+    channels = ((packed >> 41) & 0x7) + 1
+    total_samples = packed & ((1 << 36) - 1)
+    duration = total_samples / sample_rate if total_samples and sample_rate else None
+    return AudioHeader("flac", duration, sample_rate or None, channels)
+
+
+def _probe_ogg(data: bytes, partial: bool) -> AudioHeader:
+    segments = data[26]
+    packet = data[27 + segments:27 + segments + 19]
+    if packet.startswith(b"\x01vorbis"):
+        channels, sample_rate = packet[11], int.from_bytes(packet[12:16], "little")
+        granule_rate, pre_skip = sample_rate, 0
+    elif packet.startswith(b"OpusHead"):
+        channels, sample_rate = packet[9], int.from_bytes(packet[12:16], "little")
+        # Opus granule positions always count 48 kHz samples
+        granule_rate, pre_skip = 48000, int.from_bytes(packet[10:12], "little")
+    else:
+        return AudioHeader("ogg")
+
+    duration = None
+    # The last page's granule position is the length, once the whole file is there
+    last_page = -1 if partial else data.rfind(b"OggS")
+    if last_page > 0 and last_page + 18 <= len(data) and data[last_page + 14:last_page + 18] == data[14:18]:
+        granule = int.from_bytes(data[last_page + 6:last_page + 14], "little", signed=True)
+        if granule > 0 and granule_rate:
+            duration = max(0, granule - pre_skip) / granule_rate
+    return AudioHeader("ogg", duration, sample_rate or None, channels)
+
+
+# Matroska/WebM element IDs (with their length marker bits)
+_EBML_SEGMENT = 0x18538067
+_EBML_INFO = 0x1549A966
+_EBML_TIMECODE_SCALE = 0x2AD7B1
+_EBML_DURATION = 0x4489
+_EBML_TRACKS = 0x1654AE6B
+_EBML_TRACK_ENTRY = 0xAE
+_EBML_AUDIO = 0xE1
+_EBML_SAMPLING_FREQUENCY = 0xB5
+_EBML_CHANNELS = 0x9F
+_EBML_CLUSTER = 0x1F43B675
+_EBML_MASTERS = {_EBML_SEGMENT, _EBML_INFO, _EBML_TRACKS, _EBML_TRACK_ENTRY, _EBML_AUDIO}
+
+# Segment > Tracks > TrackEntry > Audio; deeper nesting is not a real header
+_EBML_MAX_DEPTH = 4
+
+
+def _vint_length(first_byte: int) -> int:
+    if first_byte == 0:
+        raise ValueError("Invalid EBML variable-length integer")
+    return 9 - first_byte.bit_length()
+
+
+def _read_ebml_element(data: bytes, pos: int):
+    """(element id, body offset, body size or None when unknown)."""
+    id_len = _vint_length(data[pos])
+    element_id = int.from_bytes(data[pos:pos + id_len], "big")
+    pos += id_len
+    size_len = _vint_length(data[pos])
+    value_bits = 7 * size_len
+    size = int.from_bytes(data[pos:pos + size_len], "big") & ((1 << value_bits) - 1)
+    if size == (1 << value_bits) - 1:
+        size = None
+    return element_id, pos + size_len, size
+
+
+def _probe_webm(data: bytes, partial: bool) -> AudioHeader:
+    fields: Dict[str, float] = {}
+
+    def walk(pos: int, end: int, depth: int) -> bool:
+        """Read the elements in [pos, end); False once the first cluster is reached."""
+        while pos < end:
+            element_id, body, size = _read_ebml_element(data, pos)
+            stop = end if size is None else min(body + size, end)
+            if element_id == _EBML_CLUSTER:
+                return False
+            if element_id in _EBML_MASTERS:
+                if depth >= _EBML_MAX_DEPTH:
+                    raise ValueError("EBML elements nested too deeply")
+                if not walk(body, stop, depth + 1):
+                    return False
+            elif size is None:
+                return False
+            elif element_id in (_EBML_DURATION, _EBML_SAMPLING_FREQUENCY):
+                value = struct.unpack(">f" if size == 4 else ">d", data[body:stop])[0]
+                fields["duration" if element_id == _EBML_DURATION else "sample_rate"] = value
+            elif element_id in (_EBML_TIMECODE_SCALE, _EBML_CHANNELS):
+                value = int.from_bytes(data[body:stop], "big")
+                fields["timecode_scale" if element_id == _EBML_TIMECODE_SCALE else "channels"] = value
+            pos = stop
+        return True
+
+    walk(0, len(data), 0)
+    duration = None
+    if "duration" in fields:
+        duration = fields["duration"] * fields.get("timecode_scale", 1_000_000) / 1e9
+    sample_rate = int(fields["sample_rate"]) if "sample_rate" in fields else None
+    channels = int(fields["channels"]) if "channels" in fields else None
+    return AudioHeader("webm", duration, sample_rate, channels)
+
+
+_PROBES = {"wav": _probe_wav, "flac": _probe_flac, "ogg": _probe_ogg, "webm": _probe_webm}
+
+
+def probe_header(audio_data: bytes, audio_format: str, partial: bool = False) -> AudioHeader:
+    """
+    Read the duration, sample rate and channels from the container header only.
+
+    With ``partial`` the data is only the beginning of an upload still being
+    received: durations are reported only when the header declares them.
+    """
+    probe = _PROBES.get(audio_format)
+    if probe is None:
+        return AudioHeader(audio_format)
+    try:
+        return probe(audio_data, partial)
+    except (IndexError, ValueError, struct.error) as e:
+        # Truncated or unusual header: decoding will tell whether it is usable
+        logger.debug(f"Could not read the {audio_format} header: {e}")
+        return AudioHeader(audio_format)
+
+
+def check_audio_limits(
+    duration_sec: Optional[float],
+    sample_rate: Optional[int],
+    channels: Optional[int]
+) -> Optional[str]:
+    """Return the rejection reason if audio is outside the accepted limits (None: unknown)."""
+    # Check duration limits
+    if duration_sec is not None:
+        if duration_sec < MIN_AUDIO_DURATION_SEC:
+            return f"Audio too short: {duration_sec:.2f}s (min: {MIN_AUDIO_DURATION_SEC}s)"
+        if duration_sec > MAX_AUDIO_DURATION_SEC:
+            return f"Audio too long: {duration_sec:.2f}s (max: {MAX_AUDIO_DURATION_SEC}s)"
+
+    # Check channels (prefer mono)
+    if channels is not None and channels > 2:
+        return f"Too many channels: {channels}"
+
+    # Check sample rate (prefer 16kHz)
+    if sample_rate is not None and sample_rate < 8000:
+        return f"Sample rate too low: {sample_rate}Hz"
+
+    return None
+
+
+def get_max_upload_bytes() -> int:
+    """Upload size limit (AUDIO_MAX_UPLOAD_BYTES, default MAX_AUDIO_SIZE_BYTES)."""
+    return int(os.getenv("AUDIO_MAX_UPLOAD_BYTES", str(MAX_AUDIO_SIZE_BYTES)))
+
+
+def check_upload(audio_data: bytes, audio_format: str, max_bytes: Optional[int] = None) -> AudioHeader:
+    """
+    Header-only validation of an upload.
+
+    Args:
+        audio_data: Raw upload bytes
+        audio_format: Normalized (sniffed) format
+        max_bytes: Size limit; defaults to AUDIO_MAX_UPLOAD_BYTES or MAX_AUDIO_SIZE_BYTES
+
+    Raises:
+        AudioValidationError: If the upload is empty, too large, in an
+            unsupported format or outside the duration/channel limits
+    """
+    if max_bytes is None:
+        max_bytes = get_max_upload_bytes()
+    if not audio_data:
+        raise AudioValidationError("Empty audio data")
+    if len(audio_data) > max_bytes:
+        raise AudioValidationError(f"Audio file too large: {len(audio_data)} bytes (max: {max_bytes})")
+    if audio_format not in UPLOAD_FORMATS:
+        raise AudioValidationError(f"Unsupported format: {audio_format}")
+
+    header = probe_header(audio_data, audio_format)
+    reason = check_audio_limits(header.duration_sec, header.sample_rate, header.channels)
+    if reason:
+        raise AudioValidationError(reason)
+    return header
+
+
+# ----------------------------------------------------------------------
+# Signal quality of the decoded buffer
+# ----------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class SignalQuality:
+    snr_db: float
+    clipping_ratio: float
+    silence_ratio: float
+
+    def to_dict(self) -> Dict[str, float]:
+        return asdict(self)
+
+
+def measure_signal_quality(waveform: np.ndarray, sample_rate: int) -> SignalQuality:
+    """
+    SNR, clipping and silence of an utterance.
+
+    The noise floor is the 10th percentile of the frame powers and the
+    signal the 95th percentile above it (the same statistics the VAD uses,
+    so the estimate holds for utterances without pauses); the silence ratio
+    is the share of frames the VAD does not count as speech.
+    """
+    if len(waveform) == 0:
+        return SignalQuality(snr_db=0.0, clipping_ratio=0.0, silence_ratio=1.0)
+
+    clipping_ratio = float(np.count_nonzero(np.abs(waveform) >= CLIPPING_LEVEL)) / len(waveform)
+
+    levels = frame_levels_db(waveform, frame_length(sample_rate))
+    if len(levels) == 0:
+        return SignalQuality(snr_db=0.0, clipping_ratio=clipping_ratio, silence_ratio=1.0)
+
+    power = np.power(10.0, levels.astype(np.float64) / 10.0)
+    noise_power, loud_power = np.percentile(power, [10, 95])
+    if noise_power <= _EPS:
+        snr_db = MAX_SNR_DB
+    else:
+        snr_db = 10.0 * np.log10(max(loud_power - noise_power, _EPS) / noise_power)
+
+    # No hangover: pauses between words count as silence
+    speech = speech_frame_mask(waveform, sample_rate, hangover_ms=0.0)
+    return SignalQuality(
+        snr_db=float(np.clip(snr_db, -MAX_SNR_DB, MAX_SNR_DB)),
+        clipping_ratio=clipping_ratio,
+        silence_ratio=float(1.0 - speech.mean())
+    )
+
+
+@dataclass(frozen=True)
+class QualityThresholds:
+    min_snr_db: float = 5.0
+    max_clipping_ratio: float = 0.05
+    max_silence_ratio: float = 0.9
+
+
+def get_quality_thresholds() -> QualityThresholds:
+    """Limits from AUDIO_MIN_SNR_DB, AUDIO_MAX_CLIPPING_RATIO and AUDIO_MAX_SILENCE_RATIO."""
+    defaults = QualityThresholds()
+    return QualityThresholds(
+        min_snr_db=float(os.getenv("AUDIO_MIN_SNR_DB", str(defaults.min_snr_db))),
+        max_clipping_ratio=float(os.getenv("AUDIO_MAX_CLIPPING_RATIO", str(defaults.max_clipping_ratio))),
+        max_silence_ratio=float(os.getenv("AUDIO_MAX_SILENCE_RATIO", str(defaults.max_silence_ratio))),
+    )
+
+
+def check_signal_quality(
+    quality: SignalQuality,
+    thresholds: Optional[QualityThresholds] = None
+) -> Optional[str]:
+    """Return the rejection reason if the signal is too noisy, clipped or silent."""
+    thresholds = thresholds or get_quality_thresholds()
+    if quality.silence_ratio > thresholds.max_silence_ratio:
+        return f"Too little speech: {1 - quality.silence_ratio:.0%} of the audio"
+    if quality.snr_db < thresholds.min_snr_db:
+        return f"Audio too noisy: SNR {quality.snr_db:.1f} dB (min: {thresholds.min_snr_db} dB)"
+    if quality.clipping_ratio > thresholds.max_clipping_ratio:
+        return f"Audio clipped: {quality.clipping_ratio:.1%} of samples (max: {thresholds.max_clipping_ratio:.1%})"
+    return None
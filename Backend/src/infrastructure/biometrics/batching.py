@@ -0,0 +1,225 @@
+"""Dynamic micro-batching for model inference.
+
+Adapters are called synchronously from worker threads (see
+``VoiceBiometricEngineFacade``). Instead of each caller running its own
+forward pass behind a lock, callers hand their preprocessed input to a
+``MicroBatcher``. A background thread collects requests for a short window
+(or until the batch is full), runs a single batched forward pass and fans
+the results back out to every waiting caller.
+
+An optional ``bucket_fn`` splits each collected batch into groups (e.g. by
+utterance duration) that are run as separate forward passes, which keeps
+padding waste low for variable-length models.
+
+With ``num_workers > 1`` several worker threads collect and run batches
+concurrently, which pairs with a ``ModelReplicaPool`` of the same size.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Sentinel used to wake up and stop the worker thread
+_STOP = object()
+
+
+@dataclass
+class _PendingRequest:
+    """A single request waiting to be batched."""
+    item: Any
+    future: Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class MicroBatcher:
+    """
+    Collects concurrent requests into batches for a single forward pass.
+
+    Args:
+        batch_fn: Callable receiving a list of items and returning a list of
+            results in the same order.
+        max_batch_size: Maximum number of requests per batch.
+        max_wait_ms: Maximum time to wait for more requests after the first
+            one arrives before flushing the batch.
+        name: Name used for the worker thread and log messages.
+        bucket_fn: Optional callable mapping an item to a bucket key. Items
+            collected in the same window but with different keys are run
+            in separate forward passes.
+        num_workers: Number of worker threads running batches concurrently
+            (one per model replica).
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0,
+        name: str = "micro_batcher",
+        bucket_fn: Optional[Callable[[Any], Hashable]] = None,
+        num_workers: int = 1
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if num_workers < 1:
+            raise ValueError("num_workers must be at least 1")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms cannot be negative")
+
+        self._batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.name = name
+        self._bucket_fn = bucket_fn
+
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        # Held for submit's check-and-put and close's flag-and-stop, so every
+        # accepted request is queued ahead of the stop sentinels
+        self._close_lock = threading.Lock()
+        self._closed = False
+
+        # Runtime statistics
+        self._stats_lock = threading.Lock()
+        self._batches_run = 0
+        self._items_processed = 0
+        self._largest_batch = 0
+        self._total_queue_wait_ms = 0.0
+        self._total_inference_ms = 0.0
+
+        self._workers = [
+            threading.Thread(
+                target=self._run,
+                name=name if num_workers == 1 else f"{name}_{i}",
+                daemon=True
+            )
+            for i in range(num_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, item: Any) -> Future:
+        """Queue an item for batched processing and return its future."""
+        future: Future = Future()
+        with self._close_lock:
+            if self._closed:
+                raise RuntimeError(f"{self.name} is closed")
+            self._queue.put(_PendingRequest(item=item, future=future))
+        return future
+
+    def run(self, item: Any, timeout: Optional[float] = None) -> Any:
+        """Submit an item and block until its result is available."""
+        return self.submit(item).result(timeout=timeout)
+
+    def close(self):
+        """Stop the worker threads after draining already queued requests."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            for _ in self._workers:
+                self._queue.put(_STOP)
+        for worker in self._workers:
+            worker.join(timeout=5.0)
+
+    def _collect_batch(self, first: _PendingRequest) -> tuple[List[_PendingRequest], bool]:
+        """Collect requests until the batch is full or the window expires."""
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait_ms / 1000.0
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining <= 0:
+                    pending = self._queue.get_nowait()
+                else:
+                    pending = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if pending is _STOP:
+                return batch, True
+            batch.append(pending)
+
+        return batch, False
+
+    def _run(self):
+        """Worker loop: collect, run and dispatch batches."""
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+
+            batch, stop_requested = self._collect_batch(first)
+            self._dispatch(batch)
+
+            if stop_requested:
+                break
+
+    def _dispatch(self, batch: List[_PendingRequest]):
+        """Split a collected batch into buckets and process each one."""
+        if self._bucket_fn is None:
+            self._process_batch(batch)
+            return
+
+        buckets: Dict[Hashable, List[_PendingRequest]] = {}
+        for pending in batch:
+            try:
+                key = self._bucket_fn(pending.item)
+            except Exception as e:
+                pending.future.set_exception(e)
+                continue
+            buckets.setdefault(key, []).append(pending)
+
+        # Dict preserves insertion order, so earlier arrivals run first
+        for bucket in buckets.values():
+            self._process_batch(bucket)
+
+    def _process_batch(self, batch: List[_PendingRequest]):
+        """Run the batch function and fan results out to the waiting callers."""
+        started = time.perf_counter()
+        queue_wait_ms = sum((started - p.enqueued_at) * 1000 for p in batch)
+
+        try:
+            results = self._batch_fn([p.item for p in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"{self.name}: batch function returned {len(results)} results for {len(batch)} items"
+                )
+        except Exception as e:
+            logger.error(f"{self.name}: batch of {len(batch)} failed: {e}")
+            for pending in batch:
+                pending.future.set_exception(e)
+            return
+        finally:
+            inference_ms = (time.perf_counter() - started) * 1000
+            with self._stats_lock:
+                self._batches_run += 1
+                self._items_processed += len(batch)
+                self._largest_batch = max(self._largest_batch, len(batch))
+                self._total_queue_wait_ms += queue_wait_ms
+                self._total_inference_ms += inference_ms
+
+        for pending, result in zip(batch, results):
+            pending.future.set_result(result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching statistics for monitoring."""
+        with self._stats_lock:
+            batches = self._batches_run
+            items = self._items_processed
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait_ms,
+                "workers": len(self._workers),
+                "batches_run": batches,
+                "items_processed": items,
+                "largest_batch": self._largest_batch,
+                "avg_batch_size": items / batches if batches else 0.0,
+                "avg_queue_wait_ms": self._total_queue_wait_ms / items if items else 0.0,
+                "avg_batch_inference_ms": self._total_inference_ms / batches if batches else 0.0,
+                "pending": self._queue.qsize(),
+            }
@@ -0,0 +1,197 @@
+"""Phrase-constrained scoring of CTC emissions.
+
+Verification always knows the phrase the user was asked to read, so instead
+of decoding freely and comparing strings, the expected phrase is aligned
+against the wav2vec2 CTC log-probabilities (Viterbi forced alignment over the
+usual blank-interleaved CTC topology).
+
+Scores are likelihood ratios against the free path, as in goodness of
+pronunciation (GOP): on every frame, the log-probability of the label the
+forced alignment emits is compared with the best label of that frame (the
+greedy CTC path, the unconstrained optimum). Where the speaker said the
+phrase the two paths agree and the ratio is 1; every frame where the phrase
+has to fight the acoustics lowers it. A word's confidence is the
+exponentiated mean frame log-ratio over the frames it spans, and the phrase
+score is the exponentiated total log-ratio per frame of the spoken region,
+so both lie in (0, 1] and do not depend on the phrase length or on the
+silence around it.
+
+Everything works on numpy arrays of shape (frames, vocabulary); the only
+Python loop is over frames, vectorized across alignment states.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+@dataclass
+class WordAlignment:
+    word: str
+    confidence: float
+    start_sec: float
+    end_sec: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "word": self.word,
+            "confidence": self.confidence,
+            "start_sec": self.start_sec,
+            "end_sec": self.end_sec,
+        }
+
+
+@dataclass
+class PhraseAlignment:
+    """Result of aligning an expected phrase against CTC emissions."""
+    score: float
+    log_likelihood: float
+    words: List[WordAlignment] = field(default_factory=list)
+    # Forced minus free path log-likelihood, per frame of the spoken region
+    log_likelihood_ratio: float = float("-inf")
+
+    @property
+    def aligned(self) -> bool:
+        """False when the audio is too short to hold the phrase at all."""
+        return np.isfinite(self.log_likelihood)
+
+    def word_confidences(self) -> List[Dict[str, Any]]:
+        return [word.to_dict() for word in self.words]
+
+
+def forced_align(
+    log_probs: np.ndarray,
+    targets: Sequence[int],
+    blank: int = 0
+) -> Tuple[Optional[np.ndarray], float]:
+    """
+    Best CTC alignment of ``targets`` to ``log_probs`` (frames x vocabulary).
+
+    Returns the target index emitted at each frame (-1 for blank frames) and
+    the log-likelihood of that path, or (None, -inf) if there are fewer
+    frames than the phrase needs.
+    """
+    num_frames = log_probs.shape[0]
+    num_states = 2 * len(targets) + 1
+    if num_frames == 0:
+        return None, float("-inf")
+
+    labels = np.full(num_states, blank, dtype=np.int64)
+    labels[1::2] = targets
+    emissions = log_probs[:, labels]  # (frames, states)
+
+    # A token may follow the previous token directly (skipping the blank
+    # between them) unless both are the same symbol
+    can_skip = np.zeros(num_states, dtype=bool)
+    can_skip[3::2] = labels[3::2] != labels[1:-2:2]
+
+    scores = np.full(num_states, -np.inf)
+    scores[:2] = emissions[0, :2]
+    backpointers = np.zeros((num_frames, num_states), dtype=np.int8)
+    candidates = np.full((3, num_states), -np.inf)
+    state_index = np.arange(num_states)
+
+    for t in range(1, num_frames):
+        candidates[0] = scores
+        candidates[1, 1:] = scores[:-1]
+        candidates[2, 2:] = np.where(can_skip[2:], scores[:-2], -np.inf)
+        best = candidates.argmax(axis=0)
+        scores = candidates[best, state_index] + emissions[t]
+        backpointers[t] = best
+
+    # The path ends on the last token or the blank after it
+    final_states = [num_states - 1] + ([num_states - 2] if num_states > 1 else [])
+    state = max(final_states, key=lambda s: scores[s])
+    log_likelihood = float(scores[state])
+    if not np.isfinite(log_likelihood):
+        return None, float("-inf")
+
+    path = np.empty(num_frames, dtype=np.int64)
+    for t in range(num_frames - 1, -1, -1):
+        path[t] = state
+        state -= backpointers[t, state]
+
+    # States 1, 3, 5... are the targets; blanks become -1
+    token_path = np.where(path % 2 == 1, path // 2, -1)
+    return token_path, log_likelihood
+
+
+def score_phrase(
+    log_probs: np.ndarray,
+    word_tokens: Sequence[Sequence[int]],
+    words: Sequence[str],
+    frame_sec: float,
+    blank: int = 0
+) -> PhraseAlignment:
+    """
+    Align a tokenized phrase and compute per-word confidences.
+
+    Args:
+        log_probs: CTC log-probabilities of one utterance (frames x vocabulary).
+        word_tokens: Token ids of each word of the expected phrase.
+        words: The words themselves (reported back with their confidences).
+        frame_sec: Duration of one emission frame.
+        blank: Index of the CTC blank symbol.
+    """
+    targets = [token for tokens in word_tokens for token in tokens]
+    if not targets:
+        return PhraseAlignment(score=0.0, log_likelihood=float("-inf"))
+
+    token_path, log_likelihood = forced_align(log_probs, targets, blank)
+    if token_path is None:
+        return PhraseAlignment(
+            score=0.0,
+            log_likelihood=log_likelihood,
+            words=[WordAlignment(word, 0.0, 0.0, 0.0) for word in words]
+        )
+
+    # Frame log-ratio of the forced path against the free (best-label) path
+    target_ids = np.asarray(targets)
+    forced_labels = np.where(token_path >= 0, target_ids[np.maximum(token_path, 0)], blank)
+    frame_ratio = log_probs[np.arange(len(token_path)), forced_labels] - log_probs.max(axis=-1)
+
+    num_targets = len(targets)
+    aligned = token_path >= 0
+    frames = np.flatnonzero(aligned)
+    token_at_frame = token_path[aligned]
+    first_frame = np.full(num_targets, len(token_path))
+    last_frame = np.full(num_targets, -1)
+    np.minimum.at(first_frame, token_at_frame, frames)
+    np.maximum.at(last_frame, token_at_frame, frames)
+
+    results = []
+    offset = 0
+    for word, tokens in zip(words, word_tokens):
+        span = slice(offset, offset + len(tokens))
+        offset += len(tokens)
+        if len(tokens) == 0:
+            results.append(WordAlignment(word, 0.0, 0.0, 0.0))
+            continue
+        start, end = first_frame[span].min(), last_frame[span].max() + 1
+        results.append(WordAlignment(
+            word,
+            float(np.exp(frame_ratio[start:end].mean())),
+            float(start * frame_sec),
+            float(end * frame_sec)
+        ))
+
+    # Frames outside the spoken region count too (extra speech there is
+    # penalized) but do not dilute the ratio with silence
+    spoken_frames = frames[-1] - frames[0] + 1
+    log_likelihood_ratio = float(frame_ratio.sum() / spoken_frames)
+    return PhraseAlignment(
+        score=float(np.exp(log_likelihood_ratio)),
+        log_likelihood=log_likelihood,
+        words=results,
+        log_likelihood_ratio=log_likelihood_ratio
+    )
+
+
+def greedy_token_ids(log_probs: np.ndarray, blank: int = 0) -> List[int]:
+    """Best-path CTC decoding: collapse repeats, then drop blanks."""
+    best = log_probs.argmax(axis=-1)
+    if len(best) == 0:
+        return []
+    keep = np.concatenate([[True], best[1:] != best[:-1]]) & (best != blank)
+    return best[keep].tolist()
@@ -2,7 +2,9 @@
 Utility classes to load locally provided anti-spoofing models (AASIST, RawNet2).
 
 These helpers avoid direct SpeechBrain downloads by consuming the checkpoints
-stored under `Backend/models/anti-spoofing`.
+stored under `Backend/models/anti-spoofing`. When an exported ONNX graph sits
+next to a checkpoint, `load_local_antispoof_model` runs it on ONNX Runtime
+instead of eager PyTorch.
 """
 
 from __future__ import annotations
@@ -12,12 +14,24 @@ import json
 import logging
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import torch
 import torch.nn.functional as F
 import yaml
 
+from .quantization import is_quantization_supported, quantize_dynamic_int8
+from .shared_weights import load_checkpoint, load_state_dict_shared
+from .onnx_runtime import (
+    AASIST_ONNX_FILE,
+    RAWNET2_ONNX_FILE,
+    WAVEFORM_INPUT,
+    create_onnx_session,
+    export_antispoof_onnx,
+    run_onnx_session,
+    should_use_onnx,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -62,16 +76,71 @@ class LocalModelPaths:
     def aasist_dir(self) -> Path:
         return self.anti_spoof_root / "aasist"
 
+    @property
+    def rawnet_onnx(self) -> Path:
+        return self.rawnet_dir / RAWNET2_ONNX_FILE
+
+    @property
+    def aasist_onnx(self) -> Path:
+        return self.aasist_dir / AASIST_ONNX_FILE
+
 
 class BaseLocalAntiSpoofModel:
+    runtime = "torch"
+
     def __init__(self, device: torch.device):
         self.device = device
         self.available = False
+        self._model = None
+        self._target_len = 64600
+
+    def _forward_logits(self, batch: torch.Tensor) -> torch.Tensor:
+        """Run the network on a (batch, samples) tensor and return class logits."""
+        raise NotImplementedError
+
+    def _logits_module(self) -> torch.nn.Module:
+        """Module mapping (batch, samples) waveforms to logits, used for export."""
+        return self._model
+
+    def export_onnx(self, onnx_path: Path) -> bool:
+        """Write the loaded network as an ONNX graph; False if nothing is loaded."""
+        if not self.available or self._model is None:
+            return False
+        export_antispoof_onnx(self._logits_module(), self._target_len, onnx_path)
+        return True
+
+    def quantize_dynamic(self, name: str) -> bool:
+        """Apply dynamic INT8 quantization to the loaded network (CPU only)."""
+        if self._model is None or not is_quantization_supported(self.device):
+            return False
+        return quantize_dynamic_int8(self._model, name)
 
     def predict_spoof_probability(
         self, waveform: torch.Tensor, sample_rate: int
     ) -> Optional[float]:
-        raise NotImplementedError
+        scores = self.predict_spoof_probability_batch([waveform], sample_rate)
+        return scores[0] if scores else None
+
+    def predict_spoof_probability_batch(
+        self, waveforms: List[torch.Tensor], sample_rate: int
+    ) -> Optional[List[float]]:
+        """Score several waveforms with a single forward pass.
+
+        Every waveform is padded/cropped to the model's fixed ``nb_samp``
+        window, so requests of any length stack into one tensor.
+        """
+        if not self.available or self._model is None:
+            return None
+        if not waveforms:
+            return []
+        with torch.no_grad():
+            batch = torch.stack(
+                [_normalize_audio_length(w, self._target_len) for w in waveforms]
+            ).to(self.device)
+            logits = self._forward_logits(batch)
+            probs = torch.softmax(logits, dim=1)
+            # Convention: index 1 corresponds to spoof class in both releases
+            return probs[:, 1].tolist()
 
 
 class LocalRawNet2Model(BaseLocalAntiSpoofModel):
@@ -95,10 +164,10 @@ class LocalRawNet2Model(BaseLocalAntiSpoofModel):
             module = _load_module(self._module_path, "local_rawnet2")
             RawNet = getattr(module, "RawNet")
             self._model = RawNet(model_args, device=self.device).to(self.device)
-            state = torch.load(self._checkpoint_path, map_location=self.device)
+            state = load_checkpoint(self._checkpoint_path, map_location=self.device)
             if isinstance(state, dict) and "model_state_dict" in state:
                 state = state["model_state_dict"]
-            self._model.load_state_dict(state, strict=False)
+            load_state_dict_shared(self._model, state, strict=False)
             self._model.eval()
             self.available = True
             logger.info("Local RawNet2 anti-spoofing model loaded")
@@ -107,18 +176,8 @@ class LocalRawNet2Model(BaseLocalAntiSpoofModel):
             self._model = None
             self.available = False
 
-    def predict_spoof_probability(
-        self, waveform: torch.Tensor, sample_rate: int
-    ) -> Optional[float]:
-        if not self.available or self._model is None:
-            return None
-        with torch.no_grad():
-            vec = _normalize_audio_length(waveform, self._target_len).unsqueeze(0)
-            vec = vec.to(self.device)
-            logits = self._model(vec)
-            probs = torch.softmax(logits, dim=1)
-            # Convention: index 1 corresponds to spoof class in RawNet2 release
-            return probs[:, 1].item()
+    def _forward_logits(self, batch: torch.Tensor) -> torch.Tensor:
+        return self._model(batch)
 
 
 class LocalAASISTModel(BaseLocalAntiSpoofModel):
@@ -142,10 +201,10 @@ class LocalAASISTModel(BaseLocalAntiSpoofModel):
             module = _load_module(self._module_path, "local_aasist")
             Model = getattr(module, "Model")
             self._model = Model(model_args).to(self.device)
-            state = torch.load(self._checkpoint_path, map_location=self.device)
+            state = load_checkpoint(self._checkpoint_path, map_location=self.device)
             if isinstance(state, dict) and "model_state_dict" in state:
                 state = state["model_state_dict"]
-            self._model.load_state_dict(state, strict=False)
+            load_state_dict_shared(self._model, state, strict=False)
             self._model.eval()
             self.available = True
             logger.info("Local AASIST anti-spoofing model loaded")
@@ -154,17 +213,86 @@ class LocalAASISTModel(BaseLocalAntiSpoofModel):
             self._model = None
             self.available = False
 
-    def predict_spoof_probability(
-        self, waveform: torch.Tensor, sample_rate: int
-    ) -> Optional[float]:
-        if not self.available or self._model is None:
-            return None
-        with torch.no_grad():
-            vec = _normalize_audio_length(waveform, self._target_len).unsqueeze(0)
-            vec = vec.to(self.device)
-            _, logits = self._model(vec)
-            probs = torch.softmax(logits, dim=1)
-            return probs[:, 1].item()
+    def _forward_logits(self, batch: torch.Tensor) -> torch.Tensor:
+        _, logits = self._model(batch)
+        return logits
+
+    def _logits_module(self) -> torch.nn.Module:
+        return _AASISTLogits(self._model)
+
+
+class _AASISTLogits(torch.nn.Module):
+    """AASIST returns (embedding, logits); the exported graph keeps the logits."""
+
+    def __init__(self, model: torch.nn.Module):
+        super().__init__()
+        self.model = model
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        _, logits = self.model(x)
+        return logits
+
+
+class LocalONNXAntiSpoofModel(BaseLocalAntiSpoofModel):
+    """Anti-spoofing network exported to ONNX and run on ONNX Runtime."""
+
+    runtime = "onnx"
+
+    def __init__(self, device: torch.device, onnx_path: Path, name: str):
+        super().__init__(device)
+        self._onnx_path = onnx_path
+        self._name = name
+        self._load_model()
+
+    def _load_model(self):
+        try:
+            self._model = create_onnx_session(self._onnx_path, self.device, model_key="antispoof")
+            # The waveform window is fixed in the graph: (batch, nb_samp)
+            window = self._model.get_inputs()[0].shape[1]
+            if isinstance(window, int):
+                self._target_len = window
+            self.available = True
+            logger.info("Local %s anti-spoofing model loaded (ONNX Runtime)", self._name)
+        except Exception as exc:
+            logger.warning("Failed to load %s ONNX graph: %s", self._name, exc)
+            self._model = None
+            self.available = False
+
+    def _forward_logits(self, batch: torch.Tensor) -> torch.Tensor:
+        logits = run_onnx_session(self._model, WAVEFORM_INPUT, batch.cpu().numpy())
+        return torch.from_numpy(logits)
+
+    def quantize_dynamic(self, name: str) -> bool:
+        # torch quantization does not apply to an ONNX Runtime graph
+        return False
+
+    def export_onnx(self, onnx_path: Path) -> bool:
+        return False
+
+    def __deepcopy__(self, memo):
+        # Sessions are thread-safe: replicas share one instead of copying it
+        return self
+
+
+def load_local_antispoof_model(
+    name: str, device: torch.device, paths: LocalModelPaths
+) -> BaseLocalAntiSpoofModel:
+    """Load AASIST or RawNet2 on ONNX Runtime if its graph exists, else on torch.
+
+    If the ONNX graph fails to load, the torch checkpoint is used instead.
+    """
+    if name == "aasist":
+        onnx_path, torch_cls = paths.aasist_onnx, LocalAASISTModel
+    elif name == "rawnet2":
+        onnx_path, torch_cls = paths.rawnet_onnx, LocalRawNet2Model
+    else:
+        raise ValueError(f"Unknown local anti-spoofing model: {name}")
+
+    if should_use_onnx(onnx_path):
+        onnx_model = LocalONNXAntiSpoofModel(device, onnx_path, name)
+        if onnx_model.available:
+            return onnx_model
+    return torch_cls(device=device, paths=paths)
 
 
 def build_local_model_paths() -> LocalModelPaths:
@@ -0,0 +1,226 @@
+"""
+Concurrent model loading and warm-up.
+
+The speaker, anti-spoofing and ASR adapters are independent, so their
+constructors (weight loading, replica creation, quantization) run in
+parallel threads. Each loaded adapter then gets a warm-up pass over
+synthetic speech of typical lengths, one call per replica at a time, so
+lazy allocations, kernel selection and batch-queue threads are paid for at
+startup instead of by the first real request.
+
+``ModelReadiness`` records the state of every model
+(pending -> loading -> warming -> ready, or failed) with load and warm-up
+timings; it backs the per-model section of ``/health``. An adapter that
+was built but runs on its mock fallback (weights missing, SpeechBrain not
+installed) ends up degraded rather than ready.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .audio_sample import AudioSample, TARGET_SAMPLE_RATE
+from .resampling import preload_resamplers
+
+logger = logging.getLogger(__name__)
+
+MODEL_KEYS = ("speaker", "antispoof", "asr")
+
+STATE_PENDING = "pending"
+STATE_LOADING = "loading"
+STATE_WARMING = "warming"
+STATE_READY = "ready"
+STATE_DEGRADED = "degraded"  # Loaded, but answering with the mock fallback
+STATE_FAILED = "failed"
+
+FALLBACK_ERROR = "model not loaded, using the mock fallback"
+
+DEFAULT_WARMUP_DURATIONS_SEC = (1.5, 3.0, 5.0)
+
+
+def warmup_durations_from_env() -> List[float]:
+    """Utterance lengths used for warm-up (empty when MODEL_WARMUP_ENABLED=false)."""
+    if os.getenv("MODEL_WARMUP_ENABLED", "true").lower() not in ("1", "true", "yes"):
+        return []
+    raw = os.getenv("MODEL_WARMUP_DURATIONS_SEC")
+    if not raw:
+        return list(DEFAULT_WARMUP_DURATIONS_SEC)
+    return [float(value) for value in raw.split(",") if value.strip()]
+
+
+class ModelReadiness:
+    """Thread-safe per-model loading state and timings."""
+
+    def __init__(self, keys: Iterable[str] = MODEL_KEYS):
+        self._lock = threading.Lock()
+        self._models: Dict[str, Dict[str, Any]] = {
+            key: {"state": STATE_PENDING, "load_sec": None, "warmup_sec": None, "error": None}
+            for key in keys
+        }
+
+    def update(self, key: str, state: str, **fields: Any):
+        """Move a model to ``state`` and record any timing/error fields."""
+        with self._lock:
+            entry = self._models.setdefault(
+                key, {"state": STATE_PENDING, "load_sec": None, "warmup_sec": None, "error": None}
+            )
+            entry["state"] = state
+            entry.update(fields)
+
+    def reset(self):
+        """Back to pending (the engine was closed)."""
+        with self._lock:
+            for entry in self._models.values():
+                entry.update(state=STATE_PENDING, load_sec=None, warmup_sec=None, error=None)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {key: dict(entry) for key, entry in self._models.items()}
+
+    @property
+    def all_ready(self) -> bool:
+        with self._lock:
+            return all(entry["state"] == STATE_READY for entry in self._models.values())
+
+    @property
+    def any_failed(self) -> bool:
+        with self._lock:
+            return any(entry["state"] == STATE_FAILED for entry in self._models.values())
+
+    @property
+    def any_degraded(self) -> bool:
+        with self._lock:
+            return any(entry["state"] == STATE_DEGRADED for entry in self._models.values())
+
+
+def is_model_loaded(adapter: Any) -> bool:
+    """Whether the adapter runs its real model; adapters without the check count as loaded."""
+    check = getattr(adapter, "is_model_loaded", None)
+    return True if check is None else bool(check())
+
+
+def synthetic_speech(duration_sec: float, seed: int = 0) -> AudioSample:
+    """
+    Speech-like test signal: a gliding harmonic voice modulated at a
+    syllable rate, over a low noise floor, so the VAD keeps it and every
+    model sees a realistic amount of audio.
+    """
+    num_samples = max(1, int(duration_sec * TARGET_SAMPLE_RATE))
+    t = np.arange(num_samples) / TARGET_SAMPLE_RATE
+
+    f0 = 120.0 + 20.0 * np.sin(2 * np.pi * 0.5 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / TARGET_SAMPLE_RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+    syllables = 0.5 * (1 - np.cos(2 * np.pi * 4.0 * t))
+
+    noise = np.random.default_rng(seed).standard_normal(num_samples)
+    waveform = 0.3 * voiced * syllables + 0.005 * noise
+    return AudioSample(waveform=waveform.astype(np.float32), source_format="wav")
+
+
+def _warmup_call(key: str, adapter: Any) -> Callable[[AudioSample], Any]:
+    """The inference entry point exercised for each model type."""
+    if key == "speaker":
+        return lambda sample: adapter.extract_embedding(sample, sample.source_format)
+    if key == "antispoof":
+        return adapter.detect_spoof
+    if key == "asr":
+        return adapter.transcribe
+    raise ValueError(f"Unknown model key: {key}")
+
+
+def warm_up_adapter(key: str, adapter: Any, durations_sec: Iterable[float]):
+    """Run each warm-up length once per replica, concurrently, so every replica is exercised."""
+    call = _warmup_call(key, adapter)
+    replica_stats = adapter.get_replica_stats() if hasattr(adapter, "get_replica_stats") else None
+    replicas = (replica_stats or {}).get("replicas", 1)
+
+    with ThreadPoolExecutor(max_workers=replicas, thread_name_prefix=f"{key}_warmup") as executor:
+        for index, duration in enumerate(durations_sec):
+            samples = [synthetic_speech(duration, seed=index * replicas + r) for r in range(replicas)]
+            list(executor.map(call, samples))
+
+
+def _load_one(
+    key: str,
+    factory: Callable[[], Any],
+    readiness: ModelReadiness,
+    durations_sec: List[float]
+) -> Any:
+    readiness.update(key, STATE_LOADING)
+    started = time.perf_counter()
+    try:
+        adapter = factory()
+    except Exception as e:
+        readiness.update(key, STATE_FAILED, load_sec=time.perf_counter() - started, error=str(e))
+        logger.error(f"Failed to load {key} model: {e}")
+        raise
+    load_sec = time.perf_counter() - started
+    readiness.update(key, STATE_WARMING, load_sec=load_sec)
+
+    started = time.perf_counter()
+    try:
+        warm_up_adapter(key, adapter, durations_sec)
+    except Exception as e:
+        # The model is usable; the first request just pays the warm-up cost
+        logger.warning(f"Warm-up of {key} model failed: {e}")
+    warmup_sec = time.perf_counter() - started
+
+    if not is_model_loaded(adapter):
+        readiness.update(key, STATE_DEGRADED, warmup_sec=warmup_sec, error=FALLBACK_ERROR)
+        logger.warning(f"{key} model degraded: {FALLBACK_ERROR}")
+        return adapter
+
+    readiness.update(key, STATE_READY, warmup_sec=warmup_sec)
+    logger.info(f"{key} model ready (load {load_sec:.1f}s, warm-up {warmup_sec:.1f}s)")
+    return adapter
+
+
+def load_models_concurrently(
+    factories: Dict[str, Callable[[], Any]],
+    readiness: Optional[ModelReadiness] = None,
+    warmup_durations_sec: Optional[List[float]] = None
+) -> Dict[str, Any]:
+    """
+    Build every adapter in its own thread, then warm it up.
+
+    Args:
+        factories: Model key -> zero-argument adapter constructor.
+        readiness: Tracker updated as each model progresses.
+        warmup_durations_sec: Synthetic utterance lengths; defaults to the
+            MODEL_WARMUP_* settings. An empty list skips warm-up.
+
+    Raises:
+        RuntimeError: If any model failed to load (after all have finished).
+    """
+    if readiness is None:
+        readiness = ModelReadiness(factories.keys())
+    if warmup_durations_sec is None:
+        warmup_durations_sec = warmup_durations_from_env()
+
+    # Resampling kernels for the browser rates, shared by every request
+    preload_resamplers()
+
+    with ThreadPoolExecutor(max_workers=len(factories), thread_name_prefix="model_loader") as executor:
+        futures = {
+            key: executor.submit(_load_one, key, factory, readiness, warmup_durations_sec)
+            for key, factory in factories.items()
+        }
+
+    adapters, errors = {}, []
+    for key, future in futures.items():
+        try:
+            adapters[key] = future.result()
+        except Exception as e:
+            errors.append(f"{key}: {e}")
+    if errors:
+        for adapter in adapters.values():
+            if hasattr(adapter, "close"):
+                adapter.close()
+        raise RuntimeError(f"Model loading failed ({'; '.join(errors)})")
+    return adapters
@@ -18,6 +18,52 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+_MB = 1024 * 1024
+
+
+def _process_memory() -> Dict[str, Any]:
+    """
+    Resident memory of this process split into shared and private pages.
+    
+    Model weights that are memory-mapped or inherited from a preloading
+    master (SHARED_MODEL_WEIGHTS) show up as shared; PSS divides shared
+    pages among the processes using them, so summing PSS over workers gives
+    the real footprint.
+    """
+    if PSUTIL_AVAILABLE:
+        try:
+            info = psutil.Process().memory_full_info()
+            if hasattr(info, "pss"):
+                return {
+                    "pid": os.getpid(),
+                    "rss_mb": info.rss / _MB,
+                    "pss_mb": info.pss / _MB,
+                    "private_mb": info.uss / _MB,
+                    "shared_mb": (info.rss - info.uss) / _MB
+                }
+        except Exception as e:
+            logger.debug(f"psutil memory_full_info unavailable: {e}")
+    
+    # Linux without psutil: the kernel's per-process rollup (values in kB)
+    try:
+        fields = {}
+        with open("/proc/self/smaps_rollup") as rollup:
+            for line in rollup:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                    fields[parts[0][:-1]] = int(parts[1]) * 1024
+        private = fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+        shared = fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0)
+        return {
+            "pid": os.getpid(),
+            "rss_mb": fields.get("Rss", 0) / _MB,
+            "pss_mb": fields.get("Pss", 0) / _MB,
+            "private_mb": private / _MB,
+            "shared_mb": shared / _MB
+        }
+    except OSError:
+        return {"pid": os.getpid(), "rss_mb": None, "pss_mb": None, "private_mb": None, "shared_mb": None}
+
 
 @dataclass
 class ModelConfig:
@@ -31,6 +77,7 @@ class ModelConfig:
     description: str = ""
     priority: int = 1  # Higher priority models load first
     memory_usage_mb: Optional[int] = None  # Estimated memory usage
+    quantize: bool = False  # Dynamic INT8 quantization at load time (CPU only)
 
 
 @dataclass
@@ -70,8 +117,10 @@ class ModelManager:
         self._currently_downloading: Set[str] = set()
         self._download_lock = threading.Lock()
         
-        # Start cache cleanup thread
+        # Start cache cleanup thread (again in forked workers, which inherit no threads)
         self._start_cache_cleanup_thread()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._start_cache_cleanup_thread)
         
         # Model configurations - Anteproyecto specifications with performance data
         self.models = {
@@ -127,6 +176,14 @@ class ModelManager:
             )
         }
         
+        # QUANTIZE_MODELS overrides the per-model quantize flag,
+        # e.g. "ecapa_tdnn,rawnet2", "all" or "none"
+        quantize_env = os.getenv("QUANTIZE_MODELS")
+        if quantize_env is not None:
+            selected = {m.strip() for m in quantize_env.split(",") if m.strip()}
+            for model_id, config in self.models.items():
+                config.quantize = "all" in selected or model_id in selected
+        
     def get_model_path(self, model_id: str) -> Path:
         """Get the local path for a model."""
         if model_id not in self.models:
@@ -350,9 +407,22 @@ class ModelManager:
             "version": config.version,
             "size_mb": config.size_mb,
             "description": config.description,
+            "quantize": config.quantize,
             "available": self.is_model_available(model_id)
         }
     
+    def is_quantized(self, model_id: str) -> bool:
+        """Whether a model should be loaded with dynamic INT8 quantization."""
+        if model_id not in self.models:
+            raise ValueError(f"Unknown model: {model_id}")
+        return self.models[model_id].quantize
+    
+    def set_quantization(self, model_id: str, enabled: bool):
+        """Toggle INT8 quantization for a model (applies to adapters created afterwards)."""
+        if model_id not in self.models:
+            raise ValueError(f"Unknown model: {model_id}")
+        self.models[model_id].quantize = enabled
+    
     def list_models(self) -> Dict[str, Dict[str, Any]]:
         """List all configured models and their status."""
         return {model_id: self.get_model_info(model_id) for model_id in self.models}
@@ -430,10 +500,14 @@ class ModelManager:
         logger.info(f"Preloaded {loaded_count} models successfully")
         return results
     
-    def get_memory_usage(self) -> Dict[str, float]:
-        """Get current memory usage statistics."""
+    def get_memory_usage(self) -> Dict[str, Any]:
+        """Get current memory usage statistics, including this worker's shared vs private memory."""
+        from .shared_weights import get_shared_weights_stats
+        
         with self._cache_lock:
             total_cache_mb = sum(entry.memory_size_mb for entry in self._model_cache.values())
+        process_memory = _process_memory()
+        shared_weights = get_shared_weights_stats()
         
         if PSUTIL_AVAILABLE:
             try:
@@ -445,6 +519,8 @@ class ModelManager:
                     "system_available_mb": system_memory.available / (1024 * 1024),
                     "system_usage_percent": system_memory.percent,
                     "cached_models": list(self._model_cache.keys()),
+                    "process": process_memory,
+                    "shared_weights": shared_weights,
                     "psutil_available": True
                 }
             except Exception as e:
@@ -458,6 +534,8 @@ class ModelManager:
             "system_available_mb": 4096.0,  # Assume 4GB available
             "system_usage_percent": 50.0,  # Assume 50% usage
             "cached_models": list(self._model_cache.keys()),
+            "process": process_memory,
+            "shared_weights": shared_weights,
             "psutil_available": False
         }
     
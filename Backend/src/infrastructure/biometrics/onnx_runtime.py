@@ -0,0 +1,169 @@
+"""ONNX export and ONNX Runtime sessions for the CPU inference path.
+
+Eager PyTorch runs every layer through the Python interpreter and cannot
+fuse operators. The anti-spoofing networks (AASIST, RawNet2) and the
+ECAPA-TDNN embedding model are exported once to ONNX graphs stored next to
+their weights in ``models/``; at load time the adapters run those graphs
+with ONNX Runtime (graph optimizations enabled) and fall back to torch when
+a graph or ``onnxruntime`` itself is missing.
+
+Graphs are written by ``scripts/export_onnx_models.py``. ``MODEL_RUNTIME``
+selects the runtime: ``auto`` (ONNX when the graph exists), ``onnx`` or
+``torch``.
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import torch
+
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ort = None
+    ONNXRUNTIME_AVAILABLE = False
+
+from .resource_governor import get_resource_governor
+
+logger = logging.getLogger(__name__)
+
+ONNX_OPSET = 17
+
+# Suffix appended to the model version so audit trails distinguish ONNX results
+ONNX_VERSION_SUFFIX = "+onnx"
+
+# Graph file names inside each model directory
+AASIST_ONNX_FILE = "AASIST.onnx"
+RAWNET2_ONNX_FILE = "rawnet2.onnx"
+ECAPA_ONNX_FILE = "embedding_model.onnx"
+
+# Input/output names shared by the export step and the sessions
+WAVEFORM_INPUT = "waveform"
+LOGITS_OUTPUT = "logits"
+FEATS_INPUT = "feats"
+EMBEDDING_OUTPUT = "embedding"
+
+
+def get_model_runtime() -> str:
+    """Runtime requested through MODEL_RUNTIME (auto | onnx | torch)."""
+    runtime = os.getenv("MODEL_RUNTIME", "auto").strip().lower()
+    if runtime not in ("auto", "onnx", "torch"):
+        logger.warning(f"Unknown MODEL_RUNTIME '{runtime}', using auto")
+        return "auto"
+    return runtime
+
+
+def should_use_onnx(onnx_path: Path) -> bool:
+    """Whether a model should run on ONNX Runtime instead of torch."""
+    runtime = get_model_runtime()
+    if runtime == "torch":
+        return False
+    if not ONNXRUNTIME_AVAILABLE:
+        if runtime == "onnx":
+            logger.warning("MODEL_RUNTIME=onnx but onnxruntime is not installed, using torch")
+        return False
+    if not onnx_path.exists():
+        if runtime == "onnx":
+            logger.warning(f"ONNX graph not found at {onnx_path}, using torch")
+        return False
+    return True
+
+
+def _session_threads(model_key: Optional[str]) -> int:
+    """Priority: ONNX_THREADS > CPU governor budget > torch.get_num_threads()."""
+    env_threads = os.getenv("ONNX_THREADS")
+    if env_threads:
+        return int(env_threads)
+    governor = get_resource_governor() if model_key else None
+    if governor is not None:
+        return governor.budget(model_key)
+    return torch.get_num_threads()
+
+
+def create_onnx_session(
+    onnx_path: Path,
+    device: Optional[torch.device] = None,
+    model_key: Optional[str] = None
+):
+    """
+    Open an ONNX Runtime session with all graph optimizations enabled.
+
+    Sessions are thread-safe, so one session serves concurrent requests.
+    Intra-op threads follow ONNX_THREADS, then the CPU governor budget of
+    ``model_key``, then torch's setting. The count is fixed for the life of
+    the session, and the governor is told so.
+    """
+    if not ONNXRUNTIME_AVAILABLE:
+        raise RuntimeError("onnxruntime is not installed")
+
+    threads = _session_threads(model_key)
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.intra_op_num_threads = threads
+
+    providers = ["CPUExecutionProvider"]
+    if device is not None and device.type == "cuda" and \
+            "CUDAExecutionProvider" in ort.get_available_providers():
+        providers.insert(0, "CUDAExecutionProvider")
+
+    session = ort.InferenceSession(str(onnx_path), options, providers=providers)
+    governor = get_resource_governor() if model_key else None
+    if governor is not None:
+        governor.fix_budget(model_key, threads)
+    logger.info(f"ONNX Runtime session ready: {onnx_path.name} ({', '.join(session.get_providers())})")
+    return session
+
+
+def export_antispoof_onnx(module: torch.nn.Module, target_len: int, onnx_path: Path):
+    """
+    Export an anti-spoofing network taking (batch, target_len) waveforms.
+
+    ``module`` must return the class logits only; the batch axis is dynamic.
+    """
+    onnx_path.parent.mkdir(parents=True, exist_ok=True)
+    example = torch.randn(2, target_len)
+    with torch.no_grad():
+        torch.onnx.export(
+            module.eval().cpu(),
+            (example,),
+            str(onnx_path),
+            input_names=[WAVEFORM_INPUT],
+            output_names=[LOGITS_OUTPUT],
+            dynamic_axes={WAVEFORM_INPUT: {0: "batch"}, LOGITS_OUTPUT: {0: "batch"}},
+            opset_version=ONNX_OPSET,
+            dynamo=False
+        )
+    logger.info(f"Exported ONNX graph to {onnx_path}")
+
+
+def export_speaker_encoder_onnx(embedding_model: torch.nn.Module, n_mels: int, onnx_path: Path):
+    """
+    Export the ECAPA-TDNN embedding model taking (1, frames, n_mels) features.
+
+    The relative-length masks in ECAPA's pooling are traced with a fixed
+    batch size, so the graph scores one utterance per call (frames are
+    dynamic) and the feature extraction stays in torch.
+    """
+    onnx_path.parent.mkdir(parents=True, exist_ok=True)
+    example = torch.randn(1, 200, n_mels)
+    with torch.no_grad():
+        torch.onnx.export(
+            embedding_model.eval().cpu(),
+            (example,),
+            str(onnx_path),
+            input_names=[FEATS_INPUT],
+            output_names=[EMBEDDING_OUTPUT],
+            dynamic_axes={FEATS_INPUT: {1: "frames"}},
+            opset_version=ONNX_OPSET,
+            dynamo=False
+        )
+    logger.info(f"Exported ONNX graph to {onnx_path}")
+
+
+def run_onnx_session(session, input_name: str, array: np.ndarray) -> np.ndarray:
+    """Run a single-input, single-output session on a float32 array."""
+    return session.run(None, {input_name: np.ascontiguousarray(array, dtype=np.float32)})[0]
@@ -0,0 +1,725 @@
+"""Process-pool inference backend.
+
+By default the speaker, anti-spoofing and ASR adapters live in the API
+process and run on the facade's thread pool, so their Python-side pre- and
+postprocessing contend for the GIL. This backend instead hosts a full set of
+adapters in each of N worker processes.
+
+Decoded audio is handed to a worker through ``multiprocessing.shared_memory``
+(only the segment name and metadata travel through the request queue), so
+large waveforms are never pickled. Results are small (an embedding, a score
+or a string) and come back over a shared response queue.
+
+A monitor thread checks worker health and restarts workers that crash or
+hang; requests in flight on a lost worker fail with ``RuntimeError`` so the
+caller can retry. Restarts back off exponentially, and a worker that keeps
+failing is given up on after ``max_restarts`` consecutive restarts; the
+pool then reports itself degraded. Results a worker's adapters produced with a mock or
+heuristic fallback are flagged, so the API-side result cache skips them.
+``create_remote_adapters`` wraps the backend in objects
+with the same interface as the local adapters, so
+``VoiceBiometricEngineFacade`` works unchanged on top of it.
+"""
+
+import itertools
+import logging
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .audio_sample import AudioInput, AudioSample, as_audio_sample
+from .model_loading import ModelReadiness, is_model_loaded, load_models_concurrently
+from .result_cache import mark_fallback_result, track_fallbacks
+
+logger = logging.getLogger(__name__)
+
+# Operations understood by the worker loop
+OP_EMBED = "embed"
+OP_DETECT_SPOOF = "detect_spoof"
+OP_TRANSCRIBE = "transcribe"
+OP_SCORE_PHRASE = "score_phrase"
+OP_VALIDATE = "validate"
+OP_PING = "ping"
+OP_STATS = "stats"
+
+# Operations that carry no audio payload
+_CONTROL_OPS = (OP_PING, OP_STATS)
+
+# Exception types re-raised as-is in the API process; anything else becomes RuntimeError
+_PASSTHROUGH_ERRORS = {"ValueError": ValueError, "TimeoutError": TimeoutError}
+
+
+# Load/warm-up timings of this worker's models (each spawned worker has its own)
+_worker_readiness = ModelReadiness()
+
+
+def _build_adapters() -> Dict[str, Any]:
+    """Default adapter factory: load and warm up the real models inside the worker process."""
+    from .SpeakerEmbeddingAdapter import SpeakerEmbeddingAdapter
+    from .SpoofDetectorAdapter import SpoofDetectorAdapter
+    from .ASRAdapter import ASRAdapter
+    from .shared_weights import install_transfer_hooks
+
+    install_transfer_hooks()
+    return load_models_concurrently(
+        {
+            "speaker": SpeakerEmbeddingAdapter,
+            "antispoof": SpoofDetectorAdapter,
+            "asr": ASRAdapter,
+        },
+        readiness=_worker_readiness
+    )
+
+
+def _describe_adapters(adapters: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Model identity, batching stats and startup timings reported back to the API process."""
+    startup = _worker_readiness.snapshot()
+    return {
+        key: {
+            "id": adapter.get_model_id(),
+            "name": adapter.get_model_name(),
+            "version": adapter.get_model_version(),
+            "loaded": is_model_loaded(adapter),
+            "batching": adapter.get_batching_stats(),
+            "replicas": adapter.get_replica_stats(),
+            "load_sec": startup.get(key, {}).get("load_sec"),
+            "warmup_sec": startup.get(key, {}).get("warmup_sec"),
+        }
+        for key, adapter in adapters.items()
+    }
+
+
+def _run_op(adapters: Dict[str, Any], op: str, sample: AudioSample, args: tuple = ()) -> Any:
+    """Dispatch one audio operation to the worker's local adapters."""
+    if op == OP_EMBED:
+        return adapters["speaker"].extract_embedding(sample, sample.source_format)
+    if op == OP_DETECT_SPOOF:
+        return adapters["antispoof"].detect_spoof(sample)
+    if op == OP_TRANSCRIBE:
+        return adapters["asr"].transcribe(sample)
+    if op == OP_SCORE_PHRASE:
+        return adapters["asr"].score_phrase(sample, *args)
+    if op == OP_VALIDATE:
+        return adapters["speaker"].validate_audio_quality(sample)
+    raise ValueError(f"Unknown inference operation: {op}")
+
+
+def _read_shared_sample(shm_name: str, num_samples: int, meta: Dict[str, Any]) -> AudioSample:
+    """Copy a waveform out of shared memory into a worker-local AudioSample."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        view = np.ndarray((num_samples,), dtype=np.float32, buffer=shm.buf)
+        # One local memcpy lets us detach from the segment right away; the
+        # adapters may keep tensor views alive (batch queues) past this call.
+        waveform = view.copy()
+        del view
+    finally:
+        shm.close()
+    return AudioSample(waveform=waveform, **meta)
+
+
+def _worker_main(
+    worker_id: int,
+    request_queue,
+    response_queue,
+    adapter_factory: Callable[[], Dict[str, Any]],
+    num_threads: Optional[int]
+):
+    """Entry point of an inference worker process."""
+    if num_threads:
+        import torch
+        torch.set_num_threads(num_threads)
+
+    try:
+        adapters = adapter_factory()
+        response_queue.put(("ready", worker_id, os.getpid(), _describe_adapters(adapters)))
+    except Exception as e:
+        response_queue.put(("failed", worker_id, os.getpid(), str(e)))
+        return
+
+    while True:
+        message = request_queue.get()
+        if message is None:
+            break
+
+        request_id, op, shm_name, num_samples, meta, args = message
+        try:
+            with track_fallbacks() as fallbacks:
+                if op == OP_PING:
+                    result = os.getpid()
+                elif op == OP_STATS:
+                    result = _describe_adapters(adapters)
+                else:
+                    sample = _read_shared_sample(shm_name, num_samples, meta)
+                    result = _run_op(adapters, op, sample, args)
+            response_queue.put(("result", worker_id, request_id, True, result, bool(fallbacks)))
+        except Exception as e:
+            response_queue.put(("result", worker_id, request_id, False, (type(e).__name__, str(e)), False))
+
+    for adapter in adapters.values():
+        try:
+            adapter.close()
+        except Exception:
+            pass
+
+
+class _InferenceFuture(Future):
+    """Future of one worker request; ``fallback`` is set when a mock/heuristic answered it."""
+
+    def __init__(self):
+        super().__init__()
+        self.fallback = False
+
+
+@dataclass
+class _InFlight:
+    """A request dispatched to a worker and not yet answered."""
+    future: Future
+    shm: Optional[shared_memory.SharedMemory]
+    started_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class _WorkerHandle:
+    """API-process view of one worker process."""
+    worker_id: int
+    process: Any = None
+    request_queue: Any = None
+    pid: Optional[int] = None
+    ready: bool = False
+    error: Optional[str] = None
+    restarts: int = 0
+    # Restarts since the worker last stayed up; drives the backoff and the cap
+    consecutive_restarts: int = 0
+    restart_at: Optional[float] = None
+    gave_up: bool = False
+    # A "ready" that arrived before the respawned process's pid was recorded
+    early_ready: Optional[Tuple[int, Dict[str, Any]]] = None
+    started_at: float = 0.0
+    inflight: Dict[int, _InFlight] = field(default_factory=dict)
+
+
+class ProcessPoolInferenceBackend:
+    """
+    Hosts the biometric models in N worker processes.
+
+    Args:
+        num_workers: Number of worker processes (each loads every model).
+        adapter_factory: Picklable callable building the adapters inside a
+            worker; defaults to the real speaker/anti-spoofing/ASR adapters.
+        num_threads: torch intra-op threads per worker. Defaults to an even
+            split of the CPU cores so workers do not oversubscribe the node.
+        health_check_interval_sec: How often the monitor checks the workers.
+        hang_timeout_sec: A worker whose oldest request is older than this
+            is considered hung and is restarted.
+        start_timeout_sec: How long to wait for the workers to load models.
+        restart_backoff_sec: Delay before the first restart of a failed
+            worker; doubles with each consecutive restart.
+        max_restart_backoff_sec: Upper bound of the restart delay. A worker
+            that stays up this long counts as recovered and its backoff resets.
+        max_restarts: Consecutive restarts after which a worker is given up
+            on (the pool reports itself degraded).
+    """
+
+    def __init__(
+        self,
+        num_workers: int = 2,
+        adapter_factory: Callable[[], Dict[str, Any]] = _build_adapters,
+        num_threads: Optional[int] = None,
+        health_check_interval_sec: float = 5.0,
+        hang_timeout_sec: float = 120.0,
+        start_timeout_sec: float = 600.0,
+        restart_backoff_sec: float = 1.0,
+        max_restart_backoff_sec: float = 60.0,
+        max_restarts: int = 5
+    ):
+        if num_workers < 1:
+            raise ValueError("num_workers must be at least 1")
+        if max_restarts < 0:
+            raise ValueError("max_restarts cannot be negative")
+
+        self.num_workers = num_workers
+        self._adapter_factory = adapter_factory
+        self._num_threads = num_threads or max(1, (os.cpu_count() or 1) // num_workers)
+        self._health_check_interval_sec = health_check_interval_sec
+        self._hang_timeout_sec = hang_timeout_sec
+        self._restart_backoff_sec = restart_backoff_sec
+        self._max_restart_backoff_sec = max_restart_backoff_sec
+        self._max_restarts = max_restarts
+
+        self._ctx = mp.get_context("spawn")
+        self._response_queue = self._ctx.Queue()
+        self._lock = threading.Lock()
+        self._request_ids = itertools.count()
+        self._closed = False
+        self._model_info: Dict[str, Dict[str, Any]] = {}
+        self._ready_event = threading.Event()
+
+        self._workers = [_WorkerHandle(worker_id=i) for i in range(num_workers)]
+        for handle in self._workers:
+            self._start_worker(handle)
+
+        self._listener = threading.Thread(
+            target=self._listen, name="inference_pool_listener", daemon=True
+        )
+        self._listener.start()
+
+        if not self._ready_event.wait(timeout=start_timeout_sec):
+            self.close()
+            raise RuntimeError("Inference workers did not become ready in time")
+        if not any(handle.ready for handle in self._workers):
+            errors = "; ".join(h.error for h in self._workers if h.error)
+            self.close()
+            raise RuntimeError(f"Inference workers failed to start: {errors}")
+
+        self._monitor = threading.Thread(
+            target=self._monitor_workers, name="inference_pool_monitor", daemon=True
+        )
+        self._monitor.start()
+        logger.info(
+            f"Process inference backend ready: {num_workers} workers, "
+            f"{self._num_threads} threads each"
+        )
+
+    # ------------------------------------------------------------------
+    # Worker lifecycle
+    # ------------------------------------------------------------------
+
+    def _spawn_worker(self, worker_id: int) -> Tuple[Any, Any]:
+        """Start a worker process; returns its request queue and process. Needs no lock."""
+        request_queue = self._ctx.Queue()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(
+                worker_id,
+                request_queue,
+                self._response_queue,
+                self._adapter_factory,
+                self._num_threads,
+            ),
+            name=f"inference_worker_{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        return request_queue, process
+
+    def _install_worker(self, handle: _WorkerHandle, request_queue: Any, process: Any):
+        """Put a freshly spawned process behind a worker handle. Caller holds the lock."""
+        handle.request_queue = request_queue
+        handle.process = process
+        handle.pid = process.pid
+        handle.ready = False
+        handle.error = None
+        handle.started_at = time.monotonic()
+        early_ready, handle.early_ready = handle.early_ready, None
+        if early_ready is not None and early_ready[0] == handle.pid:
+            self._mark_ready(handle, early_ready[1])
+
+    def _start_worker(self, handle: _WorkerHandle):
+        """Spawn the initial process behind a worker handle (before the listener runs)."""
+        self._install_worker(handle, *self._spawn_worker(handle.worker_id))
+
+    def _mark_ready(self, handle: _WorkerHandle, info: Dict[str, Dict[str, Any]]):
+        """Record that a worker finished loading its models. Caller holds the lock."""
+        handle.ready = True
+        self._model_info = info
+        self._ready_event.set()
+
+    @staticmethod
+    def _reap(process: Any):
+        """Kill a failed worker process and wait for it to exit."""
+        if process.is_alive():
+            process.kill()
+        process.join(timeout=5.0)
+
+    def _respawn_worker(self, handle: _WorkerHandle):
+        """Replace a failed worker's process; the slow spawn runs outside the lock."""
+        request_queue, process = self._spawn_worker(handle.worker_id)
+        with self._lock:
+            closed = self._closed
+            if not closed:
+                self._install_worker(handle, request_queue, process)
+                handle.restart_at = None
+                handle.restarts += 1
+        if closed:
+            self._reap(process)
+
+    def _fail_inflight(self, handle: _WorkerHandle, reason: str):
+        """Fail every request pending on a worker that is being replaced."""
+        inflight, handle.inflight = handle.inflight, {}
+        for pending in inflight.values():
+            self._release_shm(pending.shm)
+            if not pending.future.done():
+                pending.future.set_exception(RuntimeError(reason))
+
+    def _restart_worker(self, handle: _WorkerHandle, reason: str) -> Any:
+        """
+        Take a failed worker out of rotation, fail its requests and schedule a
+        fresh process after the backoff, or give up on it past ``max_restarts``.
+
+        Caller holds the lock; only marks the handle. Returns the old process,
+        which the caller kills (``_reap``) after releasing the lock.
+        """
+        handle.ready = False
+        self._fail_inflight(handle, f"Inference worker {handle.worker_id} {reason}")
+
+        if handle.consecutive_restarts >= self._max_restarts:
+            handle.gave_up = True
+            handle.error = f"{reason}; gave up after {handle.consecutive_restarts} consecutive restarts"
+            logger.error(f"Inference worker {handle.worker_id} (pid {handle.pid}) {handle.error}")
+            return handle.process
+
+        delay = min(
+            self._restart_backoff_sec * 2 ** handle.consecutive_restarts,
+            self._max_restart_backoff_sec
+        )
+        handle.consecutive_restarts += 1
+        handle.restart_at = time.monotonic() + delay
+        logger.error(
+            f"Inference worker {handle.worker_id} (pid {handle.pid}) {reason}; "
+            f"restarting in {delay:.1f}s"
+        )
+        return handle.process
+
+    def _monitor_workers(self):
+        """Health-check loop: restart crashed or hung workers, with backoff."""
+        while not self._closed:
+            time.sleep(self._health_check_interval_sec)
+            failed, due = [], []
+            with self._lock:
+                if self._closed:
+                    break
+                now = time.monotonic()
+                for handle in self._workers:
+                    if handle.gave_up:
+                        continue
+                    if handle.restart_at is not None:
+                        if now >= handle.restart_at:
+                            due.append(handle)
+                        continue
+                    if not handle.process.is_alive():
+                        failed.append(self._restart_worker(
+                            handle, f"crashed (exit code {handle.process.exitcode})"
+                        ))
+                    elif handle.inflight and now - min(
+                        p.started_at for p in handle.inflight.values()
+                    ) > self._hang_timeout_sec:
+                        failed.append(self._restart_worker(
+                            handle, f"hung for more than {self._hang_timeout_sec:.0f}s"
+                        ))
+                    elif (
+                        handle.consecutive_restarts
+                        and handle.ready
+                        and now - handle.started_at > self._max_restart_backoff_sec
+                    ):
+                        # Stayed up long enough: the next failure starts the backoff afresh
+                        handle.consecutive_restarts = 0
+
+            # Killing and spawning processes is slow; the listener and
+            # submitters keep using the healthy workers meanwhile
+            for process in failed:
+                self._reap(process)
+            for handle in due:
+                self._respawn_worker(handle)
+
+    def _listen(self):
+        """Route worker messages to the waiting futures."""
+        while True:
+            try:
+                message = self._response_queue.get(timeout=0.5)
+            except queue.Empty:
+                if self._closed:
+                    break
+                continue
+            except (EOFError, OSError):
+                break
+
+            kind, worker_id = message[0], message[1]
+            with self._lock:
+                handle = self._workers[worker_id]
+                if kind == "ready":
+                    _, _, pid, info = message
+                    if pid == handle.pid:
+                        self._mark_ready(handle, info)
+                    else:
+                        # A respawned process not installed yet (or a stale one)
+                        handle.early_ready = (pid, info)
+                    continue
+                if kind == "failed":
+                    _, _, pid, error = message
+                    handle.error = error
+                    logger.error(f"Inference worker {worker_id} failed to load models: {error}")
+                    if all(h.error for h in self._workers):
+                        self._ready_event.set()
+                    continue
+
+                _, _, request_id, ok, payload, fallback = message
+                pending = handle.inflight.pop(request_id, None)
+
+            if pending is None:
+                # Answer from a worker that was restarted meanwhile
+                continue
+            self._release_shm(pending.shm)
+            if ok:
+                pending.future.fallback = fallback
+                pending.future.set_result(payload)
+            else:
+                error_type, error_message = payload
+                exc_class = _PASSTHROUGH_ERRORS.get(error_type, RuntimeError)
+                pending.future.set_exception(exc_class(error_message))
+
+    # ------------------------------------------------------------------
+    # Request API
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _release_shm(shm: Optional[shared_memory.SharedMemory]):
+        if shm is None:
+            return
+        try:
+            shm.close()
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _pick_worker(self) -> _WorkerHandle:
+        """Least-loaded ready worker (any running worker while they are still loading)."""
+        running = [h for h in self._workers if not h.gave_up and h.restart_at is None]
+        candidates = [h for h in running if h.ready] or running
+        if not candidates:
+            raise RuntimeError("No inference worker available")
+        return min(candidates, key=lambda h: len(h.inflight))
+
+    def _submit_to(self, handle: _WorkerHandle, op: str, sample: Optional[AudioSample], args: tuple = ()) -> Future:
+        """Queue one request on a specific worker. Caller holds the lock."""
+        future = _InferenceFuture()
+        request_id = next(self._request_ids)
+        shm = None
+        shm_name, num_samples, meta = None, 0, None
+
+        if sample is not None:
+            # Shared memory segments cannot be empty
+            shm = shared_memory.SharedMemory(create=True, size=max(1, sample.waveform.nbytes))
+            num_samples = sample.num_samples
+            np.ndarray((num_samples,), dtype=np.float32, buffer=shm.buf)[:] = sample.waveform
+            shm_name = shm.name
+            meta = {
+                "sample_rate": sample.sample_rate,
+                "source_format": sample.source_format,
+                "original_sample_rate": sample.original_sample_rate,
+                "original_channels": sample.original_channels,
+                "source_num_bytes": sample.source_num_bytes,
+            }
+
+        handle.inflight[request_id] = _InFlight(future=future, shm=shm)
+        handle.request_queue.put((request_id, op, shm_name, num_samples, meta, args))
+        return future
+
+    def submit(self, op: str, audio_data: Optional[AudioInput] = None, args: tuple = ()) -> Future:
+        """Send an operation (with extra picklable ``args``) to the least-loaded worker."""
+        if self._closed:
+            raise RuntimeError("Inference backend is closed")
+        sample = None if op in _CONTROL_OPS else as_audio_sample(audio_data)
+        with self._lock:
+            return self._submit_to(self._pick_worker(), op, sample, args)
+
+    def run(
+        self,
+        op: str,
+        audio_data: Optional[AudioInput] = None,
+        timeout: Optional[float] = None,
+        args: tuple = ()
+    ) -> Any:
+        """Submit an operation and block until its result is available."""
+        future = self.submit(op, audio_data, args)
+        result = future.result(timeout=timeout)
+        if future.fallback:
+            # Report the worker's fallback in the caller's context
+            mark_fallback_result(op)
+        return result
+
+    def _broadcast(self, op: str, timeout: float) -> List[Tuple[_WorkerHandle, Optional[Future]]]:
+        """Send a control operation to every ready worker."""
+        with self._lock:
+            futures = [
+                (h, self._submit_to(h, op, None) if h.ready and h.process.is_alive() else None)
+                for h in self._workers
+            ]
+        deadline = time.monotonic() + timeout
+        for _, future in futures:
+            if future is not None:
+                try:
+                    future.result(timeout=max(0.0, deadline - time.monotonic()))
+                except Exception:
+                    pass
+        return futures
+
+    def health_check(self, probe: bool = True, timeout: float = 2.0) -> Dict[str, Any]:
+        """
+        Report per-worker health.
+
+        Args:
+            probe: Also round-trip a ping through every ready worker.
+            timeout: Maximum time to wait for the pings.
+        """
+        pings = {}
+        if probe and not self._closed:
+            for handle, future in self._broadcast(OP_PING, timeout):
+                pings[handle.worker_id] = (
+                    future is not None and future.done() and future.exception() is None
+                )
+
+        with self._lock:
+            workers = [
+                {
+                    "worker_id": h.worker_id,
+                    "pid": h.pid,
+                    "alive": h.process.is_alive(),
+                    "ready": h.ready,
+                    "responsive": pings.get(h.worker_id) if probe else None,
+                    "inflight": len(h.inflight),
+                    "restarts": h.restarts,
+                    "consecutive_restarts": h.consecutive_restarts,
+                    "restart_pending": h.restart_at is not None,
+                    "gave_up": h.gave_up,
+                    "uptime_sec": time.monotonic() - h.started_at,
+                    "error": h.error,
+                }
+                for h in self._workers
+            ]
+
+        healthy = all(
+            w["alive"] and w["ready"] and (w["responsive"] is not False) for w in workers
+        )
+        # Workers given up on are not coming back without a redeploy
+        degraded = any(w["gave_up"] for w in workers)
+        return {"backend": "process", "healthy": healthy, "degraded": degraded, "workers": workers}
+
+    def get_model_info(self, key: str) -> Dict[str, Any]:
+        """Model identity reported by the workers at startup."""
+        return self._model_info.get(key, {})
+
+    def get_worker_stats(self, key: str, stat: str = "batching", timeout: float = 2.0) -> Optional[Dict[str, Any]]:
+        """Batching or replica stats of one model type across workers."""
+        stats = {}
+        for handle, future in self._broadcast(OP_STATS, timeout):
+            if future is not None and future.done() and future.exception() is None:
+                stats[f"worker_{handle.worker_id}"] = future.result().get(key, {}).get(stat)
+        return stats or None
+
+    def close(self):
+        """Stop all workers and fail anything still pending."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._workers)
+
+        for handle in workers:
+            try:
+                handle.request_queue.put(None)
+            except Exception:
+                pass
+        for handle in workers:
+            handle.process.join(timeout=10.0)
+            if handle.process.is_alive():
+                handle.process.kill()
+                handle.process.join(timeout=5.0)
+            with self._lock:
+                self._fail_inflight(handle, "Inference backend is closed")
+        logger.info("Process inference backend stopped")
+
+
+class _RemoteAdapter:
+    """Adapter-shaped proxy that forwards calls to the process pool."""
+
+    model_key = ""
+
+    def __init__(self, backend: ProcessPoolInferenceBackend, timeout_sec: Optional[float] = None):
+        self._backend = backend
+        self._timeout_sec = timeout_sec
+
+    def _run(self, op: str, audio_data: AudioInput, *args) -> Any:
+        return self._backend.run(op, audio_data, timeout=self._timeout_sec, args=args)
+
+    def get_model_id(self) -> Optional[int]:
+        return self._backend.get_model_info(self.model_key).get("id")
+
+    def get_model_name(self) -> Optional[str]:
+        return self._backend.get_model_info(self.model_key).get("name")
+
+    def get_model_version(self) -> Optional[str]:
+        return self._backend.get_model_info(self.model_key).get("version")
+
+    def is_model_loaded(self) -> bool:
+        return self._backend.get_model_info(self.model_key).get("loaded", True)
+
+    def get_batching_stats(self) -> Optional[Dict[str, Any]]:
+        return self._backend.get_worker_stats(self.model_key, "batching")
+
+    def get_replica_stats(self) -> Optional[Dict[str, Any]]:
+        return self._backend.get_worker_stats(self.model_key, "replicas")
+
+    def health_check(self) -> Dict[str, Any]:
+        return self._backend.health_check()
+
+    def close(self):
+        """Closing any proxy shuts the shared backend down (idempotent)."""
+        self._backend.close()
+
+
+class RemoteSpeakerEmbeddingAdapter(_RemoteAdapter):
+    """SpeakerEmbeddingAdapter interface backed by the process pool."""
+
+    model_key = "speaker"
+
+    def extract_embedding(self, audio_data: AudioInput, audio_format: str = "wav"):
+        return self._run(OP_EMBED, as_audio_sample(audio_data, audio_format))
+
+    def validate_audio_quality(self, audio_data: AudioInput, audio_format: Optional[str] = None) -> Dict[str, Any]:
+        try:
+            sample = as_audio_sample(audio_data, audio_format)
+        except ValueError as e:
+            return {"is_valid": False, "reason": str(e)}
+        return self._run(OP_VALIDATE, sample)
+
+
+class RemoteSpoofDetectorAdapter(_RemoteAdapter):
+    """SpoofDetectorAdapter interface backed by the process pool."""
+
+    model_key = "antispoof"
+
+    def detect_spoof(self, audio_data: AudioInput) -> float:
+        return self._run(OP_DETECT_SPOOF, audio_data)
+
+
+class RemoteASRAdapter(_RemoteAdapter):
+    """ASRAdapter interface backed by the process pool."""
+
+    model_key = "asr"
+
+    def transcribe(self, audio_data: AudioInput) -> str:
+        return self._run(OP_TRANSCRIBE, audio_data)
+
+    def score_phrase(self, audio_data: AudioInput, expected_phrase: str) -> Dict[str, Any]:
+        return self._run(OP_SCORE_PHRASE, audio_data, expected_phrase)
+
+
+def create_remote_adapters(
+    backend: ProcessPoolInferenceBackend,
+    timeout_sec: Optional[float] = None
+) -> Tuple[RemoteSpeakerEmbeddingAdapter, RemoteSpoofDetectorAdapter, RemoteASRAdapter]:
+    """Build the speaker, anti-spoofing and ASR proxies for VoiceBiometricEngineFacade."""
+    return (
+        RemoteSpeakerEmbeddingAdapter(backend, timeout_sec),
+        RemoteSpoofDetectorAdapter(backend, timeout_sec),
+        RemoteASRAdapter(backend, timeout_sec),
+    )
@@ -0,0 +1,64 @@
+"""Dynamic INT8 quantization for CPU inference.
+
+Dynamic quantization stores the weights of Linear/LSTM/GRU layers as int8
+and quantizes activations on the fly, which cuts their memory roughly by
+four and speeds up the matmuls on CPU. Convolutions are left in fp32, so
+the gain per model depends on how much of it is made of these layers
+(most of wav2vec2, the GRU/FC head of RawNet2, the attention and FC layers
+of AASIST and ECAPA-TDNN).
+
+Whether a model is quantized is configured per model in ``ModelManager``
+(``ModelConfig.quantize`` / ``QUANTIZE_MODELS``). Use
+``evaluation/scripts/evaluate_quantization.py`` to measure the EER and
+score drift against fp32 before enabling it.
+"""
+
+import logging
+from typing import Optional
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+# Layer types replaced by their dynamically quantized counterparts
+QUANTIZABLE_LAYERS = {torch.nn.Linear, torch.nn.LSTM, torch.nn.GRU}
+
+# Suffix appended to the model version so audit trails distinguish int8 results
+QUANTIZED_VERSION_SUFFIX = "+int8"
+
+
+def is_quantization_supported(device: Optional[torch.device] = None) -> bool:
+    """Dynamic quantization runs on CPU only and needs a quantized engine."""
+    if device is not None and device.type != "cpu":
+        return False
+    return any(engine != "none" for engine in torch.backends.quantized.supported_engines)
+
+
+def _add_flatten_parameters_noop(module: torch.nn.Module):
+    """
+    Quantized RNNs have no ``flatten_parameters`` (a cuDNN-only fp32 call),
+    but forward code such as RawNet2's calls it; give them a no-op.
+    """
+    for submodule in module.modules():
+        if isinstance(submodule, (torch.ao.nn.quantized.dynamic.LSTM, torch.ao.nn.quantized.dynamic.GRU)) and \
+                not hasattr(submodule, "flatten_parameters"):
+            submodule.flatten_parameters = lambda: None
+
+
+def quantize_dynamic_int8(module: torch.nn.Module, name: str = "model") -> bool:
+    """
+    Quantize the Linear/LSTM/GRU layers of a module in place.
+
+    Returns True on success. On failure the module keeps its fp32 layers and
+    a warning is logged, so loading never breaks.
+    """
+    try:
+        torch.ao.quantization.quantize_dynamic(
+            module, QUANTIZABLE_LAYERS, dtype=torch.qint8, inplace=True
+        )
+        _add_flatten_parameters_noop(module)
+        logger.info(f"{name}: applied dynamic INT8 quantization")
+        return True
+    except Exception as e:
+        logger.warning(f"{name}: dynamic quantization failed, keeping fp32 ({e})")
+        return False
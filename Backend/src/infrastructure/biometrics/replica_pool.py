@@ -0,0 +1,168 @@
+"""Pool of independent model replicas.
+
+An adapter with a single model instance behind ``threading.Lock`` runs at
+most one inference at a time, whatever the core count. A
+``ModelReplicaPool`` holds K instances instead; callers check one out for
+the duration of a forward pass and return it afterwards, so up to K
+inferences of the same model run in parallel. This trades memory (one copy
+of the weights per replica) for throughput on large CPU boxes.
+
+Each replica can be given its own intra-op thread budget so K replicas do
+not oversubscribe the cores. ``torch.set_num_threads`` is applied in the
+thread that checks the replica out; with the OpenMP backend the setting is
+per calling thread, so concurrent replicas each get their own share. When
+the CPU resource governor is enabled, the model's governed budget (split
+between its replicas) replaces the fixed per-replica setting and every
+checkout reports its duration back to the governor.
+"""
+
+import copy
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import torch
+
+from .resource_governor import get_resource_governor
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Replica:
+    """One model instance and its index in the pool."""
+    index: int
+    model: Any
+
+
+class ModelReplicaPool:
+    """
+    Checkout/return pool of K model replicas with wait-time metrics.
+
+    Args:
+        replicas: The model instances (at least one).
+        threads_per_replica: torch intra-op threads used while a replica is
+            checked out. None leaves the process setting untouched.
+        name: Name used in log messages and errors.
+        governor_key: Model key under the CPU resource governor
+            ("speaker", "antispoof" or "asr"); None opts out.
+    """
+
+    def __init__(
+        self,
+        replicas: List[Any],
+        threads_per_replica: Optional[int] = None,
+        name: str = "model_pool",
+        governor_key: Optional[str] = None
+    ):
+        if not replicas:
+            raise ValueError("A replica pool needs at least one model")
+
+        self.name = name
+        self.size = len(replicas)
+        self.threads_per_replica = threads_per_replica
+        self.governor_key = governor_key
+        self._governor = get_resource_governor() if governor_key else None
+
+        self._available: "queue.Queue[_Replica]" = queue.Queue()
+        for index, model in enumerate(replicas):
+            self._available.put(_Replica(index=index, model=model))
+
+        # Checkout statistics
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._total_wait_ms = 0.0
+        self._max_wait_ms = 0.0
+        self._waited_checkouts = 0
+
+    @classmethod
+    def from_model(
+        cls,
+        model: Any,
+        size: int = 1,
+        threads_per_replica: Optional[int] = None,
+        name: str = "model_pool",
+        clone_fn: Callable[[Any], Any] = copy.deepcopy,
+        governor_key: Optional[str] = None
+    ) -> "ModelReplicaPool":
+        """
+        Build a pool from one loaded model by cloning it ``size - 1`` times.
+
+        Cloning an in-memory model is much cheaper than loading it from
+        disk again. If cloning fails the pool keeps the replicas built so far.
+        """
+        replicas = [model]
+        for _ in range(max(0, size - 1)):
+            try:
+                replicas.append(clone_fn(model))
+            except Exception as e:
+                logger.warning(f"{name}: could not clone replica ({e}); using {len(replicas)}")
+                break
+
+        if threads_per_replica is None and len(replicas) > 1:
+            threads_per_replica = max(1, torch.get_num_threads() // len(replicas))
+
+        pool = cls(replicas, threads_per_replica=threads_per_replica, name=name, governor_key=governor_key)
+        logger.info(
+            f"{name}: {pool.size} replica(s)"
+            + (f", {pool.current_threads_per_replica()} thread(s) each" if pool.current_threads_per_replica() else "")
+        )
+        return pool
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """
+        Borrow a replica for one inference, blocking until one is free.
+
+        Raises:
+            TimeoutError: If no replica becomes free within ``timeout`` seconds
+        """
+        started = time.perf_counter()
+        try:
+            replica = self._available.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"{self.name}: no replica available after {timeout}s")
+        wait_ms = (time.perf_counter() - started) * 1000
+
+        with self._stats_lock:
+            self._checkouts += 1
+            self._total_wait_ms += wait_ms
+            self._max_wait_ms = max(self._max_wait_ms, wait_ms)
+            if wait_ms >= 1.0:
+                self._waited_checkouts += 1
+
+        try:
+            if self._governor is not None:
+                with self._governor.run(self.governor_key, share=self.size):
+                    yield replica.model
+            else:
+                # Per calling thread with OpenMP; inference threads keep the budget
+                if self.threads_per_replica and torch.get_num_threads() != self.threads_per_replica:
+                    torch.set_num_threads(self.threads_per_replica)
+                yield replica.model
+        finally:
+            self._available.put(replica)
+
+    def current_threads_per_replica(self) -> Optional[int]:
+        """Intra-op threads a checkout currently runs with (None: process default)."""
+        if self._governor is not None:
+            return self._governor.budget(self.governor_key, share=self.size)
+        return self.threads_per_replica
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get checkout statistics for monitoring."""
+        with self._stats_lock:
+            checkouts = self._checkouts
+            return {
+                "replicas": self.size,
+                "available": self._available.qsize(),
+                "threads_per_replica": self.current_threads_per_replica(),
+                "checkouts": checkouts,
+                "waited_checkouts": self._waited_checkouts,
+                "avg_wait_ms": self._total_wait_ms / checkouts if checkouts else 0.0,
+                "max_wait_ms": self._max_wait_ms,
+            }
@@ -0,0 +1,132 @@
+"""
+Process-wide cache of resampling kernels.
+
+torchaudio's sinc resampler is a polyphase filter bank: both rates are
+divided by their GCD (44.1 kHz -> 16 kHz becomes 441 -> 160) and one
+windowed-sinc filter per output phase is applied as a single strided
+convolution. ``torchaudio.functional.resample`` rebuilds that filter bank on
+every call, which costs more than filtering a few seconds of audio.
+
+Here each (orig_rate, target_rate, dtype) gets one ``Resample`` module whose
+kernel is built once and shared by every request and thread. The browser
+rates (RESAMPLER_PRELOAD_RATES, default 44.1 and 48 kHz) are built at start-up
+so the first upload does not pay for it, and before worker processes fork.
+
+The filter bank has about ``orig / gcd * target / gcd`` taps, and the
+source rate comes from a client-controlled header: 44.1 kHz needs 441 x 160
+taps, a coprime rate such as 44101 Hz would need gigabytes. Rates whose
+reduced ratio exceeds MAX_REDUCED_RATE are rejected before any kernel is
+built, and the cache keeps at most RESAMPLER_CACHE_SIZE kernels (least
+recently used first out).
+"""
+
+import logging
+import math
+import os
+import threading
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+import torch
+import torchaudio
+
+from .audio_validation import AudioValidationError
+
+logger = logging.getLogger(__name__)
+
+TARGET_SAMPLE_RATE = 16000
+DEFAULT_PRELOAD_RATES = (44100, 48000)
+DEFAULT_CACHE_SIZE = 8
+
+# Largest rate / gcd accepted; covers every standard rate (44.1 kHz -> 441)
+MAX_REDUCED_RATE = 1000
+
+ResamplerKey = Tuple[int, int, torch.dtype]
+
+_resamplers: "OrderedDict[ResamplerKey, torchaudio.transforms.Resample]" = OrderedDict()
+_resamplers_lock = threading.Lock()
+
+
+def cache_size_from_env() -> int:
+    """Kernels kept in the cache (RESAMPLER_CACHE_SIZE)."""
+    return max(1, int(os.getenv("RESAMPLER_CACHE_SIZE", str(DEFAULT_CACHE_SIZE))))
+
+
+def is_supported_rate(orig_rate: int, target_rate: int = TARGET_SAMPLE_RATE) -> bool:
+    """Whether the kernel for this rate pair has a bounded size."""
+    if orig_rate <= 0 or target_rate <= 0:
+        return False
+    divisor = math.gcd(orig_rate, target_rate)
+    return max(orig_rate, target_rate) // divisor <= MAX_REDUCED_RATE
+
+
+def get_resampler(
+    orig_rate: int,
+    target_rate: int = TARGET_SAMPLE_RATE,
+    dtype: torch.dtype = torch.float32
+) -> torchaudio.transforms.Resample:
+    """
+    The shared resampler for a rate pair, building its kernel on first use.
+
+    Raises:
+        AudioValidationError: If the rate pair would need an oversized kernel
+    """
+    key = (int(orig_rate), int(target_rate), dtype)
+    with _resamplers_lock:
+        resampler = _resamplers.get(key)
+        if resampler is not None:
+            _resamplers.move_to_end(key)
+            return resampler
+
+    if not is_supported_rate(key[0], key[1]):
+        raise AudioValidationError(f"Unsupported sample rate: {key[0]}Hz")
+
+    # Built outside the lock: another rate must not wait for this kernel
+    resampler = torchaudio.transforms.Resample(key[0], key[1], dtype=dtype).eval()
+    with _resamplers_lock:
+        resampler = _resamplers.setdefault(key, resampler)
+        _resamplers.move_to_end(key)
+        while len(_resamplers) > cache_size_from_env():
+            evicted, _ = _resamplers.popitem(last=False)
+            logger.debug(f"Evicted resampler {evicted[0]} -> {evicted[1]} Hz")
+    return resampler
+
+
+def resample(
+    waveform: np.ndarray,
+    orig_rate: int,
+    target_rate: int = TARGET_SAMPLE_RATE
+) -> np.ndarray:
+    """Resample a 1-D (or channels-first) array with the cached kernel."""
+    if orig_rate == target_rate:
+        return waveform
+    # The decoded buffers are read-only; copy only when torch would get such a view
+    tensor = torch.from_numpy(np.require(waveform, requirements=["C", "W"]))
+    with torch.inference_mode():
+        return get_resampler(orig_rate, target_rate, tensor.dtype)(tensor).numpy()
+
+
+def preload_rates_from_env() -> List[int]:
+    """Source rates whose kernels are built at start-up (RESAMPLER_PRELOAD_RATES)."""
+    raw = os.getenv("RESAMPLER_PRELOAD_RATES")
+    if raw is None:
+        return list(DEFAULT_PRELOAD_RATES)
+    return [int(rate) for rate in raw.split(",") if rate.strip()]
+
+
+def preload_resamplers(rates: Optional[Iterable[int]] = None):
+    """Build the kernels for the given source rates (default: RESAMPLER_PRELOAD_RATES)."""
+    for rate in preload_rates_from_env() if rates is None else rates:
+        if rate != TARGET_SAMPLE_RATE:
+            get_resampler(rate)
+
+
+def cached_resamplers() -> List[ResamplerKey]:
+    with _resamplers_lock:
+        return list(_resamplers)
+
+
+def clear_resamplers():
+    with _resamplers_lock:
+        _resamplers.clear()
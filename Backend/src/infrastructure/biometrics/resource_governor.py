@@ -0,0 +1,232 @@
+"""
+CPU resource governor for the three models.
+
+The facade runs the speaker, anti-spoofing and ASR models concurrently. Left
+alone, each forward pass uses torch's default intra-op thread count (all
+cores), so three concurrent passes oversubscribe the CPU and thrash. The
+governor splits a fixed thread budget between the models instead:
+
+- every model gets ``budget(key)`` intra-op threads, divided between its
+  replicas (applied by ``ModelReplicaPool`` when a replica is checked out);
+- with the ``adaptive`` policy, budgets are periodically recomputed from the
+  measured forward-pass latency of each model, so the three parallel
+  branches of a request finish at about the same time;
+- a model on ONNX Runtime sets its thread count once, when its session is
+  created; ``fix_budget`` records it, and rebalancing splits only the
+  remaining threads between the other models.
+
+Core pinning is not offered: the models share the facade's executor
+threads, and ``sched_setaffinity`` on one of them neither follows the model
+nor reaches the OpenMP workers torch already started.
+
+Small budgets favour throughput (more requests in flight), large budgets
+favour the latency of a single request; ``CPU_TOTAL_THREADS`` and
+``CPU_THREAD_BUDGETS`` tune this per deployment. The active allocation is
+reported by ``VoiceBiometricEngineFacade.get_engine_info``.
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+GOVERNED_MODELS = ("speaker", "antispoof", "asr")
+
+POLICY_STATIC = "static"
+POLICY_ADAPTIVE = "adaptive"
+
+# Relative cost of one forward pass (wav2vec2 >> AASIST+RawNet2 > ECAPA)
+DEFAULT_WEIGHTS = {"speaker": 1.0, "antispoof": 1.5, "asr": 2.5}
+
+
+def _parse_budgets(raw: Optional[str]) -> Dict[str, float]:
+    """Parse "speaker:2,antispoof:3,asr:3" into weights."""
+    weights = {}
+    for item in (raw or "").split(","):
+        if ":" in item:
+            key, value = item.split(":", 1)
+            weights[key.strip()] = float(value)
+    return weights
+
+
+class CPUResourceGovernor:
+    """
+    Thread budgets per model.
+
+    Args:
+        total_threads: Threads shared by all models; defaults to torch's
+            intra-op setting (the physical cores available to the process).
+        weights: Initial share of each model; budgets are proportional.
+        policy: ``static`` keeps the initial budgets, ``adaptive`` rebalances
+            them from measured latency.
+        rebalance_every: Forward passes between two adaptive rebalances.
+        min_samples: Measurements each model needs before rebalancing.
+        smoothing: EWMA factor of the latency measurements.
+    """
+
+    def __init__(
+        self,
+        total_threads: Optional[int] = None,
+        weights: Optional[Dict[str, float]] = None,
+        policy: str = POLICY_ADAPTIVE,
+        rebalance_every: int = 50,
+        min_samples: int = 10,
+        smoothing: float = 0.1
+    ):
+        if policy not in (POLICY_STATIC, POLICY_ADAPTIVE):
+            raise ValueError(f"Unknown governor policy: {policy}")
+
+        self.total_threads = max(len(GOVERNED_MODELS), total_threads or torch.get_num_threads())
+        self.policy = policy
+        self._rebalance_every = rebalance_every
+        self._min_samples = min_samples
+        self._smoothing = smoothing
+
+        self._lock = threading.Lock()
+        self._work_ms: Dict[str, Optional[float]] = {key: None for key in GOVERNED_MODELS}
+        self._samples: Dict[str, int] = {key: 0 for key in GOVERNED_MODELS}
+        self._since_rebalance = 0
+        self._rebalances = 0
+        self._fixed: Dict[str, int] = {}  # Thread counts set at session creation (ONNX Runtime)
+
+        initial = dict(DEFAULT_WEIGHTS)
+        initial.update(weights or {})
+        self._budgets = self._allocate(
+            {key: initial.get(key, 1.0) for key in GOVERNED_MODELS}, self.total_threads
+        )
+        logger.info(f"CPU governor ({policy}): {self.total_threads} threads, budgets {self._budgets}")
+
+    @staticmethod
+    def _allocate(weights: Dict[str, float], total_threads: int) -> Dict[str, int]:
+        """Split total_threads proportionally to weights (at least one thread each)."""
+        total_weight = sum(weights.values()) or 1.0
+        spare = max(0, total_threads - len(weights))
+        exact = {key: spare * weight / total_weight for key, weight in weights.items()}
+        budgets = {key: 1 + int(share) for key, share in exact.items()}
+
+        # Largest remainders get the threads lost to rounding down
+        leftover = max(0, total_threads - sum(budgets.values()))
+        for key in sorted(exact, key=lambda k: exact[k] - int(exact[k]), reverse=True)[:leftover]:
+            budgets[key] += 1
+        return budgets
+
+    def fix_budget(self, key: str, threads: int):
+        """
+        Record that a model runs with a thread count fixed at creation (an
+        ONNX Runtime session), so it is reported as applied and rebalancing
+        leaves it alone.
+        """
+        if key not in self._budgets:
+            return
+        with self._lock:
+            self._fixed[key] = threads
+            self._budgets[key] = threads
+        logger.info(f"CPU governor: {key} runs with a fixed {threads} threads")
+
+    def budget(self, key: str, share: int = 1) -> int:
+        """Intra-op threads of one of ``share`` concurrent passes of a model."""
+        with self._lock:
+            return max(1, self._budgets.get(key, 1) // max(1, share))
+
+    @contextmanager
+    def run(self, key: str, share: int = 1) -> Iterator[None]:
+        """
+        Apply the model's budget to the calling thread for one forward pass
+        and record its latency.
+        """
+        threads = self.budget(key, share)
+        if torch.get_num_threads() != threads:
+            torch.set_num_threads(threads)
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(key, (time.perf_counter() - started) * 1000, threads)
+
+    def record(self, key: str, latency_ms: float, threads: Optional[int] = None):
+        """
+        Add a forward-pass measurement.
+
+        The governor tracks thread-milliseconds (latency x threads used), an
+        estimate of the work of a pass that does not depend on the budget it
+        ran with.
+        """
+        if key not in self._work_ms:
+            return
+        work = latency_ms * (threads or self.budget(key))
+        with self._lock:
+            previous = self._work_ms[key]
+            self._work_ms[key] = work if previous is None else (
+                previous + self._smoothing * (work - previous)
+            )
+            self._samples[key] += 1
+            self._since_rebalance += 1
+            should_rebalance = (
+                self.policy == POLICY_ADAPTIVE
+                and self._since_rebalance >= self._rebalance_every
+                and all(count >= self._min_samples for count in self._samples.values())
+            )
+        if should_rebalance:
+            self.rebalance()
+
+    def rebalance(self):
+        """Make budgets proportional to each model's measured work (fixed budgets stay)."""
+        with self._lock:
+            self._since_rebalance = 0
+            if any(work is None for work in self._work_ms.values()):
+                return
+            adjustable = {key: work for key, work in self._work_ms.items() if key not in self._fixed}
+            if not adjustable:
+                return
+            budgets = self._allocate(adjustable, self.total_threads - sum(self._fixed.values()))
+            budgets.update(self._fixed)
+            if budgets == self._budgets:
+                return
+            self._budgets = budgets
+            self._rebalances += 1
+        logger.info(f"CPU governor rebalanced thread budgets: {budgets}")
+
+    def get_allocation(self) -> Dict[str, Any]:
+        """Active allocation for get_engine_info."""
+        with self._lock:
+            return {
+                "policy": self.policy,
+                "total_threads": self.total_threads,
+                "rebalances": self._rebalances,
+                "models": {
+                    key: {
+                        "threads": self._budgets[key],
+                        "fixed": key in self._fixed,
+                        "work_ms": self._work_ms[key],
+                        "samples": self._samples[key],
+                    }
+                    for key in GOVERNED_MODELS
+                },
+            }
+
+
+_governor: Optional[CPUResourceGovernor] = None
+_governor_lock = threading.Lock()
+
+
+def get_resource_governor() -> Optional[CPUResourceGovernor]:
+    """Process-wide governor configured from CPU_GOVERNOR_* settings (None when disabled)."""
+    global _governor
+    if os.getenv("CPU_GOVERNOR_ENABLED", "true").lower() not in ("1", "true", "yes"):
+        return None
+    with _governor_lock:
+        if _governor is None:
+            total = os.getenv("CPU_TOTAL_THREADS")
+            _governor = CPUResourceGovernor(
+                total_threads=int(total) if total else None,
+                weights=_parse_budgets(os.getenv("CPU_THREAD_BUDGETS")),
+                policy=os.getenv("CPU_GOVERNOR_POLICY", POLICY_ADAPTIVE).lower(),
+            )
+        return _governor
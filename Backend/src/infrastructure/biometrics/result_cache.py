@@ -0,0 +1,186 @@
+"""Content-addressed cache of inference results.
+
+Clients retry uploads after timeouts and the evaluation scripts re-submit
+the same files, so identical audio often reaches the models more than
+once. Results are keyed by the SHA-256 of the decoded audio
+(``AudioSample.digest``: mono float32 at 16 kHz, so the same recording in
+another container hits as well) plus the kind of result and the id and
+version of the model that produced it. A new model version never serves a
+stale entry.
+
+Entries are evicted least-recently-used beyond ``max_entries`` and expire
+after ``ttl_sec``. The cache lives in process memory only; with the
+process-pool backend it sits in the API process in front of the workers.
+
+Adapters that answer with a mock or heuristic fallback instead of the model
+call ``mark_fallback_result``; such results are returned but never stored,
+so a transient model failure is not served from the cache afterwards.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Kinds of cached results
+RESULT_EMBEDDING = "embedding"
+RESULT_SPOOF = "spoof"
+RESULT_TRANSCRIPT = "transcript"
+RESULT_PHRASE = "phrase"  # suffixed with the expected phrase, see phrase_result_kind
+
+
+def phrase_result_kind(expected_phrase: str) -> str:
+    """Result kind of a phrase score: one entry per (audio, phrase) pair."""
+    return f"{RESULT_PHRASE}:{expected_phrase}"
+
+
+# Fallbacks reported by the adapters during the inference being tracked
+_fallback_sources: ContextVar[Optional[List[str]]] = ContextVar("inference_fallback_sources", default=None)
+
+
+def mark_fallback_result(source: str):
+    """Flag the result being computed as a fallback output (no-op outside ``track_fallbacks``)."""
+    sources = _fallback_sources.get()
+    if sources is not None:
+        sources.append(source)
+
+
+@contextmanager
+def track_fallbacks() -> Iterator[List[str]]:
+    """
+    Collect the fallbacks reported while the block runs.
+
+    The list is shared with contexts copied inside the block, so executor
+    threads started with ``contextvars.copy_context()`` report into it too.
+    """
+    sources: List[str] = []
+    token = _fallback_sources.set(sources)
+    try:
+        yield sources
+    finally:
+        _fallback_sources.reset(token)
+
+
+class InferenceResultCache:
+    """
+    Thread-safe LRU + TTL cache of model outputs with hit/miss counters.
+
+    Args:
+        max_entries: Maximum number of results kept; 0 disables the cache.
+        ttl_sec: Seconds an entry stays valid; 0 or less never expires.
+        name: Name used in log messages.
+        clock: Monotonic time source (injectable for tests).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_sec: float = 300.0,
+        name: str = "result_cache",
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.max_entries = max(0, max_entries)
+        self.ttl_sec = ttl_sec
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._bypassed = 0
+        self._fallbacks = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def make_key(
+        digest: str,
+        kind: str,
+        model_id: Optional[int],
+        model_version: Optional[str]
+    ) -> Tuple[str, str, Optional[int], Optional[str]]:
+        """Key of one result: audio digest, result kind and model identity."""
+        return (digest, kind, model_id, model_version)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached result, or None on a miss or an expired entry."""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_expired(entry[0]):
+                del self._entries[key]
+                self._expirations += 1
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            value = entry[1]
+
+        # Callers may modify embeddings in place; never hand out the stored array
+        return value.copy() if isinstance(value, np.ndarray) else value
+
+    def put(self, key: Hashable, value: Any):
+        """Store a result, evicting the least recently used entries if full."""
+        if not self.enabled or value is None:
+            return
+        if isinstance(value, np.ndarray):
+            value = value.copy()
+
+        with self._lock:
+            self._entries[key] = (self._clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def record_bypass(self):
+        """Count a request that skipped the lookup on purpose."""
+        with self._lock:
+            self._bypassed += 1
+
+    def record_fallback(self):
+        """Count a fallback result that was not stored."""
+        with self._lock:
+            self._fallbacks += 1
+
+    def clear(self):
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def _is_expired(self, stored_at: float) -> bool:
+        return self.ttl_sec > 0 and self._clock() - stored_at > self.ttl_sec
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics for monitoring."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_sec": self.ttl_sec,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "bypassed": self._bypassed,
+                "fallbacks_not_cached": self._fallbacks,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
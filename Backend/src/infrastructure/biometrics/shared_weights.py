@@ -0,0 +1,178 @@
+"""
+Memory-mapped, fork-shared model weights.
+
+Normally every API worker process reads each checkpoint into its own
+anonymous memory and copies it into freshly allocated parameters, so N
+workers hold N private copies of ECAPA, AASIST, RawNet2 and wav2vec2.
+
+With SHARED_MODEL_WEIGHTS enabled:
+
+- checkpoints are opened with ``torch.load(..., mmap=True)`` and assigned
+  to the modules (``load_state_dict(assign=True)``) instead of copied, so
+  the parameters *are* file-backed pages of the page cache, shared by every
+  process that maps the same file;
+- ``preload_shared_weights`` (called in the master before workers fork,
+  see ``gunicorn.conf.py``) loads every checkpoint under the ModelManager
+  model directories once and freezes the garbage collector, so forked
+  workers inherit the mappings (and any checkpoint that cannot be mapped)
+  copy-on-write.
+
+SpeechBrain's parameter-transfer hook and the local anti-spoofing loaders
+both go through ``load_checkpoint`` / ``load_state_dict_shared``. Weights
+that are rewritten after loading (INT8 quantization, extra replicas) become
+private to the worker as usual.
+"""
+
+import gc
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_SUFFIXES = (".ckpt", ".pt", ".pth")
+
+_store: Dict[Path, Any] = {}
+_store_lock = threading.Lock()
+_hooks_installed = False
+
+
+def shared_weights_enabled() -> bool:
+    return os.getenv("SHARED_MODEL_WEIGHTS", "false").lower() in ("1", "true", "yes")
+
+
+def _torch_load(path: Path, map_location: Any) -> Any:
+    """
+    torch.load with mmap when the file format allows it (zip checkpoints).
+
+    Always weights-only: a checkpoint that needs full unpickling fails here
+    just as it does with a plain ``torch.load``.
+    """
+    try:
+        return torch.load(path, map_location=map_location, mmap=True, weights_only=True)
+    except Exception as e:
+        # Legacy (non-zip) checkpoints cannot be mapped
+        logger.debug(f"mmap load of {path} failed ({e}); reading it into memory")
+        return torch.load(path, map_location=map_location, weights_only=True)
+
+
+def load_checkpoint(path: Any, map_location: Any = "cpu") -> Any:
+    """
+    Load a checkpoint, sharing its memory when SHARED_MODEL_WEIGHTS is on.
+
+    Preloaded checkpoints come from the master's store (already mapped and
+    inherited by fork); others are memory-mapped now. With the feature off
+    this is a plain ``torch.load``.
+    """
+    if not shared_weights_enabled():
+        return torch.load(path, map_location=map_location)
+
+    resolved = Path(path).resolve()
+    on_cpu = map_location is None or torch.device(map_location).type == "cpu"
+    if on_cpu:
+        with _store_lock:
+            if resolved in _store:
+                return _store[resolved]
+    return _torch_load(resolved, map_location)
+
+
+def load_state_dict_shared(module: torch.nn.Module, state_dict: Dict[str, Any], strict: bool = True):
+    """
+    ``module.load_state_dict`` that keeps the checkpoint tensors (and thus
+    their shared pages) instead of copying them into the module's own
+    parameters. Falls back to a copy for modules not on the CPU.
+    """
+    on_cpu = all(p.device.type == "cpu" for p in module.parameters())
+    if shared_weights_enabled() and on_cpu:
+        return module.load_state_dict(state_dict, strict=strict, assign=True)
+    return module.load_state_dict(state_dict, strict=strict)
+
+
+def _shared_parameter_transfer(obj: torch.nn.Module, path: Any, *args, **kwargs):
+    """SpeechBrain pretrainer transfer hook: mapped load + assign."""
+    incompatible = load_state_dict_shared(obj, load_checkpoint(path, "cpu"), strict=False)
+    for key in incompatible.missing_keys:
+        logger.warning(f"During parameter transfer to {obj} loading from {path}, expected key {key} was missing")
+    for key in incompatible.unexpected_keys:
+        logger.warning(f"During parameter transfer to {obj} loading from {path}, unexpected key {key} was ignored")
+
+
+def install_transfer_hooks():
+    """Route SpeechBrain's checkpoint transfers through the shared loader (idempotent)."""
+    global _hooks_installed
+    if _hooks_installed or not shared_weights_enabled():
+        return
+    try:
+        from speechbrain.utils import checkpoints
+    except ImportError:
+        return
+    hooks = getattr(checkpoints, "DEFAULT_TRANSFER_HOOKS", None)
+    if hooks is None:
+        logger.warning("SpeechBrain has no transfer hooks; its models will not share weights")
+        return
+    # Mutated in place: the pretrainer holds a reference to the same dict
+    hooks[torch.nn.Module] = _shared_parameter_transfer
+    _hooks_installed = True
+
+
+def _checkpoint_files(model_dirs: Iterable[Path]) -> Iterable[Path]:
+    for model_dir in model_dirs:
+        if not model_dir.exists():
+            continue
+        for path in sorted(model_dir.rglob("*")):
+            if path.suffix in CHECKPOINT_SUFFIXES and path.is_file():
+                yield path.resolve()
+
+
+def preload_shared_weights(model_dirs: Optional[Iterable[Path]] = None) -> Dict[str, Any]:
+    """
+    Load every checkpoint once in the current (master) process before forking.
+
+    Args:
+        model_dirs: Directories to scan; defaults to every ModelManager model.
+
+    Returns:
+        Summary with the number of files and megabytes preloaded.
+    """
+    if not shared_weights_enabled():
+        return {"enabled": False, "files": 0, "size_mb": 0.0}
+
+    if model_dirs is None:
+        from .model_manager import model_manager
+        model_dirs = [model_manager.get_model_path(model_id) for model_id in model_manager.models]
+
+    install_transfer_hooks()
+    files, size_bytes = 0, 0
+    for path in _checkpoint_files(model_dirs):
+        try:
+            state = _torch_load(path, "cpu")
+        except Exception as e:
+            logger.warning(f"Could not preload {path}: {e}")
+            continue
+        with _store_lock:
+            _store[path] = state
+        files += 1
+        size_bytes += path.stat().st_size
+
+    # Objects created so far never get their headers rewritten by the
+    # collector in the children, so their pages stay shared
+    gc.collect()
+    gc.freeze()
+
+    size_mb = size_bytes / (1024 * 1024)
+    logger.info(f"Preloaded {files} checkpoints ({size_mb:.0f} MB) for copy-on-write sharing")
+    return {"enabled": True, "files": files, "size_mb": size_mb}
+
+
+def get_shared_weights_stats() -> Dict[str, Any]:
+    with _store_lock:
+        files = list(_store)
+    return {
+        "enabled": shared_weights_enabled(),
+        "preloaded_files": len(files),
+        "preloaded_mb": sum(p.stat().st_size for p in files if p.exists()) / (1024 * 1024),
+    }
@@ -0,0 +1,281 @@
+"""Incremental audio ingestion for streaming verification.
+
+The browser sends audio chunks over a WebSocket while the user speaks.
+Each chunk is decoded as it arrives (raw PCM directly, WebM/Ogg through one
+persistent ffmpeg process per stream), appended to a growing buffer and
+followed by an energy VAD. ``StreamingAudioSession`` reports when the user
+pauses and when the utterance has ended, and turns the speech region of the
+buffer into the shared 16 kHz ``AudioSample`` the models consume.
+"""
+
+import logging
+import os
+import shutil
+import subprocess
+import threading
+from typing import Optional
+
+import numpy as np
+
+from .audio_sample import AudioSample, TARGET_SAMPLE_RATE, normalize_format
+from .vad import StreamingEnergyVAD, get_vad_settings
+
+logger = logging.getLogger(__name__)
+
+# Raw PCM formats decoded in-process: name -> numpy dtype and full scale
+PCM_FORMATS = {
+    "pcm_s16le": (np.dtype("<i2"), 32768.0),
+    "pcm_f32le": (np.dtype("<f4"), 1.0),
+}
+
+# Container formats decoded by ffmpeg: name -> ffmpeg demuxer
+FFMPEG_DEMUXERS = {
+    "webm": "matroska",
+    "ogg": "ogg",
+}
+
+STREAM_FORMATS = tuple(PCM_FORMATS) + tuple(FFMPEG_DEMUXERS)
+
+# Rates accepted for raw PCM streams (the buffer and resampling kernel depend on it)
+STREAM_SAMPLE_RATES = (8000, 16000, 22050, 44100, 48000)
+
+
+class PCMStreamDecoder:
+    """Decoder for headerless little-endian PCM chunks (mono)."""
+
+    def __init__(self, audio_format: str, sample_rate: int):
+        self.sample_rate = sample_rate
+        self._dtype, self._scale = PCM_FORMATS[audio_format]
+        self._remainder = b""
+
+    def feed(self, chunk: bytes) -> np.ndarray:
+        """Decode a chunk; a trailing partial sample waits for the next one."""
+        data = self._remainder + chunk
+        usable = len(data) - len(data) % self._dtype.itemsize
+        self._remainder = data[usable:]
+        return np.frombuffer(data[:usable], dtype=self._dtype).astype(np.float32) / self._scale
+
+    def finish(self) -> np.ndarray:
+        self._remainder = b""
+        return np.empty(0, dtype=np.float32)
+
+    def close(self):
+        pass
+
+
+class FFmpegStreamDecoder:
+    """
+    One ffmpeg process per stream: container bytes in, 16 kHz mono PCM out.
+
+    Chunks are written to ffmpeg's stdin as they arrive and a reader thread
+    collects the decoded PCM, so decoding overlaps with the recording instead
+    of starting after the upload.
+    """
+
+    sample_rate = TARGET_SAMPLE_RATE
+
+    def __init__(self, audio_format: str, ffmpeg_path: Optional[str] = None):
+        ffmpeg_path = ffmpeg_path or os.getenv("FFMPEG_PATH") or shutil.which("ffmpeg")
+        if not ffmpeg_path:
+            raise ValueError("ffmpeg is required to stream compressed audio")
+
+        self._process = subprocess.Popen(
+            [
+                ffmpeg_path, "-hide_banner", "-loglevel", "error",
+                # Decode as soon as data arrives instead of probing megabytes first
+                "-fflags", "nobuffer", "-probesize", "4096", "-analyzeduration", "0",
+                "-f", FFMPEG_DEMUXERS[audio_format], "-i", "pipe:0",
+                "-f", "s16le", "-ac", "1", "-ar", str(TARGET_SAMPLE_RATE), "pipe:1"
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        self._output = bytearray()
+        self._lock = threading.Lock()
+        self._reader = threading.Thread(target=self._read_output, name="ffmpeg_stream_reader", daemon=True)
+        self._reader.start()
+
+    def _read_output(self):
+        while True:
+            data = self._process.stdout.read1(8192)
+            if not data:
+                return
+            with self._lock:
+                self._output.extend(data)
+
+    def _drain(self) -> np.ndarray:
+        with self._lock:
+            usable = len(self._output) - len(self._output) % 2
+            data = bytes(self._output[:usable])
+            del self._output[:usable]
+        return np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+
+    def feed(self, chunk: bytes) -> np.ndarray:
+        """Send a chunk to ffmpeg and return whatever PCM is decoded so far."""
+        try:
+            self._process.stdin.write(chunk)
+            self._process.stdin.flush()
+        except (BrokenPipeError, ValueError):
+            raise ValueError(f"ffmpeg stopped decoding: {self._stderr()}")
+        return self._drain()
+
+    def finish(self, timeout: float = 5.0) -> np.ndarray:
+        """Close the input and return the rest of the decoded audio (blocking)."""
+        try:
+            self._process.stdin.close()
+        except BrokenPipeError:
+            pass
+        self._reader.join(timeout=timeout)
+        self._process.wait(timeout=timeout)
+        if self._process.returncode != 0:
+            logger.warning(f"ffmpeg exited with {self._process.returncode}: {self._stderr()}")
+        return self._drain()
+
+    def _stderr(self) -> str:
+        try:
+            return self._process.stderr.read1(4096).decode(errors="replace").strip()
+        except Exception:
+            return ""
+
+    def close(self):
+        if self._process.poll() is None:
+            self._process.kill()
+            self._process.wait()
+
+
+def create_stream_decoder(audio_format: str, sample_rate: int = TARGET_SAMPLE_RATE):
+    """
+    Decoder for a streamed format (pcm_s16le, pcm_f32le, webm, ogg).
+
+    Raises:
+        ValueError: If the format cannot be streamed, or a PCM sample rate
+            is not one of STREAM_SAMPLE_RATES
+        OSError: If the ffmpeg executable cannot be started
+    """
+    format_lower = audio_format.lower() if audio_format in PCM_FORMATS else normalize_format(audio_format)
+    if format_lower in PCM_FORMATS:
+        if sample_rate not in STREAM_SAMPLE_RATES:
+            raise ValueError(
+                f"Unsupported stream sample rate: {sample_rate} "
+                f"(expected one of {', '.join(map(str, STREAM_SAMPLE_RATES))})"
+            )
+        return PCMStreamDecoder(format_lower, sample_rate)
+    if format_lower in FFMPEG_DEMUXERS:
+        return FFmpegStreamDecoder(format_lower)
+    raise ValueError(f"Unsupported stream format: {audio_format} (expected one of {', '.join(STREAM_FORMATS)})")
+
+
+class StreamingAudioSession:
+    """
+    Growing audio buffer of one stream with VAD end-pointing.
+
+    The utterance has ended once at least ``min_speech_sec`` of speech was
+    heard and ``end_silence_ms`` of silence followed it, or the buffer
+    reached ``max_duration_sec``.
+    """
+
+    # Audio kept around the speech region when building the model input
+    PAD_SEC = 0.2
+
+    def __init__(
+        self,
+        decoder,
+        max_duration_sec: Optional[float] = None,
+        end_silence_ms: Optional[float] = None,
+        min_speech_sec: Optional[float] = None,
+        hangover_ms: Optional[float] = None
+    ):
+        # Priority: parameter > env var > default
+        if max_duration_sec is None:
+            max_duration_sec = float(os.getenv("STREAM_MAX_DURATION_SEC", "15"))
+        if end_silence_ms is None:
+            end_silence_ms = float(os.getenv("STREAM_END_SILENCE_MS", "700"))
+        if min_speech_sec is None:
+            min_speech_sec = float(os.getenv("STREAM_MIN_SPEECH_SEC", "1.0"))
+        vad_settings = get_vad_settings()
+        if hangover_ms is None:
+            hangover_ms = vad_settings.hangover_ms
+
+        self._decoder = decoder
+        self.sample_rate = decoder.sample_rate
+        self.end_silence_sec = end_silence_ms / 1000
+        self.min_speech_sec = min_speech_sec
+        self._vad = StreamingEnergyVAD(
+            self.sample_rate, margin_db=vad_settings.margin_db, hangover_ms=hangover_ms
+        )
+
+        self._buffer = np.empty(int(max_duration_sec * self.sample_rate), dtype=np.float32)
+        self._length = 0
+        self._was_in_speech = False
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        Decode and buffer a chunk.
+
+        Returns True when a pause follows speech (the VAD hangover has just
+        expired): a good moment to start analysing the audio heard so far.
+        """
+        self._append(self._decoder.feed(chunk))
+        paused = self._was_in_speech and not self._vad.in_speech
+        self._was_in_speech = self._vad.in_speech
+        return paused
+
+    def finish(self):
+        """Flush the decoder (blocking for ffmpeg streams)."""
+        self._append(self._decoder.finish())
+
+    def close(self):
+        self._decoder.close()
+
+    def _append(self, samples: np.ndarray):
+        room = len(self._buffer) - self._length
+        samples = samples[:room]
+        if len(samples) == 0:
+            return
+        self._buffer[self._length:self._length + len(samples)] = samples
+        self._length += len(samples)
+        self._vad.process(samples)
+
+    @property
+    def duration_sec(self) -> float:
+        return self._length / self.sample_rate
+
+    @property
+    def speech_sec(self) -> float:
+        return self._vad.speech_sec
+
+    @property
+    def is_full(self) -> bool:
+        return self._length >= len(self._buffer)
+
+    @property
+    def speech_ended(self) -> bool:
+        """Enough speech followed by enough silence, or no room left."""
+        if self.is_full:
+            return True
+        return (
+            self._vad.speech_sec >= self.min_speech_sec
+            and not self._vad.in_speech
+            and self._vad.trailing_silence_sec >= self.end_silence_sec
+        )
+
+    def to_sample(self) -> Optional[AudioSample]:
+        """
+        The speech region (with ``PAD_SEC`` around it) as a 16 kHz AudioSample.
+
+        The region only depends on the speech heard, so once the pad after
+        the last word has arrived, later silence yields the same sample (and
+        the same cache digest). Returns None if no speech was detected.
+        """
+        bounds = self._vad.speech_bounds()
+        if bounds is None:
+            return None
+        pad = int(self.PAD_SEC * self.sample_rate)
+        start = max(0, bounds[0] - pad)
+        end = min(self._length, bounds[1] + pad)
+        return AudioSample.from_array(
+            self._buffer[start:end].copy(),
+            self.sample_rate,
+            source_format="stream"
+        )
@@ -0,0 +1,234 @@
+"""Energy-based voice activity detection.
+
+Frame energies are computed for a whole block of samples at once (one
+reshape, no per-sample Python work); a frame is speech when its level is
+``margin_db`` above the noise floor and above an absolute ``min_level_db``.
+A hangover keeps short pauses between words inside the same speech segment.
+
+``speech_frame_mask``/``trim_to_speech`` work on a complete utterance (the
+noise floor is a low percentile of all frames) and drop leading, trailing
+and long internal silence before the models run. ``StreamingEnergyVAD``
+keeps its state between calls so it can follow audio as it arrives
+(streaming verification); frames are aligned on the total number of samples
+seen, whatever the chunk sizes.
+
+Settings come from the environment: ``VAD_ENABLED``, ``VAD_AGGRESSIVENESS``
+(0-3, higher drops more) and ``VAD_HANGOVER_MS``.
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FRAME_MS = 30
+
+# Level above the noise floor required for speech, per aggressiveness
+AGGRESSIVENESS_MARGIN_DB = {0: 6.0, 1: 9.0, 2: 12.0, 3: 15.0}
+
+# Frames this far below the loud (95th percentile) frames are never speech;
+# keeps the threshold sane for audio without any silence to measure noise on
+DYNAMIC_RANGE_DB = 30.0
+
+# Frames kept before each speech onset (consonant attacks are quiet)
+PRE_ROLL_FRAMES = 2
+
+# Level of digital silence; keeps log10 finite
+_EPS = 1e-10
+
+
+@dataclass(frozen=True)
+class VADSettings:
+    enabled: bool = True
+    aggressiveness: int = 2
+    hangover_ms: float = 300.0
+
+    @property
+    def margin_db(self) -> float:
+        return AGGRESSIVENESS_MARGIN_DB[self.aggressiveness]
+
+
+def get_vad_settings() -> VADSettings:
+    """VAD settings from VAD_ENABLED, VAD_AGGRESSIVENESS and VAD_HANGOVER_MS."""
+    aggressiveness = int(os.getenv("VAD_AGGRESSIVENESS", "2"))
+    if aggressiveness not in AGGRESSIVENESS_MARGIN_DB:
+        logger.warning(f"VAD_AGGRESSIVENESS must be 0-3, got {aggressiveness}; using 2")
+        aggressiveness = 2
+    return VADSettings(
+        enabled=os.getenv("VAD_ENABLED", "true").lower() in ("1", "true", "yes"),
+        aggressiveness=aggressiveness,
+        hangover_ms=float(os.getenv("VAD_HANGOVER_MS", "300"))
+    )
+
+
+def frame_length(sample_rate: int, frame_ms: int = FRAME_MS) -> int:
+    return max(1, int(sample_rate * frame_ms / 1000))
+
+
+def frame_levels_db(samples: np.ndarray, frame_len: int) -> np.ndarray:
+    """RMS level in dBFS of each complete frame of ``samples``."""
+    n_frames = len(samples) // frame_len
+    if n_frames == 0:
+        return np.empty(0, dtype=np.float32)
+    frames = np.asarray(samples[:n_frames * frame_len], dtype=np.float32).reshape(n_frames, frame_len)
+    power = np.einsum("ij,ij->i", frames, frames) / frame_len
+    return (10.0 * np.log10(power + _EPS)).astype(np.float32)
+
+
+def speech_frame_mask(
+    waveform: np.ndarray,
+    sample_rate: int,
+    margin_db: float = AGGRESSIVENESS_MARGIN_DB[2],
+    hangover_ms: float = 300.0,
+    frame_ms: int = FRAME_MS,
+    min_level_db: float = -50.0
+) -> np.ndarray:
+    """
+    Speech/non-speech decision for each complete frame of an utterance.
+
+    The noise floor is the 10th percentile of the frame levels. Frames that
+    follow speech within ``hangover_ms``, and ``PRE_ROLL_FRAMES`` before it,
+    count as speech.
+    """
+    levels = frame_levels_db(waveform, frame_length(sample_rate, frame_ms))
+    if len(levels) == 0:
+        return np.zeros(0, dtype=bool)
+
+    noise_db, loud_db = np.percentile(levels, [10, 95])
+    threshold = max(min_level_db, min(noise_db + margin_db, loud_db - DYNAMIC_RANGE_DB))
+    active = levels > threshold
+
+    # Hangover and pre-roll: distance to the previous/next active frame
+    index = np.arange(len(levels))
+    last_active = np.maximum.accumulate(np.where(active, index, -len(levels) - 1))
+    next_active = np.minimum.accumulate(np.where(active, index, 2 * len(levels) + 1)[::-1])[::-1]
+    hangover_frames = int(round(hangover_ms / frame_ms))
+    return (index - last_active <= hangover_frames) | (next_active - index <= PRE_ROLL_FRAMES)
+
+
+def trim_to_speech(
+    waveform: np.ndarray,
+    sample_rate: int,
+    settings: Optional[VADSettings] = None
+) -> np.ndarray:
+    """
+    Keep only the speech frames of an utterance (a new array).
+
+    Returns the input unchanged when the VAD is disabled or hears no speech,
+    so a quiet recording is never reduced to nothing.
+    """
+    settings = settings or get_vad_settings()
+    if not settings.enabled:
+        return waveform
+
+    mask = speech_frame_mask(waveform, sample_rate, settings.margin_db, settings.hangover_ms)
+    if not mask.any():
+        return waveform
+
+    frame_len = frame_length(sample_rate)
+    keep = np.repeat(mask, frame_len)
+    # The incomplete last frame follows the decision of the frame before it
+    keep = np.concatenate([keep, np.full(len(waveform) - len(keep), mask[-1])])
+    return waveform[keep]
+
+
+class StreamingEnergyVAD:
+    """
+    Incremental energy VAD with an adaptive noise floor and hangover.
+
+    Args:
+        sample_rate: Sample rate of the audio fed in.
+        frame_ms: Analysis frame length.
+        margin_db: Level above the noise floor needed for speech.
+        min_level_db: Frames quieter than this (dBFS) are never speech.
+        hangover_ms: Silence tolerated inside a speech segment.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        frame_ms: int = FRAME_MS,
+        margin_db: float = 12.0,
+        min_level_db: float = -50.0,
+        hangover_ms: float = 300.0
+    ):
+        self.sample_rate = sample_rate
+        self.frame_len = frame_length(sample_rate, frame_ms)
+        self.margin_db = margin_db
+        self.min_level_db = min_level_db
+        self.hangover_frames = max(0, int(round(hangover_ms / frame_ms)))
+
+        self._pending = np.empty(0, dtype=np.float32)
+        self._frames_seen = 0
+        self._noise_db: Optional[float] = None
+
+        self._in_speech = False
+        self._silence_run = 0
+        self._speech_frames = 0
+        self._segments: List[List[int]] = []  # [start_frame, end_frame) of each speech segment
+
+    def process(self, samples: np.ndarray):
+        """Consume new samples; frames left incomplete wait for the next call."""
+        if len(samples) == 0:
+            return
+        pending = np.concatenate([self._pending, np.asarray(samples, dtype=np.float32)])
+        levels = frame_levels_db(pending, self.frame_len)
+        self._pending = pending[len(levels) * self.frame_len:]
+
+        for level in levels:
+            self._update(float(level))
+            self._frames_seen += 1
+
+    def _update(self, level_db: float):
+        # Noise floor: drops to quieter frames at once and rises slowly
+        # (~3 s time constant), so pauses between words keep it near the
+        # background level even during continuous speech
+        if self._noise_db is None:
+            self._noise_db = min(level_db, self.min_level_db)
+        elif level_db < self._noise_db:
+            self._noise_db = level_db
+        else:
+            self._noise_db += 0.01 * (level_db - self._noise_db)
+
+        if level_db > max(self._noise_db + self.margin_db, self.min_level_db):
+            self._speech_frames += 1
+            self._silence_run = 0
+            if self._in_speech:
+                self._segments[-1][1] = self._frames_seen + 1
+            else:
+                self._in_speech = True
+                self._segments.append([self._frames_seen, self._frames_seen + 1])
+            return
+
+        self._silence_run += 1
+        if self._in_speech and self._silence_run > self.hangover_frames:
+            self._in_speech = False
+
+    @property
+    def in_speech(self) -> bool:
+        """True while inside a speech segment (hangover included)."""
+        return self._in_speech
+
+    @property
+    def speech_sec(self) -> float:
+        """Total duration of the frames classified as speech."""
+        return self._speech_frames * self.frame_len / self.sample_rate
+
+    @property
+    def trailing_silence_sec(self) -> float:
+        """Silence since the last speech frame (0 while speech is ongoing)."""
+        return self._silence_run * self.frame_len / self.sample_rate
+
+    @property
+    def num_segments(self) -> int:
+        return len(self._segments)
+
+    def speech_bounds(self) -> Optional[Tuple[int, int]]:
+        """Sample range from the first speech frame to the end of the last one."""
+        if not self._segments:
+            return None
+        return self._segments[0][0] * self.frame_len, self._segments[-1][1] * self.frame_len
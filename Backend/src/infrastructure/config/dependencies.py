@@ -24,8 +24,10 @@ logger = logging.getLogger(__name__)
 _db_pool: Optional[asyncpg.Pool] = None
 _db_initialized: bool = False
 _biometric_engine = None
+_inference_backend = None
 _models_loaded: bool = False
 _initialization_error: Optional[str] = None
+_model_readiness = None
 
 
 async def init_db_pool() -> asyncpg.Pool:
@@ -93,25 +95,95 @@ async def close_db_pool():
         logger.info("Database pool closed")
 
 
+def get_model_readiness():
+    """Per-model loading state shared by startup and /health."""
+    global _model_readiness
+    if _model_readiness is None:
+        from ..biometrics.model_loading import ModelReadiness
+        _model_readiness = ModelReadiness()
+    return _model_readiness
+
+
 def init_biometric_engine():
-    """Initialize biometric engine synchronously (called in background task)."""
-    global _biometric_engine, _models_loaded
+    """
+    Initialize biometric engine synchronously (called in background task).
+    
+    The three models load concurrently and are warmed up with synthetic
+    audio before the engine is reported ready.
+    """
+    global _biometric_engine, _inference_backend, _models_loaded
     
-    from ..biometrics.SpeakerEmbeddingAdapter import SpeakerEmbeddingAdapter
-    from ..biometrics.SpoofDetectorAdapter import SpoofDetectorAdapter
-    from ..biometrics.ASRAdapter import ASRAdapter
     from ..biometrics.VoiceBiometricEngineFacade import VoiceBiometricEngineFacade
+    from ..biometrics import model_loading
 
     logger.info("Loading ML models (this may take a moment)...")
+    readiness = get_model_readiness()
     
-    speaker_adapter = SpeakerEmbeddingAdapter()
-    spoof_adapter = SpoofDetectorAdapter()
-    asr_adapter = ASRAdapter()
+    # INFERENCE_BACKEND=process hosts the models in worker processes instead of this one
+    backend = os.getenv("INFERENCE_BACKEND", "thread").lower()
+    max_workers = 3
+    if backend == "process":
+        from ..biometrics.process_pool import ProcessPoolInferenceBackend, create_remote_adapters
+        
+        num_workers = int(os.getenv("INFERENCE_WORKERS", "2"))
+        worker_threads = os.getenv("INFERENCE_WORKER_THREADS")
+        # Each worker loads and warms up its models concurrently
+        for key in model_loading.MODEL_KEYS:
+            readiness.update(key, model_loading.STATE_LOADING)
+        try:
+            _inference_backend = ProcessPoolInferenceBackend(
+                num_workers=num_workers,
+                num_threads=int(worker_threads) if worker_threads else None,
+                hang_timeout_sec=float(os.getenv("INFERENCE_WORKER_HANG_TIMEOUT_SEC", "120")),
+                restart_backoff_sec=float(os.getenv("INFERENCE_WORKER_RESTART_BACKOFF_SEC", "1")),
+                max_restart_backoff_sec=float(os.getenv("INFERENCE_WORKER_MAX_RESTART_BACKOFF_SEC", "60")),
+                max_restarts=int(os.getenv("INFERENCE_WORKER_MAX_RESTARTS", "5"))
+            )
+        except Exception as e:
+            for key in model_loading.MODEL_KEYS:
+                readiness.update(key, model_loading.STATE_FAILED, error=str(e))
+            raise
+        for key in model_loading.MODEL_KEYS:
+            info = _inference_backend.get_model_info(key)
+            if info.get("loaded", True):
+                readiness.update(
+                    key, model_loading.STATE_READY,
+                    load_sec=info.get("load_sec"), warmup_sec=info.get("warmup_sec")
+                )
+            else:
+                readiness.update(
+                    key, model_loading.STATE_DEGRADED,
+                    load_sec=info.get("load_sec"), warmup_sec=info.get("warmup_sec"),
+                    error=model_loading.FALLBACK_ERROR
+                )
+        speaker_adapter, spoof_adapter, asr_adapter = create_remote_adapters(_inference_backend)
+        # Enough facade threads to keep every worker busy with all three models
+        max_workers = 3 * num_workers
+    else:
+        from ..biometrics.SpeakerEmbeddingAdapter import SpeakerEmbeddingAdapter
+        from ..biometrics.SpoofDetectorAdapter import SpoofDetectorAdapter
+        from ..biometrics.ASRAdapter import ASRAdapter
+        from ..biometrics.shared_weights import install_transfer_hooks
+        
+        # SHARED_MODEL_WEIGHTS: map checkpoints (preloaded by the master) instead of copying them
+        install_transfer_hooks()
+        adapters = model_loading.load_models_concurrently(
+            {
+                "speaker": SpeakerEmbeddingAdapter,
+                "antispoof": SpoofDetectorAdapter,
+                "asr": ASRAdapter,
+            },
+            readiness=readiness
+        )
+        speaker_adapter, spoof_adapter, asr_adapter = (
+            adapters["speaker"], adapters["antispoof"], adapters["asr"]
+        )
 
     _biometric_engine = VoiceBiometricEngineFacade(
         speaker_adapter=speaker_adapter,
         spoof_adapter=spoof_adapter,
         asr_adapter=asr_adapter,
+        max_workers=max_workers,
     )
     _models_loaded = True
     logger.info("✅ ML models loaded successfully")
@@ -133,11 +205,32 @@ def get_voice_biometric_engine():
     return _biometric_engine
 
 
+def close_biometric_engine():
+    """Stop inference threads/worker processes. Call this on application shutdown."""
+    global _biometric_engine, _inference_backend, _models_loaded
+    if _biometric_engine is not None:
+        _biometric_engine.close()
+        _biometric_engine = None
+        _inference_backend = None
+        _models_loaded = False
+        get_model_readiness().reset()
+        logger.info("Biometric engine stopped")
+
+
+def get_inference_backend_health() -> Optional[dict]:
+    """Worker health of the process-pool backend (None for the in-process backend)."""
+    if _inference_backend is None:
+        return None
+    # No ping round-trip: this is called from the event loop
+    return _inference_backend.health_check(probe=False)
+
+
 def is_ready() -> dict:
     """Check if all services are initialized and ready."""
     return {
         "database": _db_initialized,
         "models": _models_loaded,
+        "model_status": get_model_readiness().snapshot(),
         "ready": _db_initialized and _models_loaded
     }
 
@@ -216,6 +309,7 @@ async def get_verification_service():
     """Get verification service instance with dependencies."""
     from ..persistence.PostgresVoiceSignatureRepository import PostgresVoiceSignatureRepository
     from ..persistence.PostgresAuditLogRepository import PostgresAuditLogRepository
+    from ..persistence.PostgresAuthAttemptRepository import PostgresAuthAttemptRepository
     from ...application.verification_service import VerificationService
     
     pool = await get_db_pool()
@@ -233,7 +327,8 @@ async def get_verification_service():
         challenge_service=challenge_service,
         biometric_validator=biometric_validator,
         similarity_threshold=float(os.getenv("SIMILARITY_THRESHOLD", "0.60")),
-        anti_spoofing_threshold=float(os.getenv("ANTI_SPOOFING_THRESHOLD", "0.5"))
+        anti_spoofing_threshold=float(os.getenv("ANTI_SPOOFING_THRESHOLD", "0.5")),
+        auth_attempt_repo=PostgresAuthAttemptRepository(pool)
     )
 
 
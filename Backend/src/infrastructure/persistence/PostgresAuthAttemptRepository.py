@@ -0,0 +1,309 @@
+"""PostgreSQL implementation of AuthAttemptRepositoryPort."""
+
+import asyncpg
+import json
+import logging
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from ...domain.model.AuthAttemptResult import AuthAttemptResult, BiometricScores
+from ...domain.repositories.AuthAttemptRepositoryPort import AuthAttemptRepositoryPort
+from ...shared.constants.biometric_constants import MAX_INFERENCE_LATENCY_MS
+from ...shared.types.common_types import AuthReason, UserId, ClientId, AttemptId
+from ..security.encryption import DataEncryptor, get_encryptor
+
+logger = logging.getLogger(__name__)
+
+_SELECT_ATTEMPT = """
+    SELECT
+        a.id, a.user_id, a.client_id, a.challenge_id, a.audio_id,
+        a.decided, a.accept, a.reason, a.policy_id,
+        a.total_latency_ms, a.stage_latency_ms, a.created_at, a.decided_at,
+        s.similarity, s.spoof_prob, s.phrase_match, s.phrase_ok, s.inference_ms,
+        s.speaker_model_id, s.antispoof_model_id, s.asr_model_id
+    FROM auth_attempt a
+    LEFT JOIN scores s ON s.attempt_id = a.id
+"""
+
+
+class PostgresAuthAttemptRepository(AuthAttemptRepositoryPort):
+    """
+    PostgreSQL implementation of the authentication attempt repository.
+
+    An attempt is one ``auth_attempt`` row (decision, end-to-end latency and
+    its per-stage breakdown) plus one ``scores`` row (raw biometric signals
+    and model inference latency).
+    """
+
+    def __init__(self, connection_pool: asyncpg.Pool):
+        self._pool = connection_pool
+        self._encryptor: DataEncryptor = get_encryptor()
+
+    async def save_attempt(self, attempt: AuthAttemptResult) -> AttemptId:
+        """Save an authentication attempt and its scores in one transaction."""
+        async with self._pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(
+                    """
+                    INSERT INTO auth_attempt (
+                        id, user_id, client_id, challenge_id, audio_id,
+                        decided, accept, reason, policy_id,
+                        total_latency_ms, stage_latency_ms, created_at, decided_at
+                    )
+                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11::jsonb, $12, $13)
+                    """,
+                    attempt.id,
+                    attempt.user_id,
+                    attempt.client_id,
+                    attempt.challenge_id,
+                    attempt.audio_id,
+                    attempt.decided,
+                    attempt.accept,
+                    attempt.reason.value if attempt.reason else None,
+                    attempt.policy_id,
+                    attempt.total_latency_ms,
+                    json.dumps(attempt.stage_latency_ms) if attempt.stage_latency_ms else None,
+                    attempt.created_at,
+                    attempt.decided_at
+                )
+                if attempt.scores:
+                    await self._upsert_scores(conn, attempt.id, attempt.scores)
+
+        logger.debug(f"Saved auth attempt {attempt.id} ({attempt.total_latency_ms} ms)")
+        return attempt.id
+
+    async def _upsert_scores(self, conn: asyncpg.Connection, attempt_id: UUID, scores: BiometricScores):
+        await conn.execute(
+            """
+            INSERT INTO scores (
+                attempt_id, similarity, spoof_prob, phrase_match, phrase_ok, inference_ms,
+                speaker_model_id, antispoof_model_id, asr_model_id
+            )
+            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+            ON CONFLICT (attempt_id) DO UPDATE SET
+                similarity = EXCLUDED.similarity,
+                spoof_prob = EXCLUDED.spoof_prob,
+                phrase_match = EXCLUDED.phrase_match,
+                phrase_ok = EXCLUDED.phrase_ok,
+                inference_ms = EXCLUDED.inference_ms,
+                speaker_model_id = EXCLUDED.speaker_model_id,
+                antispoof_model_id = EXCLUDED.antispoof_model_id,
+                asr_model_id = EXCLUDED.asr_model_id
+            """,
+            attempt_id,
+            float(scores.similarity),
+            float(scores.spoof_probability) if scores.spoof_probability is not None else None,
+            float(scores.phrase_match),
+            scores.phrase_ok,
+            scores.inference_latency_ms,
+            scores.speaker_model_id,
+            scores.antispoof_model_id,
+            scores.asr_model_id
+        )
+
+    @staticmethod
+    def _row_to_attempt(row: asyncpg.Record) -> AuthAttemptResult:
+        scores = None
+        if row['similarity'] is not None:
+            scores = BiometricScores(
+                similarity=row['similarity'],
+                spoof_probability=row['spoof_prob'],
+                phrase_match=row['phrase_match'],
+                phrase_ok=row['phrase_ok'],
+                inference_latency_ms=row['inference_ms'],
+                speaker_model_id=row['speaker_model_id'],
+                antispoof_model_id=row['antispoof_model_id'],
+                asr_model_id=row['asr_model_id']
+            )
+        stage_latency_ms = row['stage_latency_ms']
+        if isinstance(stage_latency_ms, str):
+            stage_latency_ms = json.loads(stage_latency_ms)
+        return AuthAttemptResult(
+            id=row['id'],
+            user_id=row['user_id'],
+            client_id=row['client_id'],
+            challenge_id=row['challenge_id'],
+            audio_id=row['audio_id'],
+            decided=row['decided'],
+            accept=row['accept'],
+            reason=AuthReason(row['reason']) if row['reason'] else None,
+            policy_id=row['policy_id'],
+            total_latency_ms=row['total_latency_ms'],
+            stage_latency_ms=stage_latency_ms,
+            scores=scores,
+            created_at=row['created_at'],
+            decided_at=row['decided_at']
+        )
+
+    async def get_attempt(self, attempt_id: AttemptId) -> Optional[AuthAttemptResult]:
+        """Get attempt by ID."""
+        async with self._pool.acquire() as conn:
+            row = await conn.fetchrow(_SELECT_ATTEMPT + " WHERE a.id = $1", attempt_id)
+            return self._row_to_attempt(row) if row else None
+
+    async def update_attempt(self, attempt: AuthAttemptResult) -> None:
+        """Update the decision, latencies and scores of an existing attempt."""
+        async with self._pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(
+                    """
+                    UPDATE auth_attempt
+                    SET decided = $2, accept = $3, reason = $4, policy_id = $5,
+                        total_latency_ms = $6, stage_latency_ms = $7::jsonb, decided_at = $8
+                    WHERE id = $1
+                    """,
+                    attempt.id,
+                    attempt.decided,
+                    attempt.accept,
+                    attempt.reason.value if attempt.reason else None,
+                    attempt.policy_id,
+                    attempt.total_latency_ms,
+                    json.dumps(attempt.stage_latency_ms) if attempt.stage_latency_ms else None,
+                    attempt.decided_at
+                )
+                if attempt.scores:
+                    await self._upsert_scores(conn, attempt.id, attempt.scores)
+
+    async def get_recent_attempts(
+        self,
+        user_id: UserId,
+        hours: int = 24,
+        limit: int = 100
+    ) -> List[AuthAttemptResult]:
+        """Get recent attempts for a user."""
+        async with self._pool.acquire() as conn:
+            rows = await conn.fetch(
+                _SELECT_ATTEMPT + """
+                WHERE a.user_id = $1 AND a.created_at > now() - make_interval(hours => $2)
+                ORDER BY a.created_at DESC
+                LIMIT $3
+                """,
+                user_id, hours, limit
+            )
+            return [self._row_to_attempt(row) for row in rows]
+
+    async def get_failed_attempts_count(
+        self,
+        user_id: UserId,
+        since: datetime
+    ) -> int:
+        """Count failed attempts for a user since a certain time."""
+        async with self._pool.acquire() as conn:
+            return await conn.fetchval(
+                """
+                SELECT COUNT(*) FROM auth_attempt
+                WHERE user_id = $1 AND decided AND accept = FALSE AND created_at >= $2
+                """,
+                user_id, since
+            )
+
+    async def get_attempts_by_client(
+        self,
+        client_id: ClientId,
+        hours: int = 24,
+        limit: int = 100
+    ) -> List[AuthAttemptResult]:
+        """Get recent attempts for a client."""
+        async with self._pool.acquire() as conn:
+            rows = await conn.fetch(
+                _SELECT_ATTEMPT + """
+                WHERE a.client_id = $1 AND a.created_at > now() - make_interval(hours => $2)
+                ORDER BY a.created_at DESC
+                LIMIT $3
+                """,
+                client_id, hours, limit
+            )
+            return [self._row_to_attempt(row) for row in rows]
+
+    async def get_suspicious_attempts(
+        self,
+        hours: int = 24,
+        limit: int = 100
+    ) -> List[AuthAttemptResult]:
+        """Get attempts that might indicate fraud (see AuthAttemptResult.is_fraud_attempt)."""
+        async with self._pool.acquire() as conn:
+            rows = await conn.fetch(
+                _SELECT_ATTEMPT + """
+                WHERE a.created_at > now() - make_interval(hours => $1)
+                  AND (a.reason = 'spoof' OR s.spoof_prob > 0.7 OR (s.similarity < 0.3 AND s.phrase_ok))
+                ORDER BY a.created_at DESC
+                LIMIT $2
+                """,
+                hours, limit
+            )
+            return [self._row_to_attempt(row) for row in rows]
+
+    async def get_latency_summary(
+        self,
+        hours: int = 24,
+        sla_ms: Optional[int] = None
+    ) -> dict:
+        """
+        Latency percentiles (p50/p95/p99, ms) of the end-to-end request, the
+        model inference and every recorded stage, and the share of attempts
+        whose inference exceeded the SLA (MAX_INFERENCE_LATENCY_MS by default).
+        """
+        if sla_ms is None:
+            sla_ms = MAX_INFERENCE_LATENCY_MS
+
+        async with self._pool.acquire() as conn:
+            totals = await conn.fetchrow(
+                """
+                SELECT
+                    COUNT(*) AS attempts,
+                    percentile_cont(ARRAY[0.5, 0.95, 0.99]) WITHIN GROUP (ORDER BY a.total_latency_ms) AS total_ms,
+                    percentile_cont(ARRAY[0.5, 0.95, 0.99]) WITHIN GROUP (ORDER BY s.inference_ms) AS inference_ms,
+                    COUNT(*) FILTER (WHERE s.inference_ms > $2) AS over_sla
+                FROM auth_attempt a
+                LEFT JOIN scores s ON s.attempt_id = a.id
+                WHERE a.created_at > now() - make_interval(hours => $1)
+                """,
+                hours, sla_ms
+            )
+            stages = await conn.fetch(
+                """
+                SELECT
+                    stage.key AS stage,
+                    percentile_cont(ARRAY[0.5, 0.95, 0.99]) WITHIN GROUP (ORDER BY stage.value::int) AS ms
+                FROM auth_attempt a, jsonb_each_text(a.stage_latency_ms) AS stage
+                WHERE a.created_at > now() - make_interval(hours => $1)
+                GROUP BY stage.key
+                ORDER BY stage.key
+                """,
+                hours
+            )
+
+        def percentiles(values) -> Optional[dict]:
+            if not values or values[0] is None:
+                return None
+            return dict(zip(("p50", "p95", "p99"), (float(v) for v in values)))
+
+        attempts = totals['attempts']
+        return {
+            "hours": hours,
+            "attempts": attempts,
+            "sla_ms": sla_ms,
+            "over_sla": totals['over_sla'],
+            "over_sla_ratio": totals['over_sla'] / attempts if attempts else 0.0,
+            "total_ms": percentiles(totals['total_ms']),
+            "inference_ms": percentiles(totals['inference_ms']),
+            "stages": {row['stage']: percentiles(row['ms']) for row in stages}
+        }
+
+    async def store_audio_blob(self, audio_data: bytes, mime_type: str) -> UUID:
+        """Store encrypted audio data and return blob ID."""
+        async with self._pool.acquire() as conn:
+            return await conn.fetchval(
+                "INSERT INTO audio_blob (content, mime) VALUES ($1, $2) RETURNING id",
+                self._encryptor.encrypt(audio_data),
+                mime_type
+            )
+
+    async def get_audio_blob(self, audio_id: UUID) -> Optional[tuple[bytes, str]]:
+        """Retrieve audio data and mime type."""
+        async with self._pool.acquire() as conn:
+            row = await conn.fetchrow("SELECT content, mime FROM audio_blob WHERE id = $1", audio_id)
+            if not row:
+                return None
+            return self._encryptor.decrypt(row['content']), row['mime']
@@ -32,7 +32,8 @@ from .api.evaluation_controller import router as evaluation_router
 from .api.dataset_recording_controller import router as dataset_recording_router
 from .infrastructure.config.dependencies import (
     close_db_pool, init_db_pool, init_biometric_engine_async, 
-    get_voice_biometric_engine, is_ready
+    get_voice_biometric_engine, is_ready, close_biometric_engine,
+    get_inference_backend_health
 )
 from .api.enrollment_controller import router as enrollment_router
 from .api.verification_controller import router as verification_router
@@ -175,11 +176,13 @@ async def lifespan(app: FastAPI):
             logger.info("Cleanup job cancelled")
     
     # Cleanup resources
+    await asyncio.get_running_loop().run_in_executor(None, close_biometric_engine)
     await close_db_pool()
     logger.info("Database connection pool closed")
 
 
 from .api.error_handlers import value_error_handler, generic_exception_handler
+from .api.middleware.upload_limit_middleware import UploadSizeLimitMiddleware
 
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
@@ -221,6 +224,9 @@ def create_app() -> FastAPI:
         
         return response
     
+    # Cut off oversized uploads while the body streams in (AUDIO_MAX_UPLOAD_BYTES)
+    app.add_middleware(UploadSizeLimitMiddleware)
+    
     # Add CORS middleware
     origins = os.getenv("CORS_ALLOWED_ORIGINS", "http://localhost:3000").split(",")
     env = os.getenv("ENV", "development")
@@ -282,16 +288,32 @@ def create_app() -> FastAPI:
     @app.get("/health")
     async def health_check():
         readiness = is_ready()
+        model_status = readiness["model_status"]
+        models_failed = any(model["state"] == "failed" for model in model_status.values())
+        models_degraded = any(model["state"] == "degraded" for model in model_status.values())
         status = "healthy" if readiness["ready"] else "starting"
-        return {
+        if models_failed or models_degraded:
+            status = "degraded"
+        response = {
             "status": status,
             "service": "voice-biometrics-api",
             "version": "1.0.0",
             "components": {
                 "database": "up" if readiness["database"] else "down",
-                "models": "loaded" if readiness["models"] else "loading"
+                "models": "loaded" if readiness["models"] else ("failed" if models_failed else "loading"),
+                # state (pending/loading/warming/ready/degraded/failed), load_sec, warmup_sec, error
+                "model_status": model_status
             }
         }
+        
+        # Worker process health when models run in the process-pool backend
+        inference_health = get_inference_backend_health()
+        if inference_health is not None:
+            response["components"]["inference_workers"] = inference_health
+            if inference_health["degraded"] or (status == "healthy" and not inference_health["healthy"]):
+                response["status"] = "degraded"
+        
+        return response
     
 
     return app
@@ -4,6 +4,9 @@
 DEFAULT_SIMILARITY_THRESHOLD = 0.85
 DEFAULT_SPOOF_THRESHOLD = 0.3
 DEFAULT_PHRASE_MATCH_THRESHOLD = 0.8
+# Phrase check: CTC likelihood ratio (forced vs. free path) and transcript similarity
+DEFAULT_PHRASE_SCORE_THRESHOLD = 0.5
+TRANSCRIPT_PHRASE_MATCH_THRESHOLD = 0.7
 
 # Retention policy defaults
 DEFAULT_RETENTION_DAYS = 7
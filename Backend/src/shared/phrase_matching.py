@@ -0,0 +1,166 @@
+"""
+Phrase matching shared by the ASR adapter, the biometric engine and the
+verification service.
+
+Text is normalized once per phrase (Spanish-aware: case-folded, accents and
+diaeresis removed but ``ñ`` kept, ``¿¡`` and other punctuation dropped) and
+compared with a bit-parallel Levenshtein distance (Myers/Hyyrö), at character
+or word level. A compiled phrase keeps the symbol bitmasks of its text, so
+matching many transcripts against the same phrase (the API, batch ASR
+evaluation) only scans the transcript.
+"""
+
+import functools
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, Hashable, Sequence, Tuple
+
+# Combining tilde: kept after n/N so that "año" does not become "ano"
+_COMBINING_TILDE = "\u0303"
+_NON_WORD_PATTERN = re.compile(r"[^\w\s]|_")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_text(text: str) -> str:
+    """
+    Canonical form of a phrase or transcript for matching.
+
+    "¿Está bien, Señor?" -> "esta bien señor"
+    """
+    if not text:
+        return ""
+
+    decomposed = unicodedata.normalize("NFD", text)
+    kept = []
+    for char in decomposed:
+        if unicodedata.combining(char):
+            if char == _COMBINING_TILDE and kept and kept[-1] in "nN":
+                kept.append(char)
+            continue
+        kept.append(char)
+
+    stripped = unicodedata.normalize("NFC", "".join(kept)).casefold()
+    stripped = _NON_WORD_PATTERN.sub(" ", stripped)
+    return _WHITESPACE_PATTERN.sub(" ", stripped).strip()
+
+
+def normalize_words(text: str) -> Tuple[str, ...]:
+    """Normalized words of a phrase or transcript."""
+    normalized = normalize_text(text)
+    return tuple(normalized.split(" ")) if normalized else ()
+
+
+def _pattern_masks(pattern: Sequence[Hashable]) -> Dict[Hashable, int]:
+    """Bitmask of the positions of each symbol in the pattern."""
+    masks: Dict[Hashable, int] = {}
+    for i, symbol in enumerate(pattern):
+        masks[symbol] = masks.get(symbol, 0) | (1 << i)
+    return masks
+
+
+def _bit_parallel_distance(masks: Dict[Hashable, int], length: int, text: Sequence[Hashable]) -> int:
+    """
+    Levenshtein distance between a pattern (given by its masks) and ``text``.
+
+    Myers' algorithm in Hyyrö's formulation: one DP column is held as two
+    bit vectors of vertical +1/-1 deltas, so each text symbol costs a few
+    integer operations regardless of the pattern length (Python integers
+    are unbounded, so there is no 64-symbol limit).
+    """
+    if length == 0:
+        return len(text)
+
+    all_ones = (1 << length) - 1
+    last = 1 << (length - 1)
+    plus_vertical = all_ones
+    minus_vertical = 0
+    distance = length
+
+    for symbol in text:
+        eq = masks.get(symbol, 0)
+        xv = eq | minus_vertical
+        xh = (((eq & plus_vertical) + plus_vertical) ^ plus_vertical) | eq
+        plus_horizontal = minus_vertical | ~(xh | plus_vertical)
+        minus_horizontal = plus_vertical & xh
+
+        if plus_horizontal & last:
+            distance += 1
+        elif minus_horizontal & last:
+            distance -= 1
+
+        # The first row is 0..n, so a +1 is shifted in at the top
+        plus_horizontal = (plus_horizontal << 1) | 1
+        minus_horizontal = minus_horizontal << 1
+        plus_vertical = (minus_horizontal | ~(xv | plus_horizontal)) & all_ones
+        minus_vertical = plus_horizontal & xv
+
+    return distance
+
+
+def edit_distance(a: Sequence[Hashable], b: Sequence[Hashable]) -> int:
+    """
+    Levenshtein distance between two sequences.
+
+    Works on strings (character level) and on sequences of words (word
+    level) alike.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    # The shorter sequence is the bit-vector pattern
+    return _bit_parallel_distance(_pattern_masks(b), len(b), a)
+
+
+@dataclass(frozen=True)
+class CompiledPhrase:
+    """Normalized form of an expected phrase, ready to match transcripts."""
+    text: str
+    words: Tuple[str, ...]
+    char_masks: Dict[str, int]
+    word_masks: Dict[str, int]
+
+    def char_distance(self, recognized: str) -> int:
+        """Character edit distance to a transcript."""
+        return _bit_parallel_distance(self.char_masks, len(self.text), normalize_text(recognized))
+
+    def word_distance(self, recognized: str) -> int:
+        """Word edit distance to a transcript."""
+        return _bit_parallel_distance(self.word_masks, len(self.words), normalize_words(recognized))
+
+    def similarity(self, recognized: str) -> float:
+        """Character-level similarity to a transcript: 1 - distance / longer length (0-1)."""
+        recognized_norm = normalize_text(recognized)
+        if not self.text or not recognized_norm:
+            return 0.0
+        distance = _bit_parallel_distance(self.char_masks, len(self.text), recognized_norm)
+        return 1.0 - distance / max(len(self.text), len(recognized_norm))
+
+    def word_error_rate(self, recognized: str) -> float:
+        """Word error rate of a transcript against this phrase."""
+        if not self.words:
+            return 1.0 if normalize_words(recognized) else 0.0
+        return self.word_distance(recognized) / len(self.words)
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_phrase(phrase: str) -> CompiledPhrase:
+    """Normalize an expected phrase once; repeated phrases come from the cache."""
+    normalized = normalize_text(phrase)
+    words = normalize_words(phrase)
+    return CompiledPhrase(
+        text=normalized,
+        words=words,
+        char_masks=_pattern_masks(normalized),
+        word_masks=_pattern_masks(words)
+    )
+
+
+def phrase_similarity(expected: str, recognized: str) -> float:
+    """Similarity between an expected phrase and a transcript (0-1)."""
+    return compile_phrase(expected).similarity(recognized)
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word error rate of ``hypothesis`` against ``reference``."""
+    return compile_phrase(reference).word_error_rate(hypothesis)
@@ -0,0 +1,95 @@
+"""
+Per-stage latency of a verification request.
+
+A request handler starts a ``StageTimer``; it is stored in a context
+variable, so the biometric facade, the audio decoder and the verification
+service record their stages into it (``timed_stage``) without the timer
+being passed through every call. asyncio tasks inherit the timer, and the
+facade copies the context into its executor threads.
+
+Stages (milliseconds, repeated stages accumulate):
+
+- ``convert``: container conversion to WAV (non-WAV uploads)
+- ``decode``: WAV parsing and resampling to 16 kHz
+- ``validate``: header checks and the SNR/clipping/silence measurement
+- ``preprocess``: voice activity trimming and hashing of the waveform
+- ``embed``, ``spoof``, ``asr``: each model, including cache lookups
+- ``inference``: wall time of the model phase (models run in parallel,
+  so this is less than their sum)
+- ``db``: database reads and writes of the request
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+STAGE_CONVERT = "convert"
+STAGE_DECODE = "decode"
+STAGE_VALIDATE = "validate"
+STAGE_PREPROCESS = "preprocess"
+STAGE_EMBED = "embed"
+STAGE_SPOOF = "spoof"
+STAGE_ASR = "asr"
+STAGE_INFERENCE = "inference"
+STAGE_DB = "db"
+
+
+class StageTimer:
+    """Accumulated duration of each named stage, plus the time since creation."""
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self._stages: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, elapsed_ms: float):
+        with self._lock:
+            self._stages[stage] = self._stages.get(stage, 0.0) + elapsed_ms
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, (time.perf_counter() - started) * 1000)
+
+    def get(self, stage: str) -> Optional[float]:
+        with self._lock:
+            return self._stages.get(stage)
+
+    def elapsed_ms(self) -> float:
+        """Time since the timer started (the end-to-end request latency so far)."""
+        return (time.perf_counter() - self._started) * 1000
+
+    def as_dict(self) -> Dict[str, int]:
+        """Whole milliseconds per stage, as persisted with the attempt."""
+        with self._lock:
+            return {stage: int(round(ms)) for stage, ms in self._stages.items()}
+
+
+_current_timer: ContextVar[Optional[StageTimer]] = ContextVar("stage_timer", default=None)
+
+
+def start_stage_timer() -> StageTimer:
+    """Start timing the current request (and the tasks it spawns from now on)."""
+    timer = StageTimer()
+    _current_timer.set(timer)
+    return timer
+
+
+def current_stage_timer() -> Optional[StageTimer]:
+    return _current_timer.get()
+
+
+@contextmanager
+def timed_stage(stage: str) -> Iterator[None]:
+    """Time a block into the current request's timer; a no-op outside a timed request."""
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    with timer.stage(stage):
+        yield
@@ -0,0 +1,97 @@
+"""Integration tests for the streaming verification WebSocket."""
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from src.main import create_app
+from src.infrastructure.config.dependencies import get_verification_service, get_voice_biometric_engine
+
+VERIFICATION_ID = "550e8400-e29b-41d4-a716-446655440000"
+PHRASE_ID = "550e8400-e29b-41d4-a716-446655440001"
+RATE = 16000
+
+
+class _FakeEngine:
+    def __init__(self):
+        self.analyzed = []
+
+    async def analyze(self, audio_data, audio_format="wav", reference_embedding=None):
+        self.analyzed.append(audio_data)
+        return {
+            "embedding": np.ones(4, dtype=np.float32),
+            "anti_spoofing_score": 0.1,
+            "transcribed_text": "hola mundo",
+            "similarity": 0.9,
+            "short_circuited": False,
+            "short_circuit_reason": None
+        }
+
+
+class _FakeService:
+    async def get_reference_embedding(self, verification_id):
+        return np.ones(4, dtype=np.float32)
+
+    async def get_phrase(self, phrase_id):
+        return None
+
+    async def verify_voice(self, verification_id, **kwargs):
+        return {
+            "verification_id": verification_id,
+            "user_id": "user-1",
+            "is_verified": True,
+            "confidence_score": 0.9,
+            "similarity_score": 0.9,
+            "anti_spoofing_score": kwargs["anti_spoofing_score"],
+            "phrase_match": True,
+            "is_live": True,
+            "threshold_used": 0.6
+        }
+
+
+@pytest.fixture
+def stream_client():
+    engine = _FakeEngine()
+    app = create_app()
+    app.dependency_overrides[get_voice_biometric_engine] = lambda: engine
+    app.dependency_overrides[get_verification_service] = lambda: _FakeService()
+    return TestClient(app), engine
+
+
+def _utterance() -> bytes:
+    t = np.arange(RATE) / RATE
+    speech = 0.3 * np.sin(2 * np.pi * 220 * t)
+    silence = np.random.default_rng(0).standard_normal(RATE) * 1e-3
+    return (np.concatenate([silence[:4800], speech, silence]) * 32767).astype("<i2").tobytes()
+
+
+def test_stream_ends_on_silence_and_reuses_partial_analysis(stream_client):
+    """Test that trailing silence ends the stream and the pause analysis is the final one."""
+    client, engine = stream_client
+    url = f"/api/verification/verify/stream?verification_id={VERIFICATION_ID}&phrase_id={PHRASE_ID}&format=pcm_s16le"
+    audio = _utterance()
+
+    with client.websocket_connect(url) as ws:
+        assert ws.receive_json()["type"] == "ready"
+        for start in range(0, len(audio), 3200):
+            ws.send_bytes(audio[start:start + 3200])
+        messages = []
+        while not messages or messages[-1]["type"] not in ("result", "error"):
+            messages.append(ws.receive_json())
+
+    result = messages[-1]
+    assert result["type"] == "result"
+    assert result["is_verified"]
+    assert result["anti_spoofing_score"] == pytest.approx(0.1)
+    assert len(engine.analyzed) == 1
+
+
+def test_stream_rejects_unknown_format(stream_client):
+    """Test that a format without an incremental decoder is refused."""
+    client, _ = stream_client
+    url = f"/api/verification/verify/stream?verification_id={VERIFICATION_ID}&phrase_id={PHRASE_ID}&format=mp3"
+
+    with client.websocket_connect(url) as ws:
+        message = ws.receive_json()
+
+    assert message["type"] == "error"
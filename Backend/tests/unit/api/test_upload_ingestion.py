@@ -0,0 +1,123 @@
+"""Unit tests for chunked upload ingestion and the request body limit."""
+
+import io
+import wave
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+
+from src.api.middleware.upload_limit_middleware import UploadSizeLimitMiddleware
+from src.api.upload_ingestion import UPLOAD_CHUNK_SIZE, read_audio_upload
+
+
+class _CountingFile(io.BytesIO):
+    """BytesIO that records how many bytes were read."""
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def _upload(data: bytes, content_type: str = "audio/wav", declare_size: bool = True):
+    file = _CountingFile(data)
+    upload = UploadFile(
+        file=file,
+        size=len(data) if declare_size else None,
+        headers=Headers({"content-type": content_type})
+    )
+    return upload, file
+
+
+def _wav(duration_sec: float, sample_rate: int = 8000) -> bytes:
+    wav_io = io.BytesIO()
+    with wave.open(wav_io, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(1)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(b"\x80" * int(duration_sec * sample_rate))
+    return wav_io.getvalue()
+
+
+async def test_valid_upload_is_read_with_sniffed_format():
+    """Test that a valid upload is returned whole with its container format."""
+    data = _wav(3.0)
+    upload, _ = _upload(data, content_type="application/octet-stream")
+
+    audio_bytes, audio_format = await read_audio_upload(upload)
+
+    assert audio_bytes == data
+    assert audio_format == "wav"
+
+
+async def test_oversized_upload_rejected_before_reading():
+    """Test that the declared size or the first chunk past the limit stops the read."""
+    data = _wav(3.0)
+    upload, file = _upload(data)
+    with pytest.raises(HTTPException) as declared:
+        await read_audio_upload(upload, max_bytes=1000)
+    assert declared.value.status_code == 413
+    assert file.bytes_read == 0
+
+    upload, file = _upload(b"RIFF" + b"\x00" * (3 * UPLOAD_CHUNK_SIZE), declare_size=False)
+    with pytest.raises(HTTPException) as streamed:
+        await read_audio_upload(upload, max_bytes=UPLOAD_CHUNK_SIZE + 10)
+    assert streamed.value.status_code == 413
+    assert file.bytes_read == 2 * UPLOAD_CHUNK_SIZE
+
+
+async def test_unsupported_and_too_long_uploads_fail_on_the_first_bytes():
+    """Test that format and header duration are checked before the body is read."""
+    upload, file = _upload(b"%PDF-1.7" + b"\x00" * (4 * UPLOAD_CHUNK_SIZE), content_type="application/pdf")
+    with pytest.raises(HTTPException) as unsupported:
+        await read_audio_upload(upload)
+    assert unsupported.value.status_code == 415
+    assert file.bytes_read == UPLOAD_CHUNK_SIZE
+
+    data = _wav(31.0)
+    upload, file = _upload(data)
+    with pytest.raises(HTTPException) as too_long:
+        await read_audio_upload(upload)
+    assert too_long.value.status_code == 400
+    assert "too long" in too_long.value.detail
+    assert file.bytes_read < len(data)
+
+
+async def test_middleware_cuts_off_streamed_body():
+    """Test that a multipart body over the limit gets a 413 without reaching its end."""
+    chunks = [b"x" * 100 for _ in range(10)]
+    received_by_app = []
+
+    async def app(scope, receive, send):
+        while True:
+            message = await receive()
+            received_by_app.append(message)
+            if not message.get("more_body"):
+                break
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    async def receive():
+        body = chunks.pop(0)
+        return {"type": "http.request", "body": body, "more_body": bool(chunks)}
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "path": "/api/verification/verify",
+        "headers": [(b"content-type", b"multipart/form-data; boundary=x")],
+    }
+    await UploadSizeLimitMiddleware(app, max_body_bytes=250)(scope, receive, send)
+
+    assert sent[0]["status"] == 413
+    assert len(received_by_app) == 2
+    assert len(chunks) == 7
@@ -0,0 +1,36 @@
+"""Unit tests for ASRAdapter input preparation."""
+
+import numpy as np
+import torch
+
+from src.infrastructure.biometrics.ASRAdapter import ASRAdapter
+from src.infrastructure.biometrics.audio_sample import AudioSample
+
+
+def _adapter_feeding_model(max_speech_sec: float, fed: list) -> ASRAdapter:
+    """Adapter with a loaded-model stand-in that records the waveform it is fed."""
+    adapter = ASRAdapter.__new__(ASRAdapter)
+    adapter.max_speech_sec = max_speech_sec
+    adapter.device = torch.device("cpu")
+    adapter._model_loaded = True
+
+    def run(waveform, expected_phrase=None):
+        fed.append(waveform.shape[-1])
+        return {"recognized_text": "", "phrase_match": 1.0} if expected_phrase else ""
+
+    adapter._run = run
+    return adapter
+
+
+def test_phrase_longer_than_max_speech_is_scored_whole(monkeypatch):
+    """Test that phrase scoring aligns all speech while transcription keeps the ASR_MAX_SPEECH_SEC crop."""
+    monkeypatch.setenv("VAD_ENABLED", "false")
+    waveform = np.random.default_rng(0).uniform(-0.5, 0.5, 3 * 16000).astype(np.float32)
+    sample = AudioSample.from_array(waveform, 16000)
+    fed = []
+    adapter = _adapter_feeding_model(max_speech_sec=1.0, fed=fed)
+
+    adapter.score_phrase(sample, "una frase que dura tres segundos")
+    adapter.transcribe(sample)
+
+    assert fed == [3 * 16000, 16000]
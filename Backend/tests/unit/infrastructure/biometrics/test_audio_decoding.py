@@ -0,0 +1,74 @@
+"""Unit tests for in-process upload decoding."""
+
+import io
+import shutil
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from src.infrastructure.biometrics.audio_decoding import (
+    FFmpegDecoderPool,
+    _decode_wave_module,
+    decode_audio,
+)
+from src.infrastructure.biometrics.audio_sample import AudioSample
+
+
+def _tone(duration_sec: float, sample_rate: int, channels: int = 1) -> np.ndarray:
+    t = np.arange(int(duration_sec * sample_rate)) / sample_rate
+    tone = 0.5 * np.sin(2 * np.pi * 220 * t)
+    return np.repeat(tone[:, None], channels, axis=1).astype(np.float32)
+
+
+def _encode(frames: np.ndarray, sample_rate: int, audio_format: str, subtype: str) -> bytes:
+    buffer = io.BytesIO()
+    sf.write(buffer, frames, sample_rate, format=audio_format, subtype=subtype)
+    return buffer.getvalue()
+
+
+def test_wav_decodes_like_the_wave_module():
+    """Test that libsndfile and the standard-library fallback agree on PCM WAV."""
+    wav_bytes = _encode(_tone(1.0, 16000, channels=2), 16000, "WAV", "PCM_16")
+
+    waveform, sample_rate, channels = decode_audio(wav_bytes, "wav")
+    reference, _, _ = _decode_wave_module(wav_bytes)
+
+    assert (sample_rate, channels) == (16000, 2)
+    assert waveform.ndim == 1
+    np.testing.assert_allclose(waveform, reference, atol=1e-4)
+
+
+def test_flac_decodes_in_process_and_resamples():
+    """Test that FLAC uploads become 16 kHz samples without an external converter."""
+    flac_bytes = _encode(_tone(1.5, 44100), 44100, "FLAC", "PCM_16")
+
+    sample = AudioSample.from_bytes(flac_bytes, "audio/flac")
+
+    assert sample.source_format == "flac"
+    assert sample.original_sample_rate == 44100
+    assert sample.duration_sec == pytest.approx(1.5, abs=1e-3)
+
+
+def test_corrupt_wav_is_rejected():
+    """Test that unreadable WAV uploads raise ValueError."""
+    with pytest.raises(ValueError):
+        decode_audio(b"RIFF\x00\x00\x00\x00WAVEjunk", "wav")
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_ffmpeg_pool_decodes_and_refills():
+    """Test that pre-started ffmpeg processes decode uploads to 16 kHz float32."""
+    pool = FFmpegDecoderPool(size=1)
+    try:
+        flac_bytes = _encode(_tone(1.0, 8000), 8000, "FLAC", "PCM_16")
+        for _ in range(2):
+            waveform, sample_rate, _ = pool.decode(flac_bytes)
+            assert sample_rate == 16000
+            assert waveform.dtype == np.float32
+            assert len(waveform) == pytest.approx(16000, abs=200)
+
+        with pytest.raises(ValueError):
+            pool.decode(b"not audio at all")
+    finally:
+        pool.close()
@@ -0,0 +1,68 @@
+"""Unit tests for the shared-spectrogram anti-spoofing features."""
+
+import librosa
+import numpy as np
+import pytest
+
+from src.infrastructure.biometrics import audio_features
+from src.infrastructure.biometrics.audio_features import AudioFeatureExtractor
+
+SAMPLE_RATE = 16000
+
+
+def _voice_like(duration_sec: float, seed: int) -> np.ndarray:
+    """Gliding harmonic tone in bursts over background noise."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration_sec * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch = 150 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    gate = (np.floor(t * 3) % 3 != 2).astype(np.float64)
+    voice = 0.3 * (np.sin(phase) + 0.5 * np.sin(2 * phase)) * gate
+    return (voice + rng.normal(0, 0.003, len(t))).astype(np.float32)
+
+
+def test_features_share_one_stft(monkeypatch):
+    """Test that all features of a clip are computed from a single STFT."""
+    calls = []
+    original_stft = librosa.stft
+
+    def counting_stft(*args, **kwargs):
+        calls.append(1)
+        return original_stft(*args, **kwargs)
+
+    monkeypatch.setattr(audio_features.librosa, "stft", counting_stft)
+    features = AudioFeatureExtractor(SAMPLE_RATE).extract_all_features(_voice_like(2.0, seed=0))
+
+    assert len(calls) == 1
+    assert set(features) == {"snr", "spectral_artifacts", "background_noise", "pitch_stability"}
+
+
+def test_pitch_and_spectral_features_match_librosa_on_the_signal():
+    """Test that reusing the spectrogram gives the same values as recomputing it from the signal."""
+    audio = _voice_like(2.0, seed=1)
+    extractor = AudioFeatureExtractor(SAMPLE_RATE)
+
+    flatness = librosa.feature.spectral_flatness(y=audio, n_fft=2048, hop_length=512)
+    shared = librosa.feature.spectral_flatness(S=extractor.prepare(audio).magnitude)
+    np.testing.assert_allclose(shared, flatness, rtol=1e-5)
+
+    pitches, magnitudes = librosa.piptrack(y=audio, sr=SAMPLE_RATE, fmin=80, fmax=400)
+    reference = np.array([
+        pitches[magnitudes[:, t].argmax(), t] for t in range(pitches.shape[1])
+    ])
+    reference = reference[reference > 0]
+    global_score = np.clip(np.var(reference) / 500, 0, 1)
+    local_score = np.clip(np.mean(np.abs(np.diff(reference))) / 20, 0, 1)
+
+    assert extractor.calculate_pitch_stability(audio) == pytest.approx(0.6 * global_score + 0.4 * local_score)
+
+
+def test_batch_matches_single_clip_extraction():
+    """Test that the batch entry point returns per-clip results in input order."""
+    clips = [_voice_like(duration, seed) for seed, duration in enumerate((1.5, 2.0, 3.0))]
+    extractor = AudioFeatureExtractor(SAMPLE_RATE)
+
+    batch = extractor.extract_features_batch(clips, max_workers=3)
+
+    assert batch == [extractor.extract_all_features(clip) for clip in clips]
+    assert extractor.extract_features_batch([]) == []
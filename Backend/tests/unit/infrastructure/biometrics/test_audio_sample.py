@@ -0,0 +1,136 @@
+"""Unit tests for the decode-once AudioSample representation."""
+
+import io
+import warnings
+import wave
+
+import numpy as np
+import pytest
+
+from src.infrastructure.biometrics.audio_sample import (
+    AudioSample,
+    as_audio_sample,
+    normalize_format,
+    sniff_format,
+)
+
+
+def _make_wav(duration_sec: float, sample_rate: int = 16000, channels: int = 1) -> bytes:
+    t = np.arange(int(duration_sec * sample_rate)) / sample_rate
+    tone = 0.5 * np.sin(2 * np.pi * 220 * t)
+    frames = np.repeat(tone[:, None], channels, axis=1)
+    pcm = (frames * 32767).astype(np.int16)
+    wav_io = io.BytesIO()
+    with wave.open(wav_io, 'wb') as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm.tobytes())
+    return wav_io.getvalue()
+
+
+def test_from_bytes_decodes_wav():
+    """Test that WAV bytes decode to mono float32 at 16 kHz with upload metadata."""
+    audio_bytes = _make_wav(2.5, channels=2)
+    sample = AudioSample.from_bytes(audio_bytes, "audio/wav")
+
+    assert sample.waveform.dtype == np.float32
+    assert sample.waveform.ndim == 1
+    assert sample.duration_sec == pytest.approx(2.5)
+    assert sample.original_channels == 2
+    assert sample.source_num_bytes == len(audio_bytes)
+
+
+def test_from_bytes_resamples_to_16k():
+    """Test that non-16 kHz input is resampled while keeping its duration."""
+    sample = AudioSample.from_bytes(_make_wav(2.0, sample_rate=44100))
+
+    assert sample.sample_rate == 16000
+    assert sample.original_sample_rate == 44100
+    assert sample.duration_sec == pytest.approx(2.0, abs=1e-3)
+
+
+def test_waveform_is_read_only_and_shared():
+    """Test that the buffer cannot be mutated and tensor views do not copy it."""
+    sample = AudioSample.from_bytes(_make_wav(2.0))
+
+    with pytest.raises(ValueError):
+        sample.waveform[0] = 1.0
+    assert sample.as_tensor().data_ptr() == sample.waveform.ctypes.data
+    assert as_audio_sample(sample) is sample
+
+
+def test_not_writable_warning_is_only_silenced_for_the_shared_buffer():
+    """Test that tensor views over the buffer are quiet without muting the warning process-wide."""
+    sample = AudioSample.from_bytes(_make_wav(1.0))
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        sample.as_tensor()
+    assert not caught
+    assert not any(
+        action == "ignore" and message is not None and message.search("NumPy array is not writable")
+        for action, message, *_ in warnings.filters
+    )
+
+
+def test_wav_round_trip():
+    """Test that re-encoding to WAV preserves the decoded audio."""
+    sample = AudioSample.from_bytes(_make_wav(2.0))
+    decoded = AudioSample.from_bytes(sample.to_wav_bytes())
+
+    np.testing.assert_allclose(decoded.waveform, sample.waveform, atol=1e-4)
+
+
+def test_from_bytes_rejects_invalid_audio():
+    """Test that empty or corrupt uploads raise ValueError."""
+    with pytest.raises(ValueError):
+        AudioSample.from_bytes(b"")
+    with pytest.raises(ValueError):
+        AudioSample.from_bytes(b"RIFF\x00\x00\x00\x00WAVEjunk", "audio/wav")
+
+
+def test_format_detection():
+    """Test MIME normalization and header sniffing."""
+    assert normalize_format("audio/webm;codecs=opus") == "webm"
+    assert normalize_format("audio/x-wav") == "wav"
+    assert sniff_format(_make_wav(0.1)) == "wav"
+    assert sniff_format(b"\x1a\x45\xdf\xa3" + b"\x00" * 8) == "webm"
+    assert sniff_format(b"OggS" + b"\x00" * 8) == "ogg"
+    assert sniff_format(b"\x00" * 12) is None
+
+
+def _silence_speech_silence(sample_rate: int = 16000) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    silence = rng.standard_normal(sample_rate) * 1e-3
+    t = np.arange(2 * sample_rate) / sample_rate
+    speech = 0.3 * np.sin(2 * np.pi * 220 * t)
+    return np.concatenate([silence, speech, silence]).astype(np.float32)
+
+
+def test_speech_waveform_drops_silence():
+    """Test that leading and trailing silence is trimmed once per sample."""
+    sample = AudioSample.from_array(_silence_speech_silence(), 16000)
+
+    # 2 s of speech plus the hangover and pre-roll frames
+    assert 2.0 <= sample.speech_duration_sec < 2.5
+    assert sample.speech_waveform is sample.speech_waveform
+    assert not sample.speech_waveform.flags.writeable
+
+
+def test_speech_waveform_passthrough(monkeypatch):
+    """Test that disabled VAD and silent audio keep the full waveform."""
+    silent = AudioSample.from_array(np.zeros(16000, dtype=np.float32), 16000)
+    assert silent.speech_waveform is silent.waveform
+
+    monkeypatch.setenv("VAD_ENABLED", "false")
+    sample = AudioSample.from_array(_silence_speech_silence(), 16000)
+    assert sample.speech_waveform is sample.waveform
+
+
+def test_model_input_center_crops_speech():
+    """Test that model_input caps the speech at max_speech_sec."""
+    sample = AudioSample.from_array(_silence_speech_silence(), 16000)
+
+    assert len(sample.model_input(1.0)) == 16000
+    assert len(sample.model_input(None)) == len(sample.speech_waveform)
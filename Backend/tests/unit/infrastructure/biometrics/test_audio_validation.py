@@ -0,0 +1,95 @@
+"""Unit tests for header-only upload checks and signal quality measurement."""
+
+import io
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from src.infrastructure.biometrics.audio_validation import (
+    AudioValidationError,
+    QualityThresholds,
+    check_signal_quality,
+    check_upload,
+    measure_signal_quality,
+    probe_header,
+)
+
+SAMPLE_RATE = 16000
+
+
+def _encode(frames: np.ndarray, sample_rate: int, audio_format: str, subtype: str) -> bytes:
+    buffer = io.BytesIO()
+    sf.write(buffer, frames, sample_rate, format=audio_format, subtype=subtype)
+    return buffer.getvalue()
+
+
+def _bursts(duration_sec: float, noise_std: float, seed: int = 0) -> np.ndarray:
+    """Half-second tone bursts separated by half-second pauses, over white noise."""
+    t = np.arange(int(duration_sec * SAMPLE_RATE)) / SAMPLE_RATE
+    gate = (np.floor(t * 2) % 2 == 0).astype(np.float32)
+    tone = 0.5 * np.sin(2 * np.pi * 220 * t) * gate
+    noise = np.random.default_rng(seed).normal(0, noise_std, len(t))
+    return (tone + noise).astype(np.float32)
+
+
+def test_wav_and_flac_headers_give_duration_without_decoding():
+    """Test that the duration, rate and channels come from the container header."""
+    frames = np.zeros((int(2.5 * 22050), 2), dtype=np.float32)
+    wav = probe_header(_encode(frames, 22050, "WAV", "PCM_16"), "wav")
+    flac = probe_header(_encode(frames, 22050, "FLAC", "PCM_16"), "flac")
+
+    for header in (wav, flac):
+        assert header.duration_sec == pytest.approx(2.5, abs=1e-3)
+        assert (header.sample_rate, header.channels) == (22050, 2)
+
+
+def test_unreadable_header_is_unknown_not_an_error():
+    """Test that formats or headers that do not state a duration are left to the decoder."""
+    assert probe_header(b"OggS-truncated", "ogg").duration_sec is None
+    assert probe_header(b"\xff\xfb\x90\x00", "mp3").duration_sec is None
+
+
+def test_deeply_nested_webm_header_is_unknown():
+    """Test that nested unknown-size Segments give an unknown header instead of a RecursionError."""
+    unknown_size_segment = bytes.fromhex("18538067") + b"\x01" + b"\xff" * 7
+    assert probe_header(unknown_size_segment * 5000, "webm").duration_sec is None
+
+
+def test_upload_rejected_before_decoding():
+    """Test that oversized and too long uploads fail on size/header alone."""
+    with pytest.raises(AudioValidationError, match="too large"):
+        check_upload(b"\x00" * 2048, "webm", max_bytes=1024)
+
+    too_long = _encode(np.zeros(31 * 8000, dtype=np.float32), 8000, "WAV", "PCM_U8")
+    with pytest.raises(AudioValidationError, match="too long"):
+        check_upload(too_long, "wav")
+
+    with pytest.raises(AudioValidationError, match="Unsupported"):
+        check_upload(b"data", "aiff")
+
+
+def test_snr_matches_the_mixed_noise_level():
+    """Test that the SNR follows the mix (tone power 0.125, noise power 2.5e-5 -> ~37 dB)."""
+    quality = measure_signal_quality(_bursts(3.0, noise_std=0.005), SAMPLE_RATE)
+
+    assert quality.snr_db == pytest.approx(37.0, abs=2.0)
+    assert quality.clipping_ratio == 0.0
+    assert 0.3 < quality.silence_ratio < 0.6
+    assert check_signal_quality(quality, QualityThresholds()) is None
+
+
+def test_noisy_clipped_and_silent_audio_are_rejected():
+    """Test that each signal defect produces a rejection reason."""
+    thresholds = QualityThresholds()
+
+    noisy = measure_signal_quality(_bursts(3.0, noise_std=0.3), SAMPLE_RATE)
+    assert "noisy" in check_signal_quality(noisy, thresholds)
+
+    clipped = measure_signal_quality(np.clip(_bursts(3.0, 0.005) * 4, -1.0, 1.0), SAMPLE_RATE)
+    assert clipped.clipping_ratio > thresholds.max_clipping_ratio
+    assert "clipped" in check_signal_quality(clipped, thresholds)
+
+    silent = measure_signal_quality(np.zeros(3 * SAMPLE_RATE, dtype=np.float32), SAMPLE_RATE)
+    assert silent.silence_ratio == 1.0
+    assert "speech" in check_signal_quality(silent, thresholds)
@@ -0,0 +1,159 @@
+"""Unit tests for the MicroBatcher scheduler."""
+
+import threading
+
+import pytest
+
+from src.infrastructure.biometrics.batching import MicroBatcher
+
+
+def _run_concurrently(batcher: MicroBatcher, items: list) -> list:
+    """Submit items from separate threads and collect results in order."""
+    results = [None] * len(items)
+
+    def worker(index):
+        results[index] = batcher.run(items[index], timeout=5)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(items))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_results_are_fanned_out_in_order():
+    """Test that each caller receives the result for its own item."""
+    batcher = MicroBatcher(lambda items: [x * 2 for x in items], max_batch_size=4, max_wait_ms=50)
+    try:
+        results = _run_concurrently(batcher, list(range(10)))
+    finally:
+        batcher.close()
+
+    assert results == [x * 2 for x in range(10)]
+
+
+def test_concurrent_requests_share_batches():
+    """Test that concurrent requests are coalesced up to max_batch_size."""
+    batch_sizes = []
+
+    def batch_fn(items):
+        batch_sizes.append(len(items))
+        return items
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=4, max_wait_ms=100)
+    try:
+        _run_concurrently(batcher, list(range(8)))
+        stats = batcher.get_stats()
+    finally:
+        batcher.close()
+
+    assert sum(batch_sizes) == 8
+    assert max(batch_sizes) <= 4
+    assert len(batch_sizes) < 8
+    assert stats["items_processed"] == 8
+    assert stats["batches_run"] == len(batch_sizes)
+
+
+def test_batch_failure_propagates_to_every_caller():
+    """Test that an exception in the batch function reaches all callers."""
+    def batch_fn(items):
+        raise ValueError("model exploded")
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=2, max_wait_ms=1)
+    try:
+        with pytest.raises(ValueError, match="model exploded"):
+            batcher.run("audio", timeout=5)
+    finally:
+        batcher.close()
+
+
+def test_result_count_mismatch_is_an_error():
+    """Test that a batch function returning the wrong number of results fails."""
+    batcher = MicroBatcher(lambda items: [], max_batch_size=2, max_wait_ms=1)
+    try:
+        with pytest.raises(RuntimeError):
+            batcher.run("audio", timeout=5)
+    finally:
+        batcher.close()
+
+
+def test_submit_after_close_is_rejected():
+    """Test that a closed batcher does not accept new work."""
+    batcher = MicroBatcher(lambda items: items)
+    batcher.close()
+
+    with pytest.raises(RuntimeError):
+        batcher.submit("audio")
+
+
+def test_invalid_configuration():
+    """Test that invalid batch configuration is rejected."""
+    with pytest.raises(ValueError):
+        MicroBatcher(lambda items: items, max_batch_size=0)
+
+
+def test_bucket_fn_splits_batches_by_key():
+    """Test that items with different bucket keys never share a forward pass."""
+    batches = []
+
+    def batch_fn(items):
+        batches.append(list(items))
+        return items
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=8, max_wait_ms=100, bucket_fn=lambda x: x // 10)
+    try:
+        results = _run_concurrently(batcher, [1, 2, 11, 12, 3, 13])
+    finally:
+        batcher.close()
+
+    assert results == [1, 2, 11, 12, 3, 13]
+    for batch in batches:
+        assert len({x // 10 for x in batch}) == 1
+
+
+def test_multiple_workers_run_batches_concurrently():
+    """Test that num_workers > 1 lets two batches be in flight at the same time."""
+    both_running = threading.Barrier(2, timeout=5)
+
+    def batch_fn(items):
+        # Only returns if a second worker reaches the barrier concurrently
+        both_running.wait()
+        return items
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=1, max_wait_ms=0, num_workers=2)
+    try:
+        results = _run_concurrently(batcher, [1, 2])
+    finally:
+        batcher.close()
+
+    assert sorted(results) == [1, 2]
+    assert batcher.get_stats()["workers"] == 2
+
+
+def test_requests_racing_close_are_all_completed():
+    """Test that every request accepted while close() runs is processed, none left hanging."""
+    batcher = MicroBatcher(lambda items: items, max_batch_size=4, max_wait_ms=1, num_workers=2)
+    accepted = []
+    start = threading.Barrier(5, timeout=5)
+
+    def submitter():
+        accepted.append(batcher.submit(-1))
+        start.wait()
+        while True:
+            try:
+                accepted.append(batcher.submit(len(accepted)))
+            except RuntimeError:
+                return
+
+    threads = [threading.Thread(target=submitter) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    batcher.close()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert all(not thread.is_alive() for thread in threads)
+    for future in accepted:
+        future.result(timeout=5)
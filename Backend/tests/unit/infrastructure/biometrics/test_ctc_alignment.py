@@ -0,0 +1,79 @@
+"""Unit tests for phrase-constrained CTC scoring."""
+
+import numpy as np
+
+from src.infrastructure.biometrics.ctc_alignment import forced_align, greedy_token_ids, score_phrase
+
+VOCAB = 5
+
+
+def _emissions(frame_tokens, peak=0.96):
+    """Log-probabilities where each frame strongly predicts one token (0 = blank)."""
+    probs = np.full((len(frame_tokens), VOCAB), (1 - peak) / (VOCAB - 1))
+    probs[np.arange(len(frame_tokens)), frame_tokens] = peak
+    return np.log(probs)
+
+
+# "ab cd" spoken with blanks and repeated frames
+SPOKEN = [0, 1, 1, 0, 2, 0, 3, 3, 0, 4, 0, 0]
+
+
+def test_expected_phrase_scores_high():
+    """Test that the phrase actually spoken gets high word confidences."""
+    result = score_phrase(_emissions(SPOKEN), [[1, 2], [3, 4]], ["ab", "cd"], frame_sec=0.02)
+
+    assert result.aligned
+    assert result.score > 0.9
+    assert [w["word"] for w in result.word_confidences()] == ["ab", "cd"]
+    first, second = result.words
+    assert first.start_sec == 0.02
+    assert first.end_sec <= second.start_sec
+
+
+def test_wrong_phrase_scores_low():
+    """Test that a phrase with the wrong tokens scores far below the spoken one."""
+    emissions = _emissions(SPOKEN)
+    spoken = score_phrase(emissions, [[1, 2], [3, 4]], ["ab", "cd"], frame_sec=0.02)
+    wrong = score_phrase(emissions, [[2, 1], [4, 3]], ["ba", "dc"], frame_sec=0.02)
+
+    assert wrong.score < 0.5 * spoken.score
+    assert wrong.log_likelihood < spoken.log_likelihood
+
+
+def test_repeated_tokens_need_a_blank_between_them():
+    """Test that a doubled token cannot be aligned without a separating frame."""
+    token_path, _ = forced_align(_emissions([1, 1, 0, 1]), [1, 1])
+    assert token_path.tolist() == [0, 0, -1, 1]
+
+    token_path, log_likelihood = forced_align(_emissions([1, 1]), [1, 1])
+    assert token_path is None
+    assert log_likelihood == float("-inf")
+
+
+def test_audio_too_short_for_phrase():
+    """Test that too few frames give a zero score instead of an error."""
+    result = score_phrase(_emissions([1, 2]), [[1, 2], [3, 4]], ["ab", "cd"], frame_sec=0.02)
+
+    assert not result.aligned
+    assert result.score == 0.0
+    assert [w.confidence for w in result.words] == [0.0, 0.0]
+
+
+def test_greedy_decoding_collapses_repeats_and_blanks():
+    """Test best-path decoding of the same emissions."""
+    assert greedy_token_ids(_emissions(SPOKEN)) == [1, 2, 3, 4]
+    assert greedy_token_ids(np.zeros((0, VOCAB))) == []
+
+
+def test_score_is_likelihood_ratio_against_free_path():
+    """Test that the score compares the forced path with the best path, not raw posteriors."""
+    # Low-confidence emissions: the spoken phrase still matches the free path
+    spoken = score_phrase(_emissions(SPOKEN, peak=0.4), [[1, 2], [3, 4]], ["ab", "cd"], frame_sec=0.02)
+    assert spoken.log_likelihood_ratio == 0.0
+    assert spoken.score == 1.0
+
+    # One wrong word pulls its own confidence down, the other word is untouched
+    half = score_phrase(_emissions(SPOKEN), [[1, 2], [4, 3]], ["ab", "dc"], frame_sec=0.02)
+    assert half.words[0].confidence == 1.0
+    assert half.words[1].confidence < 0.5
+    assert half.log_likelihood_ratio < 0
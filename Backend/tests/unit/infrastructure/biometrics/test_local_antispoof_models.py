@@ -0,0 +1,55 @@
+"""Unit tests for batched inference in the local anti-spoofing models."""
+
+import pytest
+import torch
+
+from src.infrastructure.biometrics.local_antispoof_models import BaseLocalAntiSpoofModel
+
+
+class _EnergyNet(torch.nn.Module):
+    """Tiny stand-in network: logits depend on per-sample energy."""
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        energy = x.pow(2).mean(dim=1, keepdim=True)
+        return torch.cat([-energy, energy], dim=1)
+
+
+class _FakeLocalModel(BaseLocalAntiSpoofModel):
+    def __init__(self):
+        super().__init__(torch.device("cpu"))
+        self._model = _EnergyNet()
+        self._target_len = 1600
+        self.available = True
+        self.forward_calls = 0
+
+    def _forward_logits(self, batch: torch.Tensor) -> torch.Tensor:
+        self.forward_calls += 1
+        return self._model(batch)
+
+
+def test_batch_matches_single_predictions():
+    """Test that batched scores equal per-request scores for mixed lengths."""
+    model = _FakeLocalModel()
+    waveforms = [torch.randn(1, n) for n in (800, 1600, 4000)]
+
+    singles = [model.predict_spoof_probability(w, 16000) for w in waveforms]
+    batch = model.predict_spoof_probability_batch(waveforms, 16000)
+
+    assert batch == pytest.approx(singles)
+
+
+def test_batch_runs_single_forward_pass():
+    """Test that a whole batch is scored with one forward pass."""
+    model = _FakeLocalModel()
+    model.predict_spoof_probability_batch([torch.randn(1, 1600) for _ in range(4)], 16000)
+
+    assert model.forward_calls == 1
+
+
+def test_unavailable_model_returns_none():
+    """Test that an unloaded model reports no scores."""
+    model = _FakeLocalModel()
+    model.available = False
+
+    assert model.predict_spoof_probability_batch([torch.randn(1, 1600)], 16000) is None
+    assert model.predict_spoof_probability(torch.randn(1, 1600), 16000) is None
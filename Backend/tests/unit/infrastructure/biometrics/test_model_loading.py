@@ -0,0 +1,109 @@
+"""Unit tests for concurrent model loading and warm-up."""
+
+import threading
+
+import pytest
+
+from src.infrastructure.biometrics.model_loading import (
+    ModelReadiness,
+    STATE_DEGRADED,
+    STATE_FAILED,
+    STATE_READY,
+    load_models_concurrently,
+    synthetic_speech,
+)
+
+
+class _FakeAdapter:
+    def __init__(self, replicas=1):
+        self.calls = []
+        self._replicas = replicas
+        self.closed = False
+
+    def get_replica_stats(self):
+        return {"replicas": self._replicas}
+
+    def extract_embedding(self, sample, audio_format):
+        self.calls.append(sample.duration_sec)
+
+    def detect_spoof(self, sample):
+        self.calls.append(sample.duration_sec)
+
+    def transcribe(self, sample):
+        self.calls.append(sample.duration_sec)
+
+    def close(self):
+        self.closed = True
+
+
+def test_models_load_concurrently_and_are_warmed_up():
+    """Test that all constructors run at the same time and each replica gets every warm-up length."""
+    started = threading.Barrier(3, timeout=5)
+    adapters = {"speaker": _FakeAdapter(), "antispoof": _FakeAdapter(replicas=2), "asr": _FakeAdapter()}
+
+    def factory(key):
+        def build():
+            started.wait()  # Fails unless the three loads overlap
+            return adapters[key]
+        return build
+
+    readiness = ModelReadiness()
+    loaded = load_models_concurrently(
+        {key: factory(key) for key in adapters}, readiness=readiness, warmup_durations_sec=[1.0, 2.0]
+    )
+
+    assert loaded == adapters
+    assert sorted(adapters["speaker"].calls) == [1.0, 2.0]
+    assert sorted(adapters["antispoof"].calls) == [1.0, 1.0, 2.0, 2.0]
+    assert readiness.all_ready
+    status = readiness.snapshot()
+    assert all(model["state"] == STATE_READY for model in status.values())
+    assert all(model["load_sec"] is not None and model["warmup_sec"] is not None for model in status.values())
+
+
+def test_failed_model_is_reported_and_others_are_closed():
+    """Test that one failing load marks that model failed and releases the others."""
+    speaker = _FakeAdapter()
+
+    def broken():
+        raise OSError("weights not found")
+
+    readiness = ModelReadiness()
+    with pytest.raises(RuntimeError, match="weights not found"):
+        load_models_concurrently(
+            {"speaker": lambda: speaker, "antispoof": broken, "asr": _FakeAdapter},
+            readiness=readiness,
+            warmup_durations_sec=[]
+        )
+
+    status = readiness.snapshot()
+    assert status["antispoof"]["state"] == STATE_FAILED
+    assert status["antispoof"]["error"] == "weights not found"
+    assert readiness.any_failed and not readiness.all_ready
+    assert speaker.closed
+
+
+def test_mock_fallback_is_reported_as_degraded():
+    """Test that an adapter running on its mock fallback is degraded, not ready."""
+    mock = _FakeAdapter()
+    mock.is_model_loaded = lambda: False
+
+    readiness = ModelReadiness()
+    loaded = load_models_concurrently(
+        {"speaker": _FakeAdapter, "antispoof": lambda: mock, "asr": _FakeAdapter},
+        readiness=readiness,
+        warmup_durations_sec=[]
+    )
+
+    assert loaded["antispoof"] is mock
+    status = readiness.snapshot()
+    assert status["antispoof"]["state"] == STATE_DEGRADED
+    assert status["speaker"]["state"] == STATE_READY
+    assert readiness.any_degraded and not readiness.all_ready and not readiness.any_failed
+
+
+def test_synthetic_speech_has_requested_length():
+    """Test the warm-up signal."""
+    sample = synthetic_speech(2.5)
+    assert sample.duration_sec == pytest.approx(2.5)
+    assert 0.0 < abs(sample.waveform).max() < 1.0
@@ -0,0 +1,116 @@
+"""Parity tests between the torch models and their ONNX Runtime exports."""
+
+import copy
+
+import numpy as np
+import pytest
+import torch
+
+pytest.importorskip("onnxruntime")
+
+from src.infrastructure.biometrics.local_antispoof_models import (
+    BaseLocalAntiSpoofModel,
+    LocalModelPaths,
+    LocalONNXAntiSpoofModel,
+    LocalRawNet2Model,
+    load_local_antispoof_model,
+)
+from src.infrastructure.biometrics.onnx_runtime import (
+    FEATS_INPUT,
+    create_onnx_session,
+    export_speaker_encoder_onnx,
+    run_onnx_session,
+)
+
+
+class _ConvGruNet(torch.nn.Module):
+    """Small raw-waveform classifier with the layer types of RawNet2."""
+
+    def __init__(self):
+        super().__init__()
+        self.conv = torch.nn.Conv1d(1, 8, kernel_size=9, stride=4)
+        self.gru = torch.nn.GRU(input_size=8, hidden_size=16, batch_first=True)
+        self.fc = torch.nn.Linear(16, 2)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        h = torch.relu(self.conv(x.unsqueeze(1))).transpose(1, 2)
+        out, _ = self.gru(h)
+        return self.fc(out[:, -1, :])
+
+
+class _FakeLocalModel(BaseLocalAntiSpoofModel):
+    def __init__(self):
+        super().__init__(torch.device("cpu"))
+        torch.manual_seed(0)
+        self._model = _ConvGruNet().eval()
+        self._target_len = 1600
+        self.available = True
+
+    def _forward_logits(self, batch: torch.Tensor) -> torch.Tensor:
+        return self._model(batch)
+
+
+@pytest.fixture
+def exported(tmp_path):
+    model = _FakeLocalModel()
+    onnx_path = tmp_path / "fake.onnx"
+    assert model.export_onnx(onnx_path)
+    return model, LocalONNXAntiSpoofModel(torch.device("cpu"), onnx_path, "fake")
+
+
+def test_antispoof_onnx_matches_torch(exported):
+    """Test that ONNX scores match torch for a batch of mixed-length waveforms."""
+    torch_model, onnx_model = exported
+    waveforms = [torch.randn(1, n) for n in (800, 1600, 4000)]
+
+    expected = torch_model.predict_spoof_probability_batch(waveforms, 16000)
+    actual = onnx_model.predict_spoof_probability_batch(waveforms, 16000)
+
+    assert onnx_model.runtime == "onnx"
+    assert onnx_model._target_len == 1600
+    assert actual == pytest.approx(expected, abs=1e-5)
+
+
+def test_onnx_model_replicas_share_session(exported):
+    """Test that replica cloning reuses the thread-safe session."""
+    _, onnx_model = exported
+
+    assert copy.deepcopy({"fake": onnx_model})["fake"] is onnx_model
+    assert not onnx_model.quantize_dynamic("fake")
+
+
+def test_speaker_encoder_onnx_matches_torch(tmp_path):
+    """Test that the exported ECAPA-TDNN gives the torch embedding for any length."""
+    from speechbrain.lobes.models.ECAPA_TDNN import ECAPA_TDNN
+
+    torch.manual_seed(0)
+    encoder = ECAPA_TDNN(
+        40, lin_neurons=32, channels=[64, 64, 64, 64, 192], attention_channels=16
+    ).eval()
+    onnx_path = tmp_path / "embedding_model.onnx"
+    export_speaker_encoder_onnx(encoder, 40, onnx_path)
+    session = create_onnx_session(onnx_path)
+
+    for frames in (120, 301):
+        feats = torch.randn(1, frames, 40)
+        with torch.no_grad():
+            expected = encoder(feats).numpy()
+        actual = run_onnx_session(session, FEATS_INPUT, feats.numpy())
+        np.testing.assert_allclose(actual, expected, atol=1e-4)
+
+
+def test_falls_back_to_torch_without_graph(tmp_path, monkeypatch):
+    """Test that a missing graph or MODEL_RUNTIME=torch selects the torch loader."""
+    paths = LocalModelPaths(project_root=tmp_path)
+    paths.rawnet_dir.mkdir(parents=True)
+
+    model = load_local_antispoof_model("rawnet2", torch.device("cpu"), paths)
+    assert isinstance(model, LocalRawNet2Model)
+
+    _FakeLocalModel().export_onnx(paths.rawnet_onnx)
+    assert load_local_antispoof_model("rawnet2", torch.device("cpu"), paths).runtime == "onnx"
+
+    monkeypatch.setenv("MODEL_RUNTIME", "torch")
+    assert isinstance(
+        load_local_antispoof_model("rawnet2", torch.device("cpu"), paths), LocalRawNet2Model
+    )
@@ -0,0 +1,147 @@
+"""Unit tests for the process-pool inference backend."""
+
+import os
+import time
+
+import numpy as np
+import pytest
+
+from src.infrastructure.biometrics.audio_sample import AudioSample
+from src.infrastructure.biometrics.process_pool import (
+    ProcessPoolInferenceBackend,
+    create_remote_adapters,
+)
+
+# A waveform of this length makes the fake ASR model kill its worker
+_CRASH_SAMPLES = 1234
+
+
+class _FakeAdapter:
+    """Cheap stand-in for the three adapters, loaded inside each worker."""
+
+    def extract_embedding(self, audio_data, audio_format="wav"):
+        return np.full(4, audio_data.waveform.sum(), dtype=np.float32)
+
+    def detect_spoof(self, audio_data):
+        return float(audio_data.waveform.max())
+
+    def transcribe(self, audio_data):
+        if audio_data.num_samples == _CRASH_SAMPLES:
+            os._exit(1)
+        return f"{audio_data.num_samples} samples"
+
+    def validate_audio_quality(self, audio_data, audio_format=None):
+        if audio_data.duration_sec < 0.05:
+            raise ValueError("Audio too short")
+        return {"is_valid": True, "duration_sec": audio_data.duration_sec}
+
+    def get_model_id(self):
+        return 7
+
+    def get_model_name(self):
+        return "fake"
+
+    def get_model_version(self):
+        return "1.0"
+
+    def get_batching_stats(self):
+        return None
+
+    def get_replica_stats(self):
+        return None
+
+    def close(self):
+        pass
+
+
+def _fake_adapters():
+    adapter = _FakeAdapter()
+    return {"speaker": adapter, "antispoof": adapter, "asr": adapter}
+
+
+@pytest.fixture(scope="module")
+def backend():
+    pool = ProcessPoolInferenceBackend(
+        num_workers=2,
+        adapter_factory=_fake_adapters,
+        num_threads=1,
+        health_check_interval_sec=0.1,
+        start_timeout_sec=120
+    )
+    yield pool
+    pool.close()
+
+
+def _sample(num_samples: int, value: float = 0.25) -> AudioSample:
+    return AudioSample.from_array(np.full(num_samples, value, dtype=np.float32), 16000)
+
+
+def test_remote_adapters_match_local_interface(backend):
+    """Test that the proxies return the worker results for shared-memory audio."""
+    speaker, spoof, asr = create_remote_adapters(backend, timeout_sec=30)
+    sample = _sample(1600)
+
+    np.testing.assert_allclose(speaker.extract_embedding(sample), np.full(4, 400.0))
+    assert spoof.detect_spoof(sample) == pytest.approx(0.25)
+    assert asr.transcribe(sample) == "1600 samples"
+    assert speaker.get_model_id() == 7
+    assert speaker.get_model_name() == "fake"
+
+
+def test_worker_errors_keep_their_type(backend):
+    """Test that ValueError raised in a worker reaches the caller as ValueError."""
+    speaker, _, _ = create_remote_adapters(backend, timeout_sec=30)
+
+    with pytest.raises(ValueError, match="too short"):
+        speaker.validate_audio_quality(_sample(100))
+
+
+def test_crashed_worker_is_restarted(backend):
+    """Test that a crash fails the in-flight request and the pool recovers."""
+    _, _, asr = create_remote_adapters(backend, timeout_sec=30)
+
+    with pytest.raises(RuntimeError, match="crashed"):
+        asr.transcribe(_sample(_CRASH_SAMPLES))
+
+    # Wait for the monitor to bring the worker back up
+    deadline = time.monotonic() + 120
+    health = backend.health_check(timeout=5.0)
+    while not health["healthy"] and time.monotonic() < deadline:
+        time.sleep(0.2)
+        health = backend.health_check(timeout=5.0)
+    assert health["healthy"]
+    assert sum(w["restarts"] for w in health["workers"]) == 1
+    assert asr.transcribe(_sample(800)) == "800 samples"
+
+
+def test_worker_is_given_up_after_max_restarts():
+    """Test that a worker crashing past max_restarts is not respawned and the pool reports degraded."""
+    pool = ProcessPoolInferenceBackend(
+        num_workers=1,
+        adapter_factory=_fake_adapters,
+        num_threads=1,
+        health_check_interval_sec=0.1,
+        start_timeout_sec=120,
+        restart_backoff_sec=0.1,
+        max_restarts=1
+    )
+    try:
+        _, _, asr = create_remote_adapters(pool, timeout_sec=120)
+        with pytest.raises(RuntimeError, match="crashed"):
+            asr.transcribe(_sample(_CRASH_SAMPLES))
+
+        # Wait for the single restart, then crash the worker again
+        deadline = time.monotonic() + 120
+        while not pool.health_check(probe=False)["healthy"] and time.monotonic() < deadline:
+            time.sleep(0.2)
+        with pytest.raises(RuntimeError, match="crashed"):
+            asr.transcribe(_sample(_CRASH_SAMPLES))
+
+        health = pool.health_check(probe=False)
+        assert health["degraded"] and not health["healthy"]
+        assert health["workers"][0]["gave_up"]
+        assert health["workers"][0]["restarts"] == 1
+        with pytest.raises(RuntimeError, match="No inference worker available"):
+            asr.transcribe(_sample(800))
+    finally:
+        pool.close()
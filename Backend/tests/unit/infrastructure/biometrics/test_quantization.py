@@ -0,0 +1,90 @@
+"""Unit tests for dynamic INT8 quantization."""
+
+import pytest
+import torch
+
+from src.infrastructure.biometrics.local_antispoof_models import BaseLocalAntiSpoofModel
+from src.infrastructure.biometrics.model_manager import ModelManager
+from src.infrastructure.biometrics.quantization import (
+    is_quantization_supported,
+    quantize_dynamic_int8,
+)
+
+pytestmark = pytest.mark.skipif(
+    not is_quantization_supported(), reason="No quantized engine in this torch build"
+)
+
+
+class _GruHead(torch.nn.Module):
+    """RawNet2-like head: a GRU followed by a classifier, calling flatten_parameters."""
+
+    def __init__(self):
+        super().__init__()
+        self.gru = torch.nn.GRU(input_size=8, hidden_size=16, batch_first=True)
+        self.fc = torch.nn.Linear(16, 2)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        self.gru.flatten_parameters()
+        out, _ = self.gru(x.view(x.shape[0], -1, 8))
+        return self.fc(out[:, -1, :])
+
+
+class _FakeLocalModel(BaseLocalAntiSpoofModel):
+    def __init__(self):
+        super().__init__(torch.device("cpu"))
+        self._model = _GruHead().eval()
+        self._target_len = 1600
+        self.available = True
+
+    def _forward_logits(self, batch: torch.Tensor) -> torch.Tensor:
+        return self._model(batch)
+
+
+def test_quantized_module_keeps_scores_close():
+    """Test that Linear/GRU layers are replaced and outputs stay close to fp32."""
+    torch.manual_seed(0)
+    module = _GruHead().eval()
+    x = torch.randn(4, 1600)
+    with torch.no_grad():
+        expected = torch.softmax(module(x), dim=1)
+
+        assert quantize_dynamic_int8(module, "gru_head")
+        actual = torch.softmax(module(x), dim=1)
+
+    assert not isinstance(module.fc, torch.nn.Linear)
+    assert torch.allclose(actual, expected, atol=0.02)
+
+
+def test_local_model_quantize_dynamic():
+    """Test that a local anti-spoof model still scores after quantization."""
+    model = _FakeLocalModel()
+    waveform = torch.randn(1, 1600)
+    before = model.predict_spoof_probability(waveform, 16000)
+
+    assert model.quantize_dynamic("fake")
+    after = model.predict_spoof_probability(waveform, 16000)
+
+    assert after == pytest.approx(before, abs=0.02)
+
+
+def test_unloaded_local_model_is_not_quantized():
+    """Test that a model without weights reports no quantization."""
+    model = _FakeLocalModel()
+    model._model = None
+
+    assert not model.quantize_dynamic("fake")
+
+
+def test_model_manager_quantization_toggle(monkeypatch, tmp_path):
+    """Test the per-model flag and the QUANTIZE_MODELS override."""
+    monkeypatch.setenv("QUANTIZE_MODELS", "rawnet2")
+    manager = ModelManager(models_dir=str(tmp_path))
+
+    assert manager.is_quantized("rawnet2")
+    assert not manager.is_quantized("ecapa_tdnn")
+
+    manager.set_quantization("ecapa_tdnn", True)
+    assert manager.is_quantized("ecapa_tdnn")
+
+    with pytest.raises(ValueError):
+        manager.is_quantized("unknown")
@@ -0,0 +1,58 @@
+"""Unit tests for the model replica pool."""
+
+import threading
+
+import pytest
+import torch
+
+from src.infrastructure.biometrics.replica_pool import ModelReplicaPool
+
+
+def test_from_model_clones_independent_replicas():
+    """Test that replicas are separate copies with the CPU split between them."""
+    model = torch.nn.Linear(4, 2)
+    pool = ModelReplicaPool.from_model(model, size=3, threads_per_replica=2)
+
+    original_threads = torch.get_num_threads()
+    try:
+        with pool.checkout() as first, pool.checkout() as second, pool.checkout() as third:
+            seen = [first, second, third]
+            assert torch.get_num_threads() == 2
+    finally:
+        torch.set_num_threads(original_threads)
+
+    assert len({id(replica) for replica in seen}) == 3
+    assert model in seen
+    assert torch.equal(seen[1].weight, model.weight)
+    assert pool.get_stats()["replicas"] == 3
+
+
+def test_checkout_blocks_until_a_replica_is_returned():
+    """Test that a second caller waits for the single replica and the wait is recorded."""
+    pool = ModelReplicaPool([object()])
+    released = threading.Event()
+
+    def holder():
+        with pool.checkout():
+            released.wait(timeout=5)
+
+    thread = threading.Thread(target=holder)
+    thread.start()
+    with pytest.raises(TimeoutError):
+        with pool.checkout(timeout=0.05):
+            pass
+
+    released.set()
+    thread.join()
+    with pool.checkout(timeout=1):
+        pass
+
+    stats = pool.get_stats()
+    assert stats["checkouts"] == 2
+    assert stats["available"] == 1
+
+
+def test_empty_pool_is_rejected():
+    """Test that a pool needs at least one model."""
+    with pytest.raises(ValueError):
+        ModelReplicaPool([])
@@ -0,0 +1,81 @@
+"""Unit tests for the shared resampling kernel cache."""
+
+import warnings
+
+import numpy as np
+import pytest
+import torch
+import torchaudio
+
+from src.infrastructure.biometrics import resampling
+from src.infrastructure.biometrics.audio_validation import AudioValidationError
+from src.infrastructure.biometrics.resampling import get_resampler, preload_resamplers, resample
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    resampling.clear_resamplers()
+    yield
+    resampling.clear_resamplers()
+
+
+def test_kernel_is_built_once_per_rate_pair():
+    """Test that the same (rate, rate, dtype) returns the same resampler."""
+    assert get_resampler(48000) is get_resampler(48000)
+    assert get_resampler(48000) is not get_resampler(44100)
+    assert get_resampler(48000, dtype=torch.float64) is not get_resampler(48000)
+    assert len(resampling.cached_resamplers()) == 3
+
+
+@pytest.mark.parametrize("orig_rate", [8000, 44100, 48000])
+def test_cached_kernel_matches_functional_resample(orig_rate):
+    """Test that the cached resampler gives the same output as torchaudio.functional.resample."""
+    waveform = np.random.default_rng(0).uniform(-1, 1, orig_rate).astype(np.float32)
+
+    expected = torchaudio.functional.resample(torch.from_numpy(waveform), orig_rate, 16000).numpy()
+    result = resample(waveform, orig_rate, 16000)
+
+    assert result.dtype == np.float32
+    np.testing.assert_allclose(result, expected, atol=1e-6)
+    assert resample(result, 16000, 16000) is result
+
+
+def test_preload_builds_browser_rates(monkeypatch):
+    """Test that start-up preloading builds the RESAMPLER_PRELOAD_RATES kernels."""
+    monkeypatch.setenv("RESAMPLER_PRELOAD_RATES", "44100,48000,16000")
+    preload_resamplers()
+
+    assert sorted(key[0] for key in resampling.cached_resamplers()) == [44100, 48000]
+
+
+def test_cache_keeps_the_most_recently_used_kernels(monkeypatch):
+    """Test that the cache is bounded by RESAMPLER_CACHE_SIZE and evicts the least recently used kernel."""
+    monkeypatch.setenv("RESAMPLER_CACHE_SIZE", "2")
+    first = get_resampler(48000)
+    get_resampler(44100)
+    assert get_resampler(48000) is first
+    get_resampler(22050)
+
+    assert sorted(key[0] for key in resampling.cached_resamplers()) == [22050, 48000]
+
+
+def test_rate_with_oversized_kernel_is_rejected():
+    """Test that a coprime rate is rejected before its kernel is built."""
+    with pytest.raises(AudioValidationError, match="44101"):
+        resample(np.zeros(44101, dtype=np.float32), 44101)
+
+    assert resampling.cached_resamplers() == []
+    assert resampling.is_supported_rate(44100) and resampling.is_supported_rate(8000)
+
+
+def test_read_only_input_is_resampled_from_a_writable_copy():
+    """Test that resampling the read-only decoded buffer leaves it untouched and raises no warning."""
+    waveform = np.random.default_rng(0).uniform(-1, 1, 48000).astype(np.float32)
+    waveform.setflags(write=False)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        result = resample(waveform, 48000)
+
+    assert len(result) == 16000
+    assert not waveform.flags.writeable
@@ -0,0 +1,120 @@
+"""Unit tests for the CPU resource governor."""
+
+import pytest
+import torch
+
+from src.infrastructure.biometrics.replica_pool import ModelReplicaPool
+from src.infrastructure.biometrics.resource_governor import (
+    CPUResourceGovernor,
+    GOVERNED_MODELS,
+    POLICY_STATIC,
+    _parse_budgets,
+)
+
+
+def test_budgets_split_total_threads():
+    """Test that budgets add up to the total and follow the weights."""
+    governor = CPUResourceGovernor(total_threads=8, weights={"speaker": 2, "antispoof": 3, "asr": 3})
+    budgets = {key: governor.budget(key) for key in GOVERNED_MODELS}
+
+    assert sum(budgets.values()) == 8
+    assert budgets["speaker"] <= budgets["antispoof"] <= budgets["asr"] + 1
+    assert governor.budget("asr", share=2) == budgets["asr"] // 2
+
+
+def test_every_model_gets_at_least_one_thread():
+    """Test that tiny totals and skewed weights still leave each model a thread."""
+    governor = CPUResourceGovernor(total_threads=3, weights={"speaker": 0.01, "antispoof": 0.01, "asr": 100})
+    assert [governor.budget(key) for key in GOVERNED_MODELS] == [1, 1, 1]
+
+    governor = CPUResourceGovernor(total_threads=1)
+    assert governor.total_threads == len(GOVERNED_MODELS)
+    assert governor.budget("speaker", share=4) == 1
+
+
+def test_adaptive_policy_moves_threads_to_the_slowest_model():
+    """Test that measured work drives the rebalanced budgets."""
+    governor = CPUResourceGovernor(
+        total_threads=12,
+        weights={"speaker": 1, "antispoof": 1, "asr": 1},
+        rebalance_every=3,
+        min_samples=1,
+    )
+    assert governor.budget("asr") == 4
+
+    for _ in range(2):
+        governor.record("speaker", 10.0, threads=4)
+        governor.record("antispoof", 10.0, threads=4)
+        governor.record("asr", 80.0, threads=4)
+
+    allocation = governor.get_allocation()
+    assert allocation["rebalances"] >= 1
+    assert governor.budget("asr") > governor.budget("speaker")
+    assert sum(m["threads"] for m in allocation["models"].values()) == 12
+
+
+def test_fixed_budget_is_reported_and_kept_by_rebalancing():
+    """Test that a model with a creation-time thread count keeps it and the others share the rest."""
+    governor = CPUResourceGovernor(
+        total_threads=12,
+        weights={"speaker": 1, "antispoof": 1, "asr": 1},
+        rebalance_every=3,
+        min_samples=1,
+    )
+    governor.fix_budget("antispoof", 2)
+
+    for _ in range(2):
+        governor.record("speaker", 10.0, threads=4)
+        governor.record("antispoof", 500.0, threads=2)
+        governor.record("asr", 30.0, threads=4)
+
+    models = governor.get_allocation()["models"]
+    assert models["antispoof"]["threads"] == 2 and models["antispoof"]["fixed"]
+    assert models["speaker"]["threads"] + models["asr"]["threads"] == 10
+    assert models["asr"]["threads"] > models["speaker"]["threads"]
+
+
+def test_static_policy_keeps_budgets():
+    """Test that the static policy ignores measurements."""
+    governor = CPUResourceGovernor(total_threads=6, policy=POLICY_STATIC, rebalance_every=1, min_samples=1)
+    before = {key: governor.budget(key) for key in GOVERNED_MODELS}
+
+    for key in GOVERNED_MODELS:
+        governor.record(key, 100.0 if key == "speaker" else 1.0)
+
+    assert {key: governor.budget(key) for key in GOVERNED_MODELS} == before
+    assert governor.get_allocation()["rebalances"] == 0
+
+
+def test_unknown_policy_is_rejected():
+    """Test that a typo in CPU_GOVERNOR_POLICY fails loudly."""
+    with pytest.raises(ValueError):
+        CPUResourceGovernor(policy="greedy")
+
+
+def test_run_applies_budget_and_records_latency():
+    """Test that a governed pass runs with the model's threads."""
+    governor = CPUResourceGovernor(total_threads=6, weights={"speaker": 1, "antispoof": 1, "asr": 1})
+    previous = torch.get_num_threads()
+    try:
+        with governor.run("speaker"):
+            assert torch.get_num_threads() == 2
+    finally:
+        torch.set_num_threads(previous)
+
+    assert governor.get_allocation()["models"]["speaker"]["samples"] == 1
+
+
+def test_replica_pool_reports_governed_threads(monkeypatch):
+    """Test that a governed pool takes its per-replica threads from the governor."""
+    monkeypatch.setenv("CPU_GOVERNOR_ENABLED", "true")
+    pool = ModelReplicaPool([object(), object()], threads_per_replica=7, governor_key="asr")
+
+    assert pool.current_threads_per_replica() == pool._governor.budget("asr", share=2)
+    assert pool.get_stats()["threads_per_replica"] == pool.current_threads_per_replica()
+
+
+def test_parse_budgets():
+    """Test the CPU_THREAD_BUDGETS format."""
+    assert _parse_budgets("speaker:2, antispoof:3,asr:3") == {"speaker": 2.0, "antispoof": 3.0, "asr": 3.0}
+    assert _parse_budgets(None) == {}
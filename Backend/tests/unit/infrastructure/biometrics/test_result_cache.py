@@ -0,0 +1,82 @@
+"""Unit tests for the content-addressed inference result cache."""
+
+import numpy as np
+
+from src.infrastructure.biometrics.audio_sample import AudioSample, stable_audio_seed
+from src.infrastructure.biometrics.result_cache import InferenceResultCache, RESULT_SPOOF
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction_keeps_recently_used_entries():
+    """Test that the least recently used entry is evicted first."""
+    cache = InferenceResultCache(max_entries=2, ttl_sec=0)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl():
+    """Test that an entry older than the TTL is a miss."""
+    clock = _FakeClock()
+    cache = InferenceResultCache(max_entries=4, ttl_sec=10, clock=clock)
+    cache.put("a", "hola")
+
+    clock.now = 5
+    assert cache.get("a") == "hola"
+    clock.now = 16
+    assert cache.get("a") is None
+
+    stats = cache.get_stats()
+    assert stats["expirations"] == 1
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_cached_arrays_are_isolated_from_callers():
+    """Test that modifying a stored or returned embedding does not change the entry."""
+    cache = InferenceResultCache()
+    embedding = np.ones(4, dtype=np.float32)
+    cache.put("a", embedding)
+    embedding[0] = 5
+
+    returned = cache.get("a")
+    returned[1] = 7
+
+    np.testing.assert_array_equal(cache.get("a"), np.ones(4, dtype=np.float32))
+
+
+def test_disabled_cache_stores_nothing():
+    """Test that a cache with zero entries never hits."""
+    cache = InferenceResultCache(max_entries=0)
+    cache.put("a", 1)
+
+    assert not cache.enabled
+    assert cache.get("a") is None
+
+
+def test_key_depends_on_audio_and_model_version():
+    """Test that the digest follows the decoded audio and the key the model version."""
+    waveform = np.linspace(-0.5, 0.5, 1600, dtype=np.float32)
+    sample = AudioSample.from_array(waveform, 16000)
+    same = AudioSample.from_array(waveform.copy(), 16000)
+    other = AudioSample.from_array(waveform[::-1].copy(), 16000)
+
+    assert sample.digest == same.digest
+    assert sample.digest != other.digest
+    assert stable_audio_seed(sample) == stable_audio_seed(same)
+    assert InferenceResultCache.make_key(sample.digest, RESULT_SPOOF, 2, "1.0") != \
+        InferenceResultCache.make_key(sample.digest, RESULT_SPOOF, 2, "1.0+int8")
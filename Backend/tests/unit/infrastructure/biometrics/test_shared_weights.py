@@ -0,0 +1,76 @@
+"""Unit tests for memory-mapped, fork-shared model weights."""
+
+import gc
+import pickle
+
+import pytest
+import torch
+
+from src.infrastructure.biometrics import shared_weights
+from src.infrastructure.biometrics.shared_weights import (
+    load_checkpoint,
+    load_state_dict_shared,
+    preload_shared_weights,
+)
+
+
+class _PickledObject:
+    """Arbitrary object that only full (unsafe) unpickling can restore."""
+
+
+@pytest.fixture
+def checkpoint(tmp_path, monkeypatch):
+    monkeypatch.setenv("SHARED_MODEL_WEIGHTS", "true")
+    path = tmp_path / "model.ckpt"
+    torch.save(torch.nn.Linear(4, 2).state_dict(), path)
+    yield path
+    shared_weights._store.clear()
+    gc.unfreeze()
+
+
+def test_preloaded_checkpoint_is_reused(checkpoint):
+    """Test that the master's preloaded state dict is handed out instead of reloading the file."""
+    summary = preload_shared_weights([checkpoint.parent])
+
+    assert summary["files"] == 1
+    assert load_checkpoint(checkpoint) is load_checkpoint(str(checkpoint))
+    assert shared_weights.get_shared_weights_stats()["preloaded_files"] == 1
+
+
+def test_parameters_are_assigned_not_copied(checkpoint):
+    """Test that the module's parameters are the (mapped) checkpoint tensors."""
+    state = load_checkpoint(checkpoint)
+    model = torch.nn.Linear(4, 2)
+    load_state_dict_shared(model, state)
+
+    assert model.weight.data_ptr() == state["weight"].data_ptr()
+    assert isinstance(model.weight, torch.nn.Parameter)
+
+
+def test_disabled_mode_copies(checkpoint, monkeypatch):
+    """Test that without SHARED_MODEL_WEIGHTS the parameters keep their own memory."""
+    monkeypatch.setenv("SHARED_MODEL_WEIGHTS", "false")
+    state = load_checkpoint(checkpoint)
+    model = torch.nn.Linear(4, 2)
+    load_state_dict_shared(model, state)
+
+    assert model.weight.data_ptr() != state["weight"].data_ptr()
+    assert torch.equal(model.weight, state["weight"])
+    assert preload_shared_weights([checkpoint.parent])["enabled"] is False
+
+
+def test_legacy_checkpoint_falls_back_to_an_unmapped_load(checkpoint):
+    """Test that a non-zip checkpoint that cannot be mapped is still read, weights-only."""
+    torch.save(torch.nn.Linear(4, 2).state_dict(), checkpoint, _use_new_zipfile_serialization=False)
+
+    state = load_checkpoint(checkpoint)
+
+    assert set(state) == {"weight", "bias"}
+
+
+def test_pickled_object_checkpoint_is_refused(checkpoint):
+    """Test that a failed mmap load never retries with full unpickling."""
+    torch.save({"model": _PickledObject()}, checkpoint)
+
+    with pytest.raises(pickle.UnpicklingError):
+        load_checkpoint(checkpoint)
@@ -0,0 +1,84 @@
+"""Unit tests for the uncertainty-gated staged anti-spoofing ensemble."""
+
+import pytest
+import torch
+
+from src.infrastructure.biometrics.SpoofDetectorAdapter import SpoofDetectorAdapter
+
+
+class _FixedScoreModel:
+    """Stand-in local model: the score is the first sample of each waveform."""
+
+    runtime = "torch"
+    available = True
+
+    def __init__(self):
+        self.scored = 0
+
+    def predict_spoof_probability_batch(self, waveforms, sample_rate):
+        self.scored += len(waveforms)
+        return [float(w[0, 0]) for w in waveforms]
+
+
+@pytest.fixture
+def make_detector(monkeypatch):
+    models = {"aasist": _FixedScoreModel(), "rawnet2": _FixedScoreModel()}
+
+    def fake_load(self):
+        self._local_models = models
+        self._models_loaded = True
+
+    monkeypatch.setattr(SpoofDetectorAdapter, "_load_antispoofing_models", fake_load)
+
+    def make(**kwargs):
+        detector = SpoofDetectorAdapter(use_gpu=False, max_batch_size=1, **kwargs)
+        return detector, models
+
+    return make
+
+
+def test_confident_first_stage_skips_second(make_detector):
+    """Test that scores outside the band are settled by the first stage alone."""
+    detector, models = make_detector(staged=True, first_stage="rawnet2", uncertainty_band=(0.3, 0.7))
+    waveforms = [torch.full((1, 160), 0.05), torch.full((1, 160), 0.95)]
+
+    scores = detector._detect_spoof_batch(waveforms)
+
+    assert scores == pytest.approx([0.05, 0.95])
+    assert models["rawnet2"].scored == 2
+    assert models["aasist"].scored == 0
+
+
+def test_uncertain_first_stage_escalates(make_detector):
+    """Test that only in-band requests reach the second model and are counted."""
+    detector, models = make_detector(staged=True, first_stage="rawnet2", uncertainty_band=(0.3, 0.7))
+    waveforms = [torch.full((1, 160), 0.5), torch.full((1, 160), 0.9)]
+
+    per_request = detector._score_batch(waveforms)
+
+    assert list(per_request[0]) == ["rawnet2", "aasist"]
+    assert list(per_request[1]) == ["rawnet2"]
+    assert models["aasist"].scored == 1
+
+    stats = detector.get_staging_stats()
+    assert stats["first_stage_only"] == 1
+    assert stats["escalated"] == 1
+    assert stats["escalation_rate"] == pytest.approx(0.5)
+
+
+def test_unstaged_runs_every_model(make_detector):
+    """Test that the full ensemble is kept when staging is off."""
+    detector, models = make_detector(staged=False)
+    latency = {}
+
+    per_request = detector._score_batch([torch.full((1, 160), 0.9)], latency)
+
+    assert set(per_request[0]) == {"aasist", "rawnet2"}
+    assert set(latency) == {"aasist", "rawnet2"}
+    assert detector.get_staging_stats()["escalated"] == 0
+
+
+def test_unknown_first_stage_is_rejected(make_detector):
+    """Test that the first stage must be an ensemble member."""
+    with pytest.raises(ValueError):
+        make_detector(staged=True, first_stage="resnet")
@@ -0,0 +1,119 @@
+"""Unit tests for streaming ingestion: PCM decoding, VAD and end-pointing."""
+
+import numpy as np
+import pytest
+
+from src.infrastructure.biometrics.streaming import (
+    PCMStreamDecoder,
+    StreamingAudioSession,
+    create_stream_decoder,
+)
+from src.infrastructure.biometrics.vad import StreamingEnergyVAD, frame_levels_db
+
+RATE = 16000
+
+
+def _tone(seconds, amplitude=0.3):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def _noise(seconds, amplitude=1e-3, seed=0):
+    return (np.random.default_rng(seed).standard_normal(int(seconds * RATE)) * amplitude).astype(np.float32)
+
+
+def _pcm(samples):
+    return (samples * 32767).astype("<i2").tobytes()
+
+
+def _stream(session, samples, chunk_sec=0.1):
+    """Feed samples in odd-sized chunks; return the indices of chunks that ended a pause."""
+    data, step, pauses = _pcm(samples), int(chunk_sec * RATE) * 2 + 1, []
+    for i, start in enumerate(range(0, len(data), step)):
+        if session.feed(data[start:start + step]):
+            pauses.append(i)
+    return pauses
+
+
+def test_pcm_decoder_keeps_partial_samples():
+    """Test that a sample split across chunks is decoded once both halves arrive."""
+    decoder = PCMStreamDecoder("pcm_s16le", RATE)
+    data = np.array([1000, -2000, 3000], dtype="<i2").tobytes()
+
+    first = decoder.feed(data[:3])
+    second = decoder.feed(data[3:])
+
+    np.testing.assert_allclose(np.concatenate([first, second]) * 32768, [1000, -2000, 3000])
+
+
+def test_frame_levels_match_rms():
+    """Test the vectorized frame levels against a per-frame computation."""
+    samples = _tone(0.1)
+    levels = frame_levels_db(samples, 480)
+
+    expected = [10 * np.log10(np.mean(samples[i:i + 480] ** 2) + 1e-10) for i in range(0, 1440, 480)]
+    np.testing.assert_allclose(levels, expected, rtol=1e-4)
+
+
+def test_vad_bounds_cover_speech_only():
+    """Test that leading and trailing silence fall outside the speech bounds."""
+    vad = StreamingEnergyVAD(RATE, hangover_ms=150)
+    vad.process(np.concatenate([_noise(0.5), _tone(1.0), _noise(0.6, seed=1)]))
+
+    start, end = vad.speech_bounds()
+    assert start == pytest.approx(0.5 * RATE, abs=480)
+    assert end == pytest.approx(1.5 * RATE, abs=480)
+    assert not vad.in_speech
+    assert vad.trailing_silence_sec == pytest.approx(0.6, abs=0.05)
+
+
+def test_session_detects_pause_and_end_of_speech():
+    """Test the pause signal, end-pointing and a stable speech sample."""
+    session = StreamingAudioSession(
+        PCMStreamDecoder("pcm_s16le", RATE),
+        max_duration_sec=10, end_silence_ms=500, min_speech_sec=0.5, hangover_ms=200
+    )
+
+    pauses = _stream(session, np.concatenate([_noise(0.3), _tone(1.0), _noise(0.3, seed=1)]))
+    assert pauses and not session.speech_ended
+    at_pause = session.to_sample()
+
+    _stream(session, _noise(0.4, seed=2))
+    assert session.speech_ended
+    assert session.to_sample().digest == at_pause.digest
+    assert at_pause.duration_sec == pytest.approx(1.4, abs=0.1)
+
+
+def test_session_without_speech_has_no_sample():
+    """Test that silence alone never ends the utterance nor yields a sample."""
+    session = StreamingAudioSession(PCMStreamDecoder("pcm_s16le", RATE), max_duration_sec=10)
+    _stream(session, _noise(2.0))
+
+    assert session.to_sample() is None
+    assert not session.speech_ended
+
+
+def test_session_resamples_to_16k():
+    """Test that 48 kHz PCM becomes the shared 16 kHz representation."""
+    session = StreamingAudioSession(
+        PCMStreamDecoder("pcm_f32le", 48000), max_duration_sec=5, min_speech_sec=0.2
+    )
+    tone = np.repeat(_tone(0.5), 3)
+    session.feed(tone.astype("<f4").tobytes())
+
+    sample = session.to_sample()
+    assert sample.sample_rate == 16000
+    assert sample.original_sample_rate == 48000
+
+
+def test_unsupported_stream_format():
+    """Test that formats that cannot be decoded incrementally are rejected."""
+    with pytest.raises(ValueError):
+        create_stream_decoder("mp3")
+
+
+def test_unsupported_pcm_sample_rate():
+    """Test that a PCM stream at a rate outside STREAM_SAMPLE_RATES is rejected."""
+    with pytest.raises(ValueError, match="sample rate"):
+        create_stream_decoder("pcm_s16le", 10**9)
+    assert create_stream_decoder("pcm_s16le", 44100).sample_rate == 44100
@@ -0,0 +1,180 @@
+"""Unit tests for the async API of VoiceBiometricEngineFacade."""
+
+import threading
+
+import numpy as np
+import pytest
+
+from src.infrastructure.biometrics.VoiceBiometricEngineFacade import VoiceBiometricEngineFacade
+from src.infrastructure.biometrics.audio_sample import AudioSample
+from src.infrastructure.biometrics.result_cache import mark_fallback_result
+
+
+class _RecordingAdapter:
+    """Fake adapter that records which thread ran each call."""
+
+    def __init__(self):
+        self.threads = []
+
+    def _record(self):
+        self.threads.append(threading.current_thread())
+
+    def extract_embedding(self, audio_data, audio_format="wav"):
+        self._record()
+        return np.ones(256, dtype=np.float32)
+
+    def detect_spoof(self, audio_data):
+        self._record()
+        return 0.1
+
+    def transcribe(self, audio_data):
+        self._record()
+        return "hola mundo"
+
+    def get_model_id(self):
+        return 1
+
+    def get_model_version(self):
+        return "1.0"
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def facade():
+    adapter = _RecordingAdapter()
+    engine = VoiceBiometricEngineFacade(adapter, adapter, adapter)
+    yield engine, adapter
+    engine.close()
+
+
+@pytest.fixture
+def sample():
+    return AudioSample.from_array(np.zeros(32000, dtype=np.float32), 16000)
+
+
+async def test_analyze_runs_inference_off_the_event_loop(facade, sample):
+    """Test that analyze returns all features and never runs a model on the loop thread."""
+    engine, adapter = facade
+
+    features = await engine.analyze(sample)
+
+    assert features["anti_spoofing_score"] == 0.1
+    assert features["transcribed_text"] == "hola mundo"
+    assert features["embedding"].shape == (256,)
+    assert len(adapter.threads) == 3
+    assert threading.current_thread() not in adapter.threads
+
+
+async def test_single_model_methods(facade, sample):
+    """Test that embed, detect_spoof and transcribe each run one model off the loop."""
+    engine, adapter = facade
+
+    assert (await engine.embed(sample)).shape == (256,)
+    assert await engine.detect_spoof(sample) == 0.1
+    assert await engine.transcribe(sample) == "hola mundo"
+    assert threading.current_thread() not in adapter.threads
+
+
+async def test_decode_rejects_invalid_audio(facade):
+    """Test that decoding errors surface as ValueError for the controllers."""
+    engine, _ = facade
+
+    with pytest.raises(ValueError):
+        await engine.decode(b"", "audio/wav")
+
+
+def _cascade_engine(adapter, **kwargs):
+    # No result cache: the cascade tests count model runs on the same sample
+    return VoiceBiometricEngineFacade(
+        adapter, adapter, adapter,
+        cascade=True, similarity_threshold=0.6, reject_margin=0.2, cache_size=0, **kwargs
+    )
+
+
+async def test_cascade_rejects_low_similarity_with_embedding_only(sample):
+    """Test that a hopeless similarity skips anti-spoofing and ASR."""
+    adapter = _RecordingAdapter()
+    engine = _cascade_engine(adapter)
+    reference = np.zeros(256, dtype=np.float32)
+    reference[0], reference[1] = 1.0, -1.0  # orthogonal to the fake embedding
+
+    features = await engine.analyze(sample, reference_embedding=reference)
+    engine.close()
+
+    assert features["short_circuited"]
+    assert features["short_circuit_reason"] == "low_similarity"
+    assert features["anti_spoofing_score"] is None
+    assert len(adapter.threads) == 1
+    assert engine.get_cascade_stats()["short_circuited"]["low_similarity"] == 1
+
+
+async def test_cascade_skips_asr_on_extreme_spoof(sample):
+    """Test that a spoof probability above the skip threshold skips ASR only."""
+    adapter = _RecordingAdapter()
+    engine = _cascade_engine(adapter, spoof_skip_asr_threshold=0.05)
+
+    features = await engine.analyze(sample, reference_embedding=np.ones(256, dtype=np.float32))
+    result = engine.analyze_voice(sample, "wav", np.ones(256, dtype=np.float32), "hola mundo")
+    engine.close()
+
+    assert features["short_circuit_reason"] == "spoof_detected"
+    assert features["anti_spoofing_score"] == 0.1
+    assert features["transcribed_text"] == ""
+    assert result.short_circuited and not result.phrase_ok
+    assert len(adapter.threads) == 4
+
+
+async def test_cascade_runs_all_models_for_plausible_attempts(sample):
+    """Test that attempts near the threshold still get the full analysis."""
+    adapter = _RecordingAdapter()
+    engine = _cascade_engine(adapter)
+
+    features = await engine.analyze(sample, reference_embedding=np.ones(256, dtype=np.float32))
+    engine.close()
+
+    assert not features["short_circuited"]
+    assert features["similarity"] == pytest.approx(1.0)
+    assert features["transcribed_text"] == "hola mundo"
+    assert len(adapter.threads) == 3
+
+
+async def test_duplicate_audio_is_answered_from_cache(facade, sample):
+    """Test that the same decoded audio skips inference and bypass_cache recomputes."""
+    engine, adapter = facade
+
+    first = await engine.analyze(sample)
+    again = await engine.analyze(AudioSample.from_array(sample.waveform.copy(), 16000))
+    assert len(adapter.threads) == 3
+    np.testing.assert_array_equal(again["embedding"], first["embedding"])
+    assert again["transcribed_text"] == "hola mundo"
+
+    await engine.analyze(sample, bypass_cache=True)
+    assert len(adapter.threads) == 6
+
+    stats = engine.get_cache_stats()
+    assert stats["hits"] == 3
+    assert stats["misses"] == 3
+    assert stats["bypassed"] == 3
+
+
+async def test_fallback_results_are_not_cached(facade, sample):
+    """Test that a result produced by an adapter fallback is recomputed instead of cached."""
+    engine, adapter = facade
+
+    def fallback_spoof(audio_data):
+        adapter._record()
+        mark_fallback_result("antispoof")
+        return 0.1
+
+    adapter.detect_spoof = fallback_spoof
+    await engine.detect_spoof(sample)
+    await engine.detect_spoof(sample)
+    await engine.embed(sample)
+    await engine.embed(sample)
+
+    assert len(adapter.threads) == 3
+    stats = engine.get_cache_stats()
+    assert stats["fallbacks_not_cached"] == 2
+    assert stats["hits"] == 1
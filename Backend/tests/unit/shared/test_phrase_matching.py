@@ -0,0 +1,67 @@
+"""Unit tests for the shared phrase matching engine."""
+
+from src.shared.phrase_matching import (
+    compile_phrase,
+    edit_distance,
+    normalize_text,
+    normalize_words,
+    phrase_similarity,
+    word_error_rate,
+)
+
+
+def _reference_distance(a, b):
+    """Plain dynamic-programming Levenshtein distance."""
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (a[i - 1] != b[j - 1]))
+        previous = current
+    return previous[-1]
+
+
+def test_normalization_drops_accents_and_punctuation_but_keeps_enie():
+    """Test Spanish-aware normalization."""
+    assert normalize_text("¿Está bien, Señor?") == "esta bien señor"
+    assert normalize_text("¡PINGÜINO!  del   año") == "pinguino del año"
+    assert normalize_words("  Hola,   mundo. ") == ("hola", "mundo")
+    assert normalize_words("¿?") == ()
+
+
+def test_bit_parallel_distance_matches_dynamic_programming():
+    """Test the bit-parallel distance against the textbook algorithm."""
+    pairs = [
+        ("", ""),
+        ("", "abc"),
+        ("kitten", "sitting"),
+        ("flaw", "lawn"),
+        ("a" * 70 + "b", "b" + "a" * 70),
+        ("la casa es azul", "la cosa es azul oscuro"),
+    ]
+    for a, b in pairs:
+        assert edit_distance(a, b) == _reference_distance(a, b)
+        assert edit_distance(b, a) == _reference_distance(a, b)
+
+
+def test_word_level_distance():
+    """Test that word sequences are compared word by word."""
+    assert edit_distance(("el", "perro", "come"), ("el", "gato", "come", "carne")) == 2
+    assert word_error_rate("El perro come.", "el gato come carne") == 2 / 3
+    assert word_error_rate("", "") == 0.0
+
+
+def test_phrase_similarity_ignores_case_accents_and_punctuation():
+    """Test that formatting differences do not lower the score."""
+    assert phrase_similarity("Mi voz es mi contraseña.", "mi voz es mi contraseña") == 1.0
+    assert phrase_similarity("Está lloviendo", "esta lloviendo") == 1.0
+    assert phrase_similarity("Mi voz es mi contraseña", "") == 0.0
+    assert phrase_similarity("Mi voz es mi contraseña", "mi voz es una contraseña") < 1.0
+
+
+def test_compiled_phrase_is_cached():
+    """Test that an expected phrase is normalized only once."""
+    assert compile_phrase("Hola mundo") is compile_phrase("Hola mundo")
+    compiled = compile_phrase("Hola mundo")
+    assert compiled.char_distance("hola  Mundo!") == 0
+    assert compiled.word_distance("hola") == 1
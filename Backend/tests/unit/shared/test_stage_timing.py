@@ -0,0 +1,63 @@
+"""Unit tests for per-stage request latency."""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+
+from src.shared.stage_timing import (
+    StageTimer,
+    current_stage_timer,
+    start_stage_timer,
+    timed_stage,
+)
+
+
+def test_repeated_stages_accumulate():
+    """Test that a stage timed twice reports the sum."""
+    timer = StageTimer()
+    timer.add("db", 2.4)
+    timer.add("db", 3.3)
+    timer.add("embed", 10.0)
+
+    assert timer.as_dict() == {"db": 6, "embed": 10}
+    assert timer.get("asr") is None
+
+
+def test_timed_stage_without_timer_is_a_noop():
+    """Test that code outside a timed request runs untimed."""
+    async def untimed():
+        with timed_stage("decode"):
+            return current_stage_timer()
+
+    assert asyncio.run(untimed()) is None
+
+
+def test_stages_from_tasks_and_executor_threads():
+    """Test that tasks and context-copying executor calls record into the request's timer."""
+    def blocking_stage():
+        with timed_stage("decode"):
+            time.sleep(0.01)
+
+    async def request():
+        timer = start_stage_timer()
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            await loop.run_in_executor(executor, contextvars.copy_context().run, blocking_stage)
+
+        async def model(stage):
+            with timed_stage(stage):
+                await asyncio.sleep(0.01)
+
+        with timed_stage("inference"):
+            await asyncio.gather(model("embed"), model("asr"))
+        return timer
+
+    timer = asyncio.run(request())
+    stages = timer.as_dict()
+
+    assert set(stages) == {"decode", "embed", "asr", "inference"}
+    assert stages["decode"] >= 9
+    # Parallel models: the wall time is below the sum of the stages
+    assert stages["inference"] < stages["embed"] + stages["asr"]
+    assert timer.elapsed_ms() >= stages["inference"]
@@ -87,4 +87,45 @@ class TestResultBuilder:
         
         assert result1.id != result2.id
         assert result1.accept is True
-        assert result2.accept is False
\ No newline at end of file
+        assert result2.accept is False
+
+    def test_builder_records_latency_breakdown(self):
+        """Test that total and per-stage latencies reach the built result."""
+        stages = {"decode": 12, "embed": 340, "asr": 910, "inference": 950, "db": 25}
+        
+        result = (ResultBuilder()
+                  .with_user(uuid4())
+                  .with_biometric_scores(
+                      similarity=0.9,
+                      spoof_probability=0.05,
+                      phrase_match=0.95,
+                      phrase_ok=True,
+                      inference_latency_ms=950
+                  )
+                  .with_stage_latencies(stages)
+                  .with_total_latency(1200)
+                  .accept_with_reason(AuthReason.OK)
+                  .build())
+        
+        assert result.total_latency_ms == 1200
+        assert result.stage_latency_ms == stages
+        assert result.stage_latency_ms is not stages
+        assert result.scores.inference_latency_ms == 950
+
+    def test_builder_keeps_skipped_spoof_check_unset(self):
+        """Test that a skipped anti-spoofing check is stored as None, not as a spoof."""
+        result = (ResultBuilder()
+                  .with_user(uuid4())
+                  .with_biometric_scores(
+                      similarity=0.2,
+                      spoof_probability=None,
+                      phrase_match=0.0,
+                      phrase_ok=False,
+                      inference_latency_ms=300
+                  )
+                  .reject_with_reason(AuthReason.LOW_SIMILARITY)
+                  .build())
+        
+        assert result.scores.spoof_probability is None
+        assert result.reason == AuthReason.LOW_SIMILARITY
+        assert not result.get_risk_indicators()["high_spoof_prob"]
@@ -4,6 +4,9 @@ import pytest
 from unittest.mock import Mock, AsyncMock, patch
 import numpy as np
 
+from src.application.verification_service import VerificationService
+from src.shared.constants.biometric_constants import TRANSCRIPT_PHRASE_MATCH_THRESHOLD
+
 
 @pytest.mark.asyncio
 class TestVerificationServiceV2:
@@ -53,3 +56,16 @@ class TestVerificationServiceV2:
         """Test verification for user without voiceprint."""
         # TODO: Implement
         pass
+
+
+def test_phrase_score_is_mapped_onto_transcript_scale():
+    """Test that an ASR phrase score enters the composite relative to its own threshold."""
+    confidence = VerificationService._phrase_confidence
+
+    assert confidence(0.5, 0.5) == pytest.approx(TRANSCRIPT_PHRASE_MATCH_THRESHOLD)
+    assert confidence(0.0, 0.5) == 0.0
+    assert confidence(1.0, 0.5) == pytest.approx(1.0)
+    assert confidence(0.25, 0.5) == pytest.approx(TRANSCRIPT_PHRASE_MATCH_THRESHOLD / 2)
+    assert confidence(0.6, 0.5) > TRANSCRIPT_PHRASE_MATCH_THRESHOLD > confidence(0.45, 0.5)
+    # Transcript similarity (no threshold given) is used as-is
+    assert confidence(0.55, None) == 0.55
@@ -188,6 +188,8 @@ CREATE TABLE IF NOT EXISTS auth_attempt (
 
   total_latency_ms INT,                         -- latencia end-to-end de la request /verify
                                                 -- (útil para SLA bancario)
+  stage_latency_ms JSONB,                       -- ms por etapa (convert, decode, preprocess,
+                                                -- embed, spoof, asr, inference, db)
 
   created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
   decided_at TIMESTAMPTZ,
@@ -202,7 +204,7 @@ CREATE TABLE IF NOT EXISTS scores (
   attempt_id UUID PRIMARY KEY REFERENCES auth_attempt(id) ON DELETE CASCADE,
 
   similarity REAL NOT NULL,                     -- score de similitud de voz (speaker verification)
-  spoof_prob REAL NOT NULL,                     -- prob. de audio falsificado/replay/deepfake
+  spoof_prob REAL,                              -- prob. de audio falsificado/replay/deepfake (NULL si no se evaluó)
   phrase_match REAL NOT NULL,                   -- similitud textual/ASR (0..1)
   phrase_ok BOOLEAN,                            -- interpretación binaria: ¿dijo la frase correcta?
 
@@ -294,7 +296,8 @@ SELECT
   s.inference_ms,
   a.user_id,
   a.client_id,
-  a.challenge_id
+  a.challenge_id,
+  a.stage_latency_ms
 FROM auth_attempt a
 JOIN scores s ON s.attempt_id = a.id;
 
@@ -0,0 +1,39 @@
+-- Migration 005: Per-stage latency breakdown of authentication attempts
+-- Created: 2026-10-16
+-- Purpose: Store how long each stage of a /verify request took
+--          (convert, decode, preprocess, embed, spoof, asr, inference, db)
+--          next to total_latency_ms, for SLA reporting, and allow a NULL
+--          scores.spoof_prob when anti-spoofing was skipped
+
+ALTER TABLE auth_attempt ADD COLUMN IF NOT EXISTS stage_latency_ms JSONB;
+
+COMMENT ON COLUMN auth_attempt.stage_latency_ms IS
+  'Milliseconds per request stage, e.g. {"decode": 12, "embed": 340, "asr": 910, "inference": 950, "db": 25}';
+
+-- NULL when the verification cascade stopped before anti-spoofing ran
+ALTER TABLE scores ALTER COLUMN spoof_prob DROP NOT NULL;
+
+COMMENT ON COLUMN scores.spoof_prob IS
+  'Spoof probability; NULL when anti-spoofing was skipped (short-circuited cascade)';
+
+-- New columns can only be appended to an existing view
+CREATE OR REPLACE VIEW v_attempt_metrics AS
+SELECT
+  a.id                  AS attempt_id,
+  a.created_at,
+  a.decided_at,
+  a.accept,
+  a.reason,
+  a.policy_id,
+  a.total_latency_ms,
+  s.similarity,
+  s.spoof_prob,
+  s.phrase_match,
+  s.phrase_ok,
+  s.inference_ms,
+  a.user_id,
+  a.client_id,
+  a.challenge_id,
+  a.stage_latency_ms
+FROM auth_attempt a
+JOIN scores s ON s.attempt_id = a.id;
@@ -194,6 +194,7 @@ CREATE TABLE auth_attempt (
     reason auth_reason,
     policy_id TEXT,
     total_latency_ms INTEGER,
+    stage_latency_ms JSONB,
     created_at TIMESTAMPTZ NOT NULL,
     decided_at TIMESTAMPTZ
 );
@@ -204,7 +205,7 @@ CREATE TABLE auth_attempt (
 CREATE TABLE scores (
     attempt_id UUID PRIMARY KEY REFERENCES auth_attempt(id),
     similarity REAL NOT NULL,
-    spoof_prob REAL NOT NULL,
+    spoof_prob REAL,
     phrase_match REAL NOT NULL,
     phrase_ok BOOLEAN,
     inference_ms INTEGER,